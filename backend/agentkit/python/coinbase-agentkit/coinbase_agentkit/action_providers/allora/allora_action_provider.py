@@ -1,13 +1,16 @@
 """Allora Network action provider."""
 
 import asyncio
+import concurrent.futures
 import json
-from concurrent.futures import ThreadPoolExecutor
+import threading
 from typing import Any
 
+import aiohttp
 from allora_sdk.v2.api_client import (
     AlloraAPIClient,
     ChainSlug,
+    Fetcher,
     PriceInferenceTimeframe,
     PriceInferenceToken,
 )
@@ -16,7 +19,14 @@ from ...network import Network
 from ...wallet_providers import WalletProvider
 from ..action_decorator import create_action
 from ..action_provider import ActionProvider
-from .schemas import GetAllTopicsInput, GetInferenceByTopicIdInput, GetPriceInferenceInput
+from .constants import REQUEST_TIMEOUT, TOPIC_CATALOG_TTL
+from .schemas import (
+    GetAllTopicsInput,
+    GetInferenceByTopicIdInput,
+    GetPriceInferenceInput,
+    GetPriceInferencesInput,
+)
+from .topic_catalog import TopicCatalog, normalize_timeframe
 
 
 def _convert_to_dict(obj: Any) -> dict[str, Any]:
@@ -41,6 +51,52 @@ def _convert_to_dict(obj: Any) -> dict[str, Any]:
         return obj
 
 
+class _SessionFetcher(Fetcher):
+    """Fetcher reusing one aiohttp session, and its connections, across requests.
+
+    The session belongs to the event loop it was created on, so the fetcher must only
+    be used from the provider's shared loop.
+    """
+
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+
+    async def fetch(self, url: str, headers: dict) -> Any:
+        """Fetch a JSON response."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        async with self._session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def close(self) -> None:
+        """Close the session."""
+        if self._session is not None:
+            await self._session.close()
+
+
+def _price_inference_enums(
+    asset: str, timeframe: str
+) -> tuple[PriceInferenceToken, PriceInferenceTimeframe] | None:
+    """Get the SDK enums for an asset and timeframe with a dedicated price endpoint.
+
+    Args:
+        asset: The asset symbol, e.g. "BTC".
+        timeframe: The timeframe, e.g. "5m" or "8h".
+
+    Returns:
+        tuple[PriceInferenceToken, PriceInferenceTimeframe] | None: The enums, or None
+            if the pair has to be looked up in the topic catalog instead.
+
+    """
+    token = PriceInferenceToken.__members__.get(asset.strip().upper())
+    normalized = normalize_timeframe(timeframe)
+    frame = next((tf for tf in PriceInferenceTimeframe if tf.value == normalized), None)
+    if token is None or frame is None:
+        return None
+    return token, frame
+
+
 class AlloraActionProvider(ActionProvider[WalletProvider]):
     """Action provider for interacting with Allora Network."""
 
@@ -48,12 +104,16 @@ class AlloraActionProvider(ActionProvider[WalletProvider]):
         self,
         api_key: str | None = None,
         chain_slug: ChainSlug | None = None,
+        topic_catalog_ttl: float = TOPIC_CATALOG_TTL,
+        request_timeout: float = REQUEST_TIMEOUT,
     ):
         """Initialize the Allora action provider.
 
         Args:
             api_key: API key for Allora Network
             chain_slug: Chain slug to use (testnet or mainnet)
+            topic_catalog_ttl: How long the topic catalog is reused, in seconds
+            request_timeout: How long a request may take before it is cancelled, in seconds
 
         """
         super().__init__("allora", [])
@@ -65,12 +125,39 @@ class AlloraActionProvider(ActionProvider[WalletProvider]):
         self.client = AlloraAPIClient(
             api_key=api_key or default_api_key,
             chain_slug=chain_slug or ChainSlug.TESTNET,
+            fetcher=_SessionFetcher(),
         )
-        # Create a thread pool executor for running async code
-        self._executor = ThreadPoolExecutor(max_workers=5)
+        self.topic_catalog_ttl = topic_catalog_ttl
+        self.request_timeout = request_timeout
+        self._topic_catalog: TopicCatalog | None = None
+        self._topic_catalog_lock = threading.Lock()
+        # Async client calls run on one event loop in a background thread, so they can
+        # share an HTTP session and run concurrently
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the shared event loop, starting it on first use.
+
+        Returns:
+            The running event loop
+
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="allora-event-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
 
     def _run_async(self, coro):
-        """Run an async coroutine in a synchronous context.
+        """Run an async coroutine on the shared event loop and wait for its result.
+
+        The coroutine is cancelled if it does not finish within the request timeout,
+        so a hung request neither blocks the caller nor holds the shared loop.
 
         Args:
             coro: The coroutine to run
@@ -78,12 +165,57 @@ class AlloraActionProvider(ActionProvider[WalletProvider]):
         Returns:
             The result of the coroutine
 
+        Raises:
+            TimeoutError: If the coroutine does not finish within the request timeout
+
         """
-        loop = asyncio.new_event_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
         try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
+            return future.result(timeout=self.request_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"Allora request timed out after {self.request_timeout} seconds"
+            ) from None
+
+    def close(self) -> None:
+        """Close the HTTP session and stop the shared event loop."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+
+        fetcher = getattr(self.client, "fetcher", None)
+        if isinstance(fetcher, _SessionFetcher):
+            asyncio.run_coroutine_threadsafe(fetcher.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def get_topic_catalog(self, max_age: float | None = None) -> TopicCatalog:
+        """Get the catalog of all topics.
+
+        All topics are fetched at once, and the catalog is only fetched again once it
+        is older than the TTL.
+
+        Args:
+            max_age: Optional maximum catalog age in seconds, overriding the TTL
+
+        Returns:
+            TopicCatalog: The topic catalog
+
+        """
+        max_age = self.topic_catalog_ttl if max_age is None else max_age
+
+        with self._topic_catalog_lock:
+            catalog = self._topic_catalog
+            if catalog is None or catalog.age() >= max_age:
+                topics = self._run_async(self.client.get_all_topics())
+                # Convert the topics to dictionaries before indexing them
+                catalog = TopicCatalog([_convert_to_dict(topic) for topic in topics])
+                self._topic_catalog = catalog
+            return catalog
 
     @create_action(
         name="get_all_topics",
@@ -123,10 +255,7 @@ A failure response will return an error message with details.
     def get_all_topics(self, args: dict[str, Any]) -> str:
         """Get all available topics from Allora Network."""
         try:
-            topics = self._run_async(self.client.get_all_topics())
-            # Convert the topics to dictionaries before serializing
-            topics_dict = [_convert_to_dict(topic) for topic in topics]
-            topics_json = json.dumps(topics_dict)
+            topics_json = json.dumps(self.get_topic_catalog().topics)
             return f"The available topics at Allora Network are:\n {topics_json}"
         except Exception as e:
             return f"Error getting all topics: {e}"
@@ -260,6 +389,116 @@ A failure response will return an error message with details.
                 # Fallback if we can't access the values
                 return f"Error getting price inference: {e}"
 
+    async def _fetch_price_inference(
+        self, asset: str, timeframe: str, topic_id: int | None
+    ) -> dict[str, Any]:
+        """Fetch one price inference, from the price endpoint or its topic.
+
+        Args:
+            asset: The asset symbol
+            timeframe: The timeframe
+            topic_id: The topic to read the inference of, or None to use the price endpoint
+
+        Returns:
+            dict[str, Any]: The price inference
+
+        """
+        if topic_id is None:
+            token, frame = _price_inference_enums(asset, timeframe)
+            inference = await self.client.get_price_inference(token, frame)
+        else:
+            inference = await self.client.get_inference_by_topic_id(topic_id)
+
+        inference_dict = _convert_to_dict(inference.inference_data)
+        result = {
+            "asset": asset,
+            "timeframe": timeframe,
+            "price": inference_dict.get("network_inference_normalized", "0"),
+            "timestamp": inference_dict.get("timestamp", 0),
+        }
+        if topic_id is not None:
+            result["topic_id"] = topic_id
+        return result
+
+    async def _gather_price_inferences(
+        self, requests: list[tuple[str, str, int | None]]
+    ) -> list[dict[str, Any] | BaseException]:
+        """Fetch several price inferences concurrently."""
+        return await asyncio.gather(
+            *(self._fetch_price_inference(*request) for request in requests),
+            return_exceptions=True,
+        )
+
+    @create_action(
+        name="get_price_inferences",
+        description="""
+This tool will get price inferences for several tokens and timeframes from Allora Network at once.
+It requires a list of requests, each with an asset symbol (e.g., 'BTC', 'ETH') and a timeframe (e.g., '5m', '8h').
+
+BTC and ETH with 5m and 8h timeframes use the dedicated price endpoint. Other pairs are looked up in
+the Allora topic list by asset and timeframe, e.g. 'SOL' and '8h' matches a topic named "SOL 8h Price Prediction".
+
+A successful response will return a message with one entry per request. Example:
+    The price inferences from Allora Network are:
+    [
+        {"asset": "BTC", "timeframe": "8h", "price": "100000", "timestamp": 1718198400},
+        {"asset": "SOL", "timeframe": "8h", "price": "150", "timestamp": 1718198400, "topic_id": 37},
+        {"asset": "DOGE", "timeframe": "1h", "error": "No price inference topic found for DOGE (1h)"}
+    ]
+
+Prefer this over calling get_price_inference for each token.
+        """,
+        schema=GetPriceInferencesInput,
+    )
+    def get_price_inferences(self, args: dict[str, Any]) -> str:
+        """Get price inferences for several token/timeframe pairs concurrently."""
+        try:
+            validated_args = GetPriceInferencesInput(**args)
+            pairs = list(
+                dict.fromkeys(
+                    (request.asset.strip().upper(), request.timeframe.strip())
+                    for request in validated_args.requests
+                )
+            )
+
+            # Resolve pairs without a price endpoint to topics before fetching anything
+            results: dict[tuple[str, str], dict[str, Any]] = {}
+            requests: list[tuple[str, str, int | None]] = []
+            for asset, timeframe in pairs:
+                if _price_inference_enums(asset, timeframe) is not None:
+                    requests.append((asset, timeframe, None))
+                    continue
+
+                try:
+                    topic = self.get_topic_catalog().find_topic(asset, timeframe)
+                except Exception as e:
+                    results[asset, timeframe] = {
+                        "asset": asset,
+                        "timeframe": timeframe,
+                        "error": f"Error getting topics: {e}",
+                    }
+                    continue
+
+                if topic is None:
+                    results[asset, timeframe] = {
+                        "asset": asset,
+                        "timeframe": timeframe,
+                        "error": f"No price inference topic found for {asset} ({timeframe})",
+                    }
+                else:
+                    requests.append((asset, timeframe, topic["topic_id"]))
+
+            inferences = self._run_async(self._gather_price_inferences(requests))
+            for (asset, timeframe, _), inference in zip(requests, inferences, strict=True):
+                if isinstance(inference, BaseException):
+                    inference = {"asset": asset, "timeframe": timeframe, "error": str(inference)}
+                results[asset, timeframe] = inference
+
+            inferences_json = json.dumps([results[pair] for pair in pairs])
+            return f"The price inferences from Allora Network are:\n{inferences_json}"
+        except Exception as e:
+            return f"Error getting price inferences: {e}"
+
     def supports_network(self, network: Network) -> bool:
         """Check if the provider supports a given network.
 
@@ -271,7 +510,10 @@ A failure response will return an error message with details.
 
 
 def allora_action_provider(
-    api_key: str | None = None, chain_slug: ChainSlug | None = None
+    api_key: str | None = None,
+    chain_slug: ChainSlug | None = None,
+    topic_catalog_ttl: float = TOPIC_CATALOG_TTL,
+    request_timeout: float = REQUEST_TIMEOUT,
 ) -> AlloraActionProvider:
     """Create a new Allora action provider.
 
@@ -279,4 +521,9 @@ def allora_action_provider(
         AlloraActionProvider: A new Allora action provider instance.
 
     """
-    return AlloraActionProvider(api_key=api_key, chain_slug=chain_slug)
+    return AlloraActionProvider(
+        api_key=api_key,
+        chain_slug=chain_slug,
+        topic_catalog_ttl=topic_catalog_ttl,
+        request_timeout=request_timeout,
+    )
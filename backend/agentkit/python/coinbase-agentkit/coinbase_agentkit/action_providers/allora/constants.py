@@ -0,0 +1,29 @@
+"""Constants for the Allora action provider."""
+
+# How long the topic catalog is reused before it is fetched again, in seconds
+TOPIC_CATALOG_TTL = 300.0
+
+# How long an Allora request, or a batch of them, may take before it is cancelled, in seconds
+REQUEST_TIMEOUT = 30.0
+
+# Maximum number of price inferences requested by one get_price_inferences call
+MAX_PRICE_INFERENCES = 20
+
+# Full asset names used in topic names, by symbol
+ASSET_NAMES = {
+    "BITCOIN": "BTC",
+    "ETHEREUM": "ETH",
+    "SOLANA": "SOL",
+    "ARBITRUM": "ARB",
+    "BINANCE": "BNB",
+}
+
+# Words marking topics that predict something other than the price, e.g. volatility
+NON_PRICE_TOPIC_WORDS = ("volatility",)
+
+# Timeframe units used in topic names, by the unit suffix of a normalized timeframe
+TIMEFRAME_UNITS = {
+    "m": ("m", "min", "mins", "minute", "minutes"),
+    "h": ("h", "hr", "hrs", "hour", "hours"),
+    "d": ("d", "day", "days"),
+}
@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, Field
 
+from .constants import MAX_PRICE_INFERENCES
+
 
 class GetAllTopicsInput(BaseModel):
     """Input schema for getting all topics from Allora Network."""
@@ -32,3 +34,14 @@ class GetPriceInferenceInput(BaseModel):
         description="The timeframe for the prediction (e.g., '5m', '8h'). Common values include 5m and 8h, but others may be supported.",
         min_length=1,
     )
+
+
+class GetPriceInferencesInput(BaseModel):
+    """Input schema for getting price inferences for several token/timeframe pairs."""
+
+    requests: list[GetPriceInferenceInput] = Field(
+        ...,
+        description="The token/timeframe pairs to get price inferences for, e.g. [{'asset': 'BTC', 'timeframe': '8h'}, {'asset': 'ETH', 'timeframe': '5m'}]",
+        min_length=1,
+        max_length=MAX_PRICE_INFERENCES,
+    )
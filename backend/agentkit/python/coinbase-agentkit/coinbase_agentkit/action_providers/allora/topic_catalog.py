@@ -0,0 +1,138 @@
+"""Catalog of Allora topics, indexed by asset and timeframe."""
+
+import re
+import time
+from typing import Any
+
+from .constants import ASSET_NAMES, NON_PRICE_TOPIC_WORDS, TIMEFRAME_UNITS
+
+_UNIT_BY_NAME = {name: unit for unit, names in TIMEFRAME_UNITS.items() for name in names}
+_TIMEFRAME_PATTERN = re.compile(
+    r"\b(\d+)\s*(" + "|".join(sorted(_UNIT_BY_NAME, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+_WORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+
+def normalize_timeframe(timeframe: str) -> str | None:
+    """Normalize a timeframe to its number and unit letter, e.g. "8 hours" to "8h".
+
+    Args:
+        timeframe: The timeframe, e.g. "5m", "5min" or "8 hours".
+
+    Returns:
+        str | None: The normalized timeframe, or None if it is not a timeframe.
+
+    """
+    match = _TIMEFRAME_PATTERN.fullmatch(timeframe.strip())
+    if match is None:
+        return None
+    return f"{int(match.group(1))}{_UNIT_BY_NAME[match.group(2).lower()]}"
+
+
+def parse_topic_name(topic_name: str) -> tuple[str | None, str | None]:
+    """Get the asset and timeframe a topic name refers to.
+
+    Args:
+        topic_name: The topic name, e.g. "ETH 10min Prediction" or "Bitcoin 8h".
+
+    Returns:
+        tuple[str | None, str | None]: The asset symbol and the normalized timeframe,
+            each None if the name does not mention one.
+
+    """
+    asset = None
+    for word in _WORD_PATTERN.findall(_TIMEFRAME_PATTERN.sub(" ", topic_name)):
+        if word.upper() in ASSET_NAMES:
+            asset = ASSET_NAMES[word.upper()]
+            break
+        if word.isupper() and 2 <= len(word) <= 6:
+            asset = word
+            break
+
+    match = _TIMEFRAME_PATTERN.search(topic_name)
+    timeframe = normalize_timeframe(match.group(0)) if match else None
+    return asset, timeframe
+
+
+def _topic_rank(topic: dict[str, Any]) -> tuple[bool, bool]:
+    """Rank topics for the same asset and timeframe, active price topics first."""
+    name = (topic.get("topic_name") or "").lower()
+    return (
+        topic.get("is_active") is False,
+        any(word in name for word in NON_PRICE_TOPIC_WORDS),
+    )
+
+
+class TopicCatalog:
+    """A point-in-time catalog of Allora topics.
+
+    The topic list is walked once when the catalog is built. Afterwards, looking up
+    a topic by ID, or the topics for an asset and timeframe, is a dictionary lookup.
+    """
+
+    def __init__(self, topics: list[dict[str, Any]]):
+        """Build the catalog from the topic list.
+
+        Args:
+            topics: The topics as returned by get_all_topics, converted to dictionaries.
+
+        """
+        self.fetched_at = time.monotonic()
+        self.topics = topics
+        self.by_id: dict[int, dict[str, Any]] = {}
+        self.by_asset_timeframe: dict[tuple[str, str], list[dict[str, Any]]] = {}
+
+        for topic in topics:
+            self.by_id[topic["topic_id"]] = topic
+            asset, timeframe = parse_topic_name(topic.get("topic_name") or "")
+            if asset and timeframe:
+                self.by_asset_timeframe.setdefault((asset, timeframe), []).append(topic)
+
+        # Active price topics are listed first, so find_topic prefers them
+        for matches in self.by_asset_timeframe.values():
+            matches.sort(key=_topic_rank)
+
+    def age(self) -> float:
+        """Get the age of the catalog.
+
+        Returns:
+            float: Seconds since the catalog was built.
+
+        """
+        return time.monotonic() - self.fetched_at
+
+    def find_topics(self, asset: str, timeframe: str) -> list[dict[str, Any]]:
+        """Get the topics for an asset and timeframe.
+
+        Args:
+            asset: The asset symbol or name, e.g. "BTC" or "bitcoin". Case insensitive.
+            timeframe: The timeframe, e.g. "5m" or "8 hours".
+
+        Returns:
+            list[dict[str, Any]]: The matching topics, active price topics first.
+
+        """
+        asset = asset.strip().upper()
+        timeframe = normalize_timeframe(timeframe)
+        if timeframe is None:
+            return []
+        return self.by_asset_timeframe.get((ASSET_NAMES.get(asset, asset), timeframe), [])
+
+    def find_topic(self, asset: str, timeframe: str) -> dict[str, Any] | None:
+        """Get the topic for an asset and timeframe, preferring active price topics.
+
+        Args:
+            asset: The asset symbol or name, e.g. "BTC" or "bitcoin". Case insensitive.
+            timeframe: The timeframe, e.g. "5m" or "8 hours".
+
+        Returns:
+            dict[str, Any] | None: The topic, or None if there is none.
+
+        """
+        topics = self.find_topics(asset, timeframe)
+        return topics[0] if topics else None
+
+    def __len__(self) -> int:
+        """Get the number of topics."""
+        return len(self.topics)
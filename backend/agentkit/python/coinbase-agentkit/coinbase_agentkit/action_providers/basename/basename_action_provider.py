@@ -8,16 +8,8 @@ from ...network import Network
 from ...wallet_providers import EvmWalletProvider
 from ..action_decorator import create_action
 from ..action_provider import ActionProvider
-from .constants import (
-    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET,
-    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_TESTNET,
-    L2_RESOLVER_ABI,
-    L2_RESOLVER_ADDRESS_MAINNET,
-    L2_RESOLVER_ADDRESS_TESTNET,
-    REGISTRAR_ABI,
-    REGISTRATION_DURATION,
-)
-from .schemas import RegisterBasenameSchema
+from . import preflight
+from .schemas import CheckBasenamesSchema, RegisterBasenameSchema
 
 
 class BasenameActionProvider(ActionProvider[EvmWalletProvider]):
@@ -32,6 +24,7 @@ class BasenameActionProvider(ActionProvider[EvmWalletProvider]):
         description="""
 This tool will register a Basename for the agent. The agent should have a wallet associated to register a Basename.
 When your network ID is 'base-mainnet' (also sometimes known simply as 'base'), the name must end with .base.eth, and when your network ID is 'base-sepolia', it must ends with .basetest.eth.
+The name is checked for availability and the payment against the registration price before anything is sent. If no amount is given, the registration price is paid.
 Do not suggest any alternatives and never try to register a Basename with another postfix. The prefix of the name must be unique so if the registration of the
 Basename fails, you should prompt to try again with a more unique name.
 """,
@@ -50,54 +43,53 @@ Basename fails, you should prompt to try again with a more unique name.
         """
         try:
             address = Web3.to_checksum_address(wallet_provider.get_address())
-            is_mainnet = wallet_provider.get_network().network_id == "base-mainnet"
+            value = Web3.to_wei(args["amount"], "ether") if args.get("amount") else None
 
-            suffix = ".base.eth" if is_mainnet else ".basetest.eth"
-            if not args["basename"].endswith(suffix):
-                args["basename"] += suffix
-
-            l2_resolver_address = Web3.to_checksum_address(
-                L2_RESOLVER_ADDRESS_MAINNET if is_mainnet else L2_RESOLVER_ADDRESS_TESTNET
-            )
-            contract_address = Web3.to_checksum_address(
-                BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET
-                if is_mainnet
-                else BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_TESTNET
+            quote, transaction = preflight.prepare_registration(
+                wallet_provider, args["basename"], value
             )
 
-            w3 = Web3()
-            resolver_contract = w3.eth.contract(abi=L2_RESOLVER_ABI)
-            registrar_contract = w3.eth.contract(abi=REGISTRAR_ABI)
-
-            name_hash = w3.ens.namehash(args["basename"])
+            tx_hash = wallet_provider.send_transaction(transaction)
 
-            address_data = resolver_contract.encode_abi("setAddr", args=[name_hash, address])
-            name_data = resolver_contract.encode_abi("setName", args=[name_hash, args["basename"]])
+            wallet_provider.wait_for_transaction_receipt(tx_hash)
 
-            register_request = {
-                "name": args["basename"].replace(suffix, ""),
-                "owner": address,
-                "duration": int(REGISTRATION_DURATION),
-                "resolver": l2_resolver_address,
-                "data": [address_data, name_data],
-                "reverseRecord": True,
-            }
+            return f"Successfully registered basename {quote.name} for address {address}"
+        except Exception as e:
+            return f"Error registering basename: {e!s}"
 
-            data = registrar_contract.encode_abi("register", args=[register_request])
+    @create_action(
+        name="check_basenames",
+        description="""
+This tool will check whether candidate Basenames are available and what registering each costs for one year, all in one call.
+Use it before register_basename to pick an available name and pay the exact price.
+Names may be given with or without the .base.eth suffix on 'base-mainnet' or the .basetest.eth suffix on 'base-sepolia'.
+""",
+        schema=CheckBasenamesSchema,
+    )
+    def check_basenames(self, wallet_provider: EvmWalletProvider, args: dict[str, Any]) -> str:
+        """Check the availability and registration price of candidate Basenames.
 
-            tx_hash = wallet_provider.send_transaction(
-                {
-                    "to": contract_address,
-                    "data": data,
-                    "value": Web3.to_wei(args["amount"], "ether"),
-                }
-            )
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider instance.
+            args (dict[str, Any]): Input arguments for the action.
 
-            wallet_provider.wait_for_transaction_receipt(tx_hash)
+        Returns:
+            str: A message containing the action response or error details.
 
-            return f"Successfully registered basename {args['basename']} for address {address}"
+        """
+        try:
+            quotes = preflight.check_basenames(wallet_provider, args["basenames"])
         except Exception as e:
-            return f"Error registering basename: {e!s}"
+            return f"Error checking basenames: {e!s}"
+
+        lines = ["Basenames for one year:"]
+        for quote in quotes:
+            if quote.available:
+                price = Web3.from_wei(quote.price, "ether")
+                lines.append(f"- {quote.name}: available for {price} ETH")
+            else:
+                lines.append(f"- {quote.name}: not available")
+        return "\n".join(lines)
 
     def supports_network(self, network: Network) -> bool:
         """Check if the network is supported by the Basename action provider.
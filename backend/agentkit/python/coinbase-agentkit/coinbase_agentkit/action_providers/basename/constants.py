@@ -9,6 +9,8 @@ L2_RESOLVER_ADDRESS_TESTNET = "0x6533C94869D28fAA8dF77cc63f9e2b2D6Cf77eBA"
 # Default registration duration (1 year in seconds)
 REGISTRATION_DURATION = "31557600"
 
+MAX_BASENAME_CHECKS = 50
+
 # ABIs for smart contracts (used in basename registration)
 L2_RESOLVER_ABI = [
     {
@@ -54,5 +56,22 @@ REGISTRAR_ABI = [
         "outputs": [],
         "stateMutability": "payable",
         "type": "function",
-    }
+    },
+    {
+        "inputs": [{"internalType": "string", "name": "name", "type": "string"}],
+        "name": "available",
+        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "string", "name": "name", "type": "string"},
+            {"internalType": "uint256", "name": "duration", "type": "uint256"},
+        ],
+        "name": "registerPrice",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
 ]
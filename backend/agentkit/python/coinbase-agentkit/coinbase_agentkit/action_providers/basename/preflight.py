@@ -0,0 +1,250 @@
+"""Pre-flight checks of Basename registrations.
+
+The availability and price of many candidate names are read with one
+Multicall3 call, and a registration is run with eth_call before it is sent, so
+an unavailable name or an underpayment is found without waiting for a revert.
+"""
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ens.utils import normalize_name
+from web3 import Web3
+from web3.types import TxParams
+
+from ...wallet_providers import EvmWalletProvider
+from ..multicall import aggregate, multicall_call
+from .constants import (
+    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET,
+    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_TESTNET,
+    L2_RESOLVER_ABI,
+    L2_RESOLVER_ADDRESS_MAINNET,
+    L2_RESOLVER_ADDRESS_TESTNET,
+    REGISTRAR_ABI,
+    REGISTRATION_DURATION,
+)
+
+_resolver_contract = Web3().eth.contract(abi=L2_RESOLVER_ABI)
+_registrar_contract = Web3().eth.contract(abi=REGISTRAR_ABI)
+
+# Labels that are already normalized under ENSIP-15, which only lowercases ASCII
+_ASCII_LABEL = re.compile(r"_*[a-z0-9-]+")
+
+
+@dataclass(frozen=True)
+class Registrar:
+    """The Basename contracts and name suffix of a network."""
+
+    controller: str
+    resolver: str
+    suffix: str
+
+
+@dataclass(frozen=True)
+class BasenameQuote:
+    """The availability and registration price of a Basename."""
+
+    name: str
+    label: str
+    available: bool
+    price: int
+
+
+def get_registrar(wallet_provider: EvmWalletProvider) -> Registrar:
+    """Get the Basename contracts of the network of a wallet.
+
+    Args:
+        wallet_provider: The wallet provider.
+
+    Returns:
+        Registrar: The registrar controller, resolver and name suffix.
+
+    """
+    if wallet_provider.get_network().network_id == "base-mainnet":
+        return Registrar(
+            controller=Web3.to_checksum_address(BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET),
+            resolver=Web3.to_checksum_address(L2_RESOLVER_ADDRESS_MAINNET),
+            suffix=".base.eth",
+        )
+    return Registrar(
+        controller=Web3.to_checksum_address(BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_TESTNET),
+        resolver=Web3.to_checksum_address(L2_RESOLVER_ADDRESS_TESTNET),
+        suffix=".basetest.eth",
+    )
+
+
+def normalize_basename(basename: str, suffix: str) -> tuple[str, str]:
+    """Normalize a Basename and add the suffix of the network if missing.
+
+    Lowercase ASCII labels are already normalized, which skips the full ENSIP-15
+    normalization for the names agents usually pick.
+
+    Args:
+        basename: The Basename, with or without the suffix.
+        suffix: The name suffix of the network.
+
+    Returns:
+        tuple[str, str]: The full name and its label.
+
+    Raises:
+        ValueError: If the name has no label or cannot be normalized.
+
+    """
+    name = basename.strip().lower()
+    if not name.endswith(suffix):
+        name += suffix
+    label = name.removesuffix(suffix)
+    if not label:
+        raise ValueError(f"{basename!r} is not a valid Basename")
+    if not all(_ASCII_LABEL.fullmatch(part) and part[2:4] != "--" for part in label.split(".")):
+        label = normalize_name(label)
+    return label + suffix, label
+
+
+@lru_cache(maxsize=4096)
+def namehash(name: str) -> bytes:
+    """Compute the ENS namehash of a normalized name.
+
+    Parent nodes are cached too, so the node of the suffix is hashed once.
+
+    Args:
+        name: The normalized name.
+
+    Returns:
+        bytes: The 32 byte node.
+
+    """
+    if not name:
+        return bytes(32)
+    label, _, parent = name.partition(".")
+    return bytes(Web3.keccak(namehash(parent) + Web3.keccak(text=label)))
+
+
+def check_basenames(
+    wallet_provider: EvmWalletProvider,
+    basenames: Sequence[str],
+    duration: int = int(REGISTRATION_DURATION),
+) -> list[BasenameQuote]:
+    """Check the availability and registration price of Basenames with one call.
+
+    Args:
+        wallet_provider: The wallet provider to read with.
+        basenames: The Basenames, with or without the suffix.
+        duration: The registration duration in seconds.
+
+    Returns:
+        list[BasenameQuote]: The quotes, in the order of the names.
+
+    Raises:
+        ValueError: If a name cannot be normalized.
+
+    """
+    registrar = get_registrar(wallet_provider)
+    names = [normalize_basename(basename, registrar.suffix) for basename in basenames]
+
+    calls = []
+    for _, label in names:
+        calls.append(
+            (
+                multicall_call(registrar.controller, _registrar_contract, "available", [label]),
+                _registrar_contract,
+                "available",
+            )
+        )
+        calls.append(
+            (
+                multicall_call(
+                    registrar.controller, _registrar_contract, "registerPrice", [label, duration]
+                ),
+                _registrar_contract,
+                "registerPrice",
+            )
+        )
+    results = aggregate(wallet_provider, calls)
+
+    return [
+        BasenameQuote(name=name, label=label, available=available, price=price)
+        for (name, label), (available,), (price,) in zip(
+            names, results[::2], results[1::2], strict=True
+        )
+    ]
+
+
+def build_register_transaction(
+    wallet_provider: EvmWalletProvider, quote: BasenameQuote, value: int
+) -> TxParams:
+    """Build the transaction registering a Basename to the wallet.
+
+    The name resolves to the wallet and becomes its primary name.
+
+    Args:
+        wallet_provider: The wallet provider registering the name.
+        quote: The quote of the name.
+        value: The amount to pay in wei.
+
+    Returns:
+        TxParams: The registration transaction.
+
+    """
+    registrar = get_registrar(wallet_provider)
+    address = Web3.to_checksum_address(wallet_provider.get_address())
+    node = namehash(quote.name)
+
+    register_request = {
+        "name": quote.label,
+        "owner": address,
+        "duration": int(REGISTRATION_DURATION),
+        "resolver": registrar.resolver,
+        "data": [
+            _resolver_contract.encode_abi("setAddr", args=[node, address]),
+            _resolver_contract.encode_abi("setName", args=[node, quote.name]),
+        ],
+        "reverseRecord": True,
+    }
+    return {
+        "to": registrar.controller,
+        "data": _registrar_contract.encode_abi("register", args=[register_request]),
+        "value": value,
+    }
+
+
+def prepare_registration(
+    wallet_provider: EvmWalletProvider, basename: str, value: int | None = None
+) -> tuple[BasenameQuote, TxParams]:
+    """Check a Basename registration and simulate it before it is sent.
+
+    The simulation is skipped if the wallet provider does not support it.
+
+    Args:
+        wallet_provider: The wallet provider registering the name.
+        basename: The Basename, with or without the suffix.
+        value: The amount to pay in wei, defaulting to the registration price.
+
+    Returns:
+        tuple[BasenameQuote, TxParams]: The quote and the registration transaction.
+
+    Raises:
+        ValueError: If the name is unavailable, the amount is below the price, or the
+            registration would revert.
+
+    """
+    (quote,) = check_basenames(wallet_provider, [basename])
+    if not quote.available:
+        raise ValueError(f"{quote.name} is not available")
+    if value is None:
+        value = quote.price
+    elif value < quote.price:
+        raise ValueError(
+            f"{Web3.from_wei(value, 'ether')} ETH is below the registration price of "
+            f"{Web3.from_wei(quote.price, 'ether')} ETH for {quote.name}"
+        )
+
+    transaction = build_register_transaction(wallet_provider, quote, value)
+    try:
+        # Returns None if the wallet provider cannot simulate, so only the checks above apply
+        wallet_provider.simulate_transaction(transaction)
+    except Exception as e:
+        raise ValueError(f"Registering {quote.name} would revert: {e!s}") from e
+    return quote, transaction
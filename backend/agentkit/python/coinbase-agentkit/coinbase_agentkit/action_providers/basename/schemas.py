@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, Field
 
+from .constants import MAX_BASENAME_CHECKS
+
 
 class RegisterBasenameSchema(BaseModel):
     """Input argument schema for registering a Basename."""
@@ -10,6 +12,18 @@ class RegisterBasenameSchema(BaseModel):
         ...,
         description="The Basename to assign to the agent (e.g., `example.base.eth` or `example.basetest.eth`)",
     )
-    amount: str = Field(
-        ..., description="The amount of Eth to pay for registration. The default is set to 0.002."
+    amount: str | None = Field(
+        None,
+        description="The amount of Eth to pay for registration, defaulting to the registration price",
+    )
+
+
+class CheckBasenamesSchema(BaseModel):
+    """Input argument schema for checking the availability and price of Basenames."""
+
+    basenames: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BASENAME_CHECKS,
+        description="The candidate Basenames, with or without the `.base.eth` or `.basetest.eth` suffix",
     )
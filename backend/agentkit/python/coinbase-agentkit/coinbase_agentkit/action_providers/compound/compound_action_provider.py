@@ -16,8 +16,10 @@ from .constants import (
     COMET_ADDRESSES,
     SUPPORTED_NETWORKS,
 )
+from .portfolio import HealthScenario, get_portfolio_snapshot
 from .schemas import (
     CompoundBorrowSchema,
+    CompoundMaxSafeBorrowSchema,
     CompoundPortfolioSchema,
     CompoundRepaySchema,
     CompoundSupplySchema,
@@ -26,10 +28,8 @@ from .schemas import (
 from .utils import (
     format_amount_from_decimals,
     format_amount_with_decimals,
-    get_base_token_address,
     get_collateral_balance,
     get_health_ratio,
-    get_health_ratio_after_borrow,
     get_health_ratio_after_withdraw,
     get_portfolio_details_markdown,
     get_token_balance,
@@ -275,22 +275,24 @@ Important notes:
         try:
             validated_args = CompoundBorrowSchema(**args)
             comet_address = self._get_comet_address(wallet_provider.get_network())
-            base_token_address = get_base_token_address(wallet_provider, comet_address)
-            base_token_decimals = get_token_decimals(wallet_provider, base_token_address)
+
+            # One snapshot gives the base token and both the current and projected health
+            snapshot = get_portfolio_snapshot(wallet_provider, comet_address)
+            base_token_address = snapshot.table.base_token
 
             # Convert human-readable amount to atomic amount
-            amount_atomic = format_amount_with_decimals(validated_args.amount, base_token_decimals)
+            amount_atomic = format_amount_with_decimals(
+                validated_args.amount, snapshot.table.base_decimals
+            )
 
             # Get current health ratio for reference
-            current_health = get_health_ratio(wallet_provider, comet_address)
+            current_health = snapshot.health_ratio()
             current_health_str = (
                 "Infinity" if current_health == Decimal("Infinity") else f"{current_health:.2f}"
             )
 
             # Check if position would be healthy after borrow
-            projected_health_ratio = get_health_ratio_after_borrow(
-                wallet_provider, comet_address, amount_atomic
-            )
+            projected_health_ratio = snapshot.health_ratio_after_borrow(amount_atomic)
 
             if projected_health_ratio < 1:
                 return f"Error: Borrowing {validated_args.amount} USDC would result in an unhealthy position. Health ratio would be {projected_health_ratio:.2f}"
@@ -442,6 +444,77 @@ Formatted in Markdown for readability.
         except Exception as e:
             return f"Error getting portfolio details: {e!s}"
 
+    @create_action(
+        name="max_safe_borrow",
+        description="""
+This tool finds how much of the base asset can be borrowed from Compound while keeping the position healthy.
+It takes:
+- target_health_ratio: The lowest acceptable health ratio after the borrow, at least 1. Defaults to 1
+- collateral_price_change_percent: Optional change of all collateral prices to stay safe under, e.g. -20 for a 20% drop
+Important notes:
+- The amount is computed from the current position and prices, and is not borrowed
+- Borrowing exactly the maximum leaves no margin for price moves, so prefer a target above 1
+""",
+        schema=CompoundMaxSafeBorrowSchema,
+    )
+    def max_safe_borrow(self, wallet_provider: EvmWalletProvider, args: dict[str, Any]) -> str:
+        """Find the largest borrow that keeps the health ratio at a target.
+
+        Args:
+            wallet_provider: The wallet whose position to check.
+            args: The input arguments with the target health ratio and price change.
+
+        Returns:
+            str: A message with the largest safe borrow.
+
+        """
+        try:
+            validated_args = CompoundMaxSafeBorrowSchema(**args)
+            comet_address = self._get_comet_address(wallet_provider.get_network())
+            snapshot = get_portfolio_snapshot(wallet_provider, comet_address)
+            table = snapshot.table
+
+            target = Decimal(str(validated_args.target_health_ratio))
+            price_change = 1 + Decimal(str(validated_args.collateral_price_change_percent)) / 100
+            price_changes = {asset.address: price_change for asset in table.assets}
+            max_borrow = snapshot.max_safe_borrow(target, price_changes)
+
+            current_health, shocked_health, health_after = snapshot.health_ratios(
+                [
+                    HealthScenario(),
+                    HealthScenario(price_changes=price_changes),
+                    HealthScenario(borrow=max_borrow, price_changes=price_changes),
+                ]
+            )
+
+            def format_ratio(ratio: Decimal) -> str:
+                return "Infinity" if ratio == Decimal("Infinity") else f"{ratio:.2f}"
+
+            scenario = f"target health ratio {format_ratio(target)}"
+            if price_change != 1:
+                scenario += (
+                    f", collateral prices {validated_args.collateral_price_change_percent:+g}%"
+                )
+                health_line = (
+                    f"Health ratio now {format_ratio(current_health)}, "
+                    f"{format_ratio(shocked_health)} after the price change"
+                )
+            else:
+                health_line = f"Health ratio now {format_ratio(current_health)}"
+
+            if max_borrow == 0:
+                return (
+                    f"No additional {table.base_symbol} can be borrowed from Compound "
+                    f"({scenario}).\n{health_line}"
+                )
+            return (
+                f"Max safe borrow: {format_amount_from_decimals(max_borrow, table.base_decimals)} "
+                f"{table.base_symbol} ({scenario}).\n"
+                f"{health_line}, {format_ratio(health_after)} after borrowing the max"
+            )
+        except Exception as e:
+            return f"Error finding max safe borrow from Compound: {e!s}"
+
     def supports_network(self, network: Network) -> bool:
         """Check if network is supported by Compound."""
         return network.protocol_family == "evm" and network.network_id in SUPPORTED_NETWORKS
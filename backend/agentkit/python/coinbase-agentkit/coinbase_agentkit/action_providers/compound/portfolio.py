@@ -0,0 +1,442 @@
+"""Snapshots of Compound positions, read in one batched call per block.
+
+A position depends on two kinds of data. The asset table of a Comet (its base
+token, collateral assets, price feeds and collateral factors) only changes with
+governance, so it is read once per Comet and kept. Balances and prices change
+every block and are read together with one Multicall3 call into a
+CompoundPortfolioSnapshot, which computes health ratios without further reads,
+including over many hypothetical borrows, withdrawals and price changes.
+"""
+
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from web3 import Web3
+
+from ...wallet_providers import EvmWalletProvider
+from ..erc20.constants import ERC20_ABI
+from ..multicall import aggregate, block_number_call, multicall_call
+from .constants import COMET_ABI, PRICE_FEED_ABI
+
+# Chainlink USD price feeds answer with 8 decimals, collateral factors have 18
+PRICE_SCALE = Decimal(10**8)
+FACTOR_SCALE = Decimal(10**18)
+
+_comet_contract = Web3().eth.contract(abi=COMET_ABI)
+_token_contract = Web3().eth.contract(abi=ERC20_ABI)
+_price_feed_contract = Web3().eth.contract(abi=PRICE_FEED_ABI)
+
+
+def _to_units(amount: int, decimals: int) -> Decimal:
+    """Convert an atomic amount to whole units, as format_amount_from_decimals."""
+    return Decimal(str(Decimal(amount) / Decimal(10**decimals)))
+
+
+@dataclass(frozen=True)
+class CompoundAsset:
+    """A collateral asset of a Comet, as returned by getAssetInfo."""
+
+    index: int
+    address: str
+    price_feed: str
+    symbol: str
+    decimals: int
+    borrow_collateral_factor: int
+    liquidate_collateral_factor: int
+
+
+@dataclass(frozen=True)
+class CometAssetTable:
+    """The assets of a Comet and their price feeds."""
+
+    comet: str
+    base_token: str
+    base_price_feed: str
+    base_symbol: str
+    base_decimals: int
+    assets: tuple[CompoundAsset, ...]
+
+    def get_asset(self, asset_address: str) -> CompoundAsset:
+        """Get a collateral asset by address.
+
+        Args:
+            asset_address: The asset address.
+
+        Returns:
+            CompoundAsset: The asset.
+
+        Raises:
+            ValueError: If the asset is not a collateral asset of the Comet.
+
+        """
+        for asset in self.assets:
+            if asset.address.lower() == asset_address.lower():
+                return asset
+        raise ValueError(f"{asset_address} is not a collateral asset of Comet {self.comet}")
+
+
+@dataclass
+class CompoundPortfolioSnapshot:
+    """Balances and prices of a Compound position at one block.
+
+    Amounts are atomic and prices are raw price feed answers, as read.
+    """
+
+    table: CometAssetTable
+    account: str
+    block_number: int
+    borrow_balance: int
+    base_price: int
+    collateral_balances: dict[str, int]
+    prices: dict[str, int]
+
+    def borrow_details(self) -> dict:
+        """Get the borrowed amount, as get_borrow_details.
+
+        Returns:
+            dict: Token Symbol, Borrow Amount (Decimal) and Price (Decimal).
+
+        """
+        return {
+            "Token Symbol": self.table.base_symbol,
+            "Borrow Amount": _to_units(self.borrow_balance, self.table.base_decimals),
+            "Price": Decimal(self.base_price) / PRICE_SCALE,
+        }
+
+    def supply_details(self) -> list[dict]:
+        """Get the supplied collateral assets, as get_supply_details.
+
+        Returns:
+            list[dict]: Token Symbol, Supply Amount (Decimal), Price (Decimal),
+                Collateral Factor (Decimal) and Decimals (int) of each supplied asset.
+
+        """
+        return [
+            {
+                "Token Symbol": asset.symbol,
+                "Supply Amount": _to_units(self.collateral_balances[asset.address], asset.decimals),
+                "Price": Decimal(self.prices[asset.address]) / PRICE_SCALE,
+                "Collateral Factor": Decimal(asset.borrow_collateral_factor) / FACTOR_SCALE,
+                "Decimals": asset.decimals,
+            }
+            for asset in self.table.assets
+            if self.collateral_balances[asset.address] > 0
+        ]
+
+    def health_ratio(self) -> Decimal:
+        """Get the health ratio of the position.
+
+        The health ratio is the collateral value weighted by the borrow collateral
+        factors, divided by the borrowed value. A ratio >= 1 is healthy.
+
+        Returns:
+            Decimal: The health ratio, or infinity if nothing is borrowed.
+
+        """
+        return self.health_ratios([HealthScenario()])[0]
+
+    def health_ratio_after_borrow(self, amount: int) -> Decimal:
+        """Get the health ratio after borrowing more of the base token.
+
+        Args:
+            amount: The additional amount to borrow, in atomic units.
+
+        Returns:
+            Decimal: The projected health ratio, or infinity if nothing would be borrowed.
+
+        """
+        return self.health_ratios([HealthScenario(borrow=int(amount))])[0]
+
+    def health_ratio_after_withdraw(self, asset_address: str, amount: int) -> Decimal:
+        """Get the health ratio after withdrawing collateral.
+
+        Args:
+            asset_address: The address of the collateral asset.
+            amount: The amount to withdraw, in atomic units.
+
+        Returns:
+            Decimal: The projected health ratio, or infinity if nothing is borrowed.
+                Withdrawing an asset that is not supplied leaves the ratio unchanged.
+
+        """
+        return self.health_ratios(
+            [HealthScenario(withdraw_asset=asset_address, withdraw_amount=int(amount))]
+        )[0]
+
+    def health_ratios(self, scenarios: Sequence["HealthScenario"]) -> list[Decimal]:
+        """Get the health ratio of the position in each of several scenarios.
+
+        The value of each supplied asset is computed once, and a scenario only
+        recomputes the assets it changes, so many scenarios cost little more than one.
+
+        Args:
+            scenarios: The scenarios.
+
+        Returns:
+            list[Decimal]: The projected health ratio of each scenario, or infinity
+                where nothing would be borrowed.
+
+        """
+        base_decimals = self.table.base_decimals
+        borrow = _to_units(self.borrow_balance, base_decimals)
+        base_price = Decimal(self.base_price) / PRICE_SCALE
+        base_token = self.table.base_token.lower()
+
+        # (address, supply, price, factor, adjusted value) of each supplied asset
+        supplied = []
+        for asset in self.table.assets:
+            balance = self.collateral_balances[asset.address]
+            if balance <= 0:
+                continue
+            supply = _to_units(balance, asset.decimals)
+            price = Decimal(self.prices[asset.address]) / PRICE_SCALE
+            factor = Decimal(asset.borrow_collateral_factor) / FACTOR_SCALE
+            supplied.append((asset, supply, price, factor, supply * price * factor))
+
+        ratios = []
+        for scenario in scenarios:
+            changes = {
+                address.lower(): change for address, change in scenario.price_changes.items()
+            }
+            borrow_value = (borrow + _to_units(scenario.borrow, base_decimals)) * (
+                base_price * changes.get(base_token, 1)
+            )
+            if borrow_value == 0:
+                ratios.append(Decimal("Infinity"))
+                continue
+
+            withdraw_asset = scenario.withdraw_asset and scenario.withdraw_asset.lower()
+            adjusted_collateral = Decimal(0)
+            for asset, supply, price, factor, value in supplied:
+                address = asset.address.lower()
+                if address == withdraw_asset or address in changes:
+                    if address == withdraw_asset:
+                        supply -= _to_units(scenario.withdraw_amount, asset.decimals)
+                    value = supply * (price * changes.get(address, 1)) * factor
+                adjusted_collateral += value
+            ratios.append(adjusted_collateral / borrow_value)
+        return ratios
+
+    def max_safe_borrow(
+        self,
+        target_health_ratio: Decimal = Decimal(1),
+        price_changes: dict[str, Decimal] | None = None,
+    ) -> int:
+        """Get the largest additional borrow that keeps the health ratio at a target.
+
+        The amount is found with a binary search over the snapshot, so it agrees to
+        the atomic unit with health_ratio_after_borrow.
+
+        Args:
+            target_health_ratio: The lowest acceptable health ratio.
+            price_changes: Optional price multipliers by asset address, applied to
+                the scenario, e.g. Decimal("0.8") for a 20% price drop.
+
+        Returns:
+            int: The amount of the base token in atomic units, 0 if the position is
+                already below the target.
+
+        """
+        price_changes = price_changes or {}
+
+        def is_safe(amount: int) -> bool:
+            scenario = HealthScenario(borrow=amount, price_changes=price_changes)
+            return self.health_ratios([scenario])[0] >= target_health_ratio
+
+        if not is_safe(0):
+            return 0
+
+        # Double an upper bound until it is unsafe, then bisect
+        low, high = 0, 10**self.table.base_decimals
+        while is_safe(high):
+            if high >= 2**256:
+                raise ValueError("The borrow is unbounded, the base token price must be positive")
+            low, high = high, high * 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if is_safe(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
+
+@dataclass(frozen=True)
+class HealthScenario:
+    """A hypothetical change to a Compound position.
+
+    Price changes are multipliers by asset address, and may include the base token.
+    """
+
+    borrow: int = 0
+    withdraw_asset: str | None = None
+    withdraw_amount: int = 0
+    price_changes: dict[str, Decimal] = field(default_factory=dict)
+
+
+class CompoundPortfolioReader:
+    """Reads Compound portfolio snapshots, keeping the asset table of each Comet."""
+
+    def __init__(self):
+        """Initialize the reader."""
+        self.rpc_calls = 0
+        self._tables: dict[tuple[int | str, str], CometAssetTable] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Forget the asset tables and reset the call counter."""
+        with self._lock:
+            self._tables.clear()
+            self.rpc_calls = 0
+
+    def get_asset_table(self, wallet_provider: EvmWalletProvider, comet: str) -> CometAssetTable:
+        """Get the asset table of a Comet, reading it the first time.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            comet: The Comet address.
+
+        Returns:
+            CometAssetTable: The asset table.
+
+        """
+        key = (wallet_provider.get_network().chain_id, comet.lower())
+        with self._lock:
+            table = self._tables.get(key)
+        if table is None:
+            table = self._load_asset_table(wallet_provider, Web3.to_checksum_address(comet))
+            with self._lock:
+                self._tables[key] = table
+        return table
+
+    def get_snapshot(
+        self, wallet_provider: EvmWalletProvider, comet: str, account: str | None = None
+    ) -> CompoundPortfolioSnapshot:
+        """Read a snapshot of a position with one Multicall3 call.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            comet: The Comet address.
+            account: The account, defaults to the wallet address.
+
+        Returns:
+            CompoundPortfolioSnapshot: The snapshot.
+
+        """
+        table = self.get_asset_table(wallet_provider, comet)
+        account = Web3.to_checksum_address(account or wallet_provider.get_address())
+
+        calls = [
+            block_number_call(),
+            self._call(table.comet, _comet_contract, "borrowBalanceOf", [account]),
+            self._call(table.base_price_feed, _price_feed_contract, "latestRoundData"),
+        ]
+        for asset in table.assets:
+            calls.append(
+                self._call(
+                    table.comet, _comet_contract, "collateralBalanceOf", [account, asset.address]
+                )
+            )
+            calls.append(self._call(asset.price_feed, _price_feed_contract, "latestRoundData"))
+
+        (block_number,), (borrow_balance,), base_round, *asset_results = self._aggregate(
+            wallet_provider, calls
+        )
+        collateral_balances = {}
+        prices = {}
+        for i, asset in enumerate(table.assets):
+            (collateral_balances[asset.address],) = asset_results[2 * i]
+            prices[asset.address] = asset_results[2 * i + 1][1]
+
+        return CompoundPortfolioSnapshot(
+            table=table,
+            account=account,
+            block_number=block_number,
+            borrow_balance=borrow_balance,
+            base_price=base_round[1],
+            collateral_balances=collateral_balances,
+            prices=prices,
+        )
+
+    @staticmethod
+    def _call(target: str, contract, function_name: str, args: list | None = None) -> tuple:
+        target = Web3.to_checksum_address(target)
+        return (multicall_call(target, contract, function_name, args), contract, function_name)
+
+    def _aggregate(self, wallet_provider: EvmWalletProvider, calls: list) -> list:
+        with self._lock:
+            self.rpc_calls += 1
+        return aggregate(wallet_provider, calls)
+
+    def _load_asset_table(self, wallet_provider: EvmWalletProvider, comet: str) -> CometAssetTable:
+        """Read the asset table of a Comet with three Multicall3 calls."""
+        (num_assets,), (base_token,), (base_price_feed,) = self._aggregate(
+            wallet_provider,
+            [
+                self._call(comet, _comet_contract, "numAssets"),
+                self._call(comet, _comet_contract, "baseToken"),
+                self._call(comet, _comet_contract, "baseTokenPriceFeed"),
+            ],
+        )
+        asset_infos = self._aggregate(
+            wallet_provider,
+            [self._call(comet, _comet_contract, "getAssetInfo", [i]) for i in range(num_assets)],
+        )
+        asset_infos = [info for (info,) in asset_infos]
+
+        tokens = [base_token, *(info[1] for info in asset_infos)]
+        metadata = self._aggregate(
+            wallet_provider,
+            [
+                self._call(token, _token_contract, function_name)
+                for token in tokens
+                for function_name in ("symbol", "decimals")
+            ],
+        )
+        symbols = [symbol for (symbol,) in metadata[::2]]
+        decimals = [value for (value,) in metadata[1::2]]
+
+        return CometAssetTable(
+            comet=comet,
+            base_token=Web3.to_checksum_address(base_token),
+            base_price_feed=Web3.to_checksum_address(base_price_feed),
+            base_symbol=symbols[0],
+            base_decimals=decimals[0],
+            assets=tuple(
+                CompoundAsset(
+                    index=info[0],
+                    address=Web3.to_checksum_address(info[1]),
+                    price_feed=Web3.to_checksum_address(info[2]),
+                    symbol=symbol,
+                    decimals=asset_decimals,
+                    borrow_collateral_factor=info[4],
+                    liquidate_collateral_factor=info[5],
+                )
+                for info, symbol, asset_decimals in zip(
+                    asset_infos, symbols[1:], decimals[1:], strict=True
+                )
+            ),
+        )
+
+
+# Shared by the Compound utils and action provider
+portfolio_reader = CompoundPortfolioReader()
+
+
+def get_portfolio_snapshot(
+    wallet_provider: EvmWalletProvider, comet: str, account: str | None = None
+) -> CompoundPortfolioSnapshot:
+    """Read a snapshot of a Compound position with the shared reader.
+
+    Args:
+        wallet_provider: The wallet provider to read with.
+        comet: The Comet address.
+        account: The account, defaults to the wallet address.
+
+    Returns:
+        CompoundPortfolioSnapshot: The snapshot.
+
+    """
+    return portfolio_reader.get_snapshot(wallet_provider, comet, account)
@@ -61,3 +61,18 @@ class CompoundPortfolioSchema(BaseModel):
     """Input schema for getting portfolio details from Compound."""
 
     pass  # No inputs required
+
+
+class CompoundMaxSafeBorrowSchema(BaseModel):
+    """Input schema for finding the largest safe borrow from Compound."""
+
+    target_health_ratio: float = Field(
+        1.0,
+        ge=1,
+        description="The lowest acceptable health ratio after the borrow, e.g. `1.5`. Defaults to 1",
+    )
+    collateral_price_change_percent: float = Field(
+        0,
+        gt=-100,
+        description="A change of all collateral prices to stay safe under, in percent, e.g. `-20` for a 20% drop. Defaults to 0",
+    )
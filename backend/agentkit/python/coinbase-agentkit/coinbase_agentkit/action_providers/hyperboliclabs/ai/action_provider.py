@@ -4,6 +4,8 @@ This module provides actions for interacting with Hyperbolic AI services.
 It includes functionality for text, image and audio generation.
 """
 
+import os
+import time
 import uuid
 from typing import Any
 
@@ -11,8 +13,10 @@ from ...action_decorator import create_action
 from ..action_provider import ActionProvider
 from .schemas import (
     GenerateAudioSchema,
+    GenerateImagesBatchSchema,
     GenerateImageSchema,
     GenerateTextSchema,
+    GenerateTextStreamSchema,
 )
 from .service import AIService
 from .types import (
@@ -21,7 +25,7 @@ from .types import (
     ChatMessage,
     ImageGenerationRequest,
 )
-from .utils import save_base64_data, save_text
+from .utils import save_text
 
 
 class AIActionProvider(ActionProvider):
@@ -116,6 +120,109 @@ Important notes:
         except Exception as e:
             return f"Error: Text generation: {e!s}"
 
+    @create_action(
+        name="generate_text_stream",
+        description="""
+This tool generates text using specified language model, streaming tokens as they are generated.
+
+Required inputs:
+- prompt: Text prompt for generation.
+- model: (Optional) Model to use for text generation.
+    Default: "meta-llama/Meta-Llama-3-70B-Instruct"
+
+Example successful response:
+    Text generation successful:
+    - Saved to: /path/to/generated_text_{uuid}.txt
+    - Time to first token: 0.42s
+
+    Preview (first 500 chars):
+
+Example error response:
+    Error: Invalid model specified
+    Error: API request failed
+
+Important notes:
+- Prefer this over generate_text for long generations
+- Tokens are written to the file as they arrive, so the file can be read while generating
+- The generated text is saved to a file with a UUID in the name
+""",
+        schema=GenerateTextStreamSchema,
+    )
+    def generate_text_stream(self, args: dict[str, Any]) -> str:
+        """Generate text using specified language model, streaming the output to a file.
+
+        Args:
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            validated_args = GenerateTextStreamSchema(**args)
+
+            messages = []
+            if validated_args.system_prompt:
+                messages.append(ChatMessage(role="system", content=validated_args.system_prompt))
+            messages.append(ChatMessage(role="user", content=validated_args.prompt))
+
+            request = ChatCompletionRequest(
+                messages=messages,
+                model=validated_args.model,
+                stream=True,
+            )
+
+            file_path = os.path.abspath(f"./tmp/generated_text_{uuid.uuid4()}.txt")
+            start_time = time.monotonic()
+            first_token_time = None
+            preview_parts = []
+            preview_length = 0
+            total_length = 0
+            f = None
+
+            try:
+                for chunk in self.ai_service.generate_text_stream(request):
+                    for choice in chunk.choices:
+                        content = choice.delta.content
+                        if choice.index != 0 or not content:
+                            continue
+
+                        if f is None:
+                            first_token_time = time.monotonic() - start_time
+                            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                            f = open(file_path, "w", encoding="utf-8")  # noqa: SIM115
+
+                        f.write(content)
+                        f.flush()
+                        total_length += len(content)
+
+                        if preview_length < 500:
+                            preview_parts.append(content[: 500 - preview_length])
+                            preview_length += len(preview_parts[-1])
+            finally:
+                if f is not None:
+                    f.close()
+
+            if first_token_time is None:
+                return "Error: Generation failed: No text was generated by the model."
+
+            preview = "".join(preview_parts)
+            if total_length > 500:
+                preview += "..."
+
+            output = [
+                "Text generation successful:",
+                f"- Saved to: {file_path}",
+                f"- Time to first token: {first_token_time:.2f}s",
+                "",
+                "Preview (first 500 chars):",
+                preview,
+            ]
+
+            return "\n".join(output)
+        except Exception as e:
+            return f"Error: Text generation: {e!s}"
+
     @create_action(
         name="generate_image",
         description="""
@@ -168,26 +275,93 @@ Important notes:
                 negative_prompt=validated_args.negative_prompt,
             )
 
-            response = self.ai_service.generate_image(request)
-
-            file_paths = []
-            for img in response.images:
-                filename = f"./tmp/generated_image_{uuid.uuid4()}.png"
-                file_path = save_base64_data(img.image, filename)
-                file_paths.append(file_path)
+            response = self.ai_service.generate_image_to_files(request)
 
-            if not file_paths:
+            if not response.images:
                 return "Error: Generation failed: No images were generated."
 
             output = ["Image generation successful:"]
-            for path in file_paths:
-                output.append(f"- Saved to: {path}")
+            for image in response.images:
+                output.append(f"- Saved to: {image.path}")
 
             return "\n".join(output)
 
         except Exception as e:
             return f"Error: Image generation: {e!s}"
 
+    @create_action(
+        name="generate_images_batch",
+        description="""
+This tool generates one image for each of several prompts, running the requests concurrently.
+
+Required inputs:
+- prompts: The image prompts to generate from (1-8 prompts)
+- model_name: (Optional) The model to use (default: "SDXL1.0-base")
+- height: (Optional) Image height in pixels (default: 1024)
+- width: (Optional) Image width in pixels (default: 1024)
+- steps: (Optional) Number of inference steps (default: 30)
+- negative_prompt: (Optional) What to avoid in the images
+
+Example successful response:
+    Batch image generation complete (2/2 succeeded):
+    - Prompt 1: Saved to: /path/to/generated_image_{uuid}.png
+    - Prompt 2: Saved to: /path/to/generated_image_{uuid}.png
+
+Example error response:
+    Error: Batch image generation: Invalid model specified
+
+Important notes:
+- Prefer this over calling generate_image repeatedly
+- A failed prompt is reported without affecting the others
+- Images are saved as PNG files with a UUID in the filename
+""",
+        schema=GenerateImagesBatchSchema,
+    )
+    def generate_images_batch(self, args: dict[str, Any]) -> str:
+        """Generate an image for each of several prompts concurrently.
+
+        Args:
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            validated_args = GenerateImagesBatchSchema(**args)
+
+            requests = [
+                ImageGenerationRequest(
+                    prompt=prompt,
+                    model_name=validated_args.model_name,
+                    height=validated_args.height,
+                    width=validated_args.width,
+                    steps=validated_args.steps,
+                    negative_prompt=validated_args.negative_prompt,
+                )
+                for prompt in validated_args.prompts
+            ]
+
+            results = self.ai_service.generate_images_batch(requests)
+
+            lines = []
+            succeeded = 0
+            for i, result in enumerate(results, start=1):
+                if isinstance(result, Exception):
+                    lines.append(f"- Prompt {i}: Error: {result!s}")
+                elif not result.images:
+                    lines.append(f"- Prompt {i}: Error: No images were generated.")
+                else:
+                    succeeded += 1
+                    for image in result.images:
+                        lines.append(f"- Prompt {i}: Saved to: {image.path}")
+
+            header = f"Batch image generation complete ({succeeded}/{len(results)} succeeded):"
+            return "\n".join([header, *lines])
+
+        except Exception as e:
+            return f"Error: Batch image generation: {e!s}"
+
     @create_action(
         name="generate_audio",
         description="""
@@ -237,14 +411,11 @@ Important notes:
                 speed=validated_args.speed,
             )
 
-            response = self.ai_service.generate_audio(request)
-
-            filename = f"./tmp/generated_audio_{uuid.uuid4()}.mp3"
-            file_path = save_base64_data(response.audio, filename)
+            response = self.ai_service.generate_audio_to_file(request)
 
             output = [
                 "Audio generation successful:",
-                f"- Saved to: {file_path}",
+                f"- Saved to: {response.path}",
             ]
 
             return "\n".join(output)
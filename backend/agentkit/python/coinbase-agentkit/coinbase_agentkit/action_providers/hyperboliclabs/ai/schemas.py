@@ -20,6 +20,10 @@ class GenerateTextSchema(BaseModel):
     )
 
 
+class GenerateTextStreamSchema(GenerateTextSchema):
+    """Schema for generate_text_stream action."""
+
+
 class GenerateImageSchema(BaseModel):
     """Schema for generate_image action."""
 
@@ -58,6 +62,42 @@ class GenerateImageSchema(BaseModel):
     )
 
 
+class GenerateImagesBatchSchema(BaseModel):
+    """Schema for generate_images_batch action."""
+
+    prompts: list[str] = Field(
+        description="The image prompts to generate from, one image per prompt",
+        min_length=1,
+        max_length=8,
+    )
+    model_name: str = Field(
+        default="SDXL1.0-base",
+        description="The model to use for image generation",
+    )
+    height: int = Field(
+        default=1024,
+        description="Image height in pixels",
+        ge=64,
+        le=2048,
+    )
+    width: int = Field(
+        default=1024,
+        description="Image width in pixels",
+        ge=64,
+        le=2048,
+    )
+    steps: int = Field(
+        default=30,
+        description="Number of inference steps",
+        ge=1,
+        le=100,
+    )
+    negative_prompt: str | None = Field(
+        None,
+        description="Text specifying what the model should not generate",
+    )
+
+
 class GenerateAudioSchema(BaseModel):
     """Schema for generate_audio action."""
 
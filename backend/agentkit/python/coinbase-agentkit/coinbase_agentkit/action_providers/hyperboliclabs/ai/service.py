@@ -1,15 +1,31 @@
 """Service for AI-related operations."""
 
-from ..constants import AI_SERVICES_BASE_URL, AI_SERVICES_ENDPOINTS, SUPPORTED_IMAGE_MODELS
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from ..constants import (
+    AI_SERVICES_BASE_URL,
+    AI_SERVICES_ENDPOINTS,
+    MAX_CONCURRENT_GENERATIONS,
+    SUPPORTED_IMAGE_MODELS,
+)
 from ..service import Base
 from .types import (
+    AudioFileResponse,
     AudioGenerationRequest,
     AudioGenerationResponse,
+    ChatCompletionChunk,
     ChatCompletionRequest,
     ChatCompletionResponse,
+    ImageFilesResponse,
     ImageGenerationRequest,
     ImageGenerationResponse,
+    SavedImage,
 )
+from .utils import accumulate_chat_completion, parse_chat_completion_chunks, save_base64_data
 
 
 class AIService(Base):
@@ -37,6 +53,9 @@ class AIService(Base):
             ChatCompletionResponse: The chat completion response.
 
         """
+        if request.stream:
+            return accumulate_chat_completion(self.generate_text_stream(request))
+
         response = self.make_request(
             endpoint=AI_SERVICES_ENDPOINTS["TEXT_GENERATION"],
             data=request.model_dump(exclude_none=True),
@@ -44,6 +63,61 @@ class AIService(Base):
 
         return ChatCompletionResponse(**response.json())
 
+    def generate_text_stream(
+        self,
+        request: ChatCompletionRequest,
+    ) -> Iterator[ChatCompletionChunk]:
+        """Generate text using specified model, yielding chunks as they are generated.
+
+        Args:
+            request: The ChatCompletionRequest object containing the request parameters.
+
+        Yields:
+            ChatCompletionChunk: Each chunk of the streamed completion.
+
+        """
+        data = request.model_dump(exclude_none=True)
+        data["stream"] = True
+
+        response = self.make_request(
+            endpoint=AI_SERVICES_ENDPOINTS["TEXT_GENERATION"],
+            data=data,
+            stream=True,
+        )
+
+        try:
+            yield from parse_chat_completion_chunks(response.iter_lines())
+        finally:
+            response.close()
+
+    async def generate_text_stream_async(
+        self,
+        request: ChatCompletionRequest,
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Generate text using specified model, asynchronously yielding chunks.
+
+        The blocking stream is read in a worker thread, one chunk at a time, so the
+        event loop is never blocked while waiting for the next token.
+
+        Args:
+            request: The ChatCompletionRequest object containing the request parameters.
+
+        Yields:
+            ChatCompletionChunk: Each chunk of the streamed completion.
+
+        """
+        chunks = self.generate_text_stream(request)
+        done = object()
+
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, done)
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(chunks.close)
+
     def generate_image(
         self,
         request: ImageGenerationRequest,
@@ -57,17 +131,79 @@ class AIService(Base):
             ImageGenerationResponse: The image generation response.
 
         """
-        if request.model_name not in SUPPORTED_IMAGE_MODELS:
-            raise ValueError(
-                f"Model {request.model_name} not supported. Use one of: {SUPPORTED_IMAGE_MODELS}"
+        return ImageGenerationResponse(**self._request_image_generation(request))
+
+    def generate_image_to_files(
+        self,
+        request: ImageGenerationRequest,
+        output_dir: str = "./tmp",
+    ) -> ImageFilesResponse:
+        """Generate images and decode them directly to PNG files.
+
+        Unlike generate_image, the base64 payloads are never copied into a response
+        model or fully decoded in memory. Each image is decoded to disk in slices
+        and released as soon as it is saved.
+
+        Args:
+            request: The ImageGenerationRequest object containing the request parameters.
+            output_dir: Directory to save the images in.
+
+        Returns:
+            ImageFilesResponse: The paths and metadata of the saved images.
+
+        """
+        data = self._request_image_generation(request)
+        images = data.get("images") or []
+
+        saved_images = []
+        for i, image in enumerate(images):
+            images[i] = None
+            file_path = save_base64_data(
+                image.pop("image"),
+                os.path.join(output_dir, f"generated_image_{uuid.uuid4()}.png"),
+            )
+            saved_images.append(
+                SavedImage(
+                    path=file_path,
+                    size_bytes=os.path.getsize(file_path),
+                    random_seed=image.get("random_seed"),
+                    index=image.get("index", i),
+                )
             )
 
-        response = self.make_request(
-            endpoint=AI_SERVICES_ENDPOINTS["IMAGE_GENERATION"],
-            data=request.model_dump(exclude_none=True),
-        )
+        return ImageFilesResponse(images=saved_images, inference_time=data.get("inference_time"))
+
+    def generate_images_batch(
+        self,
+        requests: list[ImageGenerationRequest],
+        output_dir: str = "./tmp",
+        max_workers: int = MAX_CONCURRENT_GENERATIONS,
+    ) -> list[ImageFilesResponse | Exception]:
+        """Generate images for several requests concurrently, saving them to files.
+
+        A failed request does not cancel the others. Its exception is returned in
+        place of its response.
+
+        Args:
+            requests: The ImageGenerationRequest objects to run.
+            output_dir: Directory to save the images in.
+            max_workers: Maximum number of requests in flight at once.
 
-        return ImageGenerationResponse(**response.json())
+        Returns:
+            list[ImageFilesResponse | Exception]: The result of each request, in order.
+
+        """
+        if not requests:
+            return []
+
+        def generate(request: ImageGenerationRequest) -> ImageFilesResponse | Exception:
+            try:
+                return self.generate_image_to_files(request, output_dir)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as executor:
+            return list(executor.map(generate, requests))
 
     def generate_audio(
         self,
@@ -88,3 +224,62 @@ class AIService(Base):
         )
 
         return AudioGenerationResponse(**response.json())
+
+    def generate_audio_to_file(
+        self,
+        request: AudioGenerationRequest,
+        output_path: str | None = None,
+    ) -> AudioFileResponse:
+        """Generate audio and decode it directly to an MP3 file.
+
+        Args:
+            request: The AudioGenerationRequest object containing the request parameters.
+            output_path: Path to save the audio to. If not provided, a file with a
+                         UUID in its name is created in ./tmp.
+
+        Returns:
+            AudioFileResponse: The path and metadata of the saved audio.
+
+        """
+        data = self.make_request(
+            endpoint=AI_SERVICES_ENDPOINTS["AUDIO_GENERATION"],
+            data=request.model_dump(exclude_none=True),
+        ).json()
+
+        if "audio" not in data:
+            raise ValueError("Response did not contain any audio")
+
+        file_path = save_base64_data(
+            data.pop("audio"), output_path or f"./tmp/generated_audio_{uuid.uuid4()}.mp3"
+        )
+
+        return AudioFileResponse(
+            path=file_path,
+            size_bytes=os.path.getsize(file_path),
+            duration=data.get("duration"),
+        )
+
+    def _request_image_generation(self, request: ImageGenerationRequest) -> dict:
+        """Request image generation and return the decoded JSON body.
+
+        Args:
+            request: The ImageGenerationRequest object containing the request parameters.
+
+        Returns:
+            dict: The response body.
+
+        Raises:
+            ValueError: If the requested model is not supported.
+
+        """
+        if request.model_name not in SUPPORTED_IMAGE_MODELS:
+            raise ValueError(
+                f"Model {request.model_name} not supported. Use one of: {SUPPORTED_IMAGE_MODELS}"
+            )
+
+        response = self.make_request(
+            endpoint=AI_SERVICES_ENDPOINTS["IMAGE_GENERATION"],
+            data=request.model_dump(exclude_none=True),
+        )
+
+        return response.json()
@@ -104,6 +104,34 @@ class ChatCompletionResponse(BaseModel):
     usage: ChatCompletionResponseUsage | None = Field(None, description="Token usage information")
 
 
+class ChatCompletionChunkDelta(BaseModel):
+    """An incremental message update in a streamed chat completion."""
+
+    role: str | None = Field(None, description="The role of the message sender, if changed")
+    content: str | None = Field(None, description="The content generated since the last chunk")
+
+
+class ChatCompletionChunkChoice(BaseModel):
+    """A single choice in a streamed chat completion chunk."""
+
+    index: int = Field(..., description="Index of this choice")
+    delta: ChatCompletionChunkDelta = Field(..., description="The message update")
+    finish_reason: str | None = Field(None, description="Reason for finishing")
+
+
+class ChatCompletionChunk(BaseModel):
+    """A single server-sent event of a streamed chat completion."""
+
+    id: str = Field(..., description="Unique identifier for this completion")
+    object: str = Field("chat.completion.chunk", description="Object type")
+    created: int = Field(..., description="Unix timestamp of creation")
+    model: str = Field(..., description="Model used for completion")
+    choices: list[ChatCompletionChunkChoice] = Field(
+        default_factory=list, description="List of completion choice updates"
+    )
+    usage: ChatCompletionResponseUsage | None = Field(None, description="Token usage information")
+
+
 class ImageGenerationRequest(BaseModel):
     """Request model for image generation API."""
 
@@ -157,6 +185,22 @@ class ImageGenerationResponse(BaseModel):
     inference_time: float | None = Field(None, description="Time taken for inference in seconds")
 
 
+class SavedImage(BaseModel):
+    """A generated image that was decoded directly to a file."""
+
+    path: str = Field(..., description="Absolute path to the saved image file")
+    size_bytes: int = Field(..., description="Size of the saved image file in bytes")
+    random_seed: int | None = Field(None, description="Random seed used for generation")
+    index: int = Field(..., description="Index of the image in batch")
+
+
+class ImageFilesResponse(BaseModel):
+    """Image generation response with the images saved to files."""
+
+    images: list[SavedImage] = Field(..., description="List of saved images")
+    inference_time: float | None = Field(None, description="Time taken for inference in seconds")
+
+
 class AudioGenerationRequest(BaseModel):
     """Request model for audio generation API."""
 
@@ -201,3 +245,11 @@ class AudioGenerationResponse(BaseModel):
 
     audio: str = Field(..., description="Base64 encoded audio data in MP3 format")
     duration: float | None = Field(None, description="Duration of the generated audio in seconds")
+
+
+class AudioFileResponse(BaseModel):
+    """Audio generation response with the audio saved to a file."""
+
+    path: str = Field(..., description="Absolute path to the saved MP3 file")
+    size_bytes: int = Field(..., description="Size of the saved audio file in bytes")
+    duration: float | None = Field(None, description="Duration of the generated audio in seconds")
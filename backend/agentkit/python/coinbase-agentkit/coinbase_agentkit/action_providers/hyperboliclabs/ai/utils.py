@@ -5,10 +5,62 @@ such as saving generated data.
 """
 
 import base64
+import binascii
+import json
 import os
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO
 
+from ..constants import BASE64_DECODE_CHUNK_SIZE
+from .types import (
+    ChatCompletionChunk,
+    ChatCompletionResponse,
+    ChatCompletionResponseChoice,
+    ChatCompletionResponseMessage,
+)
 
-def save_base64_data(base64_data: str, output_path: str) -> str:
+
+def decode_base64_to_file(base64_data: str | bytes, file: BinaryIO) -> int:
+    """Decode base64 data into an open binary file, one slice at a time.
+
+    The data is decoded in slices of BASE64_DECODE_CHUNK_SIZE characters, each
+    written to the file before the next is decoded, so the full decoded payload is
+    never held in memory. A data URI prefix (e.g. "data:image/png;base64,") is
+    skipped.
+
+    Args:
+        base64_data: The base64 encoded data
+        file: A binary file object to write the decoded bytes to
+
+    Returns:
+        int: The number of decoded bytes written
+
+    Raises:
+        ValueError: If the base64 data is invalid
+
+    """
+    separator = "," if isinstance(base64_data, str) else b","
+    start = base64_data.find(separator, 0, 256) + 1
+
+    written = 0
+    try:
+        for offset in range(start, len(base64_data), BASE64_DECODE_CHUNK_SIZE):
+            chunk = base64_data[offset : offset + BASE64_DECODE_CHUNK_SIZE]
+            try:
+                decoded = base64.b64decode(chunk, validate=True)
+            except binascii.Error:
+                # Embedded whitespace shifts slice boundaries, decode the rest at once
+                decoded = base64.b64decode(base64_data[offset:])
+                written += file.write(decoded)
+                break
+            written += file.write(decoded)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 data: {e!s}") from e
+
+    return written
+
+
+def save_base64_data(base64_data: str | bytes, output_path: str) -> str:
     """Save base64 encoded data to a file.
 
     Args:
@@ -23,19 +75,18 @@ def save_base64_data(base64_data: str, output_path: str) -> str:
         OSError: If there's an error saving the file
 
     """
+    file_path = os.path.abspath(output_path)
     try:
-        if "," in base64_data:
-            base64_data = base64_data.split(",")[1]
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-        decoded_data = base64.b64decode(base64_data)
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-
-        with open(output_path, "wb") as f:
-            f.write(decoded_data)
+        with open(file_path, "wb") as f:
+            decode_base64_to_file(base64_data, f)
 
-        return os.path.abspath(output_path)
-    except base64.binascii.Error as e:
-        raise ValueError(f"Invalid base64 data: {e!s}") from e
+        return file_path
+    except ValueError:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
     except OSError as e:
         raise OSError(f"Error saving file: {e!s}") from e
 
@@ -64,7 +115,114 @@ def save_text(text: str, output_path: str) -> str:
         raise OSError(f"Error saving text file: {e!s}") from e
 
 
+def parse_sse_data(lines: Iterable[str | bytes]) -> Iterator[str]:
+    """Parse the data payloads of server-sent events.
+
+    Multi-line data fields are joined with newlines, comments and other fields
+    are ignored, and parsing stops at the OpenAI-style "[DONE]" sentinel.
+
+    Args:
+        lines: The lines of the event stream, without line terminators
+
+    Yields:
+        str: The data payload of each event
+
+    """
+    data_lines: list[str] = []
+
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+
+        if not line:
+            if data_lines:
+                data = "\n".join(data_lines)
+                data_lines = []
+                if data == "[DONE]":
+                    return
+                yield data
+            continue
+
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        if field == "data":
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+
+    if data_lines:
+        data = "\n".join(data_lines)
+        if data != "[DONE]":
+            yield data
+
+
+def parse_chat_completion_chunks(lines: Iterable[str | bytes]) -> Iterator[ChatCompletionChunk]:
+    """Parse a streamed chat completion into chunks as the events arrive.
+
+    Args:
+        lines: The lines of the event stream, without line terminators
+
+    Yields:
+        ChatCompletionChunk: Each parsed chunk
+
+    """
+    for data in parse_sse_data(lines):
+        yield ChatCompletionChunk(**json.loads(data))
+
+
+def accumulate_chat_completion(chunks: Iterable[ChatCompletionChunk]) -> ChatCompletionResponse:
+    """Combine streamed chat completion chunks into a complete response.
+
+    Args:
+        chunks: The streamed chunks, in order
+
+    Returns:
+        ChatCompletionResponse: The equivalent non-streamed response
+
+    Raises:
+        ValueError: If the stream contained no chunks
+
+    """
+    first: ChatCompletionChunk | None = None
+    usage = None
+    contents: dict[int, list[str]] = {}
+    finish_reasons: dict[int, str | None] = {}
+
+    for chunk in chunks:
+        first = first or chunk
+        usage = chunk.usage or usage
+        for choice in chunk.choices:
+            parts = contents.setdefault(choice.index, [])
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+            if choice.finish_reason:
+                finish_reasons[choice.index] = choice.finish_reason
+
+    if first is None:
+        raise ValueError("Stream ended without any chat completion chunks")
+
+    return ChatCompletionResponse(
+        id=first.id,
+        object="chat.completion",
+        created=first.created,
+        model=first.model,
+        choices=[
+            ChatCompletionResponseChoice(
+                index=index,
+                message=ChatCompletionResponseMessage(role="assistant", content="".join(parts)),
+                finish_reason=finish_reasons.get(index),
+            )
+            for index, parts in sorted(contents.items())
+        ],
+        usage=usage,
+    )
+
+
 __all__ = [
+    "accumulate_chat_completion",
+    "decode_base64_to_file",
+    "parse_chat_completion_chunks",
+    "parse_sse_data",
     "save_base64_data",
     "save_text",
 ]
@@ -1,22 +1,31 @@
 """Hyperbolic Billing action provider.
 
 This module provides actions for interacting with Hyperbolic billing services.
-It includes functionality for checking balance and spend history.
+It includes functionality for checking balance, spend history and spend breakdowns.
 """
 
+import os
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from ...action_decorator import create_action
 from ..action_provider import ActionProvider
+from ..constants import BILLING_HISTORY_DB_ENV, BILLING_SYNC_INTERVAL
 from ..marketplace.service import MarketplaceService
+from .analytics import SpendAnalytics
 from .schemas import (
     GetCurrentBalanceSchema,
     GetPurchaseHistorySchema,
+    GetSpendBreakdownSchema,
     GetSpendHistorySchema,
 )
 from .service import BillingService
+from .store import INSTANCE_HISTORY, PURCHASE_HISTORY, BillingHistoryStore
 from .utils import (
     format_purchase_history,
+    format_spend_breakdown,
     format_spend_history,
 )
 
@@ -32,12 +41,15 @@ class BillingActionProvider(ActionProvider):
     def __init__(
         self,
         api_key: str | None = None,
+        history_db_path: str | None = None,
     ):
         """Initialize the Hyperbolic billing action provider.
 
         Args:
             api_key: Optional API key for authentication. If not provided,
                     will attempt to read from HYPERBOLIC_API_KEY environment variable.
+            history_db_path: Optional path to persist billing history to. If not provided,
+                    will use HYPERBOLIC_BILLING_DB_PATH, or keep the history in memory.
 
         Raises:
             ValueError: If API key is not provided and not found in environment.
@@ -46,6 +58,60 @@ class BillingActionProvider(ActionProvider):
         super().__init__("hyperbolic_billing", [], api_key=api_key)
         self.billing = BillingService(self.api_key)
         self.marketplace = MarketplaceService(self.api_key)
+        self.history_store = BillingHistoryStore(
+            history_db_path or os.getenv(BILLING_HISTORY_DB_ENV) or ":memory:"
+        )
+        self.sync_interval = BILLING_SYNC_INTERVAL
+
+    def _sync_history(self, name: str, fetch: Callable[[], Any], sync: Callable[[Any], int]) -> str:
+        """Sync a history from the API into the local store if it is stale.
+
+        If the API request fails but the history was synced before, the stored
+        history is used and a note saying so is returned.
+
+        Args:
+            name: INSTANCE_HISTORY or PURCHASE_HISTORY.
+            fetch: Callable fetching the history from the API.
+            sync: Callable storing the fetched history.
+
+        Returns:
+            str: A note to show above the response, or an empty string.
+
+        Raises:
+            Exception: If the API request fails and the history was never synced.
+
+        """
+        synced_at = self.history_store.get_synced_at(name)
+        if synced_at is not None and time.time() - synced_at < self.sync_interval:
+            return ""
+
+        try:
+            response = fetch()
+        except Exception as e:
+            if synced_at is None:
+                raise
+            synced = datetime.fromtimestamp(synced_at, tz=timezone.utc)
+            return (
+                f"Note: The API request failed ({e!s}), showing history synced at "
+                f"{synced.strftime('%Y-%m-%d %H:%M:%S')} UTC.\n\n"
+            )
+
+        if response:
+            sync(response)
+        return ""
+
+    def _sync_instance_history(self) -> str:
+        """Sync the rental history into the local store if it is stale.
+
+        Returns:
+            str: A note to show above the response, or an empty string.
+
+        """
+        return self._sync_history(
+            INSTANCE_HISTORY,
+            self.marketplace.get_instance_history,
+            self.history_store.sync_instance_history,
+        )
 
     @create_action(
         name="get_current_balance",
@@ -128,6 +194,8 @@ Important notes:
 - All costs are in USD
 - Duration is in seconds
 - History includes instance names with animal-based identifiers
+- History is synced from the API periodically into a local store,
+  which is also used if the API is unavailable
 """,
         schema=GetSpendHistorySchema,
     )
@@ -144,17 +212,98 @@ Important notes:
         try:
             GetSpendHistorySchema(**args)
 
-            response = self.marketplace.get_instance_history()
-            if not response:
+            note = self._sync_instance_history()
+            if self.history_store.get_synced_at(INSTANCE_HISTORY) is None:
                 return "Could not retrieve instance history. Please try again later."
 
+            response = self.history_store.get_instance_history()
             if not response.instance_history:
                 return "No rental history found."
 
-            return format_spend_history(response)
+            return note + format_spend_history(response)
         except Exception as e:
             return f"Error: Spend history retrieval: {e!s}"
 
+    @create_action(
+        name="get_spend_breakdown",
+        description="""
+This tool breaks down your GPU rental spending on Hyperbolic platform by GPU model, day or instance.
+
+Inputs:
+- group_by: (Optional) "gpu_model", "day" or "instance" (default: "gpu_model")
+- days: (Optional) Only include spend from the last number of days (default: all time)
+- sort_by: (Optional) "cost", "duration" or "key" (default: date for days, cost otherwise)
+- limit: (Optional) Maximum number of groups to show (default: 10)
+
+Example successful response:
+    === GPU Rental Spend by GPU Model (last 7 days) ===
+
+    - NVIDIA-GeForce-RTX-4090: $6.80 (97.7%)
+      Rentals: 10, GPUs: 10, Time: 101.10 hours
+    - NVIDIA-H100-80GB-HBM3: $0.16 (2.3%)
+      Rentals: 7, GPUs: 14, Time: 0.86 hours
+
+    Total Spending: $6.96
+
+Example error response:
+    Error: API request failed
+
+Important notes:
+- All costs are in USD
+- Rentals that ran partly inside the time window are counted pro rata
+- Rentals spanning midnight are split between days (UTC)
+- Rentals with GPUs of several models are split evenly between the models
+- History is synced from the API periodically into a local store
+""",
+        schema=GetSpendBreakdownSchema,
+    )
+    def get_spend_breakdown(self, args: dict[str, Any]) -> str:
+        """Break down GPU rental spending by GPU model, day or instance.
+
+        Args:
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            validated_args = GetSpendBreakdownSchema(**args)
+
+            note = self._sync_instance_history()
+            if self.history_store.get_synced_at(INSTANCE_HISTORY) is None:
+                return "Could not retrieve instance history. Please try again later."
+
+            response = self.history_store.get_instance_history()
+            if not response.instance_history:
+                return "No rental history found."
+
+            analytics = SpendAnalytics(response)
+            start = None
+            if validated_args.days:
+                start = datetime.now(timezone.utc) - timedelta(days=validated_args.days)
+
+            breakdown_methods = {
+                "gpu_model": analytics.get_by_gpu_model,
+                "day": analytics.get_by_day,
+                "instance": analytics.get_by_instance,
+            }
+            default_sort = "key" if validated_args.group_by == "day" else "cost"
+            breakdown = breakdown_methods[validated_args.group_by](
+                start=start,
+                limit=validated_args.limit,
+                sort_by=validated_args.sort_by or default_sort,
+            )
+
+            return note + format_spend_breakdown(
+                breakdown,
+                validated_args.group_by,
+                analytics.get_total_cost(start=start),
+                validated_args.days,
+            )
+        except Exception as e:
+            return f"Error: Spend breakdown retrieval: {e!s}"
+
     @create_action(
         name="get_purchase_history",
         description="""
@@ -176,6 +325,8 @@ Important notes:
 - This shows platform credit purchases only
 - All amounts are shown in USD
 - Purchase history is limited to 5 most recent by default
+- History is synced from the API periodically into a local store,
+  which is also used if the API is unavailable
 """,
         schema=GetPurchaseHistorySchema,
     )
@@ -191,9 +342,15 @@ Important notes:
         """
         try:
             GetPurchaseHistorySchema(**args)
-            history_response = self.billing.get_purchase_history()
 
-            return format_purchase_history(history_response)
+            note = self._sync_history(
+                PURCHASE_HISTORY,
+                self.billing.get_purchase_history,
+                self.history_store.sync_purchase_history,
+            )
+            history_response = self.history_store.get_purchase_history()
+
+            return note + format_purchase_history(history_response)
         except Exception as e:
             return f"Error: Purchase history retrieval: {e!s}"
 
@@ -0,0 +1,373 @@
+"""Columnar spend analytics for Hyperbolic GPU rental history.
+
+The instance history is ingested once into flat arrays: one row per rental,
+plus one row per (rental, GPU model) pair for rentals with several GPU models.
+Timestamps are parsed a single time, and every aggregate is computed by one
+pass over the arrays rather than by re-walking the response models.
+"""
+
+import math
+from array import array
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Literal
+
+from ..marketplace.types import InstanceHistoryEntry, InstanceHistoryResponse
+from .types import SpendBreakdownEntry
+
+SECONDS_PER_DAY = 86400
+UNKNOWN_GPU = "Unknown GPU"
+UNNAMED_INSTANCE = "unnamed-instance"
+
+SortKey = Literal["cost", "duration", "key"]
+
+
+def parse_timestamp(value: str | None) -> float:
+    """Parse an ISO format timestamp into seconds since the epoch.
+
+    Timestamps without a timezone are treated as UTC.
+
+    Args:
+        value: ISO format timestamp string.
+
+    Returns:
+        float: Seconds since the epoch, or NaN if the timestamp is missing.
+
+    """
+    if not value:
+        return math.nan
+
+    timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _to_epoch(value: datetime | None, default: float) -> float:
+    """Convert an optional window bound to seconds since the epoch.
+
+    Args:
+        value: The window bound. Naive datetimes are treated as UTC.
+        default: The value to use if the bound is not set.
+
+    Returns:
+        float: Seconds since the epoch.
+
+    """
+    if value is None:
+        return default
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SpendAnalytics:
+    """Columnar view of GPU rental history for spend aggregation.
+
+    Rentals missing a start or termination time are kept for listing, but are
+    excluded from every duration and cost aggregate.
+    """
+
+    def __init__(self, instance_history: InstanceHistoryResponse | list[InstanceHistoryEntry]):
+        """Ingest the instance history into columns.
+
+        Args:
+            instance_history: Instance history response or list of history entries.
+
+        """
+        if isinstance(instance_history, InstanceHistoryResponse):
+            instance_history = instance_history.instance_history
+
+        self.names: list[str] = []
+        self.gpu_labels: list[str] = []
+        self.gpu_counts = array("q")
+        self.started_at = array("d")
+        self.terminated_at = array("d")
+        self.hourly_prices = array("d")
+        self.durations = array("d")
+        self.costs = array("d")
+        self.complete: list[int] = []
+
+        self.models: list[str] = []
+        model_codes: dict[str, int] = {}
+        self._model_rows = array("q")
+        self._model_instances = array("q")
+        self._model_shares = array("d")
+
+        for i, instance in enumerate(instance_history):
+            gpus = instance.hardware.gpus if instance.hardware else []
+            gpu_models = [gpu.model for gpu in gpus if gpu.model] or [UNKNOWN_GPU]
+            started_at = parse_timestamp(instance.started_at)
+            terminated_at = parse_timestamp(instance.terminated_at)
+            hourly_price = instance.price.amount / 100.0
+            duration = terminated_at - started_at
+
+            self.names.append(instance.instance_name or UNNAMED_INSTANCE)
+            self.gpu_labels.append(", ".join(gpu_models))
+            self.gpu_counts.append(instance.gpu_count or 0)
+            self.started_at.append(started_at)
+            self.terminated_at.append(terminated_at)
+            self.hourly_prices.append(hourly_price)
+            self.durations.append(duration)
+            self.costs.append(duration / 3600.0 * hourly_price)
+            if not math.isnan(duration):
+                self.complete.append(i)
+
+            share = 1.0 / len(gpu_models)
+            for model in gpu_models:
+                code = model_codes.setdefault(model, len(self.models))
+                if code == len(self.models):
+                    self.models.append(model)
+                self._model_rows.append(code)
+                self._model_instances.append(i)
+                self._model_shares.append(share)
+
+        self._recent_order = sorted(
+            range(len(self.names)),
+            key=lambda i: -self.started_at[i] if not math.isnan(self.started_at[i]) else math.inf,
+        )
+
+    def __len__(self) -> int:
+        """Get the number of rentals.
+
+        Returns:
+            int: The number of rentals.
+
+        """
+        return len(self.names)
+
+    def get_recent(self, limit: int | None = None) -> list[int]:
+        """Get the rentals ordered by start time, most recent first.
+
+        Rentals without a start time come last.
+
+        Args:
+            limit: Maximum number of rentals to return.
+
+        Returns:
+            list[int]: The row indices of the rentals.
+
+        """
+        return self._recent_order[:limit]
+
+    def get_window_durations(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> array:
+        """Get the rental durations clipped to a time window.
+
+        Args:
+            start: Start of the window (inclusive). Unbounded if not set.
+            end: End of the window (exclusive). Unbounded if not set.
+
+        Returns:
+            array: Seconds of each rental inside the window, NaN for incomplete rentals.
+
+        """
+        if start is None and end is None:
+            return self.durations
+
+        window_start = _to_epoch(start, -math.inf)
+        window_end = _to_epoch(end, math.inf)
+        return array(
+            "d",
+            (
+                max(0.0, min(rental_end, window_end) - max(rental_start, window_start))
+                if not math.isnan(duration)
+                else math.nan
+                for rental_start, rental_end, duration in zip(
+                    self.started_at, self.terminated_at, self.durations, strict=True
+                )
+            ),
+        )
+
+    def get_total_cost(self, start: datetime | None = None, end: datetime | None = None) -> float:
+        """Get the total spend, optionally within a time window.
+
+        Args:
+            start: Start of the window (inclusive). Unbounded if not set.
+            end: End of the window (exclusive). Unbounded if not set.
+
+        Returns:
+            float: The total cost in USD.
+
+        """
+        durations = self.get_window_durations(start, end)
+        return math.fsum(durations[i] / 3600.0 * self.hourly_prices[i] for i in self.complete)
+
+    def get_by_gpu_model(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        sort_by: SortKey = "cost",
+    ) -> list[SpendBreakdownEntry]:
+        """Aggregate spend per GPU model.
+
+        The cost, rental count and GPU count of a rental with several GPU models
+        are split evenly between them.
+
+        Args:
+            start: Start of the window (inclusive). Unbounded if not set.
+            end: End of the window (exclusive). Unbounded if not set.
+            limit: Maximum number of entries to return.
+            sort_by: Order of the entries, highest cost or duration first, or by key.
+
+        Returns:
+            list[SpendBreakdownEntry]: The aggregate for each GPU model.
+
+        """
+        durations = self.get_window_durations(start, end)
+        windowed = start is not None or end is not None
+        size = len(self.models)
+        rentals, gpus, seconds, costs = ([0.0] * size for _ in range(4))
+
+        for code, i, share in zip(
+            self._model_rows, self._model_instances, self._model_shares, strict=True
+        ):
+            duration = durations[i]
+            if math.isnan(duration) or (windowed and duration <= 0):
+                continue
+            rentals[code] += share
+            gpus[code] += self.gpu_counts[i] * share
+            seconds[code] += duration
+            costs[code] += duration / 3600.0 * self.hourly_prices[i] * share
+
+        return _rank(self.models, rentals, gpus, seconds, costs, sort_by, limit)
+
+    def get_by_day(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        sort_by: SortKey = "key",
+    ) -> list[SpendBreakdownEntry]:
+        """Aggregate spend per UTC day.
+
+        Rentals spanning midnight are split between the days they ran on.
+
+        Args:
+            start: Start of the window (inclusive). Unbounded if not set.
+            end: End of the window (exclusive). Unbounded if not set.
+            limit: Maximum number of entries to return.
+            sort_by: Order of the entries, highest cost or duration first, or by date.
+
+        Returns:
+            list[SpendBreakdownEntry]: The aggregate for each day with spend.
+
+        """
+        window_start = _to_epoch(start, -math.inf)
+        window_end = _to_epoch(end, math.inf)
+        windowed = start is not None or end is not None
+        days: dict[int, list[float]] = {}
+
+        for i in self.complete:
+            rental_start = max(self.started_at[i], window_start)
+            rental_end = min(self.terminated_at[i], window_end)
+            if rental_end < rental_start or (windowed and rental_end == rental_start):
+                continue
+
+            day = math.floor(rental_start / SECONDS_PER_DAY)
+            while True:
+                day_start = day * SECONDS_PER_DAY
+                day_end = day_start + SECONDS_PER_DAY
+                duration = min(rental_end, day_end) - max(rental_start, day_start)
+                totals = days.setdefault(day, [0.0, 0.0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += self.gpu_counts[i]
+                totals[2] += duration
+                totals[3] += duration / 3600.0 * self.hourly_prices[i]
+                if rental_end <= day_end:
+                    break
+                day += 1
+
+        keys = sorted(days)
+        return _rank(
+            [
+                datetime.fromtimestamp(day * SECONDS_PER_DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+                for day in keys
+            ],
+            *([days[day][column] for day in keys] for column in range(4)),
+            sort_by,
+            limit,
+        )
+
+    def get_by_instance(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        sort_by: SortKey = "cost",
+    ) -> list[SpendBreakdownEntry]:
+        """Aggregate spend per instance.
+
+        Args:
+            start: Start of the window (inclusive). Unbounded if not set.
+            end: End of the window (exclusive). Unbounded if not set.
+            limit: Maximum number of entries to return.
+            sort_by: Order of the entries, highest cost or duration first, or by name.
+
+        Returns:
+            list[SpendBreakdownEntry]: The aggregate for each instance with spend.
+
+        """
+        durations = self.get_window_durations(start, end)
+        rows = self.complete
+        if start is not None or end is not None:
+            rows = [i for i in rows if durations[i] > 0]
+
+        return _rank(
+            [self.names[i] for i in rows],
+            [1.0] * len(rows),
+            [float(self.gpu_counts[i]) for i in rows],
+            [durations[i] for i in rows],
+            [durations[i] / 3600.0 * self.hourly_prices[i] for i in rows],
+            sort_by,
+            limit,
+        )
+
+
+def _rank(
+    keys: list[str],
+    rentals: list[float],
+    gpus: list[float],
+    seconds: list[float],
+    costs: list[float],
+    sort_by: SortKey,
+    limit: int | None,
+) -> list[SpendBreakdownEntry]:
+    """Build the breakdown entries for aggregated columns, sorted and truncated.
+
+    Groups without any rentals are left out.
+
+    Args:
+        keys: The group keys.
+        rentals: Rental count per group.
+        gpus: GPU count per group.
+        seconds: Rental time per group.
+        costs: Cost per group.
+        sort_by: Order of the entries, highest cost or duration first, or by key.
+        limit: Maximum number of entries to return.
+
+    Returns:
+        list[SpendBreakdownEntry]: The breakdown entries.
+
+    """
+    sort_keys: dict[str, Callable[[int], object]] = {
+        "cost": lambda i: (-costs[i], keys[i]),
+        "duration": lambda i: (-seconds[i], keys[i]),
+        "key": lambda i: keys[i],
+    }
+    if sort_by not in sort_keys:
+        raise ValueError(f"Invalid sort key {sort_by!r}. Use one of: {list(sort_keys)}")
+
+    order = sorted((i for i in range(len(keys)) if rentals[i] > 0), key=sort_keys[sort_by])
+    return [
+        SpendBreakdownEntry(
+            key=keys[i],
+            rentals=rentals[i],
+            gpus=gpus[i],
+            total_seconds=seconds[i],
+            total_cost=costs[i],
+        )
+        for i in order[:limit]
+    ]
@@ -3,7 +3,9 @@
 This module provides simplified schemas for billing action inputs.
 """
 
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class GetCurrentBalanceSchema(BaseModel):
@@ -22,3 +24,31 @@ class GetSpendHistorySchema(BaseModel):
     """Schema for get_spend_history action."""
 
     pass
+
+
+class GetSpendBreakdownSchema(BaseModel):
+    """Schema for get_spend_breakdown action."""
+
+    group_by: Literal["gpu_model", "day", "instance"] = Field(
+        default="gpu_model",
+        description="How to group the spend: by GPU model, by UTC day or by instance",
+    )
+    days: int | None = Field(
+        default=None,
+        description="Only include spend from the last number of days (default: all time)",
+        ge=1,
+        le=365,
+    )
+    sort_by: Literal["cost", "duration", "key"] | None = Field(
+        default=None,
+        description=(
+            "Order of the groups: highest cost, longest duration or by key "
+            "(default: date for days, cost otherwise)"
+        ),
+    )
+    limit: int = Field(
+        default=10,
+        description="Maximum number of groups to show",
+        ge=1,
+        le=100,
+    )
@@ -0,0 +1,229 @@
+"""Local SQLite store for Hyperbolic billing history.
+
+Rental and purchase history is persisted locally and synced incrementally:
+each sync only writes records newer than the stored watermark, plus rentals
+that were still running at the previous sync, so billing queries can be
+answered from the store and keep working while the API is unavailable.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+
+from ..marketplace.types import InstanceHistoryEntry, InstanceHistoryResponse
+from .analytics import parse_timestamp
+from .types import BillingPurchaseHistoryEntry, BillingPurchaseHistoryResponse
+
+INSTANCE_HISTORY = "instance_history"
+PURCHASE_HISTORY = "purchase_history"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instance_history (
+    key TEXT PRIMARY KEY,
+    started_ts REAL,
+    is_open INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS instance_history_started ON instance_history (started_ts);
+CREATE TABLE IF NOT EXISTS purchase_history (
+    key TEXT PRIMARY KEY,
+    ts REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS purchase_history_ts ON purchase_history (ts);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    watermark REAL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def _sortable(ts: float) -> float | None:
+    """Convert a parsed timestamp to a value SQLite can store and sort.
+
+    Args:
+        ts: Seconds since the epoch, or NaN.
+
+    Returns:
+        float | None: The timestamp, or None if it is missing.
+
+    """
+    return None if math.isnan(ts) else ts
+
+
+class BillingHistoryStore:
+    """SQLite-backed store of rental and purchase history.
+
+    The store is safe to share between threads. Use ":memory:" for a store that
+    lives only as long as the object.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """Open the store, creating its tables if needed.
+
+        Args:
+            path: Path to the SQLite database file, or ":memory:".
+
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get_synced_at(self, name: str) -> float | None:
+        """Get when a history was last synced.
+
+        Args:
+            name: INSTANCE_HISTORY or PURCHASE_HISTORY.
+
+        Returns:
+            float | None: Seconds since the epoch, or None if it was never synced.
+
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM sync_state WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync_instance_history(self, history: InstanceHistoryResponse) -> int:
+        """Store rentals that started after the watermark or were still running.
+
+        Args:
+            history: The instance history fetched from the API.
+
+        Returns:
+            int: The number of rentals written.
+
+        """
+        with self._lock, self._conn:
+            watermark = self._get_watermark(INSTANCE_HISTORY)
+            open_keys = {
+                row[0]
+                for row in self._conn.execute("SELECT key FROM instance_history WHERE is_open = 1")
+            }
+
+            rows = []
+            latest = watermark
+            for entry in history.instance_history:
+                key = f"{entry.instance_name}\0{entry.started_at or ''}"
+                started_ts = parse_timestamp(entry.started_at)
+                is_new = math.isnan(started_ts) or watermark is None or started_ts > watermark
+                if not is_new and key not in open_keys:
+                    continue
+
+                if not math.isnan(started_ts):
+                    latest = started_ts if latest is None else max(latest, started_ts)
+                rows.append(
+                    (
+                        key,
+                        _sortable(started_ts),
+                        int(not entry.started_at or not entry.terminated_at),
+                        entry.model_dump_json(),
+                    )
+                )
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO instance_history VALUES (?, ?, ?, ?)", rows
+            )
+            self._set_watermark(INSTANCE_HISTORY, latest)
+        return len(rows)
+
+    def sync_purchase_history(self, history: BillingPurchaseHistoryResponse) -> int:
+        """Store purchases made at or after the watermark.
+
+        Purchases never change, so records already stored are left untouched.
+
+        Args:
+            history: The purchase history fetched from the API.
+
+        Returns:
+            int: The number of purchases written.
+
+        """
+        with self._lock, self._conn:
+            watermark = self._get_watermark(PURCHASE_HISTORY)
+
+            rows = []
+            latest = watermark
+            for entry in history.purchase_history:
+                ts = parse_timestamp(entry.timestamp)
+                if watermark is not None and not math.isnan(ts) and ts < watermark:
+                    continue
+
+                if not math.isnan(ts):
+                    latest = ts if latest is None else max(latest, ts)
+                key = f"{entry.timestamp}\0{entry.amount}\0{entry.source}"
+                rows.append((key, _sortable(ts), entry.model_dump_json()))
+
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO purchase_history VALUES (?, ?, ?)", rows
+            )
+            self._set_watermark(PURCHASE_HISTORY, latest)
+        return max(cursor.rowcount, 0)
+
+    def get_instance_history(self) -> InstanceHistoryResponse:
+        """Get the stored rentals, most recent first.
+
+        Returns:
+            InstanceHistoryResponse: The stored instance history.
+
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM instance_history ORDER BY started_ts IS NULL, started_ts DESC"
+            ).fetchall()
+        return InstanceHistoryResponse(
+            instance_history=[InstanceHistoryEntry(**json.loads(row[0])) for row in rows]
+        )
+
+    def get_purchase_history(self) -> BillingPurchaseHistoryResponse:
+        """Get the stored purchases, most recent first.
+
+        Returns:
+            BillingPurchaseHistoryResponse: The stored purchase history.
+
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM purchase_history ORDER BY ts IS NULL, ts DESC"
+            ).fetchall()
+        return BillingPurchaseHistoryResponse(
+            purchase_history=[BillingPurchaseHistoryEntry(**json.loads(row[0])) for row in rows]
+        )
+
+    def _get_watermark(self, name: str) -> float | None:
+        """Get the latest record timestamp stored for a history.
+
+        Args:
+            name: INSTANCE_HISTORY or PURCHASE_HISTORY.
+
+        Returns:
+            float | None: Seconds since the epoch, or None if nothing is stored.
+
+        """
+        row = self._conn.execute(
+            "SELECT watermark FROM sync_state WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, name: str, watermark: float | None) -> None:
+        """Record a completed sync of a history.
+
+        Args:
+            name: INSTANCE_HISTORY or PURCHASE_HISTORY.
+            watermark: The latest record timestamp stored.
+
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)", (name, watermark, time.time())
+        )
@@ -81,3 +81,13 @@ class BillingPurchaseHistoryResponse(BaseModel):
     purchase_history: list[BillingPurchaseHistoryEntry] = Field(
         ..., description="List of purchase history entries"
     )
+
+
+class SpendBreakdownEntry(BaseModel):
+    """Aggregated GPU rental spend for one group (GPU model, day or instance)."""
+
+    key: str = Field(..., description="The group key, e.g. a GPU model, date or instance name")
+    rentals: float = Field(..., description="Number of rentals, split evenly across GPU models")
+    gpus: float = Field(..., description="Number of GPUs rented, split evenly across GPU models")
+    total_seconds: float = Field(..., description="Total rental time in seconds")
+    total_cost: float = Field(..., description="Total cost in USD")
@@ -4,14 +4,18 @@ This module provides utility functions for formatting and processing
 billing information from Hyperbolic services.
 """
 
-from collections import defaultdict
+import math
 from datetime import datetime
 
 from ..marketplace.types import InstanceHistoryResponse
+from .analytics import SpendAnalytics
 from .types import (
     BillingPurchaseHistoryResponse,
+    SpendBreakdownEntry,
 )
 
+SPEND_BREAKDOWN_TITLES = {"gpu_model": "GPU Model", "day": "Day", "instance": "Instance"}
+
 
 def calculate_duration_seconds(start_time: str, end_time: str) -> float:
     """Calculate duration in seconds between two timestamps.
@@ -64,6 +68,8 @@ def format_purchase_history(purchases: BillingPurchaseHistoryResponse, limit: in
 def format_spend_history(instance_history: InstanceHistoryResponse, limit: int = 5) -> str:
     """Format spend history into a readable analysis.
 
+    Rentals are listed most recent first, and GPU models by total cost.
+
     Args:
         instance_history: Instance history response with rental records.
         limit: Maximum number of spend records to include in the output.
@@ -75,81 +81,71 @@ def format_spend_history(instance_history: InstanceHistoryResponse, limit: int =
     if not instance_history.instance_history:
         return "No rental history found."
 
-    total_cost = 0
-    gpu_stats = defaultdict(lambda: {"count": 0, "total_cost": 0, "total_seconds": 0})
-
-    instances_summary = []
-
-    for instance in instance_history.instance_history:
-        has_complete_time_data = instance.started_at and instance.terminated_at
-
-        duration_seconds = 0
-        duration_hours = 0
-        cost = 0
-
-        if has_complete_time_data:
-            duration_seconds = calculate_duration_seconds(
-                instance.started_at, instance.terminated_at
-            )
-            duration_hours = duration_seconds / 3600.0
-            cost = (duration_hours * instance.price.amount) / 100.0
-            total_cost += cost
-
-        gpu_models = []
-        if instance.hardware and instance.hardware.gpus and len(instance.hardware.gpus) > 0:
-            gpu_models = [gpu.model for gpu in instance.hardware.gpus if gpu.model]
-
-        gpu_model = ", ".join(gpu_models) if gpu_models else "Unknown GPU"
-        gpu_count = instance.gpu_count or 0
-
-        if has_complete_time_data:
-            if gpu_models:
-                gpu_count_per_model = gpu_count / len(gpu_models) if len(gpu_models) > 0 else 0
-                cost_per_model = cost / len(gpu_models) if len(gpu_models) > 0 else 0
-
-                for model in gpu_models:
-                    gpu_stats[model]["count"] += gpu_count_per_model
-                    gpu_stats[model]["total_cost"] += cost_per_model
-                    gpu_stats[model]["total_seconds"] += duration_seconds
-            else:
-                gpu_stats["Unknown GPU"]["count"] += gpu_count
-                gpu_stats["Unknown GPU"]["total_cost"] += cost
-                gpu_stats["Unknown GPU"]["total_seconds"] += duration_seconds
-
-        summary = {
-            "name": instance.instance_name or "unnamed-instance",
-            "gpu_model": gpu_model,
-            "gpu_count": gpu_count,
-            "duration_seconds": int(duration_seconds) if has_complete_time_data else None,
-            "cost": round(cost, 2) if has_complete_time_data else None,
-            "has_complete_time_data": has_complete_time_data,
-        }
-        instances_summary.append(summary)
+    analytics = SpendAnalytics(instance_history)
+    recent = analytics.get_recent(limit)
 
     output = ["=== GPU Rental Spending Analysis ===\n"]
 
-    output.append(f"Instance Rentals (showing {min(len(instances_summary), limit)} most recent):")
-    for instance in instances_summary[:limit]:
-        output.append(f"- {instance['name']}:")
-        output.append(f"  GPU: {instance['gpu_model']} (Count: {instance['gpu_count']})")
+    output.append(f"Instance Rentals (showing {len(recent)} most recent):")
+    for i in recent:
+        output.append(f"- {analytics.names[i]}:")
+        output.append(f"  GPU: {analytics.gpu_labels[i]} (Count: {analytics.gpu_counts[i]})")
 
-        if instance["has_complete_time_data"]:
-            output.append(f"  Duration: {instance['duration_seconds']} seconds")
-            output.append(f"  Cost: ${instance['cost']:.2f}")
+        if not math.isnan(analytics.durations[i]):
+            output.append(f"  Duration: {int(analytics.durations[i])} seconds")
+            output.append(f"  Cost: ${analytics.costs[i]:.2f}")
         else:
             output.append("  Duration: Unavailable (missing timestamp data)")
             output.append("  Cost: Unavailable")
 
+    gpu_stats = analytics.get_by_gpu_model(limit=limit)
     if gpu_stats:
-        output.append(f"\nGPU Type Statistics (showing {min(len(gpu_stats), limit)} most recent):")
-        for gpu_model, stats in list(gpu_stats.items())[:limit]:
-            output.append(f"\n{gpu_model}:")
-            output.append(f"  Total Rentals: {stats['count']}")
-            output.append(f"  Total Time: {int(stats['total_seconds'])} seconds")
-            output.append(f"  Total Cost: ${stats['total_cost']:.2f}")
-
-        output.append(f"\nTotal Spending: ${total_cost:.2f}")
+        output.append(f"\nGPU Type Statistics (showing top {len(gpu_stats)} by cost):")
+        for stats in gpu_stats:
+            output.append(f"\n{stats.key}:")
+            output.append(f"  Total Rentals: {stats.gpus:g}")
+            output.append(f"  Total Time: {int(stats.total_seconds)} seconds")
+            output.append(f"  Total Cost: ${stats.total_cost:.2f}")
+
+        output.append(f"\nTotal Spending: ${analytics.get_total_cost():.2f}")
     else:
         output.append("\nNo complete rental data available to calculate statistics.")
 
     return "\n".join(output)
+
+
+def format_spend_breakdown(
+    breakdown: list[SpendBreakdownEntry],
+    group_by: str,
+    total_cost: float,
+    window_days: int | None = None,
+) -> str:
+    """Format a spend breakdown into a readable table.
+
+    Args:
+        breakdown: The aggregated spend entries, in display order.
+        group_by: What the entries are grouped by ("gpu_model", "day" or "instance").
+        total_cost: The total spend across all groups in USD.
+        window_days: The number of days the breakdown covers, if limited.
+
+    Returns:
+        str: Formatted breakdown string.
+
+    """
+    period = f"last {window_days} days" if window_days else "all time"
+    title = SPEND_BREAKDOWN_TITLES.get(group_by, group_by)
+
+    if not breakdown:
+        return f"No GPU rental spend found ({period})."
+
+    output = [f"=== GPU Rental Spend by {title} ({period}) ===\n"]
+    for entry in breakdown:
+        share = entry.total_cost / total_cost * 100 if total_cost else 0.0
+        output.append(f"- {entry.key}: ${entry.total_cost:.2f} ({share:.1f}%)")
+        output.append(
+            f"  Rentals: {entry.rentals:g}, GPUs: {entry.gpus:g}, "
+            f"Time: {entry.total_seconds / 3600:.2f} hours"
+        )
+
+    output.append(f"\nTotal Spending: ${total_cost:.2f}")
+    return "\n".join(output)
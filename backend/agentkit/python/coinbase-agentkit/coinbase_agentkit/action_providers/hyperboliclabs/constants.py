@@ -9,6 +9,28 @@ DEFAULT_HEADERS = {
     "Content-Type": "application/json",
 }
 
+# HTTP client configuration
+DEFAULT_TIMEOUT = (10.0, 120.0)  # (connect, read) seconds
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5  # seconds, doubled on each retry
+MAX_RETRY_DELAY = 30.0  # seconds, upper bound for backoff and Retry-After
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+POOL_MAXSIZE = 10
+
+# How long a snapshot of available marketplace instances is reused, in seconds
+AVAILABLE_INSTANCES_CACHE_TTL = 30.0
+
+# Billing history is re-synced from the API at most this often, in seconds
+BILLING_SYNC_INTERVAL = 60.0
+# Environment variable with a path to persist billing history to (in memory if unset)
+BILLING_HISTORY_DB_ENV = "HYPERBOLIC_BILLING_DB_PATH"
+
+# Generated media is decoded to disk in slices of this many base64 characters
+BASE64_DECODE_CHUNK_SIZE = 1 << 20  # must be a multiple of 4
+# Maximum number of generation requests run concurrently by batch helpers
+MAX_CONCURRENT_GENERATIONS = 4
+
 # Base URLs for services
 MARKETPLACE_BASE_URL = f"{API_BASE_URL}/{API_VERSION}/marketplace"
 AI_SERVICES_BASE_URL = f"{API_BASE_URL}/{API_VERSION}"
@@ -74,7 +74,7 @@ Example error response:
 Important notes:
 - The GPU prices are shown in dollars per hour
 - Only non-reserved and available GPU instances are returned
-- GPU availability is real-time and may change between queries
+- GPU availability is refreshed at most every 30 seconds and may change between queries
 """,
         schema=GetAvailableGpusSchema,
     )
@@ -91,12 +91,12 @@ Important notes:
         GetAvailableGpusSchema(**args)
 
         try:
-            response = self.marketplace.get_available_instances()
+            snapshot = self.marketplace.get_available_gpus_snapshot()
 
-            if not response.instances:
+            if not snapshot.instances:
                 return "No available GPU instances found."
 
-            return format_all_gpu_instances(response.instances)
+            return format_all_gpu_instances(snapshot.available)
 
         except Exception as e:
             return f"Error: GPU retrieval: {e!s}"
@@ -120,7 +120,7 @@ Example error response:
 
 Important notes:
 - Only models with available GPUs are listed
-- GPU availability is real-time and may change between queries
+- GPU availability is refreshed at most every 30 seconds and may change between queries
 - The GPU model names include manufacturer and specific model details
 """,
         schema=GetAvailableGpusTypesSchema,
@@ -138,12 +138,12 @@ Important notes:
         GetAvailableGpusTypesSchema(**args)
 
         try:
-            response = self.marketplace.get_available_instances()
+            snapshot = self.marketplace.get_available_gpus_snapshot()
 
-            if not response.instances:
+            if not snapshot.instances:
                 return "No available GPU instances found."
 
-            return format_gpu_types(response.instances)
+            return format_gpu_types(snapshot.available)
 
         except Exception as e:
             return f"Error: GPU types retrieval: {e!s}"
@@ -179,8 +179,8 @@ Example error response:
 
 Important notes:
 - GPU model name must be exact (including hyphens)
-- Only available instances are shown
-- Availability is real-time and may change
+- Only available instances are shown, cheapest first
+- Availability is refreshed at most every 30 seconds and may change
 """,
         schema=GetAvailableGpusByTypeSchema,
     )
@@ -198,12 +198,14 @@ Important notes:
         gpu_model = validated_args.gpu_model
 
         try:
-            response = self.marketplace.get_available_instances()
+            snapshot = self.marketplace.get_available_gpus_snapshot()
 
-            if not response.instances:
+            if not snapshot.instances:
                 return "No available GPU instances found."
 
-            return format_gpu_instances_by_type(response.instances, gpu_model)
+            return format_gpu_instances_by_type(
+                snapshot.get_instances_by_model(gpu_model), gpu_model
+            )
 
         except Exception as e:
             return f"Error: GPU retrieval: {e!s}"
@@ -1,7 +1,10 @@
 """Service for marketplace-related operations."""
 
-from ..constants import MARKETPLACE_BASE_URL, MARKETPLACE_ENDPOINTS
+import threading
+
+from ..constants import AVAILABLE_INSTANCES_CACHE_TTL, MARKETPLACE_BASE_URL, MARKETPLACE_ENDPOINTS
 from ..service import Base
+from .snapshot import GpuAvailabilitySnapshot
 from .types import (
     AvailableInstancesResponse,
     InstanceHistoryResponse,
@@ -16,14 +19,18 @@ from .types import (
 class MarketplaceService(Base):
     """Service for marketplace-related operations."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_ttl: float = AVAILABLE_INSTANCES_CACHE_TTL):
         """Initialize the marketplace service.
 
         Args:
             api_key: The API key for authentication.
+            cache_ttl: How long a snapshot of available instances is reused, in seconds.
 
         """
         super().__init__(api_key, MARKETPLACE_BASE_URL)
+        self.cache_ttl = cache_ttl
+        self._snapshot: GpuAvailabilitySnapshot | None = None
+        self._snapshot_lock = threading.Lock()
 
     def get_available_instances(self) -> AvailableInstancesResponse:
         """Get available GPU instances from the marketplace.
@@ -33,10 +40,40 @@ class MarketplaceService(Base):
 
         """
         response = self.make_request(
-            endpoint=MARKETPLACE_ENDPOINTS["LIST_INSTANCES"], method="POST", data={"filters": {}}
+            endpoint=MARKETPLACE_ENDPOINTS["LIST_INSTANCES"],
+            method="POST",
+            data={"filters": {}},
+            retry=True,
         )
         return AvailableInstancesResponse(**response.json())
 
+    def get_available_gpus_snapshot(self, max_age: float | None = None) -> GpuAvailabilitySnapshot:
+        """Get an indexed snapshot of available GPU instances.
+
+        The snapshot is shared by all GPU discovery actions and is only refetched
+        once it is older than the cache TTL.
+
+        Args:
+            max_age: Optional maximum snapshot age in seconds, overriding the cache TTL.
+
+        Returns:
+            GpuAvailabilitySnapshot: The snapshot of available instances.
+
+        """
+        max_age = self.cache_ttl if max_age is None else max_age
+
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.age() >= max_age:
+                snapshot = GpuAvailabilitySnapshot(self.get_available_instances().instances)
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate_available_gpus_snapshot(self) -> None:
+        """Discard the cached snapshot of available instances."""
+        with self._snapshot_lock:
+            self._snapshot = None
+
     def get_instance_history(self) -> InstanceHistoryResponse:
         """Get GPU instance rental history.
 
@@ -80,6 +117,7 @@ class MarketplaceService(Base):
         response = self.make_request(
             endpoint=MARKETPLACE_ENDPOINTS["CREATE_INSTANCE"], data=request.model_dump()
         )
+        self.invalidate_available_gpus_snapshot()
         return RentInstanceResponse(**response.json())
 
     def terminate_instance(
@@ -98,5 +136,6 @@ class MarketplaceService(Base):
         response = self.make_request(
             endpoint=MARKETPLACE_ENDPOINTS["TERMINATE_INSTANCE"], data=request.model_dump()
         )
+        self.invalidate_available_gpus_snapshot()
 
         return TerminateInstanceResponse(**response.json())
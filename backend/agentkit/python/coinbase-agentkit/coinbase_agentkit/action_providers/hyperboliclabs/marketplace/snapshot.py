@@ -0,0 +1,130 @@
+"""Indexed snapshot of available GPU instances on the Hyperbolic marketplace."""
+
+import time
+
+from .types import AvailableInstance
+
+
+def get_gpu_model(instance: AvailableInstance) -> str:
+    """Get the GPU model of an instance.
+
+    Args:
+        instance: AvailableInstance object containing instance details.
+
+    Returns:
+        str: The model of the instance's first GPU, or "Unknown Model".
+
+    """
+    gpus = instance.hardware.gpus
+    return gpus[0].model if gpus else "Unknown Model"
+
+
+def get_gpus_available(instance: AvailableInstance) -> int:
+    """Get the number of GPUs that can still be rented on an instance.
+
+    Args:
+        instance: AvailableInstance object containing instance details.
+
+    Returns:
+        int: The number of available GPUs, 0 if the instance is reserved.
+
+    """
+    if instance.reserved:
+        return 0
+    return (instance.gpus_total or 0) - (instance.gpus_reserved or 0)
+
+
+def get_hourly_price(instance: AvailableInstance) -> float:
+    """Get the hourly price per GPU of an instance in dollars.
+
+    Args:
+        instance: AvailableInstance object containing instance details.
+
+    Returns:
+        float: The price in dollars per hour per GPU, 0 if unknown.
+
+    """
+    return instance.pricing.price.amount / 100 if instance.pricing else 0
+
+
+class GpuAvailabilitySnapshot:
+    """A point-in-time view of the marketplace, indexed for GPU discovery.
+
+    The instance list is walked once when the snapshot is built. Afterwards,
+    listing GPU models and looking up the instances of a model or cluster are
+    dictionary lookups.
+    """
+
+    def __init__(self, instances: list[AvailableInstance]):
+        """Build the snapshot from the marketplace instance list.
+
+        Args:
+            instances: List of AvailableInstance objects as returned by the API.
+
+        """
+        self.fetched_at = time.monotonic()
+        self.instances = instances
+        self.available: list[AvailableInstance] = []
+        self.by_model: dict[str, list[AvailableInstance]] = {}
+        self.by_cluster: dict[str, list[AvailableInstance]] = {}
+
+        for instance in instances:
+            if get_gpus_available(instance) <= 0:
+                continue
+
+            self.available.append(instance)
+            self.by_model.setdefault(get_gpu_model(instance), []).append(instance)
+            self.by_cluster.setdefault(instance.cluster_name or "Unknown Cluster", []).append(
+                instance
+            )
+
+        for model_instances in self.by_model.values():
+            model_instances.sort(key=get_hourly_price)
+
+        self.gpu_models = sorted(self.by_model)
+
+    def age(self) -> float:
+        """Get the age of the snapshot.
+
+        Returns:
+            float: Seconds since the snapshot was built.
+
+        """
+        return time.monotonic() - self.fetched_at
+
+    def get_instances_by_model(self, gpu_model: str) -> list[AvailableInstance]:
+        """Get the available instances of a GPU model, cheapest first.
+
+        Args:
+            gpu_model: The exact GPU model name.
+
+        Returns:
+            list[AvailableInstance]: The matching instances.
+
+        """
+        return self.by_model.get(gpu_model, [])
+
+    def get_instances_by_cluster(self, cluster_name: str) -> list[AvailableInstance]:
+        """Get the available instances in a cluster.
+
+        Args:
+            cluster_name: The cluster name.
+
+        Returns:
+            list[AvailableInstance]: The matching instances.
+
+        """
+        return self.by_cluster.get(cluster_name, [])
+
+    def get_cheapest(self, gpu_model: str) -> AvailableInstance | None:
+        """Get the cheapest available instance of a GPU model.
+
+        Args:
+            gpu_model: The exact GPU model name.
+
+        Returns:
+            AvailableInstance | None: The cheapest instance, or None if there is none.
+
+        """
+        instances = self.get_instances_by_model(gpu_model)
+        return instances[0] if instances else None
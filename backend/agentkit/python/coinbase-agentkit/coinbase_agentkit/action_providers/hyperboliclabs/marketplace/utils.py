@@ -2,6 +2,7 @@
 
 import os
 
+from .snapshot import get_gpu_model, get_gpus_available, get_hourly_price
 from .types import (
     AvailableInstance,
     NodeRental,
@@ -36,30 +37,16 @@ def format_gpu_instance(instance: AvailableInstance) -> str | None:
         str | None: Formatted string if instance has available GPUs, None otherwise.
 
     """
-    if instance.reserved:
-        return None
-
-    cluster_name = instance.cluster_name or "Unknown Cluster"
-    node_id = instance.id
-
-    gpus = instance.hardware.gpus
-    gpu_model = gpus[0].model if gpus else "Unknown Model"
-
-    price_amount = instance.pricing.price.amount / 100 if instance.pricing else 0
-
-    gpus_total = instance.gpus_total or 0
-    gpus_reserved = instance.gpus_reserved or 0
-    gpus_available = gpus_total - gpus_reserved
-
+    gpus_available = get_gpus_available(instance)
     if gpus_available <= 0:
         return None
 
     return (
-        f"Cluster: {cluster_name}\n"
-        f"Node ID: {node_id}\n"
-        f"GPU Model: {gpu_model}\n"
-        f"Available GPUs: {gpus_available}/{gpus_total}\n"
-        f"Price: ${price_amount:.2f}/hour per GPU\n"
+        f"Cluster: {instance.cluster_name or 'Unknown Cluster'}\n"
+        f"Node ID: {instance.id}\n"
+        f"GPU Model: {get_gpu_model(instance)}\n"
+        f"Available GPUs: {gpus_available}/{instance.gpus_total or 0}\n"
+        f"Price: ${get_hourly_price(instance):.2f}/hour per GPU\n"
         f"{'-' * 40}\n\n"
     )
 
@@ -74,22 +61,11 @@ def format_gpu_types(instances: list[AvailableInstance]) -> str:
         str: Formatted string with available GPU types.
 
     """
-    gpu_models = set()
-
-    for instance in instances:
-        if instance.reserved:
-            continue
-
-        gpus_total = instance.gpus_total or 0
-        gpus_reserved = instance.gpus_reserved or 0
-        gpus_available = gpus_total - gpus_reserved
-
-        if gpus_available <= 0:
-            continue
-
-        gpus = instance.hardware.gpus
-        if gpus:
-            gpu_models.add(gpus[0].model)
+    gpu_models = {
+        instance.hardware.gpus[0].model
+        for instance in instances
+        if get_gpus_available(instance) > 0 and instance.hardware.gpus
+    }
 
     if not gpu_models:
         return "No available GPU types found."
@@ -110,28 +86,11 @@ def format_gpu_instances_by_type(instances: list[AvailableInstance], gpu_model:
         str: Formatted string with available GPU instances of the specified model.
 
     """
-    formatted_instances = []
-
-    for instance in instances:
-        if instance.reserved:
-            continue
-
-        gpus = instance.hardware.gpus
-        instance_gpu_model = gpus[0].model if gpus else "Unknown Model"
-
-        if instance_gpu_model != gpu_model:
-            continue
-
-        gpus_total = instance.gpus_total or 0
-        gpus_reserved = instance.gpus_reserved or 0
-        gpus_available = gpus_total - gpus_reserved
-
-        if gpus_available <= 0:
-            continue
-
-        formatted = format_gpu_instance(instance)
-        if formatted is not None:
-            formatted_instances.append(formatted)
+    formatted_instances = [
+        format_gpu_instance(instance)
+        for instance in instances
+        if get_gpu_model(instance) == gpu_model and get_gpus_available(instance) > 0
+    ]
 
     if not formatted_instances:
         return f"No available GPU instances with the model '{gpu_model}' found."
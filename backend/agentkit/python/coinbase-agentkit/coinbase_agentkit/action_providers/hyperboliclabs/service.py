@@ -1,26 +1,127 @@
 """Base service for making API requests to Hyperbolic platform."""
 
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from .constants import API_BASE_URL
+from .constants import (
+    API_BASE_URL,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    MAX_RETRY_DELAY,
+    POOL_MAXSIZE,
+    RETRY_STATUS_CODES,
+)
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(api_key: str) -> requests.Session:
+    """Get the shared HTTP session for an API key.
+
+    All services using the same API key share one session, so connections to the
+    Hyperbolic API are pooled and kept alive across marketplace, billing, settings
+    and AI calls.
+
+    Args:
+        api_key: The API key the session is used with.
+
+    Returns:
+        requests.Session: The shared session.
+
+    """
+    with _sessions_lock:
+        session = _sessions.get(api_key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[api_key] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close and discard all shared HTTP sessions."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_retry_delay(response: requests.Response, attempt: int, backoff_factor: float) -> float:
+    """Get how long to wait before retrying a request.
+
+    The Retry-After header is honored when present (in seconds or as an HTTP date),
+    otherwise exponential backoff is used. The delay is capped at MAX_RETRY_DELAY.
+
+    Args:
+        response: The response that triggered the retry.
+        attempt: The zero-based number of the attempt that failed.
+        backoff_factor: Base delay in seconds for exponential backoff.
+
+    Returns:
+        float: The delay in seconds.
+
+    """
+    delay = backoff_factor * (2**attempt)
+
+    retry_after = response.headers.get("Retry-After") if response.headers else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                pass
+
+    return min(max(delay, 0.0), MAX_RETRY_DELAY)
 
 
 class Base:
     """Base class with common functionality."""
 
-    def __init__(self, api_key: str, base_url: str | None = None):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    ):
         """Initialize the service.
 
         Args:
             api_key: The API key for authentication.
             base_url: Optional base URL for the service. If not provided,
                      will use API_BASE_URL from constants.
+            timeout: Optional request timeout in seconds, or a (connect, read) tuple.
+                     If not provided, will use DEFAULT_TIMEOUT from constants.
+            max_retries: Maximum number of retries for rate limited or failed requests.
+            backoff_factor: Base delay in seconds for exponential backoff between retries.
 
         """
         self.api_key = api_key
         self.base_url = base_url or API_BASE_URL
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+    @property
+    def session(self) -> requests.Session:
+        """The shared HTTP session for this service's API key."""
+        return get_session(self.api_key)
 
     def make_request(
         self,
@@ -29,15 +130,26 @@ class Base:
         data: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        retry: bool | None = None,
+        stream: bool = False,
     ) -> requests.Response:
         """Make an API request to the service endpoint.
 
+        Rate limited (429) responses are always retried. Server errors (5xx) are only
+        retried for idempotent methods, unless retry is set explicitly.
+
         Args:
             endpoint: The endpoint path to call.
             method: The HTTP method to use (default: "POST").
             data: Optional JSON body for the request.
             params: Optional query parameters.
             headers: Optional additional headers.
+            timeout: Optional timeout overriding the service timeout.
+            retry: Whether to retry server errors. If None, only idempotent methods
+                   are retried. If False, no response is retried.
+            stream: Whether to stream the response body instead of downloading it
+                    immediately. The caller must close a streamed response.
 
         Returns:
             requests.Response: The raw HTTP response object.
@@ -55,9 +167,26 @@ class Base:
         )
 
         url = f"{self.base_url}{endpoint}"
-        response = requests.request(
-            method=method, url=url, headers=headers, json=data, params=params
-        )
+        attempt = 0
+        while True:
+            response = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                json=data,
+                params=params,
+                timeout=timeout or self.timeout,
+                stream=stream,
+            )
+
+            if attempt >= self.max_retries or not self._should_retry(
+                response.status_code, method, retry
+            ):
+                break
+
+            response.close()
+            time.sleep(get_retry_delay(response, attempt, self.backoff_factor))
+            attempt += 1
 
         try:
             response.raise_for_status()
@@ -82,3 +211,68 @@ class Base:
             raise
 
         return response
+
+    async def make_request_async(
+        self,
+        endpoint: str,
+        method: str = "POST",
+        data: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        retry: bool | None = None,
+    ) -> requests.Response:
+        """Make an API request to the service endpoint without blocking the event loop.
+
+        The request runs in a worker thread on the shared session, with the same
+        timeout and retry behavior as make_request.
+
+        Args:
+            endpoint: The endpoint path to call.
+            method: The HTTP method to use (default: "POST").
+            data: Optional JSON body for the request.
+            params: Optional query parameters.
+            headers: Optional additional headers.
+            timeout: Optional timeout overriding the service timeout.
+            retry: Whether to retry server errors. If None, only idempotent methods
+                   are retried. If False, no response is retried.
+
+        Returns:
+            requests.Response: The raw HTTP response object.
+
+        Raises:
+            requests.HTTPError: If the API returns an error response (4xx, 5xx).
+            requests.RequestException: For other request-related errors.
+
+        """
+        return await asyncio.to_thread(
+            self.make_request,
+            endpoint,
+            method=method,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            retry=retry,
+        )
+
+    @staticmethod
+    def _should_retry(status_code: int, method: str, retry: bool | None) -> bool:
+        """Check whether a response with the given status should be retried.
+
+        Args:
+            status_code: The HTTP status code of the response.
+            method: The HTTP method of the request.
+            retry: The retry override passed to make_request.
+
+        Returns:
+            bool: Whether the request should be retried.
+
+        """
+        if retry is False or status_code not in RETRY_STATUS_CODES:
+            return False
+
+        if status_code == 429 or retry:
+            return True
+
+        return method.upper() in IDEMPOTENT_METHODS
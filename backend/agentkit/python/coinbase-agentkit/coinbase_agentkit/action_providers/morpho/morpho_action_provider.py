@@ -7,13 +7,14 @@ from web3 import Web3
 
 from coinbase_agentkit.action_providers.action_decorator import create_action
 from coinbase_agentkit.action_providers.action_provider import ActionProvider
-from coinbase_agentkit.action_providers.erc20.constants import ERC20_ABI
 from coinbase_agentkit.action_providers.morpho.constants import METAMORPHO_ABI
 from coinbase_agentkit.action_providers.morpho.schemas import (
+    MorphoCompareVaultsSchema,
     MorphoDepositSchema,
     MorphoWithdrawSchema,
 )
-from coinbase_agentkit.action_providers.morpho.utils import approve
+from coinbase_agentkit.action_providers.morpho.utils import approve, get_allowance
+from coinbase_agentkit.action_providers.morpho.vault_catalog import vault_catalog
 from coinbase_agentkit.network import Network
 from coinbase_agentkit.wallet_providers import EvmWalletProvider
 
@@ -25,6 +26,7 @@ class MorphoActionProvider(ActionProvider[EvmWalletProvider]):
 
     def __init__(self):
         super().__init__("morpho", [])
+        self.vault_catalog = vault_catalog
 
     @create_action(
         name="deposit",
@@ -61,19 +63,19 @@ Important notes:
             return "Error: Assets amount must be greater than 0"
 
         try:
-            decimals = wallet_provider.read_contract(
-                contract_address=args["token_address"],
-                abi=ERC20_ABI,
-                function_name="decimals",
-                args=[],
-            )
+            decimals = self.vault_catalog.get_decimals(wallet_provider, args["token_address"])
 
             atomic_assets = int(assets * (10**decimals))
 
             try:
-                approve(
-                    wallet_provider, args["token_address"], args["vault_address"], atomic_assets
+                # An allowance left by an earlier approval saves the approve transaction
+                allowance = get_allowance(
+                    wallet_provider, args["token_address"], args["vault_address"]
                 )
+                if allowance < atomic_assets:
+                    approve(
+                        wallet_provider, args["token_address"], args["vault_address"], atomic_assets
+                    )
             except Exception as e:
                 return f"Error approving Morpho Vault as spender: {e!s}"
 
@@ -143,6 +145,64 @@ This tool allows withdrawing assets from a Morpho Vault. It takes:
         except Exception as e:
             return f"Error withdrawing from Morpho Vault: {e!s}"
 
+    @create_action(
+        name="compare_morpho_vaults",
+        description="""
+This tool compares Morpho Vaults. It takes:
+- vault_addresses: The addresses of the Morpho Vaults to compare
+- amount: Optional quantity of assets to preview a deposit of in each vault, in whole units
+    Examples for USDC:
+    - 100 USDC
+    - 0.5 USDC
+For each vault it returns the asset, total assets, share price and, if an amount is given, the shares a deposit of it would mint.
+Important notes:
+- Vaults may hold different assets, the amount is in the asset of each vault
+""",
+        schema=MorphoCompareVaultsSchema,
+    )
+    def compare_morpho_vaults(
+        self, wallet_provider: EvmWalletProvider, args: dict[str, Any]
+    ) -> str:
+        """Compare Morpho Vaults with one batched read.
+
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider instance.
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the comparison or error details.
+
+        """
+        try:
+            validated_args = MorphoCompareVaultsSchema(**args)
+            amount = None if validated_args.amount is None else Decimal(validated_args.amount)
+            if amount is not None and amount <= 0:
+                return "Error: Assets amount must be greater than 0"
+
+            quotes = self.vault_catalog.get_quotes(
+                wallet_provider,
+                validated_args.vault_addresses,
+                deposit_amounts=[] if amount is None else [amount],
+            )
+
+            lines = [f"Morpho Vaults at block {quotes[0].block_number}:"]
+            for quote in quotes:
+                vault = quote.vault
+                lines.append(
+                    f"- {vault.name} ({vault.symbol}) {vault.address}: "
+                    f"{vault.to_assets(quote.total_assets):,.2f} {vault.asset_symbol} total assets, "
+                    f"share price {vault.to_assets(quote.share_price):.6f} {vault.asset_symbol}"
+                )
+                if amount is not None:
+                    shares = Decimal(quote.deposit_previews[amount]) / Decimal(10**vault.decimals)
+                    lines.append(
+                        f"  Depositing {validated_args.amount} {vault.asset_symbol} "
+                        f"mints {shares:.6f} {vault.symbol}"
+                    )
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error comparing Morpho Vaults: {e!s}"
+
     def supports_network(self, network: Network) -> bool:
         """Check if the network is supported by this action provider.
 
@@ -23,3 +23,18 @@ class MorphoWithdrawSchema(BaseModel):
     vault_address: str = Field(..., description="The address of the Morpho Vault to withdraw from")
     assets: str = Field(..., description="The amount of assets to withdraw in atomic units")
     receiver: str = Field(..., description="The address to receive the withdrawn assets")
+
+
+class MorphoCompareVaultsSchema(BaseModel):
+    """Input schema for Morpho Vault comparison action."""
+
+    vault_addresses: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="The addresses of the Morpho Vaults to compare",
+    )
+    amount: str | None = Field(
+        None,
+        description="Optional quantity of assets to preview a deposit of in each vault, in whole units",
+    )
@@ -14,6 +14,39 @@ ERC20_APPROVE_ABI = [
     }
 ]
 
+ERC20_ALLOWANCE_ABI = [
+    {
+        "inputs": [
+            {"name": "owner", "type": "address"},
+            {"name": "spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+]
+
+
+def get_allowance(wallet: EvmWalletProvider, token_address: str, spender_address: str) -> int:
+    """Get the amount a spender may spend of the wallet's tokens.
+
+    Args:
+        wallet (EvmWalletProvider): The wallet provider to read with
+        token_address (str): The address of the token contract
+        spender_address (str): The address of the spender
+
+    Returns:
+        int: The allowance in atomic units
+
+    """
+    return wallet.read_contract(
+        contract_address=token_address,
+        abi=ERC20_ALLOWANCE_ABI,
+        function_name="allowance",
+        args=[wallet.get_address(), spender_address],
+    )
+
 
 def approve(wallet: EvmWalletProvider, token_address: str, spender_address: str, amount: int):
     """Approve a spender to spend tokens on behalf of the owner.
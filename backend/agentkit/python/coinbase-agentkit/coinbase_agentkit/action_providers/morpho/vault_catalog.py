@@ -0,0 +1,260 @@
+"""Catalog of Morpho Vaults for comparing them with batched reads.
+
+The asset, name, symbol and decimals of a vault never change, so they are read
+once per vault and kept. The state that does change, total assets, share price
+and deposit and redemption previews, is read for many vaults at once with a
+single Multicall3 call at one block.
+"""
+
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+
+from web3 import Web3
+
+from ...wallet_providers import EvmWalletProvider
+from ..erc20.constants import ERC20_ABI
+from ..multicall import aggregate, block_number_call, multicall_call
+from .constants import METAMORPHO_ABI
+
+_vault_contract = Web3().eth.contract(abi=METAMORPHO_ABI)
+_token_contract = Web3().eth.contract(abi=ERC20_ABI)
+
+
+@dataclass(frozen=True)
+class VaultInfo:
+    """The static data of a Morpho Vault and its asset."""
+
+    address: str
+    name: str
+    symbol: str
+    decimals: int
+    asset: str
+    asset_symbol: str
+    asset_decimals: int
+
+    def to_atomic_assets(self, amount: Decimal) -> int:
+        """Convert an amount of the asset in whole units to atomic units."""
+        return int(amount * 10**self.asset_decimals)
+
+    def to_atomic_shares(self, amount: Decimal) -> int:
+        """Convert an amount of shares in whole units to atomic units."""
+        return int(amount * 10**self.decimals)
+
+    def to_assets(self, atomic_amount: int) -> Decimal:
+        """Convert an atomic amount of the asset to whole units."""
+        return Decimal(atomic_amount) / Decimal(10**self.asset_decimals)
+
+
+@dataclass
+class VaultQuote:
+    """The state of a Morpho Vault at one block, with previews of deposits and redemptions.
+
+    Amounts are atomic. share_price is the assets one whole share converts to.
+    The previews map whole unit amounts to the atomic shares minted by a deposit
+    and the atomic assets returned by a redemption.
+    """
+
+    vault: VaultInfo
+    block_number: int
+    total_assets: int
+    total_supply: int
+    share_price: int
+    deposit_previews: dict[Decimal, int]
+    redeem_previews: dict[Decimal, int]
+
+
+class MorphoVaultCatalog:
+    """Reads Morpho Vaults, keeping the static data of each vault and token decimals."""
+
+    def __init__(self):
+        """Initialize the catalog."""
+        self.rpc_calls = 0
+        self._vaults: dict[tuple[int | str, str], VaultInfo] = {}
+        self._decimals: dict[tuple[int | str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Forget all vaults and decimals and reset the call counter."""
+        with self._lock:
+            self._vaults.clear()
+            self._decimals.clear()
+            self.rpc_calls = 0
+
+    def get_decimals(self, wallet_provider: EvmWalletProvider, token_address: str) -> int:
+        """Get the decimals of a token, reading them the first time.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            token_address: The token address.
+
+        Returns:
+            int: The token decimals.
+
+        """
+        key = (wallet_provider.get_network().chain_id, token_address.lower())
+        with self._lock:
+            decimals = self._decimals.get(key)
+        if decimals is None:
+            decimals = wallet_provider.read_contract(
+                contract_address=token_address,
+                abi=ERC20_ABI,
+                function_name="decimals",
+                args=[],
+            )
+            with self._lock:
+                self.rpc_calls += 1
+                self._decimals[key] = decimals
+        return decimals
+
+    def get_vaults(
+        self, wallet_provider: EvmWalletProvider, vault_addresses: Sequence[str]
+    ) -> list[VaultInfo]:
+        """Get the static data of vaults, reading those not seen before.
+
+        Vaults not seen before are read with two Multicall3 calls, one for the
+        vaults and one for their assets.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            vault_addresses: The vault addresses.
+
+        Returns:
+            list[VaultInfo]: The vaults, in the order of the addresses.
+
+        """
+        chain_id = wallet_provider.get_network().chain_id
+        addresses = [Web3.to_checksum_address(address) for address in vault_addresses]
+        with self._lock:
+            missing = list(
+                dict.fromkeys(a for a in addresses if (chain_id, a.lower()) not in self._vaults)
+            )
+
+        if missing:
+            for vault in self._load_vaults(wallet_provider, missing):
+                with self._lock:
+                    self._vaults[(chain_id, vault.address.lower())] = vault
+                    self._decimals[(chain_id, vault.asset.lower())] = vault.asset_decimals
+
+        with self._lock:
+            return [self._vaults[(chain_id, address.lower())] for address in addresses]
+
+    def get_quotes(
+        self,
+        wallet_provider: EvmWalletProvider,
+        vault_addresses: Sequence[str],
+        deposit_amounts: Sequence[Decimal] = (),
+        redeem_amounts: Sequence[Decimal] = (),
+    ) -> list[VaultQuote]:
+        """Read the state of vaults and preview deposits and redemptions, in one call.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            vault_addresses: The vault addresses.
+            deposit_amounts: Amounts of the asset of each vault to preview deposits of,
+                in whole units.
+            redeem_amounts: Amounts of shares to preview redemptions of, in whole units.
+
+        Returns:
+            list[VaultQuote]: The quotes, in the order of the addresses.
+
+        """
+        vaults = self.get_vaults(wallet_provider, vault_addresses)
+
+        def vault_call(vault: VaultInfo, function_name: str, args: list | None = None) -> tuple:
+            return (
+                multicall_call(vault.address, _vault_contract, function_name, args),
+                _vault_contract,
+                function_name,
+            )
+
+        calls = [block_number_call()]
+        for vault in vaults:
+            calls.append(vault_call(vault, "totalAssets"))
+            calls.append(vault_call(vault, "totalSupply"))
+            calls.append(vault_call(vault, "convertToAssets", [10**vault.decimals]))
+            calls.extend(
+                vault_call(vault, "previewDeposit", [vault.to_atomic_assets(amount)])
+                for amount in deposit_amounts
+            )
+            calls.extend(
+                vault_call(vault, "previewRedeem", [vault.to_atomic_shares(amount)])
+                for amount in redeem_amounts
+            )
+
+        (block_number,), *results = self._aggregate(wallet_provider, calls)
+        values = iter(value for (value,) in results)
+
+        return [
+            VaultQuote(
+                vault=vault,
+                block_number=block_number,
+                total_assets=next(values),
+                total_supply=next(values),
+                share_price=next(values),
+                deposit_previews={amount: next(values) for amount in deposit_amounts},
+                redeem_previews={shares: next(values) for shares in redeem_amounts},
+            )
+            for vault in vaults
+        ]
+
+    def _aggregate(self, wallet_provider: EvmWalletProvider, calls: list) -> list:
+        with self._lock:
+            self.rpc_calls += 1
+        return aggregate(wallet_provider, calls)
+
+    def _load_vaults(
+        self, wallet_provider: EvmWalletProvider, addresses: list[str]
+    ) -> list[VaultInfo]:
+        """Read the static data of vaults and their assets with two Multicall3 calls."""
+        vault_functions = ("asset", "name", "symbol", "decimals")
+        results = self._aggregate(
+            wallet_provider,
+            [
+                (multicall_call(address, _vault_contract, fn), _vault_contract, fn)
+                for address in addresses
+                for fn in vault_functions
+            ],
+        )
+        vault_data = [
+            [value for (value,) in results[i : i + len(vault_functions)]]
+            for i in range(0, len(results), len(vault_functions))
+        ]
+
+        assets = list(dict.fromkeys(Web3.to_checksum_address(data[0]) for data in vault_data))
+        results = self._aggregate(
+            wallet_provider,
+            [
+                (multicall_call(asset, _token_contract, fn), _token_contract, fn)
+                for asset in assets
+                for fn in ("symbol", "decimals")
+            ],
+        )
+        asset_data = {
+            asset: (symbol, decimals)
+            for asset, (symbol,), (decimals,) in zip(
+                assets, results[::2], results[1::2], strict=True
+            )
+        }
+
+        vaults = []
+        for address, (asset, name, symbol, decimals) in zip(addresses, vault_data, strict=True):
+            asset = Web3.to_checksum_address(asset)
+            asset_symbol, asset_decimals = asset_data[asset]
+            vaults.append(
+                VaultInfo(
+                    address=address,
+                    name=name,
+                    symbol=symbol,
+                    decimals=decimals,
+                    asset=asset,
+                    asset_symbol=asset_symbol,
+                    asset_decimals=asset_decimals,
+                )
+            )
+        return vaults
+
+
+# Shared by the Morpho action provider instances
+vault_catalog = MorphoVaultCatalog()
@@ -0,0 +1,107 @@
+"""Batched contract reads through Multicall3.
+
+Several view calls are sent as one aggregate3 eth_call, so they cost one RPC
+request and are all read at the same block.
+"""
+
+from typing import Any
+
+from eth_abi import decode
+from eth_utils.abi import get_abi_output_types
+from web3 import Web3
+
+from ..wallet_providers import EvmWalletProvider
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getBlockNumber",
+        "outputs": [{"internalType": "uint256", "name": "blockNumber", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+# Multicall3 is deployed at the same address on Base mainnet and Base Sepolia
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+_multicall_contract = Web3().eth.contract(abi=MULTICALL3_ABI)
+
+
+def multicall_call(
+    target: str, contract: Any, function_name: str, args: list | None = None
+) -> tuple:
+    """Build a Multicall3 call that must succeed."""
+    return (target, False, contract.encode_abi(function_name, args or []))
+
+
+def block_number_call() -> tuple[tuple, Any, str]:
+    """Build the call reading the block number that an aggregate call is read at."""
+    return (
+        multicall_call(MULTICALL3_ADDRESS, _multicall_contract, "getBlockNumber"),
+        _multicall_contract,
+        "getBlockNumber",
+    )
+
+
+def _output_types(contract: Any, function_name: str) -> list[str]:
+    """Get the ABI output types of a contract function."""
+    abi = next(item for item in contract.abi if item.get("name") == function_name)
+    return get_abi_output_types(abi)
+
+
+def aggregate(
+    wallet_provider: EvmWalletProvider,
+    calls: list[tuple[tuple, Any, str]],
+    block_identifier: Any = "latest",
+) -> list[tuple]:
+    """Make calls in one Multicall3 aggregate3 call and decode their results.
+
+    Args:
+        wallet_provider: The wallet provider to read with.
+        calls: The calls, each with the contract used to decode its result.
+        block_identifier: The block to read at.
+
+    Returns:
+        list[tuple]: The decoded outputs of each call.
+
+    """
+    results = wallet_provider.read_contract(
+        contract_address=MULTICALL3_ADDRESS,
+        abi=MULTICALL3_ABI,
+        function_name="aggregate3",
+        args=[[call for call, _, _ in calls]],
+        block_identifier=block_identifier,
+    )
+    return [
+        decode(_output_types(contract, function_name), bytes(result[1]))
+        for (_, contract, function_name), result in zip(calls, results, strict=True)
+    ]
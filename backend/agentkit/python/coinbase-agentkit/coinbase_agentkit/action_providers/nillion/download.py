@@ -0,0 +1,238 @@
+"""Streaming, filtered reads of records from a Nillion SecretVault."""
+
+import codecs
+import json
+import queue
+import re
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+import nilql
+import requests
+
+from .node_client import NodeClient, NodeRequestError
+
+# Bytes read from a node response at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Number of records passed from a node reader to the join at a time
+RECORD_BATCH_SIZE = 100
+
+# Maximum number of record batches buffered per node before they are joined
+MAX_BUFFERED_BATCHES = 10
+
+_DATA_ARRAY_START = re.compile(r'\s*\{\s*"data"\s*:\s*\[')
+_WHITESPACE = re.compile(r"[\s,]*")
+
+_decoder = json.JSONDecoder()
+
+
+def iter_data_records(response: requests.Response) -> Iterator[dict]:
+    """Parse the records of a data/read response as the body streams in.
+
+    The body is expected to start with a "data" array, as nildb responses do. Records
+    are decoded one at a time, so only one record and the unread part of the current
+    network chunk are held in memory. Any other body is read in full and its "data"
+    or "errors" are used instead.
+
+    Args:
+        response: A streamed response to a data/read request.
+
+    Yields:
+        dict: The next record.
+
+    Raises:
+        NodeRequestError: If the response contains errors instead of data.
+
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = response.iter_content(chunk_size=READ_CHUNK_SIZE)
+    buffer = ""
+    pos = 0
+    in_array = False
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + decoder.decode(chunk)
+        pos = 0
+
+        if not in_array:
+            match = _DATA_ARRAY_START.match(buffer)
+            if match is None:
+                if len(buffer) < 256:
+                    continue
+                break
+            in_array = True
+            pos = match.end()
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                record, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            yield record
+
+    if in_array:
+        raise NodeRequestError("data/read response ended before the data array")
+
+    # Not a plain data array, e.g. an error body: parse it in full
+    body = json.loads(buffer + decoder.decode(b"".join(chunks), final=True))
+    if body.get("errors"):
+        raise NodeRequestError("data/read failed: " + json.dumps(body["errors"]))
+    yield from body.get("data", [])
+
+
+def close_response(response: requests.Response) -> None:
+    """Close a streamed response, releasing a reader blocked on it in another thread.
+
+    Args:
+        response: The streamed response.
+
+    """
+    # urllib3 2.3 and later can shut the socket down, which wakes a blocked read
+    shutdown = getattr(response.raw, "shutdown", None)
+    if shutdown is not None:
+        shutdown()
+    response.close()
+
+
+def project(record: dict, fields: list[str] | None) -> dict:
+    """Keep only the given top-level fields of a record, and its "_id".
+
+    Args:
+        record: The record or record share.
+        fields: The fields to keep. If None, the record is returned unchanged.
+
+    Returns:
+        dict: The projected record.
+
+    """
+    if fields is None:
+        return record
+    return {k: v for k, v in record.items() if k == "_id" or k in fields}
+
+
+def stream_records(
+    node_client: NodeClient,
+    key: Any,
+    schema_uuid: str,
+    filter: dict | None = None,
+    fields: list[str] | None = None,
+    limit: int | None = None,
+) -> Iterator[dict]:
+    """Read records from every node and unify them as their shares arrive.
+
+    The filter is applied by the nodes, so only matching records are sent. The
+    responses of all nodes are parsed concurrently as they stream in, and a record
+    is unified and yielded as soon as each node has sent its share of it, so memory
+    is bounded by the records still waiting for a share rather than the whole
+    collection. The responses are closed as soon as reading stops, so node readers
+    are released even if they are waiting for the network.
+
+    Args:
+        node_client: The client for the cluster nodes.
+        key: The nilql cluster key to decrypt with.
+        schema_uuid: The schema to read from.
+        filter: A filter on plaintext fields, applied by the nodes (default: all records).
+        fields: Top-level fields to return, in addition to "_id" (default: all fields).
+                Unselected secret fields are dropped before decryption.
+        limit: The maximum number of records to return. Reading stops once it is reached.
+
+    Yields:
+        dict: The next decrypted record.
+
+    Raises:
+        NodeRequestError: If a node fails.
+
+    """
+    nodes = node_client.nodes
+    payload = {"schema": schema_uuid, "filter": filter or {}}
+    batches = [queue.Queue(maxsize=MAX_BUFFERED_BATCHES) for _ in nodes]
+    # The responses still being read, closed by the join if it stops first
+    responses: list[requests.Response | None] = [None] * len(nodes)
+    responses_lock = threading.Lock()
+    stopped = False
+
+    def put(index: int, item: Any) -> bool:
+        # Wait for room in the queue unless the reader has stopped consuming
+        while not stopped:
+            try:
+                batches[index].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read_node(node: dict, index: int) -> None:
+        try:
+            response = node_client.request(node, "POST", "data/read", payload, stream=True)
+            with responses_lock:
+                responses[index] = response
+            try:
+                if stopped:
+                    return
+                batch = []
+                for record in iter_data_records(response):
+                    batch.append(record)
+                    if len(batch) == RECORD_BATCH_SIZE:
+                        if not put(index, batch):
+                            return
+                        batch = []
+                if batch:
+                    put(index, batch)
+            finally:
+                with responses_lock:
+                    responses[index] = None
+                response.close()
+        except Exception as e:
+            put(index, e)
+        finally:
+            put(index, None)
+
+    for i, node in enumerate(nodes):
+        node_client.submit(read_node, node, i)
+
+    pending: dict[str, list[dict | None]] = {}
+    open_nodes = list(range(len(nodes)))
+    returned = 0
+
+    try:
+        # Batches are taken from the nodes in turn, so a node that is ahead waits on a
+        # full queue instead of piling up records that can't be joined yet
+        while open_nodes:
+            for index in list(open_nodes):
+                batch = batches[index].get()
+                if batch is None:
+                    open_nodes.remove(index)
+                    continue
+                if isinstance(batch, Exception):
+                    raise batch
+
+                for record in batch:
+                    shares = pending.setdefault(record["_id"], [None] * len(nodes))
+                    shares[index] = project(record, fields)
+                    if all(share is not None for share in shares):
+                        del pending[record["_id"]]
+                        returned += 1
+                        yield nilql.unify(key, shares)
+                        if limit is not None and returned >= limit:
+                            return
+
+        # Records some nodes don't have, e.g. without secret fields, are unified from
+        # the shares that arrived, as the nodes hold them
+        for shares in pending.values():
+            if limit is not None and returned >= limit:
+                break
+            returned += 1
+            yield nilql.unify(key, [share for share in shares if share is not None])
+    finally:
+        # Let node readers still streaming stop at their next record, and release
+        # those waiting for the network
+        stopped = True
+        with responses_lock:
+            for response in responses:
+                if response is not None:
+                    close_response(response)
@@ -1,14 +1,12 @@
 """Nillion action provider."""
 
-from collections import deque, defaultdict
+from collections import deque
 import json
 import os
-import time
 import re
 import uuid
 from typing import Any, Generator
 
-import jwt
 import nilql
 import requests
 from ecdsa import SECP256k1, SigningKey
@@ -16,6 +14,15 @@ from jsonschema import Draft7Validator, validators
 
 from coinbase_agentkit.action_providers.action_decorator import create_action
 from coinbase_agentkit.action_providers.action_provider import ActionProvider
+from coinbase_agentkit.action_providers.nillion.download import stream_records
+from coinbase_agentkit.action_providers.nillion.node_client import NodeClient
+from coinbase_agentkit.action_providers.nillion.schema_catalog import SchemaCatalog
+from coinbase_agentkit.action_providers.nillion.token_manager import NodeTokenManager
+from coinbase_agentkit.action_providers.nillion.upload import (
+    PartialUploadError,
+    mutate_secret_attributes,
+    upload_records,
+)
 from coinbase_agentkit.action_providers.nillion.schemas import (
     NillionCreateSchemaInput,
     NillionLookupSchemaInput,
@@ -41,7 +48,7 @@ class NillionActionProvider(ActionProvider):
 
         self.llm = llm
 
-        """Initialize config with JWTs signed with ES256K for multiple node_ids; Add cluster key."""
+        """Initialize config with a manager for the ES256K node JWTs; Add cluster key."""
         self.org_did = org_did
         response = requests.post(
             "https://secret-vault-registration.replit.app/api/config",
@@ -56,62 +63,46 @@ class NillionActionProvider(ActionProvider):
         private_key = bytes.fromhex(secret_key)
         signer = SigningKey.from_string(private_key, curve=SECP256k1)
 
-        for node in self.nodes:
-            # Create payload for each node_id
-            payload = {
-                "iss": org_did,
-                "aud": node["did"],
-                "exp": int(time.time()) + 3600,
-            }
-
-            # Create and sign the JWT
-            node["bearer"] = jwt.encode(payload, signer.to_pem(), algorithm="ES256K")
+        # JWTs are signed per node on first use and refreshed ahead of expiry
+        self.token_manager = NodeTokenManager(org_did, signer)
 
         self.key = nilql.ClusterKey.generate({"nodes": [{}] * len(self.nodes)}, {"store": True})
+        self.node_client = NodeClient(self.nodes, token_manager=self.token_manager)
+        self.schema_catalog = SchemaCatalog(
+            self.node_client, validator_class=self._validator_builder()
+        )
 
     def post(
         self, nodes: list, endpoint: str, payload: dict
     ) -> Generator[requests.Response, Any, Any]:
-        """Post payload to nildb nodes."""
-        for node in nodes:
-            headers = {
-                "Authorization": f'Bearer {node["bearer"]}',
-                "Content-Type": "application/json",
-            }
-
-            response = requests.post(
-                f"{node['url']}/api/v1/{endpoint}",
-                headers=headers,
-                json=payload,
-            )
-
-            assert (
-                response.status_code == 200 and response.json().get("errors", []) == []
-            ), response.content.decode("utf8")
+        """Post payload to nildb nodes concurrently, yielding the responses in node order."""
+        if nodes is self.nodes:
+            yield from self.node_client.request_all("POST", endpoint, payload)
+            return
 
-            yield response
-
-    def fetch_schemas(self) -> list:
-        """Get all my schemas from the first server."""
-        headers = {
-            "Authorization": f'Bearer {self.nodes[0]["bearer"]}',
-            "Content-Type": "application/json",
-        }
-
-        response = requests.get(f"{self.nodes[0]['url']}/api/v1/schemas", headers=headers)
+        client = NodeClient(nodes, self.node_client.timeout, self.token_manager)
+        try:
+            yield from client.request_all("POST", endpoint, payload)
+        finally:
+            client.close()
 
-        assert (
-            response.status_code == 200 and response.json().get("errors", []) == []
-        ), response.content.decode("utf8")
+    def fetch_schemas(self, max_age: float | None = None) -> list:
+        """Get all my schemas from the schema catalog.
 
-        schema_list = response.json()["data"]
+        Schemas are replicated to every node, so the catalog fetches them from whichever
+        server answers first and revalidates its cached list once it is max_age old.
+        """
+        schema_list = self.schema_catalog.get_schemas(max_age)
         assert len(schema_list) > 0, "failed to fetch schemas from nildb"
         return schema_list
 
     def find_schema(self, schema_uuid: str, schema_list: list | None = None) -> dict:
         """Filter a list of schemas by single desired schema id."""
         if not schema_list:
-            schema_list = self.fetch_schemas()
+            try:
+                return self.schema_catalog.get_schema(schema_uuid)
+            except KeyError:
+                raise AssertionError("failed to lookup schema") from None
 
         my_schema = None
         for this_schema in schema_list:
@@ -123,16 +114,7 @@ class NillionActionProvider(ActionProvider):
 
     def _mutate_secret_attributes(self, entry: dict) -> None:
         """Apply encryption or secret sharing to all fields in schema that are indicated w/ %share keyname."""
-        keys = list(entry.keys())
-        for key in keys:
-            value = entry[key]
-            if key == "_id":
-                entry[key] = str(uuid.uuid4())
-            elif key == "%share":
-                del entry["%share"]
-                entry["%allot"] = nilql.encrypt(self.key, value)
-            elif isinstance(value, dict):
-                self._mutate_secret_attributes(value)
+        mutate_secret_attributes(self.key, entry)
 
     def _validator_builder(self):
         """Build a validator to validate the candidate document against loaded schema."""
@@ -366,6 +348,7 @@ A failure response will return a tuple with empty values
             deque(
                 self.post(self.nodes, "schemas", schema), maxlen=0
             )  # discard results since we throw on err
+            self.schema_catalog.add(schema)
             return schema["_id"], schema
         except Exception as e:
             print(f"Error creating schema: {str(e)}")
@@ -380,7 +363,9 @@ the desired schema itself. If you do not have the schema UUID you must use the l
 action of the NillionActionProvider.
 
 
-Success will return  a list of created record UUIDs, failure is an empty list.
+Success will return  a list of created record UUIDs, failure is an empty list. If the upload
+fails part way, only the UUIDs of the records stored before the failure are returned, and only
+the remaining records should be uploaded again.
     """,
         schema=NillionDataUploadInput,
     )
@@ -393,45 +378,29 @@ Success will return  a list of created record UUIDs, failure is an empty list.
             args (dict[str, Any]): Arguments containing a UUID and the data to upload.
 
         Returns:
-            list[str]: A list of the uploaded record's UUIDs
+            list[str]: A list of the uploaded record's UUIDs, including those stored before a
+                       failure part way through the upload
 
         """
         try:
             validated_args = NillionDataUploadInput(**args)
 
-            schema_definition = self.find_schema(validated_args.schema_uuid)
-
-            builder = self._validator_builder()
-            validator = builder(schema_definition)
-
-            for entry in validated_args.data_to_store:
-                self._mutate_secret_attributes(entry)
-
-            record_uuids = [x["_id"] for x in validated_args.data_to_store]
-            payloads = nilql.allot(validated_args.data_to_store)
-
-            for idx, shard in enumerate(payloads):
-                validator.validate(shard)
-
-                node = self.nodes[idx]
-                headers = {
-                    "Authorization": f'Bearer {node["bearer"]}',
-                    "Content-Type": "application/json",
-                }
-
-                body = {"schema": validated_args.schema_uuid, "data": shard}
-
-                response = requests.post(
-                    f"{node['url']}/api/v1/data/create",
-                    headers=headers,
-                    json=body,
-                )
-
-                assert response.status_code == 200 and response.json().get("errors", []) == [], (
-                    f"upload (host-{idx}) failed: " + response.content.decode("utf8")
-                )
-            return record_uuids
+            # Cached per schema, so repeated uploads neither refetch nor recompile it
+            validator = self.schema_catalog.get_validator(validated_args.schema_uuid)
+
+            # Records are encrypted, validated and posted in chunks, in parallel for large uploads
+            return upload_records(
+                self.node_client,
+                self.key,
+                validated_args.schema_uuid,
+                self.schema_catalog.get_schema(validated_args.schema_uuid),
+                validated_args.data_to_store,
+                validator,
+            )
 
+        except PartialUploadError as e:
+            print(f"Error creating records in node: {str(e)}")
+            return e.record_ids
         except Exception as e:
             print(f"Error creating records in node: {str(e)}")
             return []
@@ -444,6 +413,9 @@ Download all the data from your privacy preserving database, called the Nillion
 that you require. If you do not have the schema UUID you must use the lookup_schema action of the
 NillionActionProvider.
 
+Optionally pass a filter on plaintext fields (e.g. {{"name": "alice"}}) to only download matching
+records, fields to only return some top-level fields, and limit to cap the number of records.
+
 Success will return true, whereas a failure response will return false.
     """,
         schema=NillionDataDownloadInput,
@@ -463,33 +435,17 @@ Success will return true, whereas a failure response will return false.
         try:
             validated_args = NillionDataDownloadInput(**args)
 
-            shares = defaultdict(list)
-            for node in self.nodes:
-                headers = {
-                    "Authorization": f'Bearer {node["bearer"]}',
-                    "Content-Type": "application/json",
-                }
-
-                body = {
-                    "schema": validated_args.schema_uuid,
-                    "filter": {},
-                }
-
-                response = requests.post(
-                    f"{node['url']}/api/v1/data/read",
-                    headers=headers,
-                    json=body,
-                )
-                assert response.status_code == 200, "upload failed: " + response.content.decode(
-                    "utf8"
-                )
-                data = response.json().get("data")
-                for d in data:
-                    shares[d["_id"]].append(d)
-            decrypted = []
-            for k in shares:
-                decrypted.append(nilql.unify(self.key, shares[k]))
-            return decrypted
+            # Every node holds one share of each secret field, so all of them must respond.
+            # Records are unified as soon as all their shares have streamed in.
+            records = stream_records(
+                self.node_client,
+                self.key,
+                validated_args.schema_uuid,
+                filter=validated_args.filter,
+                fields=validated_args.fields,
+                limit=validated_args.limit,
+            )
+            return list(records)
         except Exception as e:
             print(f"Error retrieving records in node: {e!r}")
             return []
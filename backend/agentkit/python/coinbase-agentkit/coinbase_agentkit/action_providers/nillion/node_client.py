@@ -0,0 +1,223 @@
+"""Concurrent HTTP client for the nodes of a Nillion SecretVault cluster."""
+
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .token_manager import NodeTokenManager
+
+# (connect, read) timeout in seconds for each node request
+DEFAULT_NODE_TIMEOUT = (5.0, 30.0)
+
+
+class NodeRequestError(Exception):
+    """Raised when a node request fails or not enough nodes respond."""
+
+
+class NodeClient:
+    """Sends requests to every node of a cluster concurrently.
+
+    Requests share one pooled session with a connection pool per node, so
+    latency is that of the slowest node rather than the sum over all nodes.
+    """
+
+    def __init__(
+        self,
+        nodes: list[dict],
+        timeout: float | tuple[float, float] = DEFAULT_NODE_TIMEOUT,
+        token_manager: NodeTokenManager | None = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            nodes: The cluster nodes, each with a "url" and a "did".
+            timeout: Timeout for each node request, in seconds or as a (connect, read) tuple.
+            token_manager: Signs the bearer token for each node. If None, the static
+                           "bearer" token of each node is used.
+
+        """
+        self.nodes = nodes
+        self.timeout = timeout
+        self.token_manager = token_manager
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(nodes), pool_maxsize=len(nodes))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(nodes), 1), thread_name_prefix="nildb"
+        )
+
+    def get_headers(self, node: dict) -> dict[str, str]:
+        """Get the request headers for a node.
+
+        Args:
+            node: The node to send the request to.
+
+        Returns:
+            dict[str, str]: The authorization and content type headers.
+
+        """
+        if self.token_manager is not None:
+            token = self.token_manager.get_token(node)
+        else:
+            token = node["bearer"]
+
+        return {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+
+    def request(
+        self,
+        node: dict,
+        method: str,
+        endpoint: str,
+        payload: dict | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Send a request to a single node.
+
+        Args:
+            node: The node to send the request to.
+            method: The HTTP method, "GET" or "POST".
+            endpoint: The API path below /api/v1/.
+            payload: Optional JSON body.
+            headers: Optional additional headers, e.g. for conditional requests.
+            stream: Whether to stream the response body. A streamed body is not checked
+                    for errors, and the caller must close the response.
+
+        Returns:
+            requests.Response: The successful response, or a 304 Not Modified response
+                to a conditional request.
+
+        Raises:
+            NodeRequestError: If the node returns an error.
+
+        """
+        url = f"{node['url']}/api/v1/{endpoint}"
+        kwargs: dict[str, Any] = {
+            "headers": {**self.get_headers(node), **(headers or {})},
+            "timeout": self.timeout,
+            **({"stream": True} if stream else {}),
+        }
+        if method == "GET":
+            response = self.session.get(url, **kwargs)
+        else:
+            response = self.session.post(url, json=payload, **kwargs)
+
+        if response.status_code == 304 or (stream and response.status_code == 200):
+            return response
+        if response.status_code != 200 or response.json().get("errors", []) != []:
+            raise NodeRequestError(
+                f"{endpoint} ({node['url']}) failed: " + response.content.decode("utf8")
+            )
+        return response
+
+    def request_all(
+        self,
+        method: str,
+        endpoint: str,
+        payloads: dict | list[dict] | None = None,
+        quorum: int | None = None,
+    ) -> list[requests.Response | None]:
+        """Send a request to every node concurrently.
+
+        The call returns as soon as quorum nodes have responded successfully, and
+        fails as soon as so many nodes have failed that the quorum cannot be met.
+
+        Args:
+            method: The HTTP method, "GET" or "POST".
+            endpoint: The API path below /api/v1/.
+            payloads: A JSON body for all nodes, or a list with one body per node. A
+                      shorter list is only sent to the first nodes.
+            quorum: The number of successful responses needed (default: all nodes sent to).
+
+        Returns:
+            list[requests.Response | None]: The response of each node, in node order.
+                None for nodes that had not responded when the quorum was reached.
+
+        Raises:
+            NodeRequestError: If the quorum cannot be met.
+
+        """
+        if not isinstance(payloads, list):
+            payloads = [payloads] * len(self.nodes)
+
+        return self.map(
+            lambda node, payload: self.request(node, method, endpoint, payload),
+            payloads,
+            quorum,
+        )
+
+    def map(
+        self,
+        fn: Callable[[dict, Any], Any],
+        args: list[Any],
+        quorum: int | None = None,
+    ) -> list[Any]:
+        """Call a function for every node concurrently.
+
+        Args:
+            fn: Function called with each node and its argument.
+            args: One argument per node. A shorter list only calls the first nodes.
+            quorum: The number of successful calls needed (default: all nodes called).
+
+        Returns:
+            list[Any]: The result for each node called, in node order. None for nodes
+                that had not finished when the quorum was reached.
+
+        Raises:
+            NodeRequestError: If the quorum cannot be met.
+
+        """
+        nodes = self.nodes[: len(args)]
+        quorum = len(nodes) if quorum is None else quorum
+        futures = {
+            self._executor.submit(fn, node, arg): i
+            for i, (node, arg) in enumerate(zip(nodes, args, strict=True))
+        }
+        results: list[Any] = [None] * len(nodes)
+        errors: list[str] = []
+        succeeded = 0
+
+        pending = set(futures)
+        while pending and succeeded < quorum:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results[futures[future]] = future.result()
+                    succeeded += 1
+                except Exception as e:
+                    errors.append(str(e))
+
+            if len(nodes) - len(errors) < quorum:
+                for future in pending:
+                    future.cancel()
+                raise NodeRequestError(
+                    f"{len(errors)} of {len(nodes)} nodes failed, "
+                    f"quorum of {quorum} not reached: " + "; ".join(errors)
+                )
+
+        return results
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run a function on the node worker threads.
+
+        Args:
+            fn: The function to run.
+            *args: The arguments to call it with.
+
+        Returns:
+            Future: The future of the call.
+
+        """
+        return self._executor.submit(fn, *args)
+
+    def close(self) -> None:
+        """Close the session and stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,150 @@
+"""Cached catalog of the schemas in a Nillion SecretVault cluster."""
+
+import threading
+import time
+from typing import Any
+
+from jsonschema import Draft7Validator
+
+from .node_client import NodeClient
+
+# Seconds before the cached schema list is revalidated with the nodes
+DEFAULT_SCHEMA_TTL = 300.0
+
+
+class SchemaCatalog:
+    """Caches the schema list of a cluster and a compiled validator per schema.
+
+    The list is fetched from whichever node answers first and reused for ttl
+    seconds. After that it is revalidated with a conditional request, so an
+    unchanged list costs a 304 response instead of a full download. Unknown schema
+    ids trigger one refetch, since the schema may have been created elsewhere.
+    """
+
+    def __init__(
+        self,
+        node_client: NodeClient,
+        ttl: float = DEFAULT_SCHEMA_TTL,
+        validator_class: type = Draft7Validator,
+    ):
+        """Initialize the catalog.
+
+        Args:
+            node_client: The client for the cluster nodes.
+            ttl: Seconds before the cached schema list is revalidated.
+            validator_class: The jsonschema validator class records are validated with.
+
+        """
+        self.node_client = node_client
+        self.ttl = ttl
+        self.validator_class = validator_class
+        self.fetched_at: float | None = None
+        self._schemas: dict[str, dict] = {}
+        self._etags: dict[str, str] = {}
+        self._validators: dict[str, tuple[dict, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get_schemas(self, max_age: float | None = None) -> list[dict]:
+        """Get all schemas, revalidating the cached list if it is too old.
+
+        Args:
+            max_age: Maximum age in seconds of the cached list (default: the ttl).
+
+        Returns:
+            list[dict]: The schemas, each with its "_id" and "schema" definition.
+
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self.fetched_at is None or time.monotonic() - self.fetched_at >= max_age:
+                self._refresh()
+            return list(self._schemas.values())
+
+    def get_schema(self, schema_uuid: str) -> dict:
+        """Get the JSON schema definition of a schema.
+
+        Args:
+            schema_uuid: The id of the schema.
+
+        Returns:
+            dict: The JSON schema definition.
+
+        Raises:
+            KeyError: If no schema with this id exists.
+
+        """
+        with self._lock:
+            self.get_schemas()
+            if schema_uuid not in self._schemas:
+                self._refresh()
+            if schema_uuid not in self._schemas:
+                raise KeyError(f"failed to lookup schema {schema_uuid}")
+            return self._schemas[schema_uuid]["schema"]
+
+    def get_validator(self, schema_uuid: str) -> Any:
+        """Get the compiled validator for a schema.
+
+        Validators are cached per schema id and rebuilt only when the schema
+        definition changes.
+
+        Args:
+            schema_uuid: The id of the schema.
+
+        Returns:
+            Any: A validator instance of validator_class.
+
+        Raises:
+            KeyError: If no schema with this id exists.
+
+        """
+        with self._lock:
+            definition = self.get_schema(schema_uuid)
+            cached = self._validators.get(schema_uuid)
+            if cached is None or cached[0] != definition:
+                cached = (definition, self.validator_class(definition))
+                self._validators[schema_uuid] = cached
+            return cached[1]
+
+    def add(self, schema: dict) -> None:
+        """Add a newly created schema to the cached list.
+
+        Args:
+            schema: The schema, with its "_id" and "schema" definition.
+
+        """
+        with self._lock:
+            self._schemas[schema["_id"]] = schema
+
+    def invalidate(self) -> None:
+        """Discard the cached list, so it is fully refetched on next use."""
+        with self._lock:
+            self.fetched_at = None
+            self._etags.clear()
+
+    def _refresh(self) -> None:
+        """Fetch the schema list from whichever node answers first.
+
+        Nodes that returned an ETag are sent it in If-None-Match, and a 304 response
+        keeps the cached list.
+        """
+        responses = self.node_client.map(
+            lambda node, etag: self.node_client.request(
+                node, "GET", "schemas", headers={"If-None-Match": etag} if etag else None
+            ),
+            [self._etags.get(node["did"]) for node in self.node_client.nodes],
+            quorum=1,
+        )
+        node, response = next(
+            (node, r)
+            for node, r in zip(self.node_client.nodes, responses, strict=True)
+            if r is not None
+        )
+
+        if response.status_code != 304:
+            schema_list = response.json()["data"]
+            self._schemas = {schema["_id"]: schema for schema in schema_list}
+            # Only the ETag of the node the list came from is known to match it
+            etag = response.headers.get("ETag")
+            self._etags = {node["did"]: etag} if etag else {}
+
+        self.fetched_at = time.monotonic()
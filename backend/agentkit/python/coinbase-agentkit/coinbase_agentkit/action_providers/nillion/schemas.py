@@ -15,6 +15,15 @@ class NillionDataDownloadInput(BaseModel):
     """Input argument schema for data download action."""
 
     schema_uuid: str = Field(description="the UUID4 obtained from the nildb_schema_lookup_tool")
+    filter: dict[str, Any] = Field(
+        default_factory=dict,
+        description="optional filter on plaintext fields, e.g. {'name': 'alice'}. Secret fields "
+        "can't be filtered on",
+    )
+    fields: list[str] | None = Field(
+        None, description="optional top-level fields to return, all fields if omitted"
+    )
+    limit: int | None = Field(None, gt=0, description="optional maximum number of records")
 
 
 class NillionDataUploadInput(BaseModel):
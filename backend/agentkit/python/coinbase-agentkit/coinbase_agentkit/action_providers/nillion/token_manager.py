@@ -0,0 +1,97 @@
+"""Cached, self-refreshing JWTs for the nodes of a Nillion SecretVault cluster."""
+
+import threading
+import time
+
+import jwt
+from ecdsa import SigningKey
+
+# Lifetime of a node JWT, in seconds
+DEFAULT_TOKEN_TTL = 3600
+
+# Tokens are refreshed when less than this many seconds remain before they expire
+DEFAULT_REFRESH_MARGIN = 300
+
+
+class NodeTokenManager:
+    """Signs ES256K JWTs for the nodes of a cluster and caches them until near expiry.
+
+    A token is reused until less than refresh_margin seconds of its lifetime remain,
+    then a new one is signed before the old one expires, so long-running providers
+    never send an expired token.
+    """
+
+    def __init__(
+        self,
+        org_did: str,
+        signer: SigningKey,
+        ttl: int = DEFAULT_TOKEN_TTL,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+    ):
+        """Initialize the token manager.
+
+        Args:
+            org_did: The DID of the organization issuing the tokens.
+            signer: The secp256k1 key the tokens are signed with.
+            ttl: Lifetime of each token in seconds.
+            refresh_margin: Seconds before expiry at which a token is refreshed.
+
+        """
+        if refresh_margin >= ttl:
+            raise ValueError("refresh_margin must be shorter than the token ttl")
+
+        self.org_did = org_did
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._signing_key = signer.to_pem()
+        self._tokens: dict[str, tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, node: dict) -> str:
+        """Get a valid token for a node, signing a new one if needed.
+
+        Args:
+            node: The node the token is for, with its "did".
+
+        Returns:
+            str: The encoded JWT.
+
+        """
+        now = int(time.time())
+        with self._lock:
+            cached = self._tokens.get(node["did"])
+            if cached is not None and cached[1] - now > self.refresh_margin:
+                return cached[0]
+
+            expires_at = now + self.ttl
+            payload = {"iss": self.org_did, "aud": node["did"], "exp": expires_at}
+            token = jwt.encode(payload, self._signing_key, algorithm="ES256K")
+            self._tokens[node["did"]] = (token, expires_at)
+            return token
+
+    def get_expiry(self, node: dict) -> int | None:
+        """Get when the cached token for a node expires.
+
+        Args:
+            node: The node the token is for, with its "did".
+
+        Returns:
+            int | None: The expiry as a Unix timestamp, or None if no token is cached.
+
+        """
+        with self._lock:
+            cached = self._tokens.get(node["did"])
+        return cached[1] if cached else None
+
+    def invalidate(self, node: dict | None = None) -> None:
+        """Discard cached tokens, so new ones are signed on next use.
+
+        Args:
+            node: The node whose token to discard. If None, all tokens are discarded.
+
+        """
+        with self._lock:
+            if node is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(node["did"], None)
@@ -0,0 +1,263 @@
+"""Chunked, parallel secret sharing and upload of records to a Nillion SecretVault."""
+
+import multiprocessing
+import os
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+import nilql
+from jsonschema import Draft7Validator, ValidationError
+
+from .node_client import NodeClient
+
+# Number of records encrypted, validated and posted together
+DEFAULT_UPLOAD_CHUNK_SIZE = 1000
+
+# Number of processes encrypting and validating chunks in parallel
+DEFAULT_UPLOAD_WORKERS = min(4, os.cpu_count() or 1)
+
+# Validators compiled in each worker process, by schema id
+_worker_validators: dict[str, Any] = {}
+
+
+class RecordValidationError(ValueError):
+    """Raised when a record shard does not match its schema."""
+
+
+class PartialUploadError(Exception):
+    """Raised when a chunk fails after earlier chunks of an upload were stored.
+
+    Attributes:
+        record_ids: The ids of the records stored before the failure, in input order.
+
+    """
+
+    def __init__(self, message: str, record_ids: list[str]):
+        super().__init__(message)
+        self.record_ids = record_ids
+
+
+def mutate_secret_attributes(key: Any, entry: dict) -> None:
+    """Apply encryption or secret sharing to all fields of a record marked with a %share key.
+
+    Args:
+        key: The nilql cluster key to encrypt with.
+        entry: The record, mutated in place. Any "_id" is replaced with a new UUID.
+
+    """
+    for field in list(entry.keys()):
+        value = entry[field]
+        if field == "_id":
+            entry[field] = str(uuid.uuid4())
+        elif field == "%share":
+            del entry["%share"]
+            entry["%allot"] = nilql.encrypt(key, value)
+        elif isinstance(value, dict):
+            mutate_secret_attributes(key, value)
+
+
+def encrypt_chunk(key: Any, records: list[dict]) -> list[list[dict]]:
+    """Encrypt a chunk of records and split it into one shard per node.
+
+    Args:
+        key: The nilql cluster key to encrypt with.
+        records: The records, mutated in place.
+
+    Returns:
+        list[list[dict]]: The shard of the chunk for each node.
+
+    """
+    for record in records:
+        mutate_secret_attributes(key, record)
+    return nilql.allot(records)
+
+
+def validate_shards(shards: list[list[dict]], validator: Any) -> None:
+    """Validate the node shards of a chunk against the schema.
+
+    Args:
+        shards: The shard of the chunk for each node.
+        validator: The jsonschema validator for the schema.
+
+    Raises:
+        RecordValidationError: If a shard does not match the schema.
+
+    """
+    for shard in shards:
+        try:
+            validator.validate(shard)
+        except ValidationError as e:
+            # jsonschema errors can't be pickled back from worker processes
+            location = "/".join(str(part) for part in e.absolute_path)
+            raise RecordValidationError(f"{e.message} (at /{location})") from None
+
+
+def process_chunk(
+    key: Any, schema_uuid: str, schema: dict, records: list[dict]
+) -> list[list[dict]]:
+    """Encrypt a chunk of records and validate its node shards in a worker process.
+
+    Args:
+        key: The nilql cluster key to encrypt with.
+        schema_uuid: The id of the schema, used to cache the compiled validator.
+        schema: The JSON schema definition.
+        records: The records, mutated in place.
+
+    Returns:
+        list[list[dict]]: The validated shard of the chunk for each node.
+
+    Raises:
+        RecordValidationError: If a shard does not match the schema.
+
+    """
+    validator = _worker_validators.get(schema_uuid)
+    if validator is None:
+        validator = _worker_validators[schema_uuid] = Draft7Validator(schema)
+
+    shards = encrypt_chunk(key, records)
+    validate_shards(shards, validator)
+    return shards
+
+
+def iter_chunks(records: list[dict], chunk_size: int) -> Iterator[list[dict]]:
+    """Split records into chunks.
+
+    Args:
+        records: The records to split.
+        chunk_size: The maximum number of records per chunk.
+
+    Yields:
+        list[dict]: The next chunk of records.
+
+    """
+    for start in range(0, len(records), chunk_size):
+        yield records[start : start + chunk_size]
+
+
+def upload_records(
+    node_client: NodeClient,
+    key: Any,
+    schema_uuid: str,
+    schema: dict,
+    records: list[dict],
+    validator: Any | None = None,
+    chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+    max_workers: int = DEFAULT_UPLOAD_WORKERS,
+) -> list[str]:
+    """Secret share records and upload them to every node, one chunk at a time.
+
+    Each chunk is encrypted, split into node shards, validated and posted before
+    the next one is processed, so only a few chunks of shards are held in memory.
+    With more than one chunk and worker, chunks are encrypted and validated ahead
+    in a pool of spawned processes while earlier chunks are being posted.
+
+    Chunks are posted as they are ready, so if a later chunk fails, the earlier
+    chunks remain stored and their ids are raised with the error.
+
+    Args:
+        node_client: The client for the cluster nodes.
+        key: The nilql cluster key to encrypt with.
+        schema_uuid: The schema the records are stored in.
+        schema: The JSON schema definition of the schema.
+        records: The records to upload, with secret fields marked with %share.
+        validator: The compiled validator for the schema, used when encrypting in the
+                   calling process. Worker processes compile a Draft7Validator.
+        chunk_size: The maximum number of records per chunk.
+        max_workers: The number of worker processes. With 1, chunks are encrypted and
+                     validated in the calling process.
+
+    Returns:
+        list[str]: The ids of the uploaded records, in input order.
+
+    Raises:
+        RecordValidationError: If a shard of the first chunk does not match the schema.
+        NodeRequestError: If a node rejects the first chunk.
+        PartialUploadError: If a later chunk fails, with the ids of the records stored.
+
+    """
+    record_ids: list[str] = []
+    try:
+        _upload_chunks(
+            node_client,
+            key,
+            schema_uuid,
+            schema,
+            records,
+            validator,
+            chunk_size,
+            max_workers,
+            record_ids,
+        )
+    except Exception as e:
+        if not record_ids:
+            raise
+        raise PartialUploadError(
+            f"Upload stopped after {len(record_ids)} of {len(records)} records: {e!s}",
+            record_ids,
+        ) from e
+    return record_ids
+
+
+def _upload_chunks(
+    node_client: NodeClient,
+    key: Any,
+    schema_uuid: str,
+    schema: dict,
+    records: list[dict],
+    validator: Any | None,
+    chunk_size: int,
+    max_workers: int,
+    record_ids: list[str],
+) -> None:
+    """Encrypt, validate and post the chunks of an upload, collecting the record ids."""
+    chunks = iter_chunks(records, chunk_size)
+
+    if max_workers <= 1 or len(records) <= chunk_size:
+        validator = validator or Draft7Validator(schema)
+        for chunk in chunks:
+            shards = encrypt_chunk(key, chunk)
+            validate_shards(shards, validator)
+            _post_chunk(node_client, schema_uuid, shards, record_ids)
+        return
+
+    # Forking while the node client's threads hold locks could deadlock the workers
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        pending: deque[Future] = deque()
+
+        def submit_ahead() -> None:
+            while len(pending) <= max_workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                pending.append(executor.submit(process_chunk, key, schema_uuid, schema, chunk))
+
+        try:
+            submit_ahead()
+            while pending:
+                shards = pending.popleft().result()
+                submit_ahead()
+                _post_chunk(node_client, schema_uuid, shards, record_ids)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _post_chunk(
+    node_client: NodeClient,
+    schema_uuid: str,
+    shards: list[list[dict]],
+    record_ids: list[str],
+) -> None:
+    """Post each shard of a chunk to its node and collect the record ids."""
+    # A chunk without secret fields has a single shard, which only the first node stores
+    node_client.request_all(
+        "POST",
+        "data/create",
+        [{"schema": schema_uuid, "data": shard} for shard in shards],
+    )
+    record_ids.extend(record["_id"] for record in shards[0])
@@ -0,0 +1,24 @@
+"""Constants for the Pyth action provider."""
+
+HERMES_BASE_URL = "https://hermes.pyth.network"
+
+# (connect, read) timeout in seconds for Hermes requests
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# How long the symbol to feed ID index is reused before it is reloaded, in seconds
+FEED_INDEX_TTL = 3600.0
+
+# Maximum number of price feeds requested in one call
+MAX_FEEDS_PER_REQUEST = 100
+
+# Quote currency preferred when a symbol has feeds in several currencies
+DEFAULT_QUOTE_CURRENCY = "USD"
+
+# Maximum age in seconds, by publish time, of a streamed price served from the cache
+PRICE_STREAM_MAX_STALENESS = 10.0
+
+# Seconds to wait before reopening a dropped price stream
+PRICE_STREAM_RECONNECT_DELAY = 1.0
+
+# (connect, read) timeout in seconds for the price stream; Hermes sends updates every second
+PRICE_STREAM_TIMEOUT = (5.0, 30.0)
@@ -0,0 +1,80 @@
+"""Index of Pyth price feed IDs by token symbol."""
+
+import time
+from typing import Any
+
+from .constants import DEFAULT_QUOTE_CURRENCY
+
+
+def normalize_feed_id(price_feed_id: str) -> str:
+    """Normalize a price feed ID to the form Hermes returns it in.
+
+    Args:
+        price_feed_id: The feed ID, with or without a 0x prefix.
+
+    Returns:
+        str: The lowercase feed ID without a 0x prefix.
+
+    """
+    feed_id = price_feed_id.strip().lower()
+    return feed_id[2:] if feed_id.startswith("0x") else feed_id
+
+
+class PriceFeedIndex:
+    """A point-in-time index of Pyth price feeds by base token symbol.
+
+    The feed list is walked once when the index is built. Afterwards, looking up
+    the feed ID for a symbol is a dictionary lookup.
+    """
+
+    def __init__(self, feeds: list[dict[str, Any]], quote: str = DEFAULT_QUOTE_CURRENCY):
+        """Build the index from the Hermes price feed list.
+
+        For symbols with feeds in several quote currencies, the feed quoted in the
+        given currency is used, otherwise the first feed listed.
+
+        Args:
+            feeds: The price feeds as returned by /v2/price_feeds.
+            quote: The preferred quote currency.
+
+        """
+        self.fetched_at = time.monotonic()
+        self.by_symbol: dict[str, str] = {}
+
+        preferred: set[str] = set()
+        for feed in feeds:
+            attributes = feed.get("attributes", {})
+            symbol = attributes.get("base", "").lower()
+            if not symbol or symbol in preferred:
+                continue
+
+            if attributes.get("quote_currency", attributes.get("quote", "")).upper() == quote:
+                self.by_symbol[symbol] = feed["id"]
+                preferred.add(symbol)
+            else:
+                self.by_symbol.setdefault(symbol, feed["id"])
+
+    def age(self) -> float:
+        """Get the age of the index.
+
+        Returns:
+            float: Seconds since the index was built.
+
+        """
+        return time.monotonic() - self.fetched_at
+
+    def get_feed_id(self, token_symbol: str) -> str | None:
+        """Get the price feed ID for a token symbol.
+
+        Args:
+            token_symbol: The base token symbol, e.g. "BTC". Case insensitive.
+
+        Returns:
+            str | None: The price feed ID, or None if there is no feed for the symbol.
+
+        """
+        return self.by_symbol.get(token_symbol.strip().lower())
+
+    def __len__(self) -> int:
+        """Get the number of indexed symbols."""
+        return len(self.by_symbol)
@@ -0,0 +1,200 @@
+"""Background Pyth price streaming into an in-memory latest-price table."""
+
+import contextlib
+import json
+import threading
+import time
+from typing import Any
+
+import requests
+
+from .constants import (
+    HERMES_BASE_URL,
+    PRICE_STREAM_MAX_STALENESS,
+    PRICE_STREAM_RECONNECT_DELAY,
+    PRICE_STREAM_TIMEOUT,
+)
+from .feed_index import normalize_feed_id
+
+
+class PriceStreamer:
+    """Keeps the latest prices of subscribed feeds up to date from Hermes.
+
+    A background thread holds a Server-Sent Events connection to
+    /v2/updates/price/stream for the subscribed feeds and writes each price update
+    into a table, so price lookups are dictionary reads instead of HTTP requests.
+    The connection is reopened when the subscriptions change or the stream drops.
+    Unknown feed IDs are skipped by Hermes, so they never break the stream of the
+    other feeds.
+
+    Prices older than max_staleness seconds, by their publish time, are treated as
+    missing, so a stalled stream never serves outdated prices.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        base_url: str = HERMES_BASE_URL,
+        max_staleness: float = PRICE_STREAM_MAX_STALENESS,
+        reconnect_delay: float = PRICE_STREAM_RECONNECT_DELAY,
+    ):
+        """Initialize the streamer. The stream is opened on the first subscription.
+
+        Args:
+            session: The HTTP session to stream over. A new one is created if None.
+            base_url: The Hermes base URL.
+            max_staleness: Maximum age in seconds of a price served from the table.
+            reconnect_delay: Seconds to wait before reopening a dropped stream.
+
+        """
+        self.session = session or requests.Session()
+        self.base_url = base_url
+        self.max_staleness = max_staleness
+        self.reconnect_delay = reconnect_delay
+        self.feed_ids: set[str] = set()
+        self._prices: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._response: requests.Response | None = None
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, feed_ids: list[str]) -> None:
+        """Add feeds to the stream, reconnecting if any are new.
+
+        Args:
+            feed_ids: The price feed IDs, with or without a 0x prefix.
+
+        """
+        with self._lock:
+            new_ids = {normalize_feed_id(feed_id) for feed_id in feed_ids} - self.feed_ids
+            if not new_ids:
+                return
+
+            self.feed_ids |= new_ids
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pyth-price-stream", daemon=True
+                )
+                self._thread.start()
+            else:
+                self._reconnect()
+
+    def unsubscribe(self, feed_ids: list[str]) -> None:
+        """Remove feeds from the stream and the price table.
+
+        Args:
+            feed_ids: The price feed IDs, with or without a 0x prefix.
+
+        """
+        with self._lock:
+            for feed_id in feed_ids:
+                feed_id = normalize_feed_id(feed_id)
+                self.feed_ids.discard(feed_id)
+                self._prices.pop(feed_id, None)
+            self._reconnect()
+
+    def update(self, feed_id: str, price_info: dict[str, Any]) -> None:
+        """Store a price, unless the table already has a newer one.
+
+        Args:
+            feed_id: The price feed ID.
+            price_info: The "price" object of a parsed price update.
+
+        """
+        feed_id = normalize_feed_id(feed_id)
+        with self._lock:
+            current = self._prices.get(feed_id)
+            if current is None or current.get("publish_time", 0) <= price_info.get(
+                "publish_time", 0
+            ):
+                self._prices[feed_id] = price_info
+
+    def get_price(self, feed_id: str, max_age: float | None = None) -> dict[str, Any] | None:
+        """Get the latest price of a feed if it is fresh.
+
+        Args:
+            feed_id: The price feed ID, with or without a 0x prefix.
+            max_age: Maximum price age in seconds, overriding max_staleness.
+
+        Returns:
+            dict[str, Any] | None: The "price" object, or None if there is no price
+                published within max_age seconds.
+
+        """
+        max_age = self.max_staleness if max_age is None else max_age
+        price_info = self._prices.get(normalize_feed_id(feed_id))
+        if price_info is None or time.time() - price_info.get("publish_time", 0) > max_age:
+            return None
+        return price_info
+
+    def close(self) -> None:
+        """Stop the stream and wait for the background thread to exit."""
+        self._stopped.set()
+        with self._lock:
+            self._reconnect()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _reconnect(self) -> None:
+        """Interrupt the current stream so it is reopened. Called with the lock held."""
+        self._changed.set()
+        if self._response is not None:
+            self._response.close()
+
+    def _run(self) -> None:
+        """Stream price updates until closed, reconnecting on errors."""
+        while True:
+            with self._lock:
+                # Checked under the lock, so a close racing with this iteration is seen
+                # here or by _stream before it reads from the new response
+                if self._stopped.is_set():
+                    return
+                feed_ids = sorted(self.feed_ids)
+                self._changed.clear()
+
+            if not feed_ids:
+                self._changed.wait()
+                continue
+
+            with contextlib.suppress(Exception):
+                self._stream(feed_ids)
+
+            if not self._changed.is_set():
+                # The stream dropped on its own, so back off before reopening it
+                self._stopped.wait(self.reconnect_delay)
+
+    def _stream(self, feed_ids: list[str]) -> None:
+        """Read one stream of price updates into the table.
+
+        Args:
+            feed_ids: The feeds to stream.
+
+        """
+        response = self.session.get(
+            f"{self.base_url}/v2/updates/price/stream",
+            params={"ids[]": feed_ids, "parsed": "true", "ignore_invalid_price_ids": "true"},
+            stream=True,
+            timeout=PRICE_STREAM_TIMEOUT,
+        )
+        with self._lock:
+            if self._changed.is_set():
+                response.close()
+                return
+            self._response = response
+
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if self._changed.is_set():
+                    return
+                if not line or not line.startswith("data:"):
+                    continue
+
+                for update in json.loads(line[len("data:") :]).get("parsed") or []:
+                    self.update(update["id"], update["price"])
+        finally:
+            with self._lock:
+                self._response = None
+            response.close()
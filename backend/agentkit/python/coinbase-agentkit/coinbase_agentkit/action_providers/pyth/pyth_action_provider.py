@@ -1,33 +1,185 @@
 """Pyth action provider."""
 
+import threading
 from typing import Any
 
 import requests
-from pydantic import BaseModel, Field
 
 from ...network import Network
 from ...wallet_providers import WalletProvider
 from ..action_decorator import create_action
 from ..action_provider import ActionProvider
+from .constants import (
+    DEFAULT_TIMEOUT,
+    FEED_INDEX_TTL,
+    HERMES_BASE_URL,
+    MAX_FEEDS_PER_REQUEST,
+    PRICE_STREAM_MAX_STALENESS,
+)
+from .feed_index import PriceFeedIndex, normalize_feed_id
+from .price_stream import PriceStreamer
+from .schemas import FetchPriceFeedIdSchema, FetchPriceSchema, GetPricesSchema
 
 
-class FetchPriceFeedIdSchema(BaseModel):
-    """Input schema for fetching Pyth price feed ID."""
+def format_price(price_info: dict[str, Any]) -> str:
+    """Format a Pyth price with its exponent applied.
 
-    token_symbol: str = Field(..., description="The token symbol to fetch the price feed ID for.")
+    Args:
+        price_info: The "price" object of a parsed price update.
 
+    Returns:
+        str: The price, truncated to two decimals for fractional prices.
+
+    """
+    price = int(price_info["price"])
+    exponent = price_info["expo"]
+
+    if exponent < 0:
+        adjusted_price = price * 100
+        divisor = 10**-exponent
+        scaled_price = adjusted_price // divisor
+        price_str = f"{scaled_price // 100}.{scaled_price % 100:02}"
+        return price_str if not price_str.startswith(".") else f"0{price_str}"
 
-class FetchPriceSchema(BaseModel):
-    """Input schema for fetching Pyth price."""
+    scaled_price = price // (10**exponent)
 
-    price_feed_id: str = Field(..., description="The Pyth price feed ID to fetch the price for.")
+    return str(scaled_price)
 
 
 class PythActionProvider(ActionProvider[WalletProvider]):
     """Provides actions for interacting with Pyth price feeds."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        feed_index_ttl: float = FEED_INDEX_TTL,
+        stream_prices: bool = False,
+        max_price_staleness: float = PRICE_STREAM_MAX_STALENESS,
+        hermes_url: str = HERMES_BASE_URL,
+    ):
+        """Initialize the Pyth action provider.
+
+        Args:
+            feed_index_ttl: How long the symbol to feed ID index is reused, in seconds.
+            stream_prices: Whether to stream the prices of requested feeds in the
+                           background and answer price requests from the stream.
+            max_price_staleness: Maximum age in seconds of a streamed price.
+            hermes_url: The Hermes base URL.
+
+        """
         super().__init__("pyth", [])
+        self.feed_index_ttl = feed_index_ttl
+        self.hermes_url = hermes_url
+        # Hermes requests share one session, so connections are pooled and kept alive
+        self.session = requests.Session()
+        self._feed_index: PriceFeedIndex | None = None
+        self._feed_index_lock = threading.Lock()
+        self.price_streamer = (
+            PriceStreamer(self.session, hermes_url, max_price_staleness) if stream_prices else None
+        )
+
+    def close(self) -> None:
+        """Stop the price stream, if any, and close the HTTP session."""
+        if self.price_streamer is not None:
+            self.price_streamer.close()
+        self.session.close()
+
+    def get_feed_index(self, max_age: float | None = None) -> PriceFeedIndex:
+        """Get the index of price feed IDs by token symbol.
+
+        All crypto price feeds are loaded in one request, and the index is only
+        reloaded once it is older than the TTL.
+
+        Args:
+            max_age: Optional maximum index age in seconds, overriding the TTL.
+
+        Returns:
+            PriceFeedIndex: The index of price feeds.
+
+        """
+        max_age = self.feed_index_ttl if max_age is None else max_age
+
+        with self._feed_index_lock:
+            index = self._feed_index
+            if index is None or index.age() >= max_age:
+                response = self.session.get(
+                    f"{self.hermes_url}/v2/price_feeds",
+                    params={"asset_type": "crypto"},
+                    timeout=DEFAULT_TIMEOUT,
+                )
+                response.raise_for_status()
+                index = PriceFeedIndex(response.json())
+                self._feed_index = index
+            return index
+
+    def fetch_prices(self, price_feed_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch the latest prices of several price feeds.
+
+        Feeds are requested together, up to MAX_FEEDS_PER_REQUEST per request. Hermes
+        is asked to skip unknown feed IDs, so one invalid ID only leaves its own feed
+        without a price instead of failing the whole request.
+
+        Args:
+            price_feed_ids: The price feed IDs, with or without a 0x prefix.
+
+        Returns:
+            dict[str, dict[str, Any]]: The "price" object of each feed Hermes returned
+                a price for, by normalized feed ID.
+
+        """
+        feed_ids = list(dict.fromkeys(normalize_feed_id(feed_id) for feed_id in price_feed_ids))
+        prices = {}
+
+        for start in range(0, len(feed_ids), MAX_FEEDS_PER_REQUEST):
+            response = self.session.get(
+                f"{self.hermes_url}/v2/updates/price/latest",
+                params={
+                    "ids[]": feed_ids[start : start + MAX_FEEDS_PER_REQUEST],
+                    "ignore_invalid_price_ids": "true",
+                },
+                timeout=DEFAULT_TIMEOUT,
+            )
+            response.raise_for_status()
+
+            for update in response.json().get("parsed") or []:
+                prices[normalize_feed_id(update["id"])] = update["price"]
+
+        return prices
+
+    def get_latest_prices(self, price_feed_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Get the latest prices of several price feeds, from the price stream when fresh.
+
+        Without a price stream this is fetch_prices. With one, fresh streamed prices
+        are used as is, the others are fetched over HTTP, and all feeds are subscribed
+        so later requests are answered from the stream.
+
+        Args:
+            price_feed_ids: The price feed IDs, with or without a 0x prefix.
+
+        Returns:
+            dict[str, dict[str, Any]]: The "price" object of each feed a price was found
+                for, by normalized feed ID.
+
+        """
+        if self.price_streamer is None:
+            return self.fetch_prices(price_feed_ids)
+
+        feed_ids = [normalize_feed_id(feed_id) for feed_id in price_feed_ids]
+        prices = {}
+        missing = []
+        for feed_id in feed_ids:
+            price_info = self.price_streamer.get_price(feed_id)
+            if price_info is None:
+                missing.append(feed_id)
+            else:
+                prices[feed_id] = price_info
+
+        if missing:
+            for feed_id, price_info in self.fetch_prices(missing).items():
+                self.price_streamer.update(feed_id, price_info)
+                prices[feed_id] = price_info
+
+        self.price_streamer.subscribe(feed_ids)
+        return prices
 
     @create_action(
         name="fetch_price_feed_id",
@@ -45,21 +197,12 @@ class PythActionProvider(ActionProvider[WalletProvider]):
 
         """
         token_symbol = args["token_symbol"]
-        url = f"https://hermes.pyth.network/v2/price_feeds?query={token_symbol}&asset_type=crypto"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        price_feed_id = self.get_feed_index().get_feed_id(token_symbol)
 
-        if not data:
+        if price_feed_id is None:
             raise ValueError(f"No price feed found for {token_symbol}")
 
-        filtered_data = [
-            item for item in data if item["attributes"]["base"].lower() == token_symbol.lower()
-        ]
-        if not filtered_data:
-            raise ValueError(f"No price feed found for {token_symbol}")
-
-        return filtered_data[0]["id"]
+        return price_feed_id
 
     @create_action(
         name="get_price",
@@ -85,42 +228,98 @@ Important notes:
         """
         try:
             price_feed_id = args["price_feed_id"]
-            url = f"https://hermes.pyth.network/v2/updates/price/latest?ids[]={price_feed_id}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            parsed_data = data["parsed"]
+            prices = self.get_latest_prices([price_feed_id])
+            price_info = prices.get(normalize_feed_id(price_feed_id))
 
-            if not parsed_data:
+            if price_info is None:
                 raise ValueError(f"No price data found for {price_feed_id}")
 
-            price_info = parsed_data[0]["price"]
-            price = int(price_info["price"])
-            exponent = price_info["expo"]
+            return format_price(price_info)
+        except Exception as e:
+            return f"Error fetching price from Pyth: {e!s}"
 
-            if exponent < 0:
-                adjusted_price = price * 100
-                divisor = 10**-exponent
-                scaled_price = adjusted_price // divisor
-                price_str = f"{scaled_price // 100}.{scaled_price % 100:02}"
-                return price_str if not price_str.startswith(".") else f"0{price_str}"
+    @create_action(
+        name="get_prices",
+        description="""
+Fetch the prices of several tokens or price feeds from Pyth in one request.
 
-            scaled_price = price // (10**exponent)
+Inputs:
+- token_symbols: Token symbols to price, e.g. ["BTC", "ETH", "SOL"]
+- price_feed_ids: (Optional) Pyth price feed IDs to price
 
-            return str(scaled_price)
+Example successful response:
+    Prices from Pyth:
+    - BTC: 42123.45
+    - ETH: 2345.67
+    - DOGE: Error: No price feed found for DOGE
+
+Important notes:
+- Prefer this over calling fetch_price_feed_id and get_price for each token
+- Token symbols are resolved to price feed IDs automatically, preferring USD quoted feeds
+- A token without a price is reported without affecting the others
+""",
+        schema=GetPricesSchema,
+    )
+    def get_prices(self, args: dict[str, Any]) -> str:
+        """Fetch prices from Pyth for several token symbols and price feed IDs.
+
+        Args:
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            validated_args = GetPricesSchema(**args)
+
+            labels: list[tuple[str, str | None]] = []
+            if validated_args.token_symbols:
+                index = self.get_feed_index()
+                labels.extend(
+                    (symbol, index.get_feed_id(symbol)) for symbol in validated_args.token_symbols
+                )
+            labels.extend((feed_id, feed_id) for feed_id in validated_args.price_feed_ids)
+
+            prices = self.get_latest_prices([feed_id for _, feed_id in labels if feed_id])
+
+            lines = ["Prices from Pyth:"]
+            for label, feed_id in labels:
+                price_info = prices.get(normalize_feed_id(feed_id)) if feed_id else None
+                if feed_id is None:
+                    lines.append(f"- {label}: Error: No price feed found for {label}")
+                elif price_info is None:
+                    lines.append(f"- {label}: Error: No price data found for {feed_id}")
+                else:
+                    lines.append(f"- {label}: {format_price(price_info)}")
+
+            return "\n".join(lines)
         except Exception as e:
-            return f"Error fetching price from Pyth: {e!s}"
+            return f"Error fetching prices from Pyth: {e!s}"
 
     def supports_network(self, network: Network) -> bool:
         """Check if network is supported by Pyth."""
         return True
 
 
-def pyth_action_provider() -> PythActionProvider:
+def pyth_action_provider(
+    feed_index_ttl: float = FEED_INDEX_TTL,
+    stream_prices: bool = False,
+    max_price_staleness: float = PRICE_STREAM_MAX_STALENESS,
+) -> PythActionProvider:
     """Create a new Pyth action provider.
 
+    Args:
+        feed_index_ttl: How long the symbol to feed ID index is reused, in seconds.
+        stream_prices: Whether to stream the prices of requested feeds in the background.
+        max_price_staleness: Maximum age in seconds of a streamed price.
+
     Returns:
         PythActionProvider: A new Pyth action provider instance.
 
     """
-    return PythActionProvider()
+    return PythActionProvider(
+        feed_index_ttl=feed_index_ttl,
+        stream_prices=stream_prices,
+        max_price_staleness=max_price_staleness,
+    )
@@ -0,0 +1,34 @@
+"""Schemas for Pyth action provider."""
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class FetchPriceFeedIdSchema(BaseModel):
+    """Input schema for fetching Pyth price feed ID."""
+
+    token_symbol: str = Field(..., description="The token symbol to fetch the price feed ID for.")
+
+
+class FetchPriceSchema(BaseModel):
+    """Input schema for fetching Pyth price."""
+
+    price_feed_id: str = Field(..., description="The Pyth price feed ID to fetch the price for.")
+
+
+class GetPricesSchema(BaseModel):
+    """Input schema for fetching several Pyth prices at once."""
+
+    token_symbols: list[str] = Field(
+        default_factory=list,
+        description="The token symbols to fetch prices for (e.g. BTC, ETH, etc.).",
+    )
+    price_feed_ids: list[str] = Field(
+        default_factory=list, description="Pyth price feed IDs to fetch prices for."
+    )
+
+    @model_validator(mode="after")
+    def validate_feeds(self) -> "GetPricesSchema":
+        """Check that at least one token symbol or price feed ID is given."""
+        if not self.token_symbols and not self.price_feed_ids:
+            raise ValueError("At least one token symbol or price feed ID is required")
+        return self
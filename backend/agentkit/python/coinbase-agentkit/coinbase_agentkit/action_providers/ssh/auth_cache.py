@@ -0,0 +1,224 @@
+"""SSH Authentication Cache.
+
+This module implements process-wide caches for parsed private keys and loaded
+known_hosts files, so that repeated connections to the same server do not
+re-parse key material or re-read host key files.
+
+@module ssh/auth_cache
+"""
+
+import hashlib
+import os
+import threading
+from collections.abc import Callable
+
+import paramiko
+
+
+def _digest(*parts: str | None) -> str:
+    """Compute a stable digest for a set of string parts.
+
+    Args:
+        parts: Strings to include in the digest (None is treated as empty)
+
+    Returns:
+        str: Hex encoded SHA-256 digest
+
+    """
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update((part or "").encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _file_signature(path: str) -> tuple[str, int, int] | None:
+    """Get a signature identifying the current version of a file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        tuple[str, int, int] | None: Real path, mtime in nanoseconds and size,
+            or None if the file cannot be accessed
+
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class SSHKeyCache:
+    """Caches parsed private keys.
+
+    Keys provided as strings are cached by a digest of their content, and keys
+    loaded from files are cached by path, modification time and size so that
+    edits to the key file invalidate the cached entry.
+    """
+
+    def __init__(self):
+        """Initialize an empty key cache."""
+        self._keys: dict[tuple, paramiko.PKey] = {}
+        self._lock = threading.Lock()
+
+    def get_from_string(
+        self,
+        key_string: str,
+        password: str | None,
+        loader: Callable[[], paramiko.PKey],
+    ) -> paramiko.PKey:
+        """Get a parsed key for key content, parsing it on a cache miss.
+
+        Args:
+            key_string: Private key content as a string
+            password: Optional password for encrypted keys
+            loader: Callable that parses the key
+
+        Returns:
+            paramiko.PKey: The parsed key
+
+        """
+        return self._get(("string", _digest(key_string, password)), loader)
+
+    def get_from_file(
+        self,
+        key_path: str,
+        password: str | None,
+        loader: Callable[[], paramiko.PKey],
+    ) -> paramiko.PKey:
+        """Get a parsed key for a key file, parsing it on a cache miss.
+
+        Files that cannot be stat'ed are never cached.
+
+        Args:
+            key_path: Path to the key file
+            password: Optional password for encrypted keys
+            loader: Callable that parses the key
+
+        Returns:
+            paramiko.PKey: The parsed key
+
+        """
+        signature = _file_signature(key_path)
+        if signature is None:
+            return loader()
+
+        return self._get(("file", *signature, _digest(password)), loader)
+
+    def clear(self) -> None:
+        """Remove all cached keys."""
+        with self._lock:
+            self._keys.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached keys.
+
+        Returns:
+            int: Number of cached keys
+
+        """
+        return len(self._keys)
+
+    def _get(self, cache_key: tuple, loader: Callable[[], paramiko.PKey]) -> paramiko.PKey:
+        """Get a cached key or load and store it.
+
+        Args:
+            cache_key: Key identifying the cache entry
+            loader: Callable that parses the key
+
+        Returns:
+            paramiko.PKey: The parsed key
+
+        """
+        with self._lock:
+            cached = self._keys.get(cache_key)
+        if cached is not None:
+            return cached
+
+        key = loader()
+        with self._lock:
+            self._keys[cache_key] = key
+        return key
+
+
+class HostKeyCache:
+    """Caches loaded known_hosts files.
+
+    Each file is parsed once and re-read only when its modification time or
+    size changes, e.g. after a host key is added with ssh_add_host_key.
+    """
+
+    def __init__(self):
+        """Initialize an empty host key cache."""
+        self._host_keys: dict[str, tuple[tuple[str, int, int], paramiko.HostKeys]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> paramiko.HostKeys | None:
+        """Get the host keys stored in a known_hosts file.
+
+        Args:
+            path: Path to the known_hosts file
+
+        Returns:
+            paramiko.HostKeys | None: The loaded host keys, or None if the file
+                cannot be read
+
+        """
+        signature = _file_signature(path)
+        if signature is None:
+            return None
+
+        with self._lock:
+            cached = self._host_keys.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            host_keys = paramiko.HostKeys(path)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        with self._lock:
+            self._host_keys[path] = (signature, host_keys)
+        return host_keys
+
+    def load_into(self, ssh_client: paramiko.SSHClient, path: str, system: bool = False) -> bool:
+        """Add the host keys from a known_hosts file to an SSH client.
+
+        Args:
+            ssh_client: The SSH client to receive the host keys
+            path: Path to the known_hosts file
+            system: Whether to add the keys to the read-only system host keys, like
+                load_system_host_keys, so save_host_keys never writes them back
+
+        Returns:
+            bool: Whether the file was found and loaded
+
+        """
+        host_keys = self.get(path)
+        if host_keys is None:
+            return False
+
+        # paramiko keeps system host keys in a separate set, without a public accessor
+        client_host_keys = ssh_client._system_host_keys if system else ssh_client.get_host_keys()
+        for hostname in host_keys:
+            for key_type, key in host_keys[hostname].items():
+                client_host_keys.add(hostname, key_type, key)
+        return True
+
+    def clear(self) -> None:
+        """Remove all cached host key files."""
+        with self._lock:
+            self._host_keys.clear()
+
+
+key_cache = SSHKeyCache()
+host_key_cache = HostKeyCache()
+
+
+def clear_auth_caches() -> None:
+    """Clear the shared key and host key caches."""
+    key_cache.clear()
+    host_key_cache.clear()
@@ -14,6 +14,10 @@ from datetime import datetime
 import paramiko
 from pydantic import BaseModel, Field, model_validator
 
+from .auth_cache import host_key_cache, key_cache
+
+SYSTEM_KNOWN_HOSTS_FILE = "~/.ssh/known_hosts"
+
 
 class SSHConnectionParams(BaseModel):
     """Validates SSH connection parameters."""
@@ -128,6 +132,9 @@ class SSHConnection:
 
         self.ssh_client = None
 
+        self._auth_key = None
+        self._can_reconnect = False
+
     def is_connected(self) -> bool:
         """Check if there's an active SSH connection.
 
@@ -206,26 +213,107 @@ class SSHConnection:
                     password=params.password,
                 )
 
-            _, stdout, stderr = self.ssh_client.exec_command(
-                'echo "Connection successful"', timeout=5
-            )
-            result = stdout.read().decode().strip()
+            self._verify_connection()
+
+        except UnknownHostKeyError:
+            self.reset_connection()
+            raise
+
+    def reconnect(self) -> None:
+        """Re-establish a dropped SSH connection.
 
-            if result != "Connection successful":
-                e = stderr.read().decode().strip()
-                self.connected = False
-                raise SSHConnectionError(f"Connection test failed: {e!s}")
+        Reuses the private key parsed during the previous connection, so only the
+        network handshake is repeated.
 
-            self.connected = True
-            self.connection_time = datetime.now()
+        Raises:
+            SSHConnectionError: If the connection fails
+            UnknownHostKeyError: If the host key is not recognized
+
+        """
+        params = self.params
+        if self._auth_key is None:
+            self.connect()
+            return
 
+        try:
+            self.connect_with_key(params.host, params.username, self._auth_key, params.port)
+            self._verify_connection()
         except UnknownHostKeyError:
             self.reset_connection()
             raise
 
+    def _verify_connection(self) -> None:
+        """Verify a freshly authenticated connection by running a test command.
+
+        Raises:
+            SSHConnectionError: If the test command fails
+
+        """
+        _, stdout, stderr = self.ssh_client.exec_command('echo "Connection successful"', timeout=5)
+        result = stdout.read().decode().strip()
+
+        if result != "Connection successful":
+            e = stderr.read().decode().strip()
+            self.connected = False
+            raise SSHConnectionError(f"Connection test failed: {e!s}")
+
+        self.connected = True
+        self.connection_time = datetime.now()
+        self._can_reconnect = True
+
+    def _ensure_connected(self) -> bool:
+        """Check the connection, transparently re-establishing it if it dropped.
+
+        A connection is only re-established if it was previously connected and
+        has not been explicitly disconnected since.
+
+        Returns:
+            bool: Whether there is an active connection
+
+        Raises:
+            UnknownHostKeyError: If the host key changed since the connection dropped
+
+        """
+        if self.is_connected():
+            return True
+
+        if not self._can_reconnect:
+            return False
+
+        try:
+            self.reconnect()
+        except UnknownHostKeyError:
+            raise
+        except SSHConnectionError:
+            return False
+
+        return self.connected
+
     def _load_key_from_string(self, key_string: str, password: str | None = None) -> paramiko.PKey:
         """Load a private key from a string.
 
+        Parsed keys are cached by content, so a key is only parsed once per process.
+
+        Args:
+            key_string: Private key content as a string
+            password: Optional password for encrypted keys
+
+        Returns:
+            paramiko.PKey: The loaded key
+
+        Raises:
+            SSHKeyError: If there's an issue with the key
+
+        """
+        return key_cache.get_from_string(
+            key_string,
+            password,
+            lambda: self._parse_key_from_string(key_string, password=password),
+        )
+
+    def _parse_key_from_string(self, key_string: str, password: str | None = None) -> paramiko.PKey:
+        """Parse a private key from a string.
+
         This method attempts to load the key as different formats (RSA, DSS, ECDSA, Ed25519)
         until one succeeds. RSA keys are tried first for test compatibility.
 
@@ -272,15 +360,21 @@ class SSHConnection:
         raise SSHKeyError("Key format not supported or invalid key data")
 
     def _init_ssh_client(self):
-        """Initialize the SSH client with appropriate host key settings."""
+        """Initialize the SSH client with appropriate host key settings.
+
+        Host keys are taken from the shared host key cache, which only re-reads a
+        known_hosts file after it changes.
+        """
         self.ssh_client = paramiko.SSHClient()
-        self.ssh_client.load_system_host_keys()
+        host_key_cache.load_into(
+            self.ssh_client, os.path.expanduser(SYSTEM_KNOWN_HOSTS_FILE), system=True
+        )
 
         if self.known_hosts_file:
             try:
                 known_hosts_path = os.path.expanduser(self.known_hosts_file)
                 if os.path.exists(known_hosts_path):
-                    self.ssh_client.load_host_keys(known_hosts_path)
+                    host_key_cache.load_into(self.ssh_client, known_hosts_path)
             except Exception as e:
                 print(f"Warning: Failed to load known_hosts file: {e!s}")
 
@@ -307,7 +401,8 @@ class SSHConnection:
 
         """
         try:
-            self.disconnect()
+            # Only tear down the client, so a failed reconnect can still be retried
+            self.reset_connection()
             self._init_ssh_client()
 
             if isinstance(private_key, str):
@@ -318,6 +413,7 @@ class SSHConnection:
             self.ssh_client.connect(
                 hostname=host, username=username, pkey=key_obj, port=port, timeout=timeout
             )
+            self._auth_key = key_obj
         except SSHKeyError:
             raise
         except UnknownHostKeyError:
@@ -366,6 +462,29 @@ class SSHConnection:
     def _load_key_from_file(self, key_path: str, password: str | None = None) -> paramiko.PKey:
         """Load a private key from a file.
 
+        Parsed keys are cached by path, modification time and size, so a key file is
+        only parsed again after it changes.
+
+        Args:
+            key_path: Path to the key file
+            password: Optional password for encrypted keys
+
+        Returns:
+            paramiko.PKey: The loaded key
+
+        Raises:
+            SSHKeyError: If there's an issue with the key file
+
+        """
+        return key_cache.get_from_file(
+            key_path,
+            password,
+            lambda: self._parse_key_from_file(key_path, password=password),
+        )
+
+    def _parse_key_from_file(self, key_path: str, password: str | None = None) -> paramiko.PKey:
+        """Parse a private key from a file.
+
         This method attempts to load the key as different formats (RSA, DSS, ECDSA, Ed25519)
         until one succeeds. RSA keys are tried first for test compatibility.
 
@@ -430,7 +549,8 @@ class SSHConnection:
 
         """
         try:
-            self.disconnect()
+            # Only tear down the client, so a failed reconnect can still be retried
+            self.reset_connection()
             self._init_ssh_client()
             self.ssh_client.connect(
                 hostname=host, username=username, password=password, port=port, timeout=timeout
@@ -453,10 +573,11 @@ class SSHConnection:
 
         Raises:
             SSHConnectionError: If connection is lost or command execution fails
+            UnknownHostKeyError: If the host key changed since the connection dropped
 
         """
         params = self.params
-        if not self.is_connected():
+        if not self._ensure_connected():
             raise SSHConnectionError(
                 f"No active SSH connection for {params.connection_id}. Please connect first."
             )
@@ -494,12 +615,13 @@ class SSHConnection:
             ) from e
 
     def disconnect(self) -> None:
-        """Close SSH connection.
+        """Close SSH connection, and stop it from being re-established automatically.
 
         Raises:
             SSHConnectionError: If disconnection fails
 
         """
+        self._can_reconnect = False
         self.reset_connection()
 
     def get_connection_info(self) -> str:
@@ -541,9 +663,10 @@ class SSHConnection:
 
         Raises:
             SSHConnectionError: If there's no active connection or SFTP initialization fails
+            UnknownHostKeyError: If the host key changed since the connection dropped
 
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             raise SSHConnectionError("No active SSH connection. Please connect first.")
 
         try:
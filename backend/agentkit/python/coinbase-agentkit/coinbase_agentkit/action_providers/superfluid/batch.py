@@ -0,0 +1,308 @@
+"""Batching of Superfluid flow operations into one host batchCall transaction.
+
+Each operation becomes a call of the constant flow agreement through the host,
+so creating, updating and deleting many flows takes a single transaction. The
+host and agreement addresses are read from the chain once and kept.
+"""
+
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from eth_abi import encode
+from pydantic import BaseModel
+from web3 import Web3
+
+from ...wallet_providers import EvmWalletProvider
+from .constants import (
+    CFA_V1_ABI,
+    CFA_V1_TYPE,
+    FLOW_OPERATION_GAS,
+    HOST_ABI,
+    MAX_BATCH_OPERATIONS,
+    MAX_FLOW_RATE,
+    OPERATION_TYPE_SUPERFLUID_CALL_AGREEMENT,
+    SUPER_TOKEN_ABI,
+)
+
+_cfa_contract = Web3().eth.contract(abi=CFA_V1_ABI)
+_host_contract = Web3().eth.contract(abi=HOST_ABI)
+
+# Intrinsic gas of a transaction, paid once per transaction
+TRANSACTION_GAS = 21_000
+
+
+@dataclass(frozen=True)
+class FlowOperation:
+    """A validated flow operation of the sender, with checksummed addresses."""
+
+    operation: str
+    token: str
+    receiver: str
+    flow_rate: int | None = None
+
+
+@dataclass(frozen=True)
+class FlowBatch:
+    """A host batchCall transaction and its gas estimates."""
+
+    host: str
+    agreement: str
+    operations: list[FlowOperation]
+    data: str
+    estimated_gas: int
+    separate_estimated_gas: int
+
+
+def validate_operations(sender: str, operations: Sequence[dict]) -> list[FlowOperation]:
+    """Validate flow operations before encoding them.
+
+    All problems are collected so that they can be fixed in one go.
+
+    Args:
+        sender: The address of the wallet sending the flows.
+        operations: The operations, with operation, recipient, token_address and flow_rate,
+            as dicts or parsed schemas.
+
+    Returns:
+        list[FlowOperation]: The operations, in order.
+
+    Raises:
+        ValueError: If any operation is invalid, listing every problem.
+
+    """
+    problems = []
+    if not operations:
+        problems.append("at least one operation is required")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        problems.append(f"at most {MAX_BATCH_OPERATIONS} operations fit in one batch")
+
+    validated = []
+    seen = {}
+    for number, op in enumerate(operations, start=1):
+        if isinstance(op, BaseModel):
+            op = op.model_dump()
+        errors = []
+        operation = op.get("operation")
+        if operation not in FLOW_OPERATION_GAS:
+            errors.append(f"unknown operation {operation!r}, use create, update or delete")
+
+        addresses = {}
+        for field in ("token_address", "recipient"):
+            value = op.get(field)
+            if not isinstance(value, str) or not Web3.is_address(value):
+                errors.append(f"{field} {value!r} is not a valid address")
+            else:
+                addresses[field] = Web3.to_checksum_address(value)
+
+        recipient = addresses.get("recipient")
+        if recipient is not None and recipient.lower() == sender.lower():
+            errors.append("the recipient is the sender")
+
+        flow_rate = None
+        if operation in ("create", "update"):
+            flow_rate = _parse_flow_rate(op.get("flow_rate"), errors)
+
+        if len(addresses) == 2:
+            key = (addresses["token_address"].lower(), addresses["recipient"].lower())
+            if key in seen:
+                errors.append(f"the flow is also changed by operation {seen[key]}")
+            else:
+                seen[key] = number
+
+        if errors:
+            problems.extend(f"operation {number}: {error}" for error in errors)
+        else:
+            validated.append(
+                FlowOperation(
+                    operation=operation,
+                    token=addresses["token_address"],
+                    receiver=recipient,
+                    flow_rate=flow_rate,
+                )
+            )
+
+    if problems:
+        raise ValueError("Invalid flow operations:\n" + "\n".join(f"- {p}" for p in problems))
+    return validated
+
+
+def _parse_flow_rate(value, errors: list[str]) -> int | None:
+    """Parse a flow rate in wei per second, recording why it is invalid."""
+    if value is None:
+        errors.append("flow_rate is required")
+        return None
+    try:
+        flow_rate = int(str(value))
+    except ValueError:
+        errors.append(f"flow_rate {value!r} must be a whole number of wei per second")
+        return None
+    if not 0 < flow_rate <= MAX_FLOW_RATE:
+        errors.append(f"flow_rate {flow_rate} must be positive and fit in an int96")
+        return None
+    return flow_rate
+
+
+def encode_operation(agreement: str, sender: str, operation: FlowOperation) -> tuple:
+    """Encode a flow operation as a host batchCall agreement call.
+
+    Args:
+        agreement: The address of the constant flow agreement.
+        sender: The address of the wallet sending the flows.
+        operation: The flow operation.
+
+    Returns:
+        tuple: The operation type, target and data of the batchCall operation.
+
+    """
+    if operation.operation == "delete":
+        args = [operation.token, sender, operation.receiver, b""]
+    else:
+        args = [operation.token, operation.receiver, operation.flow_rate, b""]
+    call_data = _cfa_contract.encode_abi(f"{operation.operation}Flow", args=args)
+    data = encode(["bytes", "bytes"], [bytes.fromhex(call_data[2:]), b""])
+    return (OPERATION_TYPE_SUPERFLUID_CALL_AGREEMENT, agreement, data)
+
+
+def calldata_gas(data: bytes) -> int:
+    """Gas paid for transaction calldata, 4 per zero byte and 16 per other byte."""
+    return sum(4 if byte == 0 else 16 for byte in data)
+
+
+class SuperfluidBatcher:
+    """Builds flow batches, keeping the host of each Super Token and its flow agreement."""
+
+    def __init__(self):
+        """Initialize the batcher."""
+        self.rpc_calls = 0
+        self._hosts: dict[tuple[int | str, str], str] = {}
+        self._agreements: dict[tuple[int | str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Forget all hosts and agreements and reset the call counter."""
+        with self._lock:
+            self._hosts.clear()
+            self._agreements.clear()
+            self.rpc_calls = 0
+
+    def get_host(self, wallet_provider: EvmWalletProvider, token: str) -> str:
+        """Get the Superfluid host of a Super Token, reading it the first time.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            token: The Super Token address.
+
+        Returns:
+            str: The checksummed host address.
+
+        Raises:
+            ValueError: If the token is not a Super Token.
+
+        """
+        key = (wallet_provider.get_network().chain_id, token.lower())
+        with self._lock:
+            host = self._hosts.get(key)
+        if host is None:
+            try:
+                host = self._read(wallet_provider, token, SUPER_TOKEN_ABI, "getHost")
+            except Exception as e:
+                raise ValueError(f"{token} is not a Superfluid Super Token: {e!s}") from e
+            host = Web3.to_checksum_address(host)
+            with self._lock:
+                self._hosts[key] = host
+        return host
+
+    def get_agreement(self, wallet_provider: EvmWalletProvider, host: str) -> str:
+        """Get the constant flow agreement registered on a host, reading it the first time.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            host: The host address.
+
+        Returns:
+            str: The checksummed agreement address.
+
+        """
+        key = (wallet_provider.get_network().chain_id, host.lower())
+        with self._lock:
+            agreement = self._agreements.get(key)
+        if agreement is None:
+            agreement = Web3.to_checksum_address(
+                self._read(
+                    wallet_provider,
+                    host,
+                    HOST_ABI,
+                    "getAgreementClass",
+                    [Web3.keccak(text=CFA_V1_TYPE)],
+                )
+            )
+            with self._lock:
+                self._agreements[key] = agreement
+        return agreement
+
+    def build(self, wallet_provider: EvmWalletProvider, operations: Sequence[dict]) -> FlowBatch:
+        """Validate flow operations and encode them into one host batchCall.
+
+        Args:
+            wallet_provider: The wallet provider sending the flows.
+            operations: The operations, with operation, recipient, token_address and flow_rate.
+
+        Returns:
+            FlowBatch: The batch transaction and its gas estimates.
+
+        Raises:
+            ValueError: If an operation is invalid or the tokens have different hosts.
+
+        """
+        sender = Web3.to_checksum_address(wallet_provider.get_address())
+        validated = validate_operations(sender, operations)
+
+        hosts = {op.token: self.get_host(wallet_provider, op.token) for op in validated}
+        if len(set(hosts.values())) > 1:
+            raise ValueError(
+                "The tokens belong to different Superfluid hosts and cannot share a batch: "
+                + ", ".join(f"{token} on {host}" for token, host in hosts.items())
+            )
+        host = next(iter(hosts.values()))
+        agreement = self.get_agreement(wallet_provider, host)
+
+        batch_operations = [encode_operation(agreement, sender, op) for op in validated]
+        data = _host_contract.encode_abi("batchCall", args=[batch_operations])
+
+        operation_gas = sum(FLOW_OPERATION_GAS[op.operation] for op in validated)
+        separate_calldata_gas = sum(
+            calldata_gas(bytes.fromhex(_host_contract.encode_abi("batchCall", args=[[o]])[2:]))
+            for o in batch_operations
+        )
+        return FlowBatch(
+            host=host,
+            agreement=agreement,
+            operations=validated,
+            data=data,
+            estimated_gas=TRANSACTION_GAS + calldata_gas(bytes.fromhex(data[2:])) + operation_gas,
+            separate_estimated_gas=TRANSACTION_GAS * len(validated)
+            + separate_calldata_gas
+            + operation_gas,
+        )
+
+    def _read(
+        self,
+        wallet_provider: EvmWalletProvider,
+        address: str,
+        abi: list,
+        function_name: str,
+        args: list | None = None,
+    ):
+        with self._lock:
+            self.rpc_calls += 1
+        return wallet_provider.read_contract(
+            contract_address=address,
+            abi=abi,
+            function_name=function_name,
+            args=args or [],
+        )
+
+
+# Shared by the Superfluid action provider instances
+flow_batcher = SuperfluidBatcher()
@@ -60,3 +60,137 @@ DELETE_ABI = [
         "type": "function",
     }
 ]
+
+# Constant flow agreement, called through the host to batch flow operations
+CFA_V1_ABI = [
+    {
+        "inputs": [
+            {"internalType": "contract ISuperfluidToken", "name": "token", "type": "address"},
+            {"internalType": "address", "name": "receiver", "type": "address"},
+            {"internalType": "int96", "name": "flowRate", "type": "int96"},
+            {"internalType": "bytes", "name": "ctx", "type": "bytes"},
+        ],
+        "name": "createFlow",
+        "outputs": [{"internalType": "bytes", "name": "newCtx", "type": "bytes"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "contract ISuperfluidToken", "name": "token", "type": "address"},
+            {"internalType": "address", "name": "receiver", "type": "address"},
+            {"internalType": "int96", "name": "flowRate", "type": "int96"},
+            {"internalType": "bytes", "name": "ctx", "type": "bytes"},
+        ],
+        "name": "updateFlow",
+        "outputs": [{"internalType": "bytes", "name": "newCtx", "type": "bytes"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "contract ISuperfluidToken", "name": "token", "type": "address"},
+            {"internalType": "address", "name": "sender", "type": "address"},
+            {"internalType": "address", "name": "receiver", "type": "address"},
+            {"internalType": "bytes", "name": "ctx", "type": "bytes"},
+        ],
+        "name": "deleteFlow",
+        "outputs": [{"internalType": "bytes", "name": "newCtx", "type": "bytes"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "contract ISuperfluidToken", "name": "token", "type": "address"},
+            {"internalType": "address", "name": "account", "type": "address"},
+        ],
+        "name": "getNetFlow",
+        "outputs": [{"internalType": "int96", "name": "flowRate", "type": "int96"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+HOST_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "uint32", "name": "operationType", "type": "uint32"},
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bytes", "name": "data", "type": "bytes"},
+                ],
+                "internalType": "struct ISuperfluid.Operation[]",
+                "name": "operations",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "batchCall",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [{"internalType": "bytes32", "name": "agreementType", "type": "bytes32"}],
+        "name": "getAgreementClass",
+        "outputs": [{"internalType": "contract ISuperAgreement", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+SUPER_TOKEN_ABI = [
+    {
+        "inputs": [],
+        "name": "getHost",
+        "outputs": [{"internalType": "address", "name": "host", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
+        "name": "realtimeBalanceOfNow",
+        "outputs": [
+            {"internalType": "int256", "name": "availableBalance", "type": "int256"},
+            {"internalType": "uint256", "name": "deposit", "type": "uint256"},
+            {"internalType": "uint256", "name": "owedDeposit", "type": "uint256"},
+            {"internalType": "uint256", "name": "timestamp", "type": "uint256"},
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "symbol",
+        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+# Agreement type of the constant flow agreement, hashed with keccak256 to look it up on the host
+CFA_V1_TYPE = "org.superfluid-finance.agreements.ConstantFlowAgreement.v1"
+
+# Host batchCall operation type of an agreement call
+OPERATION_TYPE_SUPERFLUID_CALL_AGREEMENT = 201
+
+MAX_BATCH_OPERATIONS = 50
+
+# Largest flow rate an int96 can hold
+MAX_FLOW_RATE = 2**95 - 1
+
+# Approximate gas used by each flow operation, excluding calldata and the
+# intrinsic transaction gas, for gas estimates made without a node
+FLOW_OPERATION_GAS = {"create": 200_000, "update": 120_000, "delete": 150_000}
+
+# Maximum age in seconds of a reused flow state, about one block
+FLOW_STATE_MAX_AGE = 2.0
+
+MAX_FLOW_STATE_TOKENS = 20
@@ -0,0 +1,246 @@
+"""Snapshots of the Superfluid streams of an account, with local balance projection.
+
+Balances of Super Tokens change every second while flows run, but only linearly
+at the net flow rate. A snapshot of the balances and net flow rates at one block
+is enough to project balances and the time until they run out without polling.
+"""
+
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from web3 import Web3
+
+from ...wallet_providers import EvmWalletProvider
+from ..multicall import aggregate, block_number_call, multicall_call
+from .batch import SuperfluidBatcher, flow_batcher
+from .constants import CFA_V1_ABI, FLOW_STATE_MAX_AGE, SUPER_TOKEN_ABI
+
+_cfa_contract = Web3().eth.contract(abi=CFA_V1_ABI)
+_token_contract = Web3().eth.contract(abi=SUPER_TOKEN_ABI)
+
+
+@dataclass(frozen=True)
+class TokenFlowState:
+    """The balance and net flow rate of an account in one Super Token.
+
+    Amounts are atomic. The available balance excludes the deposits held for
+    outgoing flows and is negative once the account is critical. The net flow
+    rate is in atomic units per second, negative when more flows out than in.
+    """
+
+    token: str
+    symbol: str
+    decimals: int
+    available_balance: int
+    deposit: int
+    owed_deposit: int
+    net_flow_rate: int
+    timestamp: int
+
+    def balance_at(self, timestamp: int) -> int:
+        """Project the available balance at a time.
+
+        Args:
+            timestamp: The unix time to project to.
+
+        Returns:
+            int: The atomic available balance.
+
+        """
+        return self.available_balance + self.net_flow_rate * (timestamp - self.timestamp)
+
+    def seconds_until_zero(self) -> int | None:
+        """Get the seconds from the snapshot until the available balance runs out.
+
+        Outgoing flows become liquidatable when the available balance reaches zero.
+
+        Returns:
+            int | None: The seconds, 0 if already run out, or None if the balance is
+                not decreasing.
+
+        """
+        if self.net_flow_rate >= 0:
+            return None
+        if self.available_balance <= 0:
+            return 0
+        return -(-self.available_balance // -self.net_flow_rate)
+
+    def to_units(self, atomic_amount: int) -> Decimal:
+        """Convert an atomic amount of the token to whole units."""
+        return Decimal(atomic_amount) / Decimal(10**self.decimals)
+
+
+@dataclass
+class AccountFlowState:
+    """The Superfluid streams of an account in several Super Tokens at one block."""
+
+    account: str
+    block_number: int
+    tokens: list[TokenFlowState]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        """Get the age of the snapshot.
+
+        Returns:
+            float: Seconds since the snapshot was loaded.
+
+        """
+        return time.monotonic() - self.fetched_at
+
+
+@dataclass
+class FlowStateMetrics:
+    """Counters of a flow state reader."""
+
+    hits: int = 0
+    misses: int = 0
+    rpc_calls: int = 0
+
+
+class SuperfluidFlowStateReader:
+    """Reads and caches the flow states of accounts by chain, account and tokens.
+
+    A state is reused for max_age seconds, about one block. Loading a state takes
+    one Multicall3 call for the balances and net flow rates of all tokens at one
+    block. The symbol and decimals of a token are read with it the first time and
+    kept, and the host and flow agreement of a token come from the batcher.
+    """
+
+    def __init__(
+        self, batcher: SuperfluidBatcher = flow_batcher, max_age: float = FLOW_STATE_MAX_AGE
+    ):
+        """Initialize the reader.
+
+        Args:
+            batcher: The batcher resolving the flow agreement of each token.
+            max_age: Maximum age in seconds of a reused state.
+
+        """
+        self.batcher = batcher
+        self.max_age = max_age
+        self.metrics = FlowStateMetrics()
+        self._states: dict[tuple, AccountFlowState] = {}
+        self._tokens: dict[tuple[int | str, str], tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        wallet_provider: EvmWalletProvider,
+        account: str,
+        token_addresses: Sequence[str],
+        max_age: float | None = None,
+    ) -> AccountFlowState:
+        """Get the flow state of an account, loading it when the cached one is too old.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            account: The account address.
+            token_addresses: The Super Token addresses.
+            max_age: Optional maximum age in seconds of a reused state, overriding max_age.
+
+        Returns:
+            AccountFlowState: The flow state, with the tokens in the order given.
+
+        """
+        max_age = self.max_age if max_age is None else max_age
+        account = Web3.to_checksum_address(account)
+        tokens = list(dict.fromkeys(Web3.to_checksum_address(t) for t in token_addresses))
+        key = (
+            wallet_provider.get_network().chain_id,
+            account.lower(),
+            tuple(token.lower() for token in tokens),
+        )
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and state.age() < max_age:
+                self.metrics.hits += 1
+                return state
+            self.metrics.misses += 1
+
+        state = self._load(wallet_provider, account, tokens)
+        with self._lock:
+            self._states[key] = state
+        return state
+
+    def clear(self) -> None:
+        """Forget all states and tokens and reset the metrics."""
+        with self._lock:
+            self._states.clear()
+            self._tokens.clear()
+            self.metrics = FlowStateMetrics()
+
+    def _load(
+        self, wallet_provider: EvmWalletProvider, account: str, tokens: list[str]
+    ) -> AccountFlowState:
+        """Load the flow state of an account with one Multicall3 call."""
+        chain_id = wallet_provider.get_network().chain_id
+        agreements = {
+            token: self.batcher.get_agreement(
+                wallet_provider, self.batcher.get_host(wallet_provider, token)
+            )
+            for token in tokens
+        }
+        with self._lock:
+            known = {token: self._tokens.get((chain_id, token.lower())) for token in tokens}
+
+        def token_call(token: str, function_name: str, args: list | None = None) -> tuple:
+            return (
+                multicall_call(token, _token_contract, function_name, args),
+                _token_contract,
+                function_name,
+            )
+
+        calls = [block_number_call()]
+        for token in tokens:
+            calls.append(token_call(token, "realtimeBalanceOfNow", [account]))
+            calls.append(
+                (
+                    multicall_call(
+                        agreements[token], _cfa_contract, "getNetFlow", [token, account]
+                    ),
+                    _cfa_contract,
+                    "getNetFlow",
+                )
+            )
+            if known[token] is None:
+                calls.append(token_call(token, "symbol"))
+                calls.append(token_call(token, "decimals"))
+
+        with self._lock:
+            self.metrics.rpc_calls += 1
+        (block_number,), *results = aggregate(wallet_provider, calls)
+        results = iter(results)
+
+        token_states = []
+        for token in tokens:
+            available_balance, deposit, owed_deposit, timestamp = next(results)
+            (net_flow_rate,) = next(results)
+            if known[token] is None:
+                (symbol,), (decimals,) = next(results), next(results)
+                known[token] = (symbol, decimals)
+                with self._lock:
+                    self._tokens[(chain_id, token.lower())] = known[token]
+            symbol, decimals = known[token]
+            token_states.append(
+                TokenFlowState(
+                    token=token,
+                    symbol=symbol,
+                    decimals=decimals,
+                    available_balance=available_balance,
+                    deposit=deposit,
+                    owed_deposit=owed_deposit,
+                    net_flow_rate=net_flow_rate,
+                    timestamp=timestamp,
+                )
+            )
+
+        return AccountFlowState(account=account, block_number=block_number, tokens=token_states)
+
+
+# Shared by the Superfluid action provider instances
+flow_states = SuperfluidFlowStateReader()
@@ -1,7 +1,11 @@
 """Schemas for Superfluid action provider."""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+from .constants import MAX_BATCH_OPERATIONS, MAX_FLOW_STATE_TOKENS
+
 
 class CreateFlowSchema(BaseModel):
     """Input argument schema for creating a flow."""
@@ -24,3 +28,51 @@ class UpdateFlowSchema(BaseModel):
     recipient: str = Field(..., description="The wallet address of the recipient")
     token_address: str = Field(..., description="The address of the token that is being streamed")
     new_flow_rate: str = Field(..., description="The new flow rate of tokens in wei per second")
+
+
+class FlowOperationSchema(BaseModel):
+    """Input argument schema for one operation of a flow batch."""
+
+    operation: Literal["create", "update", "delete"] = Field(
+        ..., description="Whether to create, update or delete the flow"
+    )
+    recipient: str = Field(..., description="The wallet address of the recipient")
+    token_address: str = Field(..., description="The address of the token being streamed")
+    flow_rate: str | None = Field(
+        None,
+        description="The flow rate of tokens in wei per second, required to create or update",
+    )
+
+
+class BatchFlowsSchema(BaseModel):
+    """Input argument schema for creating, updating and deleting flows in one transaction."""
+
+    operations: list[FlowOperationSchema] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_OPERATIONS,
+        description="The flow operations, applied in order",
+    )
+    dry_run: bool = Field(
+        False, description="Validate the operations and estimate gas without sending"
+    )
+
+
+class GetFlowStateSchema(BaseModel):
+    """Input argument schema for reading the streams of an account."""
+
+    token_addresses: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_FLOW_STATE_TOKENS,
+        description="The addresses of the Super Tokens to read",
+    )
+    account: str | None = Field(
+        None, description="The account to read, defaulting to the wallet address"
+    )
+
+
+class ProjectFlowBalanceSchema(GetFlowStateSchema):
+    """Input argument schema for projecting the balances of an account."""
+
+    hours: float = Field(..., gt=0, description="How many hours ahead to project the balances")
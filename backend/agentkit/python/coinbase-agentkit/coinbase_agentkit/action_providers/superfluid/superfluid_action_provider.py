@@ -1,5 +1,6 @@
 """Superfluid action provider."""
 
+from decimal import Decimal
 from typing import Any
 
 from web3 import Web3
@@ -8,8 +9,44 @@ from ...network import Network
 from ...wallet_providers import EvmWalletProvider
 from ..action_decorator import create_action
 from ..action_provider import ActionProvider
+from .batch import flow_batcher
 from .constants import CREATE_ABI, DELETE_ABI, SUPERFLUID_HOST_ADDRESS, UPDATE_ABI
-from .schemas import CreateFlowSchema, DeleteFlowSchema, UpdateFlowSchema
+from .flow_state import TokenFlowState, flow_states
+from .schemas import (
+    BatchFlowsSchema,
+    CreateFlowSchema,
+    DeleteFlowSchema,
+    GetFlowStateSchema,
+    ProjectFlowBalanceSchema,
+    UpdateFlowSchema,
+)
+
+SECONDS_PER_DAY = 86_400
+
+
+def _format_duration(seconds: int) -> str:
+    """Format a duration in days, hours and minutes."""
+    if seconds < 60:
+        return "less than a minute"
+    days, seconds = divmod(seconds, SECONDS_PER_DAY)
+    hours, seconds = divmod(seconds, 3_600)
+    parts = [(days, "d"), (hours, "h"), (seconds // 60, "m")]
+    return " ".join(f"{value}{unit}" for value, unit in parts if value)
+
+
+def _format_amount(state: TokenFlowState, atomic_amount: int) -> str:
+    """Format an atomic amount of a Super Token in whole units."""
+    return f"{state.to_units(atomic_amount):,.6f} {state.symbol}"
+
+
+def _format_runway(state: TokenFlowState, elapsed: int = 0) -> str:
+    """Describe when the available balance runs out, seen elapsed seconds after the snapshot."""
+    seconds = state.seconds_until_zero()
+    if seconds is None:
+        return "not decreasing"
+    if seconds <= elapsed:
+        return "run out"
+    return f"runs out in {_format_duration(seconds - elapsed)}"
 
 
 class SuperfluidActionProvider(ActionProvider[EvmWalletProvider]):
@@ -17,6 +54,8 @@ class SuperfluidActionProvider(ActionProvider[EvmWalletProvider]):
 
     def __init__(self):
         super().__init__("superfluid", [])
+        self.flow_batcher = flow_batcher
+        self.flow_states = flow_states
 
     @create_action(
         name="create_flow",
@@ -169,6 +208,162 @@ Inputs:
         except Exception as e:
             return f"Error deleting flow: {e!s}"
 
+    @create_action(
+        name="batch_flows",
+        description="""
+This tool will create, update and delete many Superfluid money flows in a single transaction. Use it instead of create_flow, update_flow and delete_flow when changing more than one flow.
+Inputs:
+- A list of operations, each with:
+  - operation: create, update or delete
+  - Wallet address of the recipient
+  - Super token contract address
+  - The flowrate in wei per second, for create and update
+- dry_run: true to only validate the operations and estimate gas
+Important notes:
+- All tokens must be Superfluid Super tokens on the same Superfluid host.
+- Each recipient and token pair can appear once per batch, and at most 50 operations fit in one batch.
+- The operations are validated before anything is sent, and either all of them apply or none do.
+- The flowrate cannot have any decimal points, since the unit of measurement is wei per second.""",
+        schema=BatchFlowsSchema,
+    )
+    def batch_flows(self, wallet_provider: EvmWalletProvider, args: dict[str, Any]) -> str:
+        """Create, update and delete flows with one Superfluid host batchCall.
+
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider instance.
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            batch = self.flow_batcher.build(wallet_provider, args["operations"])
+        except ValueError as e:
+            return f"Error: {e!s}"
+        except Exception as e:
+            return f"Error batching flows: {e!s}"
+
+        counts = {
+            name: sum(op.operation == name for op in batch.operations)
+            for name in ("create", "update", "delete")
+        }
+        summary = (
+            f"{len(batch.operations)} flow operations ({counts['create']} create, "
+            f"{counts['update']} update, {counts['delete']} delete)"
+        )
+        estimate = (
+            f"Estimated gas: ~{batch.estimated_gas:,}, "
+            f"against ~{batch.separate_estimated_gas:,} as separate transactions."
+        )
+
+        if args.get("dry_run"):
+            return f"Validated {summary} for one batchCall to {batch.host}.\n{estimate}"
+
+        try:
+            tx_hash = wallet_provider.send_transaction({"to": batch.host, "data": batch.data})
+
+            wallet_provider.wait_for_transaction_receipt(tx_hash)
+
+            return f"Batched {summary} in one transaction. Transaction hash: {tx_hash}\n{estimate}"
+
+        except Exception as e:
+            return f"Error batching flows: {e!s}"
+
+    @create_action(
+        name="get_flow_state",
+        description="""
+This tool will read the Superfluid streams of an account: the available balance, the deposit held for outgoing flows and the net flow rate of each Super token, and when the balance runs out.
+Inputs:
+- Super token contract addresses
+- Optional account address, defaulting to the wallet address
+Important notes:
+- The available balance excludes deposits. Outgoing flows can be liquidated when it runs out.
+- Flow rates are in wei per second. A negative net flow rate means more flows out than in.""",
+        schema=GetFlowStateSchema,
+    )
+    def get_flow_state(self, wallet_provider: EvmWalletProvider, args: dict[str, Any]) -> str:
+        """Read the balances and net flow rates of an account in Super Tokens.
+
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider instance.
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            state = self.flow_states.get(
+                wallet_provider,
+                args.get("account") or wallet_provider.get_address(),
+                args["token_addresses"],
+            )
+        except Exception as e:
+            return f"Error reading Superfluid streams: {e!s}"
+
+        lines = [f"Superfluid streams of {state.account} at block {state.block_number}:"]
+        for token in state.tokens:
+            daily_flow = token.net_flow_rate * SECONDS_PER_DAY
+            lines.append(
+                f"- {token.symbol} {token.token}: available balance "
+                f"{_format_amount(token, token.available_balance)} "
+                f"(deposit {_format_amount(token, token.deposit)}), "
+                f"net flow {token.net_flow_rate:+} wei/s "
+                f"({token.to_units(daily_flow):+,.6f} {token.symbol}/day), "
+                f"{_format_runway(token)}"
+            )
+        return "\n".join(lines)
+
+    @create_action(
+        name="project_flow_balance",
+        description="""
+This tool will project the Superfluid balances of an account some hours ahead from its current flow rates, and when each balance runs out.
+Inputs:
+- Super token contract addresses
+- Optional account address, defaulting to the wallet address
+- How many hours ahead to project
+Important notes:
+- Projections assume the flows do not change in the meantime.""",
+        schema=ProjectFlowBalanceSchema,
+    )
+    def project_flow_balance(self, wallet_provider: EvmWalletProvider, args: dict[str, Any]) -> str:
+        """Project the balances of an account in Super Tokens from its net flow rates.
+
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider instance.
+            args (dict[str, Any]): Input arguments for the action.
+
+        Returns:
+            str: A message containing the action response or error details.
+
+        """
+        try:
+            state = self.flow_states.get(
+                wallet_provider,
+                args.get("account") or wallet_provider.get_address(),
+                args["token_addresses"],
+            )
+        except Exception as e:
+            return f"Error projecting Superfluid balances: {e!s}"
+
+        hours = Decimal(str(args["hours"])).normalize()
+        elapsed = int(state.age())
+        ahead = int(hours * 3_600)
+        lines = [
+            f"Projected Superfluid balances of {state.account} in {hours:f}h "
+            f"(flows read at block {state.block_number}):"
+        ]
+        for token in state.tokens:
+            now = token.timestamp + elapsed
+            lines.append(
+                f"- {token.symbol} {token.token}: "
+                f"{_format_amount(token, token.balance_at(now))} now, "
+                f"{_format_amount(token, token.balance_at(now + ahead))} then, "
+                f"{_format_runway(token, elapsed)}"
+            )
+        return "\n".join(lines)
+
     def supports_network(self, network: Network) -> bool:
         """Check if network is supported by Superfluid actions.
 
@@ -0,0 +1,13 @@
+"""Constants for the Twitter action provider."""
+
+# Longest an action waits for rate limit quota before failing, in seconds
+RATE_LIMIT_MAX_WAIT = 60.0
+
+# Endpoints whose remaining quota is spread evenly over the rate limit window,
+# instead of being used in a burst that then blocks until the window resets
+PACED_ENDPOINTS = frozenset({"POST /2/tweets", "GET /2/users/:id/mentions"})
+
+# Endpoint keys of the API calls made by the actions
+ME_ENDPOINT = "GET /2/users/me"
+MENTIONS_ENDPOINT = "GET /2/users/:id/mentions"
+CREATE_TWEET_ENDPOINT = "POST /2/tweets"
@@ -0,0 +1,241 @@
+"""Scheduling of Twitter (X) API requests within their rate limit windows."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlparse
+
+from .constants import PACED_ENDPOINTS, RATE_LIMIT_MAX_WAIT
+
+
+class RateLimitExceededError(Exception):
+    """Raised when an endpoint has no quota left and its window resets after the maximum wait."""
+
+    def __init__(self, endpoint: str, wait_time: float):
+        """Initialize the error.
+
+        Args:
+            endpoint: The endpoint key, e.g. "POST /2/tweets".
+            wait_time: Seconds until the window of the endpoint resets.
+
+        """
+        super().__init__(
+            f"Rate limit for {endpoint} exhausted, quota resets in {max(wait_time, 0):.0f} seconds"
+        )
+        self.endpoint = endpoint
+        self.wait_time = wait_time
+
+
+@dataclass
+class RateLimitWindow:
+    """The quota of one endpoint in its current rate limit window."""
+
+    limit: int
+    remaining: int
+    reset: float
+    last_request: float = 0.0
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Get the endpoint key of a request, with numeric IDs in the path replaced by ":id".
+
+    Args:
+        method: The HTTP method.
+        url: The request URL.
+
+    Returns:
+        str: The endpoint key, e.g. "GET /2/users/:id/mentions".
+
+    """
+    # The first segment is the API version, e.g. "2"
+    version, *segments = urlparse(url).path.strip("/").split("/")
+    segments = [":id" if segment.isdigit() else segment for segment in segments]
+    return f"{method.upper()} /{'/'.join([version, *segments])}"
+
+
+class RateLimitScheduler:
+    """Tracks the rate limit quota of each endpoint and schedules requests within it.
+
+    Quotas are read from the x-rate-limit-* headers of every response, so the
+    scheduler is attached to the HTTP session of the client as a response hook.
+    Before a request, acquire waits until the endpoint has quota: until the window
+    resets when it has none left, and for paced endpoints until the remaining
+    quota spread evenly over the rest of the window allows another request.
+    Pacing only smooths bursts, so it never delays a request by more than
+    max_wait. Requests to the same endpoint are queued behind each other while
+    they wait.
+    Endpoints without a known quota are not delayed.
+    """
+
+    def __init__(
+        self,
+        max_wait: float = RATE_LIMIT_MAX_WAIT,
+        paced_endpoints: frozenset[str] = PACED_ENDPOINTS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_wait: Longest acquire waits for an exhausted endpoint before raising
+                RateLimitExceededError, and the longest pacing delay.
+            paced_endpoints: Endpoints whose remaining quota is spread over the window.
+            clock: Returns the current Unix time, as the reset headers use it.
+            sleep: Sleeps for a number of seconds.
+
+        """
+        self.max_wait = max_wait
+        self.paced_endpoints = paced_endpoints
+        self.clock = clock
+        self.sleep = sleep
+        self.windows: dict[str, RateLimitWindow] = {}
+        self._lock = threading.Lock()
+        self._endpoint_locks: dict[str, threading.Lock] = {}
+
+    def record(self, endpoint: str, headers: Any, status_code: int = 200) -> None:
+        """Update the quota of an endpoint from response headers.
+
+        Args:
+            endpoint: The endpoint key.
+            headers: The response headers.
+            status_code: The response status. A 429 means no quota is left.
+
+        """
+        if "x-rate-limit-reset" not in headers:
+            return
+
+        reset = float(headers["x-rate-limit-reset"])
+        with self._lock:
+            window = self.windows.get(endpoint)
+            limit = int(headers.get("x-rate-limit-limit", window.limit if window else 0))
+            remaining = 0 if status_code == 429 else int(headers.get("x-rate-limit-remaining", 0))
+            if window is None:
+                self.windows[endpoint] = RateLimitWindow(limit, remaining, reset)
+            else:
+                window.limit, window.remaining, window.reset = limit, remaining, reset
+
+    def record_response(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        """Update the quota of an endpoint from a response, as a requests response hook.
+
+        Args:
+            response: The requests response.
+            args: Unused hook arguments.
+            kwargs: Unused hook arguments.
+
+        """
+        request = response.request
+        self.record(
+            endpoint_key(request.method, request.url), response.headers, response.status_code
+        )
+
+    def wait_time(self, endpoint: str) -> float:
+        """Estimate how long a request to an endpoint has to wait for quota.
+
+        Args:
+            endpoint: The endpoint key.
+
+        Returns:
+            float: Seconds until a request can be made, 0 if it can be made now.
+
+        """
+        with self._lock:
+            return self._wait_time(endpoint, self.clock())
+
+    def _wait_time(self, endpoint: str, now: float) -> float:
+        """Estimate the wait for an endpoint. Called with the lock held."""
+        window = self.windows.get(endpoint)
+        if window is None or now >= window.reset:
+            return 0.0
+        if window.remaining <= 0:
+            return window.reset - now
+        if endpoint not in self.paced_endpoints:
+            return 0.0
+
+        interval = (window.reset - now) / window.remaining
+        return min(self.max_wait, max(0.0, window.last_request + interval - now))
+
+    def acquire(self, endpoint: str) -> None:
+        """Wait until a request to an endpoint can be made, and reserve it.
+
+        Make the request right after acquire, holding the queue of the endpoint,
+        as call does.
+
+        Args:
+            endpoint: The endpoint key.
+
+        Raises:
+            RateLimitExceededError: If the endpoint has no quota left and its window
+                resets after max_wait.
+
+        """
+        wait = self.wait_time(endpoint)
+        if wait > self.max_wait:
+            raise RateLimitExceededError(endpoint, wait)
+        if wait > 0:
+            self.sleep(wait)
+
+        with self._lock:
+            now = self.clock()
+            window = self.windows.get(endpoint)
+            if window is not None:
+                if now >= window.reset:
+                    # The window has reset, so assume its full quota until headers say otherwise
+                    window.remaining = window.limit
+                window.remaining -= 1
+                window.last_request = now
+
+    def queue(self, endpoint: str) -> threading.Lock:
+        """Get the lock that queues requests to an endpoint.
+
+        Args:
+            endpoint: The endpoint key.
+
+        Returns:
+            threading.Lock: The queue lock.
+
+        """
+        with self._lock:
+            return self._endpoint_locks.setdefault(endpoint, threading.Lock())
+
+    def call(self, endpoint: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call a client method once its endpoint has quota.
+
+        Args:
+            endpoint: The endpoint key of the method.
+            fn: The client method.
+            args: Positional arguments for the method.
+            kwargs: Keyword arguments for the method.
+
+        Returns:
+            Any: The result of the method.
+
+        Raises:
+            RateLimitExceededError: If the endpoint has no quota left and its window
+                resets after max_wait.
+
+        """
+        with self.queue(endpoint):
+            self.acquire(endpoint)
+            return fn(*args, **kwargs)
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Get the known quota and wait time of each endpoint.
+
+        Returns:
+            dict[str, dict[str, Any]]: The limit, remaining quota, seconds until the
+                window resets and estimated wait of each endpoint.
+
+        """
+        with self._lock:
+            now = self.clock()
+            return {
+                endpoint: {
+                    "limit": window.limit,
+                    "remaining": window.remaining if now < window.reset else window.limit,
+                    "reset_in": max(0, round(window.reset - now)),
+                    "wait_time": round(self._wait_time(endpoint, now), 1),
+                }
+                for endpoint, window in sorted(self.windows.items())
+            }
@@ -13,6 +13,10 @@ class AccountMentionsSchema(BaseModel):
     """Input argument schema for Twitter account mentions action."""
 
     user_id: str = Field(..., description="The Twitter user ID to fetch mentions for")
+    new_only: bool = Field(
+        True,
+        description="Only fetch mentions newer than those returned by the previous call for this user",
+    )
 
 
 class PostTweetSchema(BaseModel):
@@ -28,3 +32,9 @@ class PostTweetReplySchema(BaseModel):
         ..., description="The text content of the reply tweet (max 280 characters)"
     )
     tweet_id: str = Field(..., description="The ID of the tweet to reply to")
+
+
+class RateLimitStatusSchema(BaseModel):
+    """Input argument schema for Twitter rate limit status action."""
+
+    pass
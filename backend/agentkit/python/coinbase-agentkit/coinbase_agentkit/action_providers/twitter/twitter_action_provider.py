@@ -7,11 +7,19 @@ from typing import Any
 from ...network import Network
 from ..action_decorator import create_action
 from ..action_provider import ActionProvider
+from .constants import (
+    CREATE_TWEET_ENDPOINT,
+    ME_ENDPOINT,
+    MENTIONS_ENDPOINT,
+    RATE_LIMIT_MAX_WAIT,
+)
+from .rate_limiter import RateLimitExceededError, RateLimitScheduler
 from .schemas import (
     AccountDetailsSchema,
     AccountMentionsSchema,
     PostTweetReplySchema,
     PostTweetSchema,
+    RateLimitStatusSchema,
 )
 
 
@@ -25,6 +33,7 @@ class TwitterActionProvider(ActionProvider):
         access_token: str | None = None,
         access_token_secret: str | None = None,
         bearer_token: str | None = None,
+        rate_limit_max_wait: float = RATE_LIMIT_MAX_WAIT,
     ):
         super().__init__("twitter", [])
 
@@ -63,6 +72,12 @@ class TwitterActionProvider(ActionProvider):
         except Exception as e:
             raise ValueError(f"Failed to initialize Twitter client: {e}") from e
 
+        # Every response updates the known rate limit quota of its endpoint
+        self.rate_limits = RateLimitScheduler(max_wait=rate_limit_max_wait)
+        self.client.session.hooks["response"].append(self.rate_limits.record_response)
+        # Newest mention ID seen per user, so mention polling only fetches newer ones
+        self.mention_since_ids: dict[str, str] = {}
+
     @create_action(
         name="account_details",
         description="""
@@ -90,12 +105,12 @@ A failure response will return a message with a Twitter API request error:
         import tweepy
 
         try:
-            response = self.client.get_me()
+            response = self.rate_limits.call(ME_ENDPOINT, self.client.get_me)
             data = response["data"]
             data["url"] = f"https://x.com/{data['username']}"
 
             return f"Successfully retrieved authenticated user account details:\n{dumps(response)}"
-        except tweepy.errors.TweepyException as e:
+        except (tweepy.errors.TweepyException, RateLimitExceededError) as e:
             return f"Error retrieving authenticated user account details:\n{e}"
 
     @create_action(
@@ -103,8 +118,14 @@ A failure response will return a message with a Twitter API request error:
         description="""
 This tool will return mentions for the specified Twitter (X) user id.
 
+By default only mentions newer than those returned by the previous call for the same user are
+fetched. Set new_only to false to fetch the most recent mentions regardless.
+
 A successful response will return a message with the API response as a JSON payload:
-    {"data": [{"id": "1857479287504584856", "text": "@CDPAgentKit reply"}]}
+    {"data": [{"id": "1857479287504584856", "text": "@CDPAgentKit reply"}], "meta": {"newest_id": "1857479287504584856", "result_count": 1}}
+
+When there are no new mentions, the payload has no data:
+    {"meta": {"result_count": 0}}
 
 A failure response will return a message with the Twitter API request error:
     Error retrieving user mentions: 429 Too Many Requests""",
@@ -121,13 +142,26 @@ A failure response will return a message with the Twitter API request error:
 
         """
         validated_args = AccountMentionsSchema(**args)
+        user_id = validated_args.user_id
 
         import tweepy
 
         try:
-            response = self.client.get_users_mentions(validated_args.user_id)
+            kwargs = {}
+            since_id = self.mention_since_ids.get(user_id)
+            if validated_args.new_only and since_id is not None:
+                kwargs["since_id"] = since_id
+
+            response = self.rate_limits.call(
+                MENTIONS_ENDPOINT, self.client.get_users_mentions, user_id, **kwargs
+            )
+
+            newest_id = (response.get("meta") or {}).get("newest_id")
+            if newest_id is not None and (since_id is None or int(newest_id) > int(since_id)):
+                self.mention_since_ids[user_id] = newest_id
+
             return f"Successfully retrieved account mentions:\n{dumps(response)}"
-        except tweepy.errors.TweepyException as e:
+        except (tweepy.errors.TweepyException, RateLimitExceededError) as e:
             return f"Error retrieving authenticated account mentions:\n{e}"
 
     @create_action(
@@ -157,9 +191,11 @@ A failure response will return a message with the Twitter API request error:
         import tweepy
 
         try:
-            response = self.client.create_tweet(text=validated_args.tweet)
+            response = self.rate_limits.call(
+                CREATE_TWEET_ENDPOINT, self.client.create_tweet, text=validated_args.tweet
+            )
             return f"Successfully posted to Twitter:\n{dumps(response)}"
-        except tweepy.errors.TweepyException as e:
+        except (tweepy.errors.TweepyException, RateLimitExceededError) as e:
             return f"Error posting to Twitter:\n{e}"
 
     @create_action(
@@ -189,13 +225,42 @@ A failure response will return a message with the Twitter API request error:
         import tweepy
 
         try:
-            response = self.client.create_tweet(
-                text=validated_args.tweet_reply, in_reply_to_tweet_id=validated_args.tweet_id
+            response = self.rate_limits.call(
+                CREATE_TWEET_ENDPOINT,
+                self.client.create_tweet,
+                text=validated_args.tweet_reply,
+                in_reply_to_tweet_id=validated_args.tweet_id,
             )
             return f"Successfully posted reply to Twitter:\n{dumps(response)}"
-        except tweepy.errors.TweepyException as e:
+        except (tweepy.errors.TweepyException, RateLimitExceededError) as e:
             return f"Error posting reply to Twitter:\n{e}"
 
+    @create_action(
+        name="rate_limit_status",
+        description="""
+This tool will return the known Twitter (X) API rate limit quota of each endpoint used so far.
+
+For each endpoint, the response has the request limit of the window, the remaining requests, the seconds
+until the window resets and the estimated seconds to wait before the next request:
+    {"POST /2/tweets": {"limit": 100, "remaining": 0, "reset_in": 512, "wait_time": 512.0}}
+
+Use it to decide when to retry an action that failed with a rate limit error.""",
+        schema=RateLimitStatusSchema,
+    )
+    def rate_limit_status(self, args: dict[str, Any]) -> str:
+        """Get the known rate limit quota of each endpoint.
+
+        Args:
+            args (dict[str, Any]): Empty dictionary, no arguments needed.
+
+        Returns:
+            str: A message containing the rate limit status.
+
+        """
+        RateLimitStatusSchema(**args)
+
+        return f"Twitter API rate limit status:\n{dumps(self.rate_limits.status())}"
+
     def supports_network(self, network: Network) -> bool:
         """Check if network is supported by Twitter actions.
 
@@ -212,6 +277,7 @@ def twitter_action_provider(
     access_token: str | None = None,
     access_token_secret: str | None = None,
     bearer_token: str | None = None,
+    rate_limit_max_wait: float = RATE_LIMIT_MAX_WAIT,
 ) -> TwitterActionProvider:
     """Create and return a new TwitterActionProvider instance."""
     return TwitterActionProvider(
@@ -220,4 +286,5 @@ def twitter_action_provider(
         access_token=access_token,
         access_token_secret=access_token_secret,
         bearer_token=bearer_token,
+        rate_limit_max_wait=rate_limit_max_wait,
     )
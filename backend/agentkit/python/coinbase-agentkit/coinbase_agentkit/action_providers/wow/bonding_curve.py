@@ -0,0 +1,204 @@
+"""Offline quotes for WOW tokens that trade on their bonding curve.
+
+Before graduating, a WOW token is priced by an exponential bonding curve
+y = A * e^(B * x), where x is the token supply. The curve contract only holds
+the constants A and B, and the token contract quotes with its total supply, so
+a quote is a pure function of three numbers. The numbers are read with the rest
+of the market state of a token, see market_state.py.
+
+The fixed point functions are ports of Solady's FixedPointMathLib that round
+exactly like the contract, so local quotes match on-chain quotes to the wei.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+WAD = 10**18
+
+
+def _sdiv(a: int, b: int) -> int:
+    """Divide rounding towards zero, as the EVM sdiv opcode."""
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def mul_wad(x: int, y: int) -> int:
+    """Compute floor(x * y / WAD), as FixedPointMathLib.mulWad."""
+    return x * y // WAD
+
+
+def div_wad(x: int, y: int) -> int:
+    """Compute floor(x * WAD / y), as FixedPointMathLib.divWad."""
+    return x * WAD // y
+
+
+def full_mul_div(x: int, y: int, d: int) -> int:
+    """Compute floor(x * y / d), as FixedPointMathLib.fullMulDiv."""
+    return x * y // d
+
+
+def exp_wad(x: int) -> int:
+    """Compute e^x for a WAD number, as FixedPointMathLib.expWad.
+
+    Args:
+        x: The exponent, as a WAD number.
+
+    Returns:
+        int: e^x as a WAD number.
+
+    Raises:
+        ValueError: If the result does not fit an int256.
+
+    """
+    if x <= -41446531673892822313:
+        return 0
+    if x >= 135305999368893231589:
+        raise ValueError("ExpOverflow")
+
+    # Convert to a 2**96 basis, then factor out powers of two: exp(x) = exp(x') * 2**k
+    x = _sdiv(x << 78, 5**18)
+    k = (_sdiv(x << 96, 54916777467707473351141471128) + 2**95) >> 96
+    x = x - k * 54916777467707473351141471128
+
+    # (6, 7)-term rational approximation, with p monic and left in a 2**192 basis
+    y = x + 1346386616545796478920950773328
+    y = ((y * x) >> 96) + 57155421227552351082224309758442
+    p = y + x - 94201549194550492254356042504812
+    p = ((p * y) >> 96) + 28719021644029726153956944680412240
+    p = p * x + (4385272521454847904659076985693276 << 96)
+
+    q = x - 2855989394907223263936484059900
+    q = ((q * x) >> 96) + 50020603652535783019961831881945
+    q = ((q * x) >> 96) - 533845033583426703283633433725380
+    q = ((q * x) >> 96) + 3604857256930695427073651918091429
+    q = ((q * x) >> 96) - 14423608567350463180887372962807573
+    q = ((q * x) >> 96) + 26449188498355588339934803723976023
+
+    r = _sdiv(p, q)
+    # Apply the scale factor, the 2**k factor and the conversion back to a WAD basis
+    return (r * 3822833074963236453042738258902158003155416615667) >> (195 - k)
+
+
+def ln_wad(x: int) -> int:
+    """Compute ln(x) for a WAD number, as FixedPointMathLib.lnWad.
+
+    Args:
+        x: The argument, as a positive WAD number.
+
+    Returns:
+        int: ln(x) as a WAD number.
+
+    Raises:
+        ValueError: If x is not positive.
+
+    """
+    if x <= 0:
+        raise ValueError("LnWadUndefined")
+
+    # Reduce x to (1, 2) * 2**96 with ln(2**k * x) = k * ln(2) + ln(x)
+    r = 255 - (x.bit_length() - 1)
+    x = (x << r) >> 159
+
+    # (8, 8)-term rational approximation, with p monic and left in a 2**192 basis
+    p = x + 3273285459638523848632254066296
+    p = ((p * x) >> 96) + 24828157081833163892658089445524
+    p = ((p * x) >> 96) + 43456485725739037958740375743393
+    p = ((p * x) >> 96) - 11111509109440967052023855526967
+    p = ((p * x) >> 96) - 45023709667254063763336534515857
+    p = ((p * x) >> 96) - 14706773417378608786704636184526
+    p = p * x - (795164235651350426258249787498 << 96)
+
+    q = x + 5573035233440673466300451813936
+    q = ((q * x) >> 96) + 71694874799317883764090561454958
+    q = ((q * x) >> 96) + 283447036172924575727196451306956
+    q = ((q * x) >> 96) + 401686690394027663651624208769553
+    q = ((q * x) >> 96) + 204048457590392012362485061816622
+    q = ((q * x) >> 96) + 31853899698501571402653359427138
+    q = ((q * x) >> 96) + 909429971244387300277376558375
+
+    p = _sdiv(p, q)
+    # Apply the scale factor, add k * ln(2) and ln(2**96 / 10**18), and convert to WAD
+    p *= 1677202110996718588342820967067443963516166
+    p += 16597577552685614221487285958193947469193820559219878177908093499208371 * (159 - r)
+    p += 600920179829731861736702779321621459595472258049074101567377883020018308
+    return p >> 174
+
+
+@dataclass(frozen=True)
+class BondingCurve:
+    """The WOW bonding curve y = A * e^(B * x), with the quotes of the curve contract."""
+
+    address: str
+    a: int
+    b: int
+
+    def exp_b(self, supply: int) -> int:
+        """Get e^(B * supply) as a WAD number."""
+        return exp_wad(mul_wad(self.b, supply))
+
+    def get_eth_buy_quote(self, current_supply: int, eth_order_size: int) -> int:
+        """Get the tokens bought for an ETH amount, as BondingCurve.getEthBuyQuote."""
+        return self.get_eth_buy_quotes(current_supply, [eth_order_size])[0]
+
+    def get_eth_buy_quotes(self, current_supply: int, eth_order_sizes: Sequence[int]) -> list[int]:
+        """Get the tokens bought for each of several ETH amounts.
+
+        e^(B * supply) is computed once for all amounts.
+
+        Args:
+            current_supply: The token total supply.
+            eth_order_sizes: The ETH amounts in wei.
+
+        Returns:
+            list[int]: The token amount bought for each ETH amount.
+
+        """
+        exp_b_x0 = self.exp_b(current_supply)
+        return [
+            div_wad(ln_wad(exp_b_x0 + full_mul_div(eth, self.b, self.a)), self.b) - current_supply
+            for eth in eth_order_sizes
+        ]
+
+    def get_token_sell_quote(self, current_supply: int, tokens_to_sell: int) -> int:
+        """Get the ETH received for selling tokens, as BondingCurve.getTokenSellQuote."""
+        return self.get_token_sell_quotes(current_supply, [tokens_to_sell])[0]
+
+    def get_token_sell_quotes(
+        self, current_supply: int, token_order_sizes: Sequence[int]
+    ) -> list[int]:
+        """Get the ETH received for selling each of several token amounts.
+
+        e^(B * supply) is computed once for all amounts.
+
+        Args:
+            current_supply: The token total supply.
+            token_order_sizes: The token amounts in wei.
+
+        Returns:
+            list[int]: The ETH amount in wei received for each token amount.
+
+        Raises:
+            ValueError: If an amount is larger than the supply.
+
+        """
+        if any(tokens > current_supply for tokens in token_order_sizes):
+            raise ValueError("INSUFFICIENT_SUPPLY")
+
+        exp_b_x1 = self.exp_b(current_supply)
+        return [
+            full_mul_div(exp_b_x1 - self.exp_b(current_supply - tokens), self.a, self.b)
+            for tokens in token_order_sizes
+        ]
+
+    def get_token_buy_quote(self, current_supply: int, token_order_size: int) -> int:
+        """Get the ETH needed to buy tokens, as BondingCurve.getTokenBuyQuote."""
+        return full_mul_div(
+            self.exp_b(current_supply + token_order_size) - self.exp_b(current_supply),
+            self.a,
+            self.b,
+        )
+
+    def get_eth_sell_quote(self, current_supply: int, eth_order_size: int) -> int:
+        """Get the tokens to sell for an ETH amount, as BondingCurve.getEthSellQuote."""
+        exp_b_x1 = self.exp_b(current_supply) - full_mul_div(eth_order_size, self.b, self.a)
+        return current_supply - div_wad(ln_wad(exp_b_x1), self.b)
@@ -816,6 +816,26 @@ WOW_ABI = [
     {"stateMutability": "payable", "type": "receive"},
 ]
 
+BONDING_CURVE_ABI = [
+    {
+        "type": "function",
+        "name": "A",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256", "internalType": "uint256"}],
+        "stateMutability": "view",
+    },
+    {
+        "type": "function",
+        "name": "B",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256", "internalType": "uint256"}],
+        "stateMutability": "view",
+    },
+]
+
+# Maximum age in seconds of a reused market state, about one Base block
+MARKET_STATE_MAX_AGE = 2.0
+
 WOW_FACTORY_CONTRACT_ADDRESSES = {
     "base-sepolia": "0x04870e22fa217Cb16aa00501D7D5253B8838C1eA",
     "base-mainnet": "0x997020E5F59cCB79C74D527Be492Cc610CB9fA2B",
@@ -845,4 +865,34 @@ addresses = {
 }
 
 
+# Event emitted by each WOW token when its factory initializes it
+WOW_TOKEN_CREATED_EVENT = (
+    "WowTokenCreated(address,address,address,address,address,string,string,string,address,address)"
+)
+
+# Blocks per eth_getLogs request when indexing tokens, split in half when a request fails
+TOKEN_INDEX_CHUNK_SIZE = 10_000
+# Concurrent eth_getLogs requests when indexing tokens
+TOKEN_INDEX_MAX_WORKERS = 4
+# Latest blocks scanned by the first sync of the token index when no start block is given,
+# about 11 days of Base blocks, so the first search does not scan the whole chain
+TOKEN_INDEX_INITIAL_BLOCKS = 500_000
+# Minimum seconds between syncs of the token index with the chain
+TOKEN_INDEX_SYNC_INTERVAL = 30.0
+# Environment variable with the path of the SQLite token index
+TOKEN_INDEX_DB_ENV = "WOW_TOKEN_INDEX_PATH"
+# Path of the SQLite token index when none is given, so the initial scan is only done once
+TOKEN_INDEX_DEFAULT_PATH = "~/.cache/coinbase_agentkit/wow_token_index.sqlite3"
+# Lowercased fragments of the errors nodes return for eth_getLogs ranges that are too long
+# or match too many logs; only these are retried as smaller ranges
+LOG_RANGE_ERROR_MESSAGES = (
+    "more than",
+    "too many",
+    "too large",
+    "block range",
+    "range too",
+    "limit exceeded",
+    "response size",
+)
+
 GENERIC_TOKEN_METADATA_URI = "ipfs://QmY1GqprFYvojCcUEKgqHeDj9uhZD9jmYGrQTfA9vAE78J"
@@ -0,0 +1,257 @@
+"""Per-token snapshots of the WOW market state that quotes and trades depend on."""
+
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from web3 import Web3
+
+from ...wallet_providers import EvmWalletProvider
+from ..multicall import aggregate, block_number_call, multicall_call
+from .bonding_curve import BondingCurve
+from .constants import BONDING_CURVE_ABI, MARKET_STATE_MAX_AGE, WOW_ABI
+
+# MarketType of a token trading on its Uniswap pool
+UNISWAP_POOL_MARKET_TYPE = 1
+
+_curve_contract = Web3().eth.contract(abi=BONDING_CURVE_ABI)
+_token_contract = Web3().eth.contract(abi=WOW_ABI)
+
+
+@dataclass
+class WowMarketState:
+    """Snapshot of the market of a WOW token.
+
+    A token trades on its bonding curve until it graduates to its Uniswap pool.
+    The curve is None for graduated tokens, whose quotes come from the pool.
+    """
+
+    token: str
+    block_number: int
+    has_graduated: bool
+    pool_address: str
+    total_supply: int
+    curve: BondingCurve | None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        """Get the age of the snapshot.
+
+        Returns:
+            float: Seconds since the snapshot was loaded.
+
+        """
+        return time.monotonic() - self.fetched_at
+
+    def _require_curve(self) -> BondingCurve:
+        if self.curve is None:
+            raise ValueError(f"Token {self.token} has graduated and trades on its Uniswap pool")
+        return self.curve
+
+    def buy_quotes(self, amounts_eth_in_wei: Sequence[int]) -> list[int]:
+        """Get the tokens bought on the bonding curve for each ETH amount.
+
+        Args:
+            amounts_eth_in_wei: The ETH amounts in wei.
+
+        Returns:
+            list[int]: The token amount bought for each ETH amount, as getEthBuyQuote.
+
+        Raises:
+            ValueError: If the token has graduated.
+
+        """
+        return self._require_curve().get_eth_buy_quotes(self.total_supply, amounts_eth_in_wei)
+
+    def sell_quotes(self, amounts_tokens_in_wei: Sequence[int]) -> list[int]:
+        """Get the ETH received on the bonding curve for each token amount.
+
+        Args:
+            amounts_tokens_in_wei: The token amounts in wei.
+
+        Returns:
+            list[int]: The ETH amount received for each token amount, as getTokenSellQuote.
+
+        Raises:
+            ValueError: If the token has graduated.
+
+        """
+        return self._require_curve().get_token_sell_quotes(self.total_supply, amounts_tokens_in_wei)
+
+
+@dataclass
+class MarketStateMetrics:
+    """Counters of a market state cache."""
+
+    hits: int = 0
+    misses: int = 0
+    rpc_calls: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class WowMarketStateCache:
+    """Cache of WOW market states by chain and token.
+
+    A state is reused for max_age seconds, about one block. Facts that never
+    change are kept for good: the pool address and bonding curve of a token, the
+    constants of a curve, and graduation once it has happened. A graduated token
+    has nothing left that quotes depend on, so its state is never reloaded.
+    Loading a state on the bonding curve takes one Multicall3 call, plus one more
+    the first time a curve is seen.
+    """
+
+    def __init__(self, max_age: float = MARKET_STATE_MAX_AGE):
+        """Initialize the cache.
+
+        Args:
+            max_age: Maximum age in seconds of a reused state.
+
+        """
+        self.max_age = max_age
+        self.metrics = MarketStateMetrics()
+        self._states: dict[tuple[int | str, str], WowMarketState] = {}
+        self._pool_addresses: dict[tuple[int | str, str], str] = {}
+        self._token_curves: dict[tuple[int | str, str], str] = {}
+        self._curves: dict[tuple[int | str, str], BondingCurve] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        wallet_provider: EvmWalletProvider,
+        token_address: str,
+        max_age: float | None = None,
+    ) -> WowMarketState:
+        """Get the market state of a token, loading it when the cached one is too old.
+
+        Args:
+            wallet_provider: The wallet provider to read with.
+            token_address: The token address.
+            max_age: Optional maximum age in seconds of a reused state, overriding max_age.
+
+        Returns:
+            WowMarketState: The market state.
+
+        """
+        max_age = self.max_age if max_age is None else max_age
+        key = (wallet_provider.get_network().chain_id, token_address.lower())
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and (state.has_graduated or state.age() < max_age):
+                self.metrics.hits += 1
+                return state
+            self.metrics.misses += 1
+
+        state = self._load(wallet_provider, token_address)
+        with self._lock:
+            self._states[key] = state
+        return state
+
+    def clear(self) -> None:
+        """Forget all states and reset the metrics."""
+        with self._lock:
+            self._states.clear()
+            self._pool_addresses.clear()
+            self._token_curves.clear()
+            self._curves.clear()
+            self.metrics = MarketStateMetrics()
+
+    def _aggregate(self, wallet_provider: EvmWalletProvider, calls: list, **kwargs) -> list:
+        with self._lock:
+            self.metrics.rpc_calls += 1
+        return aggregate(wallet_provider, calls, **kwargs)
+
+    def _load(self, wallet_provider: EvmWalletProvider, token_address: str) -> WowMarketState:
+        """Load the market state of a token, reading only what may have changed."""
+        chain_id = wallet_provider.get_network().chain_id
+        token = Web3.to_checksum_address(token_address)
+        key = (chain_id, token.lower())
+
+        with self._lock:
+            pool_address = self._pool_addresses.get(key)
+            curve_address = self._token_curves.get(key)
+
+        def token_call(function_name: str) -> tuple:
+            return (
+                multicall_call(token, _token_contract, function_name),
+                _token_contract,
+                function_name,
+            )
+
+        calls = [
+            block_number_call(),
+            token_call("marketType"),
+            token_call("totalSupply"),
+        ]
+        if pool_address is None:
+            calls.append(token_call("poolAddress"))
+        if curve_address is None:
+            calls.append(token_call("bondingCurve"))
+
+        (block_number,), (market_type,), (total_supply,), *permanent = self._aggregate(
+            wallet_provider, calls
+        )
+        if pool_address is None:
+            pool_address = Web3.to_checksum_address(permanent.pop(0)[0])
+        if curve_address is None:
+            curve_address = Web3.to_checksum_address(permanent.pop(0)[0])
+
+        has_graduated = market_type == UNISWAP_POOL_MARKET_TYPE
+        curve = None
+        if not has_graduated:
+            with self._lock:
+                curve = self._curves.get((chain_id, curve_address.lower()))
+            if curve is None:
+                (a,), (b,) = self._aggregate(
+                    wallet_provider,
+                    [
+                        (multicall_call(curve_address, _curve_contract, "A"), _curve_contract, "A"),
+                        (multicall_call(curve_address, _curve_contract, "B"), _curve_contract, "B"),
+                    ],
+                    block_identifier=block_number,
+                )
+                curve = BondingCurve(address=curve_address, a=a, b=b)
+
+        with self._lock:
+            self._pool_addresses[key] = pool_address
+            self._token_curves[key] = curve_address
+            if curve is not None:
+                self._curves[(chain_id, curve_address.lower())] = curve
+
+        return WowMarketState(
+            token=token,
+            block_number=block_number,
+            has_graduated=has_graduated,
+            pool_address=pool_address,
+            total_supply=total_supply,
+            curve=curve,
+        )
+
+
+# Shared by the quote functions and the WOW action provider
+market_states = WowMarketStateCache()
+
+
+def get_market_state(
+    wallet_provider: EvmWalletProvider,
+    token_address: str,
+    max_age: float | None = None,
+) -> WowMarketState:
+    """Get the market state of a WOW token from the shared cache.
+
+    Args:
+        wallet_provider: The wallet provider to read with.
+        token_address: The token address.
+        max_age: Optional maximum age in seconds of a reused state.
+
+    Returns:
+        WowMarketState: The market state.
+
+    """
+    return market_states.get(wallet_provider, token_address, max_age)
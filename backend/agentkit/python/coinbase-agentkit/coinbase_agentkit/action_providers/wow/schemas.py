@@ -65,3 +65,18 @@ class WowSellTokenSchema(BaseModel):
 
         """
         return validate_eth_address(v)
+
+
+class WowSearchTokensSchema(BaseModel):
+    """Input schema for searching WOW tokens."""
+
+    query: str = Field(
+        ..., min_length=1, description="Text to find in token names or symbols, or a token address"
+    )
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of tokens to return")
+
+
+class WowListRecentTokensSchema(BaseModel):
+    """Input schema for listing recently created WOW tokens."""
+
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of tokens to return")
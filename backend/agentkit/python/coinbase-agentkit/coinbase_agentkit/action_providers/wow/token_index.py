@@ -0,0 +1,501 @@
+"""Local index of WOW tokens built from their creation events.
+
+Every WOW token emits WowTokenCreated, with its factory as an indexed topic,
+when the factory initializes it. The indexer scans these logs in block range
+chunks with concurrent eth_getLogs requests, splitting ranges the node refuses
+as too long, and stores the tokens in SQLite along with the next block to scan, so each sync
+only scans blocks that are new since the previous one. The first sync can be limited to
+the latest blocks, in which case the index is partial and records the block it starts at.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from eth_abi import decode
+from web3 import Web3
+
+from .constants import (
+    LOG_RANGE_ERROR_MESSAGES,
+    TOKEN_INDEX_CHUNK_SIZE,
+    TOKEN_INDEX_MAX_WORKERS,
+    WOW_TOKEN_CREATED_EVENT,
+)
+
+TOKEN_CREATED_TOPIC = Web3.keccak(text=WOW_TOKEN_CREATED_EVENT).to_0x_hex()
+TOKEN_CREATED_DATA_TYPES = [
+    "address",
+    "address",
+    "address",
+    "string",
+    "string",
+    "string",
+    "address",
+    "address",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    creator TEXT NOT NULL,
+    token_uri TEXT NOT NULL,
+    pool_address TEXT NOT NULL,
+    bonding_curve TEXT NOT NULL,
+    factory TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    PRIMARY KEY (chain_id, address)
+);
+CREATE INDEX IF NOT EXISTS tokens_created ON tokens (chain_id, block_number, log_index);
+CREATE TABLE IF NOT EXISTS scan_state (
+    chain_id INTEGER PRIMARY KEY,
+    next_block INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    first_block INTEGER
+);
+"""
+
+
+@dataclass
+class WowToken:
+    """A WOW token, as announced by its creation event."""
+
+    address: str
+    name: str
+    symbol: str
+    creator: str
+    token_uri: str
+    pool_address: str
+    bonding_curve: str
+    factory: str
+    block_number: int
+    log_index: int
+
+
+def _topic_address(topic: Any) -> str:
+    """Get the address in an indexed address topic."""
+    return Web3.to_checksum_address(bytes(topic)[-20:])
+
+
+def is_log_range_error(error: Exception) -> bool:
+    """Check if an eth_getLogs error means the range is too long or matches too many logs.
+
+    Args:
+        error: The error raised by eth_getLogs.
+
+    Returns:
+        bool: True if the same logs can be read as smaller ranges.
+
+    """
+    message = str(error).lower()
+    return any(fragment in message for fragment in LOG_RANGE_ERROR_MESSAGES)
+
+
+def decode_token_created(log: Any) -> WowToken | None:
+    """Decode a WowTokenCreated log.
+
+    Args:
+        log: The log, as returned by eth_getLogs.
+
+    Returns:
+        WowToken | None: The token, or None if the log was not emitted by the token
+            it announces, so cannot be trusted.
+
+    """
+    (
+        _platform_referrer,
+        _protocol_fee_recipient,
+        bonding_curve,
+        token_uri,
+        name,
+        symbol,
+        token_address,
+        pool_address,
+    ) = decode(TOKEN_CREATED_DATA_TYPES, bytes(log["data"]))
+
+    if token_address.lower() != log["address"].lower():
+        return None
+
+    return WowToken(
+        address=Web3.to_checksum_address(token_address),
+        name=name,
+        symbol=symbol,
+        creator=_topic_address(log["topics"][2]),
+        token_uri=token_uri,
+        pool_address=Web3.to_checksum_address(pool_address),
+        bonding_curve=Web3.to_checksum_address(bonding_curve),
+        factory=_topic_address(log["topics"][1]),
+        block_number=log["blockNumber"],
+        log_index=log["logIndex"],
+    )
+
+
+class WowTokenIndex:
+    """SQLite-backed store of WOW tokens by chain.
+
+    The store is safe to share between threads. Use ":memory:" for a store that
+    lives only as long as the object.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """Open the store, creating its tables if needed.
+
+        Args:
+            path: Path to the SQLite database file, or ":memory:". A leading ~ is
+                expanded and missing parent directories are created.
+
+        """
+        if path != ":memory:":
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get_next_block(self, chain_id: int) -> int | None:
+        """Get the first block not scanned yet on a chain.
+
+        Args:
+            chain_id: The chain ID.
+
+        Returns:
+            int | None: The block number, or None if the chain was never scanned.
+
+        """
+        row = self._fetchone("SELECT next_block FROM scan_state WHERE chain_id = ?", (chain_id,))
+        return row[0] if row else None
+
+    def get_first_block(self, chain_id: int) -> int | None:
+        """Get the first block scanned on a chain, if the index is partial.
+
+        Args:
+            chain_id: The chain ID.
+
+        Returns:
+            int | None: The block number, or None if the chain was never scanned or
+                its index covers every block since the factory deployment.
+
+        """
+        row = self._fetchone("SELECT first_block FROM scan_state WHERE chain_id = ?", (chain_id,))
+        return row[0] if row else None
+
+    def get_synced_at(self, chain_id: int) -> float | None:
+        """Get when a chain was last scanned.
+
+        Args:
+            chain_id: The chain ID.
+
+        Returns:
+            float | None: Seconds since the epoch, or None if it was never scanned.
+
+        """
+        row = self._fetchone("SELECT synced_at FROM scan_state WHERE chain_id = ?", (chain_id,))
+        return row[0] if row else None
+
+    def add_tokens(
+        self,
+        chain_id: int,
+        tokens: list[WowToken],
+        next_block: int,
+        first_block: int | None = None,
+    ) -> int:
+        """Store tokens and the next block to scan, in one transaction.
+
+        Args:
+            chain_id: The chain ID.
+            tokens: The tokens found in the scanned blocks.
+            next_block: The first block not scanned yet.
+            first_block: The first block of a partial index. Only stored with the first
+                scan of the chain.
+
+        Returns:
+            int: The number of tokens not stored before.
+
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO tokens VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(chain_id, *asdict(token).values()) for token in tokens],
+            )
+            self._conn.execute(
+                "INSERT INTO scan_state VALUES (?, ?, ?, ?) ON CONFLICT (chain_id) DO UPDATE "
+                "SET next_block = excluded.next_block, synced_at = excluded.synced_at",
+                (chain_id, next_block, time.time(), first_block),
+            )
+        return max(cursor.rowcount, 0)
+
+    def count(self, chain_id: int) -> int:
+        """Get the number of tokens stored for a chain.
+
+        Args:
+            chain_id: The chain ID.
+
+        Returns:
+            int: The number of tokens.
+
+        """
+        return self._fetchone("SELECT COUNT(*) FROM tokens WHERE chain_id = ?", (chain_id,))[0]
+
+    def recent(self, chain_id: int, limit: int = 10) -> list[WowToken]:
+        """Get the most recently created tokens.
+
+        Args:
+            chain_id: The chain ID.
+            limit: Maximum number of tokens.
+
+        Returns:
+            list[WowToken]: The tokens, newest first.
+
+        """
+        return self._tokens(
+            "WHERE chain_id = ? ORDER BY block_number DESC, log_index DESC LIMIT ?",
+            (chain_id, limit),
+        )
+
+    def search(self, chain_id: int, query: str, limit: int = 10) -> list[WowToken]:
+        """Search tokens by name, symbol or address.
+
+        Exact symbol and address matches come first, then symbols and names
+        starting with the query, then other matches, newest first within each.
+
+        Args:
+            chain_id: The chain ID.
+            query: Case insensitive text to find in the name or symbol, or an address.
+            limit: Maximum number of tokens.
+
+        Returns:
+            list[WowToken]: The matching tokens.
+
+        """
+        query = query.strip().lower()
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return self._tokens(
+            """WHERE chain_id = ? AND (
+                lower(name) LIKE ? ESCAPE '\\' OR lower(symbol) LIKE ? ESCAPE '\\'
+                OR lower(address) = ?
+            )
+            ORDER BY
+                CASE
+                    WHEN lower(symbol) = ? OR lower(address) = ? THEN 0
+                    WHEN lower(symbol) LIKE ? ESCAPE '\\' OR lower(name) LIKE ? ESCAPE '\\'
+                        THEN 1
+                    ELSE 2
+                END,
+                block_number DESC, log_index DESC
+            LIMIT ?""",
+            (
+                chain_id,
+                f"%{escaped}%",
+                f"%{escaped}%",
+                query,
+                query,
+                query,
+                f"{escaped}%",
+                f"{escaped}%",
+                limit,
+            ),
+        )
+
+    def _fetchone(self, sql: str, params: tuple) -> tuple | None:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _tokens(self, where: str, params: tuple) -> list[WowToken]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT address, name, symbol, creator, token_uri, pool_address, bonding_curve, "
+                f"factory, block_number, log_index FROM tokens {where}",
+                params,
+            ).fetchall()
+        return [WowToken(*row) for row in rows]
+
+
+class WowTokenIndexer:
+    """Scans a chain for WOW token creation events into a WowTokenIndex."""
+
+    def __init__(
+        self,
+        web3: Web3,
+        index: WowTokenIndex,
+        chain_id: int,
+        factories: list[str],
+        start_block: int | None = None,
+        max_initial_blocks: int | None = None,
+        chunk_size: int = TOKEN_INDEX_CHUNK_SIZE,
+        max_workers: int = TOKEN_INDEX_MAX_WORKERS,
+    ):
+        """Initialize the indexer.
+
+        Args:
+            web3: Web3 instance connected to the chain.
+            index: The index to store tokens in.
+            chain_id: The chain ID.
+            factories: The WOW factory addresses whose tokens are indexed.
+            start_block: The block to start the first scan from. If None, the first
+                block at which a factory has code is looked up.
+            max_initial_blocks: If set and start_block is None, the first scan covers at
+                most this many latest blocks instead, and the index is partial.
+            chunk_size: Blocks per eth_getLogs request.
+            max_workers: Concurrent eth_getLogs requests.
+
+        """
+        self.web3 = web3
+        self.index = index
+        self.chain_id = chain_id
+        self.factories = [Web3.to_checksum_address(factory) for factory in factories]
+        self.start_block = start_block
+        self.max_initial_blocks = max_initial_blocks
+        self.max_chunk_size = chunk_size
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def sync(self, to_block: int | None = None) -> int:
+        """Scan the blocks not scanned yet, up to the latest block.
+
+        Blocks are scanned in rounds of one chunk per worker. The tokens found in
+        a round and the next block to scan are stored together, so an interrupted
+        sync resumes after the last completed round.
+
+        Args:
+            to_block: The last block to scan. Defaults to the latest block.
+
+        Returns:
+            int: The number of new tokens.
+
+        """
+        to_block = self.web3.eth.block_number if to_block is None else to_block
+        from_block = self.index.get_next_block(self.chain_id)
+        first_block = None
+        if from_block is None:
+            if self.start_block is not None:
+                from_block = self.start_block
+            elif self.max_initial_blocks is not None:
+                from_block = max(to_block - self.max_initial_blocks + 1, 0)
+                first_block = from_block or None
+            else:
+                from_block = self.find_start_block(to_block)
+
+        new_tokens = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while from_block <= to_block:
+                chunk_size = self.chunk_size
+                ranges = []
+                for _ in range(self.max_workers):
+                    if from_block > to_block:
+                        break
+                    end = min(from_block + chunk_size - 1, to_block)
+                    ranges.append((from_block, end))
+                    from_block = end + 1
+
+                logs = [
+                    log
+                    for chunk in executor.map(lambda r: self.get_logs(*r), ranges)
+                    for log in chunk
+                ]
+                tokens = [token for token in map(decode_token_created, logs) if token]
+                new_tokens += self.index.add_tokens(self.chain_id, tokens, from_block, first_block)
+
+                with self._lock:
+                    if self.chunk_size == chunk_size:
+                        # The round needed no splits, so try larger ranges again
+                        self.chunk_size = min(chunk_size * 2, self.max_chunk_size)
+
+        if new_tokens == 0 and self.index.get_next_block(self.chain_id) is None:
+            self.index.add_tokens(self.chain_id, [], from_block, first_block)
+        return new_tokens
+
+    def get_logs(self, from_block: int, to_block: int) -> list:
+        """Get the WowTokenCreated logs of the factories in a block range.
+
+        A range the node refuses as too long or matching too many logs is retried
+        as two requests for each half of the range, and later chunks use the
+        smaller size. Other errors are raised as is.
+
+        Args:
+            from_block: The first block.
+            to_block: The last block.
+
+        Returns:
+            list: The logs.
+
+        """
+        with self._lock:
+            self.requests += 1
+        try:
+            return list(
+                self.web3.eth.get_logs(
+                    {
+                        "fromBlock": from_block,
+                        "toBlock": to_block,
+                        "topics": [
+                            TOKEN_CREATED_TOPIC,
+                            [
+                                "0x" + factory[2:].lower().rjust(64, "0")
+                                for factory in self.factories
+                            ],
+                        ],
+                    }
+                )
+            )
+        except Exception as e:
+            if from_block >= to_block or not is_log_range_error(e):
+                raise
+
+        middle = (from_block + to_block) // 2
+        with self._lock:
+            self.chunk_size = max(1, min(self.chunk_size, middle - from_block + 1))
+        return self.get_logs(from_block, middle) + self.get_logs(middle + 1, to_block)
+
+    def find_start_block(self, latest: int) -> int:
+        """Find the first block at which a factory has code, with a binary search.
+
+        Args:
+            latest: The latest block.
+
+        Returns:
+            int: The block.
+
+        Raises:
+            ValueError: If no factory is deployed, or the node has no state history
+                to search, in which case start_block or an archive node is needed.
+
+        """
+        if not self._has_code(latest):
+            raise ValueError(f"No WOW factory is deployed on chain {self.chain_id}")
+
+        low, high = 0, latest
+        try:
+            while low < high:
+                middle = (low + high) // 2
+                if self._has_code(middle):
+                    high = middle
+                else:
+                    low = middle + 1
+        except Exception as e:
+            raise ValueError(
+                "Cannot find the WOW factory deployment block, the RPC node has no state "
+                f"history ({e!s}). Use an archive node or set start_block."
+            ) from e
+        return low
+
+    def _has_code(self, block: int) -> bool:
+        return any(
+            len(self.web3.eth.get_code(factory, block_identifier=block)) > 0
+            for factory in self.factories
+        )
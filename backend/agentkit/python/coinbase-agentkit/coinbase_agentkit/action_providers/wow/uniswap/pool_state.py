@@ -0,0 +1,312 @@
+"""Offline Uniswap V3 quotes from a snapshot of pool state."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from web3 import Web3
+
+from ....wallet_providers import EvmWalletProvider
+from ...multicall import aggregate, block_number_call, multicall_call
+from ..constants import WOW_ABI
+from .constants import (
+    POOL_STATE_MAX_AGE,
+    TICK_BITMAP_WORD_RADIUS,
+    UNISWAP_V3_ABI,
+)
+from .v3_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    compute_swap_step,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    next_initialized_tick_within_one_word,
+    tick_bitmap_position,
+)
+
+_pool_contract = Web3().eth.contract(abi=UNISWAP_V3_ABI)
+_token_contract = Web3().eth.contract(abi=WOW_ABI)
+
+
+class PoolStateRangeError(Exception):
+    """Raised when a simulated swap moves past the loaded tick bitmap words."""
+
+
+@dataclass
+class SwapQuote:
+    """Result of a simulated exact input swap."""
+
+    amount_in: int
+    amount_out: int
+    sqrt_price_x96_after: int
+    initialized_ticks_crossed: int
+
+
+@dataclass
+class PoolState:
+    """Snapshot of the state of a Uniswap V3 pool that quotes depend on.
+
+    Holds the price, active liquidity and the initialized ticks around the current
+    price, all read at the same block, so exact input swaps can be simulated
+    without RPC calls.
+    """
+
+    address: str
+    token0: str
+    token1: str
+    fee: int
+    tick_spacing: int
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    balance0: int
+    balance1: int
+    block_number: int
+    tick_bitmap: dict[int, int]
+    liquidity_net: dict[int, int]
+    word_range: tuple[int, int]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        """Get the age of the snapshot.
+
+        Returns:
+            float: Seconds since the snapshot was loaded.
+
+        """
+        return time.monotonic() - self.fetched_at
+
+    def quote_exact_input(self, amount_in: int, zero_for_one: bool) -> SwapQuote:
+        """Simulate an exact input swap without a price limit, as the quoter does.
+
+        The swap loop of UniswapV3Pool.swap, without state changes. If liquidity
+        runs out, the swap stops at the price limit and amount_in is the amount
+        actually swapped, like a quote from QuoterV2.
+
+        Args:
+            amount_in: The amount of the input token, in wei.
+            zero_for_one: Whether token0 is swapped for token1.
+
+        Returns:
+            SwapQuote: The amount swapped and received, and the price after the swap.
+
+        Raises:
+            PoolStateRangeError: If the swap moves past the loaded tick bitmap words.
+
+        """
+        if amount_in <= 0:
+            raise ValueError("Amount in must be positive")
+
+        sqrt_price_limit = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+        amount_remaining = amount_in
+        amount_out = 0
+        sqrt_price = self.sqrt_price_x96
+        tick = self.tick
+        liquidity = self.liquidity
+        ticks_crossed = 0
+
+        while amount_remaining != 0 and sqrt_price != sqrt_price_limit:
+            word = tick_bitmap_position(tick // self.tick_spacing + (0 if zero_for_one else 1))[0]
+            if not self.word_range[0] <= word <= self.word_range[1]:
+                raise PoolStateRangeError(f"Swap moves past the loaded ticks of {self.address}")
+
+            sqrt_price_start = sqrt_price
+            tick_next, initialized = next_initialized_tick_within_one_word(
+                self.tick_bitmap, tick, self.tick_spacing, zero_for_one
+            )
+            tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+            sqrt_price_next = get_sqrt_ratio_at_tick(tick_next)
+
+            if zero_for_one:
+                sqrt_price_target = max(sqrt_price_next, sqrt_price_limit)
+            else:
+                sqrt_price_target = min(sqrt_price_next, sqrt_price_limit)
+
+            sqrt_price, step_in, step_out, step_fee = compute_swap_step(
+                sqrt_price, sqrt_price_target, liquidity, amount_remaining, self.fee
+            )
+            amount_remaining -= step_in + step_fee
+            amount_out += step_out
+
+            if sqrt_price == sqrt_price_next:
+                if initialized:
+                    net = self.liquidity_net.get(tick_next, 0)
+                    liquidity += -net if zero_for_one else net
+                    ticks_crossed += 1
+                tick = tick_next - 1 if zero_for_one else tick_next
+            elif sqrt_price != sqrt_price_start:
+                tick = get_tick_at_sqrt_ratio(sqrt_price)
+
+        return SwapQuote(
+            amount_in=amount_in - amount_remaining,
+            amount_out=amount_out,
+            sqrt_price_x96_after=sqrt_price,
+            initialized_ticks_crossed=ticks_crossed,
+        )
+
+    def quote(self, token_in: str, amount_in: int) -> SwapQuote:
+        """Simulate an exact input swap of a pool token.
+
+        Args:
+            token_in: The address of the input token.
+            amount_in: The amount of the input token, in wei.
+
+        Returns:
+            SwapQuote: The amount swapped and received, and the price after the swap.
+
+        """
+        return self.quote_exact_input(amount_in, token_in.lower() == self.token0.lower())
+
+
+def load_pool_state(wallet_provider: EvmWalletProvider, pool_address: str) -> PoolState:
+    """Load the state of a Uniswap V3 pool in three Multicall3 calls.
+
+    The first call reads the block number, price, liquidity and pool constants.
+    The second reads the tick bitmap around the current tick and the pool token
+    balances at that block, the third the liquidity of each initialized tick.
+
+    Args:
+        wallet_provider: The wallet provider to read with.
+        pool_address: The pool address.
+
+    Returns:
+        PoolState: The pool state.
+
+    """
+    pool = Web3.to_checksum_address(pool_address)
+
+    (
+        (block_number,),
+        (sqrt_price_x96, tick, *_),
+        (liquidity,),
+        (fee,),
+        (tick_spacing,),
+        (token0,),
+        (token1,),
+    ) = aggregate(
+        wallet_provider,
+        [
+            block_number_call(),
+            (multicall_call(pool, _pool_contract, "slot0"), _pool_contract, "slot0"),
+            (multicall_call(pool, _pool_contract, "liquidity"), _pool_contract, "liquidity"),
+            (multicall_call(pool, _pool_contract, "fee"), _pool_contract, "fee"),
+            (multicall_call(pool, _pool_contract, "tickSpacing"), _pool_contract, "tickSpacing"),
+            (multicall_call(pool, _pool_contract, "token0"), _pool_contract, "token0"),
+            (multicall_call(pool, _pool_contract, "token1"), _pool_contract, "token1"),
+        ],
+    )
+
+    current_word = tick_bitmap_position(tick // tick_spacing)[0]
+    first_word = max(
+        current_word - TICK_BITMAP_WORD_RADIUS, tick_bitmap_position(MIN_TICK // tick_spacing)[0]
+    )
+    last_word = min(
+        current_word + TICK_BITMAP_WORD_RADIUS, tick_bitmap_position(MAX_TICK // tick_spacing)[0]
+    )
+    words = list(range(first_word, last_word + 1))
+
+    token0 = Web3.to_checksum_address(token0)
+    token1 = Web3.to_checksum_address(token1)
+    (balance0,), (balance1,), *word_results = aggregate(
+        wallet_provider,
+        [
+            (
+                multicall_call(token0, _token_contract, "balanceOf", [pool]),
+                _token_contract,
+                "balanceOf",
+            ),
+            (
+                multicall_call(token1, _token_contract, "balanceOf", [pool]),
+                _token_contract,
+                "balanceOf",
+            ),
+            *(
+                (
+                    multicall_call(pool, _pool_contract, "tickBitmap", [word]),
+                    _pool_contract,
+                    "tickBitmap",
+                )
+                for word in words
+            ),
+        ],
+        block_identifier=block_number,
+    )
+    tick_bitmap = {word: bits for word, (bits,) in zip(words, word_results, strict=True) if bits}
+
+    initialized_ticks = [
+        ((word << 8) + bit) * tick_spacing
+        for word, bits in tick_bitmap.items()
+        for bit in range(256)
+        if bits >> bit & 1
+    ]
+    tick_results = (
+        aggregate(
+            wallet_provider,
+            [
+                (multicall_call(pool, _pool_contract, "ticks", [t]), _pool_contract, "ticks")
+                for t in initialized_ticks
+            ],
+            block_identifier=block_number,
+        )
+        if initialized_ticks
+        else []
+    )
+
+    return PoolState(
+        address=pool,
+        token0=token0,
+        token1=token1,
+        fee=fee,
+        tick_spacing=tick_spacing,
+        sqrt_price_x96=sqrt_price_x96,
+        tick=tick,
+        liquidity=liquidity,
+        balance0=balance0,
+        balance1=balance1,
+        block_number=block_number,
+        tick_bitmap=tick_bitmap,
+        liquidity_net={
+            t: result[1] for t, result in zip(initialized_ticks, tick_results, strict=True)
+        },
+        word_range=(first_word, last_word),
+    )
+
+
+_pool_states: dict[tuple[int | str, str], PoolState] = {}
+_pool_states_lock = threading.Lock()
+
+
+def get_pool_state(
+    wallet_provider: EvmWalletProvider,
+    pool_address: str,
+    max_age: float = POOL_STATE_MAX_AGE,
+) -> PoolState:
+    """Get the state of a Uniswap V3 pool, loading it at most once per max_age seconds.
+
+    Args:
+        wallet_provider: The wallet provider to read with.
+        pool_address: The pool address.
+        max_age: Maximum age of a reused state in seconds. The default is about one block.
+
+    Returns:
+        PoolState: The pool state.
+
+    """
+    key = (wallet_provider.get_network().chain_id, pool_address.lower())
+    with _pool_states_lock:
+        state = _pool_states.get(key)
+        if state is not None and state.age() < max_age:
+            return state
+
+    state = load_pool_state(wallet_provider, pool_address)
+    with _pool_states_lock:
+        _pool_states[key] = state
+    return state
+
+
+def clear_pool_states() -> None:
+    """Forget all loaded pool states."""
+    with _pool_states_lock:
+        _pool_states.clear()
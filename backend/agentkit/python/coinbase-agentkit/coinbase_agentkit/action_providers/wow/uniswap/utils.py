@@ -9,7 +9,8 @@ from web3.types import Wei
 
 from ....wallet_providers import EvmWalletProvider
 from ..constants import WOW_ABI, addresses
-from .constants import UNISWAP_QUOTER_ABI, UNISWAP_V3_ABI
+from .constants import UNISWAP_QUOTER_ABI
+from .pool_state import PoolStateRangeError, get_pool_state
 
 
 @dataclass
@@ -47,19 +48,6 @@ class Quote:
     error: str | None
 
 
-@dataclass
-class PoolInfo:
-    """Pool info for a given uniswap v3 pool."""
-
-    token0: str
-    balance0: int
-    token1: str
-    balance1: int
-    fee: int
-    liquidity: int
-    sqrt_price_x96: int
-
-
 def create_price_info(wei_amount: Wei, eth_price_in_usd: float) -> PriceInfo:
     """Create a PriceInfo object from wei amount and ETH price.
 
@@ -96,76 +84,6 @@ def get_has_graduated(wallet_provider: EvmWalletProvider, token_address: str) ->
     return market_type == 1
 
 
-def get_pool_info(wallet_provider: EvmWalletProvider, pool_address: str) -> PoolInfo:
-    """Get pool info for a given uniswap v3 pool address.
-
-    Args:
-        wallet_provider: The wallet provider to use for contract calls
-        pool_address: Uniswap v3 pool address
-
-    Returns:
-        PoolInfo: A PoolInfo object containing the token0, balance0, token1, balance1, fee, liquidity, and sqrt_price_x96.
-
-    """
-    try:
-        token0 = wallet_provider.read_contract(
-            contract_address=pool_address,
-            abi=UNISWAP_V3_ABI,
-            function_name="token0",
-            args=[],
-        )
-        token1 = wallet_provider.read_contract(
-            contract_address=pool_address,
-            abi=UNISWAP_V3_ABI,
-            function_name="token1",
-            args=[],
-        )
-        fee = wallet_provider.read_contract(
-            contract_address=pool_address,
-            abi=UNISWAP_V3_ABI,
-            function_name="fee",
-            args=[],
-        )
-        liquidity = wallet_provider.read_contract(
-            contract_address=pool_address,
-            abi=UNISWAP_V3_ABI,
-            function_name="liquidity",
-            args=[],
-        )
-        slot0 = wallet_provider.read_contract(
-            contract_address=pool_address,
-            abi=UNISWAP_V3_ABI,
-            function_name="slot0",
-            args=[],
-        )
-
-        balance0 = wallet_provider.read_contract(
-            contract_address=token0,
-            abi=WOW_ABI,
-            function_name="balanceOf",
-            args=[pool_address],
-        )
-
-        balance1 = wallet_provider.read_contract(
-            contract_address=token1,
-            abi=WOW_ABI,
-            function_name="balanceOf",
-            args=[pool_address],
-        )
-
-        return PoolInfo(
-            token0=token0,
-            balance0=balance0,
-            token1=token1,
-            balance1=balance1,
-            fee=fee,
-            liquidity=liquidity,
-            sqrt_price_x96=slot0[0],
-        )
-    except Exception as error:
-        raise Exception(f"Failed to fetch pool information: {error!s}") from error
-
-
 def exact_input_single(
     wallet_provider: EvmWalletProvider, token_in: str, token_out: str, amount_in: int, fee: str
 ) -> int:
@@ -226,94 +144,128 @@ def get_uniswap_quote(
         Quote: A Quote object containing the amount in, amount out, balance, fee, and any error messages.
 
     """
-    pool = None
-    tokens = None
-    balances = None
-    eth_price_in_usd = None
-    quote_result = None
-    utilization = Wei(0)
-    insufficient_liquidity = False
+    return get_uniswap_quotes(wallet_provider, token_address, [amount], quote_type)[0]
+
 
+def get_uniswap_quotes(
+    wallet_provider: EvmWalletProvider,
+    token_address: str,
+    amounts: list[int],
+    quote_type: Literal["buy", "sell"],
+    pool_address: str | None = None,
+) -> list[Quote]:
+    """Get Uniswap quotes for buying or selling several amounts of tokens.
+
+    The pool state is loaded once, at most once per block, and every amount is
+    quoted by simulating the swap locally, so quoting more amounts costs no RPC
+    calls. If a swap moves past the loaded ticks, that amount is quoted by the
+    quoter contract instead.
+
+    Args:
+        wallet_provider: The wallet provider to use for contract calls
+        token_address: Token address, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amounts: Amounts of tokens to quote (in Wei), ETH for buys and tokens for sells
+        quote_type: 'buy' or 'sell'
+        pool_address: The pool address of the token, if known, saving the read of it
+
+    Returns:
+        list[Quote]: A Quote object for each amount, containing the amount in, amount out, balance, fee, and any error messages.
+
+    """
     chain_id = wallet_provider.get_network().chain_id
     network = "base-mainnet" if chain_id == 8453 else "base-sepolia"
     if network not in addresses:
         raise ValueError(f"Unsupported network: {network}")
 
-    pool_address = wallet_provider.read_contract(
-        contract_address=token_address,
-        abi=WOW_ABI,
-        function_name="poolAddress",
-        args=[],
-    )
-    invalid_pool_error = "Invalid pool address" if not pool_address else None
-
-    try:
-        pool_info = get_pool_info(wallet_provider, pool_address)
-        token0, token1 = pool_info.token0, pool_info.token1
-        balance0, balance1 = pool_info.balance0, pool_info.balance1
-        fee = pool_info.fee
-
-        pool = pool_info
-        tokens = (token0, token1)
-        balances = (balance0, balance1)
-
-        is_token0_weth = token0.lower() == addresses[network]["weth"].lower()
-        token_in = (
-            token0
-            if (quote_type == "buy" and is_token0_weth)
-            or (quote_type == "sell" and not is_token0_weth)
-            else token1
+    if pool_address is None:
+        pool_address = wallet_provider.read_contract(
+            contract_address=token_address,
+            abi=WOW_ABI,
+            function_name="poolAddress",
+            args=[],
         )
+    if not pool_address or int(pool_address, 16) == 0:
+        return [
+            Quote(
+                amount_in=amount,
+                amount_out=Wei(0),
+                balance=None,
+                fee=None,
+                error="Invalid pool address",
+            )
+            for amount in amounts
+        ]
 
-        token_out, balance_out = (token1, balance1) if token_in == token0 else (token0, balance0)
-
-        if isinstance(balance_out, list | tuple):
-            balance_out = balance_out[0] if balance_out else 0
-        balance_out = int(balance_out)
+    try:
+        pool = get_pool_state(wallet_provider, pool_address)
+    except Exception as e:
+        return [
+            Quote(
+                amount_in=amount,
+                amount_out=Wei(0),
+                balance=None,
+                fee=None,
+                error=f"Failed fetching pool: {e!s}",
+            )
+            for amount in amounts
+        ]
+
+    is_token0_weth = pool.token0.lower() == addresses[network]["weth"].lower()
+    token_in, token_out, balance_out = (
+        (pool.token0, pool.token1, pool.balance1)
+        if (quote_type == "buy") == is_token0_weth
+        else (pool.token1, pool.token0, pool.balance0)
+    )
+    balance = (
+        Balance(erc20z=Wei(pool.balance1), weth=Wei(pool.balance0))
+        if is_token0_weth
+        else Balance(erc20z=Wei(pool.balance0), weth=Wei(pool.balance1))
+    )
 
-        insufficient_liquidity = quote_type == "buy" and amount > balance_out
+    quotes = []
+    for amount in amounts:
+        fully_swapped = True
+        quote_error = None
+        try:
+            swap = pool.quote(token_in, amount)
+            amount_out = swap.amount_out
+            fully_swapped = swap.amount_in == amount
+        except PoolStateRangeError:
+            amount_out = exact_input_single(wallet_provider, token_in, token_out, amount, pool.fee)
+        except Exception as e:
+            quote_error = f"Failed fetching quote: {e!s}"
+            amount_out = 0
+
+        insufficient_liquidity = (
+            (quote_type == "buy" and amount > balance_out)
+            or (quote_type == "sell" and not amount_out)
+            or not fully_swapped
+        )
         utilization = (
             Wei(int(amount / balance_out)) if quote_type == "buy" and balance_out > 0 else Wei(0)
         )
 
-        quote_result = exact_input_single(wallet_provider, token_in, token_out, amount, fee)
-
-    except Exception as e:
-        print(f"Error fetching quote: {e!s}")
-
-    insufficient_liquidity = (
-        quote_type == "sell" and pool and not quote_result
-    ) or insufficient_liquidity
-
-    error_msg = None
-    if not pool or not eth_price_in_usd:
-        error_msg = "Failed fetching pool"
-    elif insufficient_liquidity:
-        error_msg = "Insufficient liquidity"
-    elif not quote_result and utilization >= Wei(int(0.9 * 1e18)):
-        error_msg = "Price impact too high"
-    elif not quote_result:
-        error_msg = "Failed fetching quote"
-
-    balance_result = None
-    if tokens and balances:
-        is_weth_token0 = tokens[0].lower() == addresses[network]["weth"].lower()
-        balance_result = Balance(
-            erc20z=Wei(balances[1][0] if isinstance(balances[1], list | tuple) else balances[1])
-            if is_weth_token0
-            else Wei(balances[0][0] if isinstance(balances[0], list | tuple) else balances[0]),
-            weth=Wei(balances[0][0] if isinstance(balances[0], list | tuple) else balances[0])
-            if is_weth_token0
-            else Wei(balances[1][0] if isinstance(balances[1], list | tuple) else balances[1]),
+        error = None
+        if quote_error:
+            error = quote_error
+        elif insufficient_liquidity:
+            error = "Insufficient liquidity"
+        elif not amount_out and utilization >= Wei(int(0.9 * 1e18)):
+            error = "Price impact too high"
+        elif not amount_out:
+            error = "Failed fetching quote"
+
+        quotes.append(
+            Quote(
+                amount_in=amount,
+                amount_out=Wei(amount_out),
+                balance=balance,
+                fee=pool.fee / 1000000,
+                error=error,
+            )
         )
 
-    return Quote(
-        amount_in=amount,
-        amount_out=quote_result if quote_result else Wei(0),
-        balance=balance_result,
-        fee=pool.fee / 1000000 if pool else None,
-        error=invalid_pool_error or error_msg,
-    )
+    return quotes
 
 
 def get_pool_address(wallet_provider: EvmWalletProvider, token_address: str) -> str:
@@ -0,0 +1,277 @@
+"""Uniswap V3 swap math.
+
+Ports of the TickMath, SqrtPriceMath, SwapMath and TickBitmap libraries of
+Uniswap V3 core to Python integers. Every function rounds exactly like its
+Solidity counterpart, so a simulated swap matches the on-chain swap to the wei.
+"""
+
+import math
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+MAX_UINT160 = (1 << 160) - 1
+MAX_UINT256 = (1 << 256) - 1
+FEE_DENOMINATOR = 1_000_000
+
+# Multipliers of getSqrtRatioAtTick, one per bit of the absolute tick from 0x2 up
+_TICK_RATIO_MULTIPLIERS = (
+    0xFFF97272373D413259A46990580E213A,
+    0xFFF2E50F5F656932EF12357CF3C7FDCC,
+    0xFFE5CACA7E10E4E61C3624EAA0941CD0,
+    0xFFCB9843D60F6159C9DB58835C926644,
+    0xFF973B41FA98C081472E6896DFB254C0,
+    0xFF2EA16466C96A3843EC78B326B52861,
+    0xFE5DEE046A99A2A811C461F1969C3053,
+    0xFCBE86C7900A88AEDCFFC83B479AA3A4,
+    0xF987A7253AC413176F2B074CF7815E54,
+    0xF3392B0822B70005940C7A398E4B70F3,
+    0xE7159475A2C29B7443B29C7FA6E889D9,
+    0xD097F3BDFD2022B8845AD8F792AA5825,
+    0xA9F746462D870FDF8A65DC1F90E061E5,
+    0x70D869A156D2A1B890BB3DF62BAF32F7,
+    0x31BE135F97D08FD981231505542FCFA6,
+    0x9AA508B5B7A84E1C677DE54F3E99BC9,
+    0x5D6AF8DEDB81196699C329225EE604,
+    0x2216E584F5FA1EA926041BEDFE98,
+    0x48A170391F7DC42444E8FA2,
+)
+
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    """Compute floor(a * b / denominator), as FullMath.mulDiv."""
+    return a * b // denominator
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """Compute ceil(a * b / denominator), as FullMath.mulDivRoundingUp."""
+    return -(-a * b // denominator)
+
+
+def div_rounding_up(a: int, b: int) -> int:
+    """Compute ceil(a / b), as UnsafeMath.divRoundingUp."""
+    return -(-a // b)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """Get sqrt(1.0001^tick) as a Q64.96 number, as TickMath.getSqrtRatioAtTick.
+
+    Args:
+        tick: The tick, between MIN_TICK and MAX_TICK.
+
+    Returns:
+        int: The sqrt price as a Q64.96 number.
+
+    Raises:
+        ValueError: If the tick is out of range.
+
+    """
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} is out of range")
+
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if abs_tick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    for bit, multiplier in enumerate(_TICK_RATIO_MULTIPLIERS, start=1):
+        if abs_tick & (1 << bit):
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Round up, so getTickAtSqrtRatio of the result is the tick
+    return (ratio >> 32) + (1 if ratio % (1 << 32) else 0)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """Get the greatest tick whose sqrt ratio is at most a sqrt price.
+
+    Gives the same result as TickMath.getTickAtSqrtRatio. The tick is estimated
+    with a logarithm and then corrected with exact getSqrtRatioAtTick comparisons.
+
+    Args:
+        sqrt_price_x96: The sqrt price as a Q64.96 number.
+
+    Returns:
+        int: The tick.
+
+    Raises:
+        ValueError: If the sqrt price is out of range.
+
+    """
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"Sqrt price {sqrt_price_x96} is out of range")
+
+    log_sqrt_price = math.log(sqrt_price_x96) - 96 * math.log(2)
+    tick = max(MIN_TICK, min(MAX_TICK, math.floor(2 * log_sqrt_price / math.log(1.0001))))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def get_amount0_delta(sqrt_ratio_a: int, sqrt_ratio_b: int, liquidity: int, round_up: bool) -> int:
+    """Get the token0 amount between two prices, as SqrtPriceMath.getAmount0Delta."""
+    if sqrt_ratio_a > sqrt_ratio_b:
+        sqrt_ratio_a, sqrt_ratio_b = sqrt_ratio_b, sqrt_ratio_a
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b - sqrt_ratio_a
+    if round_up:
+        return div_rounding_up(
+            mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b), sqrt_ratio_a
+        )
+    return mul_div(numerator1, numerator2, sqrt_ratio_b) // sqrt_ratio_a
+
+
+def get_amount1_delta(sqrt_ratio_a: int, sqrt_ratio_b: int, liquidity: int, round_up: bool) -> int:
+    """Get the token1 amount between two prices, as SqrtPriceMath.getAmount1Delta."""
+    if sqrt_ratio_a > sqrt_ratio_b:
+        sqrt_ratio_a, sqrt_ratio_b = sqrt_ratio_b, sqrt_ratio_a
+
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_ratio_b - sqrt_ratio_a, Q96)
+    return mul_div(liquidity, sqrt_ratio_b - sqrt_ratio_a, Q96)
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    """Get the price after adding an input amount, as SqrtPriceMath.getNextSqrtPriceFromInput.
+
+    Args:
+        sqrt_price_x96: The starting sqrt price.
+        liquidity: The active liquidity.
+        amount_in: The amount of the input token added.
+        zero_for_one: Whether the input is token0.
+
+    Returns:
+        int: The sqrt price after the input is added.
+
+    """
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("Sqrt price and liquidity must be positive")
+    if amount_in == 0:
+        return sqrt_price_x96
+
+    if zero_for_one:
+        # getNextSqrtPriceFromAmount0RoundingUp, adding amount_in
+        numerator1 = liquidity << 96
+        product = amount_in * sqrt_price_x96
+        if product <= MAX_UINT256 and numerator1 + product <= MAX_UINT256:
+            return mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 + product)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount_in)
+
+    # getNextSqrtPriceFromAmount1RoundingDown, adding amount_in
+    quotient = (amount_in << 96) // liquidity
+    next_sqrt_price = sqrt_price_x96 + quotient
+    if next_sqrt_price > MAX_UINT160:
+        raise ValueError("Sqrt price overflow")
+    return next_sqrt_price
+
+
+def compute_swap_step(
+    sqrt_price_current: int,
+    sqrt_price_target: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int,
+) -> tuple[int, int, int, int]:
+    """Compute one exact input swap step within a tick range, as SwapMath.computeSwapStep.
+
+    Args:
+        sqrt_price_current: The current sqrt price.
+        sqrt_price_target: The sqrt price the step may not pass.
+        liquidity: The active liquidity.
+        amount_remaining: The input amount left to swap, fees included.
+        fee_pips: The pool fee in hundredths of a bip.
+
+    Returns:
+        tuple[int, int, int, int]: The sqrt price after the step, the amount in,
+            the amount out and the fee amount.
+
+    """
+    zero_for_one = sqrt_price_current >= sqrt_price_target
+
+    amount_remaining_less_fee = mul_div(
+        amount_remaining, FEE_DENOMINATOR - fee_pips, FEE_DENOMINATOR
+    )
+    if zero_for_one:
+        amount_in = get_amount0_delta(sqrt_price_target, sqrt_price_current, liquidity, True)
+    else:
+        amount_in = get_amount1_delta(sqrt_price_current, sqrt_price_target, liquidity, True)
+
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_price_next = sqrt_price_target
+    else:
+        sqrt_price_next = get_next_sqrt_price_from_input(
+            sqrt_price_current, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_price_next == sqrt_price_target
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(sqrt_price_next, sqrt_price_current, liquidity, True)
+        amount_out = get_amount1_delta(sqrt_price_next, sqrt_price_current, liquidity, False)
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(sqrt_price_current, sqrt_price_next, liquidity, True)
+        amount_out = get_amount0_delta(sqrt_price_current, sqrt_price_next, liquidity, False)
+
+    if not reached_target:
+        # The input is used up, so whatever is left of it is the fee
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, FEE_DENOMINATOR - fee_pips)
+
+    return sqrt_price_next, amount_in, amount_out, fee_amount
+
+
+def tick_bitmap_position(compressed_tick: int) -> tuple[int, int]:
+    """Get the word and bit of a compressed tick in the tick bitmap, as TickBitmap.position."""
+    return compressed_tick >> 8, compressed_tick % 256
+
+
+def next_initialized_tick_within_one_word(
+    bitmap: dict[int, int], tick: int, tick_spacing: int, lte: bool
+) -> tuple[int, bool]:
+    """Find the next initialized tick in the bitmap word of a tick.
+
+    The same search as TickBitmap.nextInitializedTickWithinOneWord.
+
+    Args:
+        bitmap: The tick bitmap words by word position. Missing words are empty.
+        tick: The starting tick.
+        tick_spacing: The tick spacing of the pool.
+        lte: Whether to search at or below the tick, otherwise above it.
+
+    Returns:
+        tuple[int, bool]: The next tick, and whether it is initialized. An
+            uninitialized tick is the end of the word.
+
+    """
+    # Python floor division rounds towards negative infinity like the contract does
+    compressed = tick // tick_spacing
+
+    if lte:
+        word_pos, bit_pos = tick_bitmap_position(compressed)
+        mask = (1 << bit_pos) - 1 + (1 << bit_pos)
+        masked = bitmap.get(word_pos, 0) & mask
+        if masked:
+            return (compressed - (bit_pos - (masked.bit_length() - 1))) * tick_spacing, True
+        return (compressed - bit_pos) * tick_spacing, False
+
+    word_pos, bit_pos = tick_bitmap_position(compressed + 1)
+    mask = MAX_UINT256 ^ ((1 << bit_pos) - 1)
+    masked = bitmap.get(word_pos, 0) & mask
+    if masked:
+        least_significant_bit = (masked & -masked).bit_length() - 1
+        return (compressed + 1 + (least_significant_bit - bit_pos)) * tick_spacing, True
+    return (compressed + 1 + (255 - bit_pos)) * tick_spacing, False
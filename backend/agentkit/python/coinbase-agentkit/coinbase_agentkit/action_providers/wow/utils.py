@@ -1,8 +1,11 @@
 """Utilities for WOW action provider."""
 
+from typing import Literal
+
 from ...wallet_providers import EvmWalletProvider
 from .constants import WOW_ABI, WOW_FACTORY_CONTRACT_ADDRESSES
-from .uniswap.utils import get_has_graduated, get_uniswap_quote
+from .market_state import WowMarketState, get_market_state
+from .uniswap.utils import get_uniswap_quotes
 
 
 def get_factory_address(chain_id: str) -> str:
@@ -46,6 +49,84 @@ def get_current_supply(wallet_provider: EvmWalletProvider, token_address: str) -
     )
 
 
+def get_has_graduated(wallet_provider: EvmWalletProvider, token_address: str) -> bool:
+    """Check if a token has graduated from its bonding curve to its Uniswap pool.
+
+    Args:
+        wallet_provider: The wallet provider to use for contract calls
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+
+    Returns:
+        bool: True if the token has graduated, False otherwise
+
+    """
+    return get_market_state(wallet_provider, token_address).has_graduated
+
+
+def _uniswap_amounts_out(
+    wallet_provider: EvmWalletProvider,
+    state: WowMarketState,
+    amounts: list[int],
+    quote_type: Literal["buy", "sell"],
+) -> list[int]:
+    """Get the Uniswap amounts out of a graduated token, raising if any amount has no quote."""
+    quotes = get_uniswap_quotes(
+        wallet_provider, state.token, amounts, quote_type, pool_address=state.pool_address
+    )
+    for quote in quotes:
+        if not quote.amount_out:
+            raise ValueError(quote.error or "No Uniswap quote")
+    return [quote.amount_out for quote in quotes]
+
+
+def get_buy_quotes(
+    wallet_provider: EvmWalletProvider, token_address: str, amounts_eth_in_wei: list[int]
+) -> list[int]:
+    """Get quotes for buying tokens with each of several ETH amounts.
+
+    Tokens on the bonding curve are quoted locally from their cached market state,
+    graduated tokens from a snapshot of their Uniswap pool, so quoting more
+    amounts costs no extra RPC calls.
+
+    Args:
+        wallet_provider: The wallet provider to use for contract calls
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amounts_eth_in_wei: Amounts of ETH to buy with (in wei)
+
+    Returns:
+        list[int]: The amount of tokens that would be received for each ETH amount
+
+    """
+    state = get_market_state(wallet_provider, token_address)
+    if state.has_graduated:
+        return _uniswap_amounts_out(wallet_provider, state, amounts_eth_in_wei, "buy")
+    return state.buy_quotes(amounts_eth_in_wei)
+
+
+def get_sell_quotes(
+    wallet_provider: EvmWalletProvider, token_address: str, amounts_tokens_in_wei: list[int]
+) -> list[int]:
+    """Get quotes for selling each of several token amounts.
+
+    Tokens on the bonding curve are quoted locally from their cached market state,
+    graduated tokens from a snapshot of their Uniswap pool, so quoting more
+    amounts costs no extra RPC calls.
+
+    Args:
+        wallet_provider: The wallet provider to use for contract calls
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amounts_tokens_in_wei: Amounts of tokens to sell (in wei)
+
+    Returns:
+        list[int]: The amount of ETH that would be received for each token amount
+
+    """
+    state = get_market_state(wallet_provider, token_address)
+    if state.has_graduated:
+        return _uniswap_amounts_out(wallet_provider, state, amounts_tokens_in_wei, "sell")
+    return state.sell_quotes(amounts_tokens_in_wei)
+
+
 def get_buy_quote(
     wallet_provider: EvmWalletProvider, token_address: str, amount_eth_in_wei: str
 ) -> int:
@@ -60,21 +141,7 @@ def get_buy_quote(
         int: The amount of tokens that would be received for the given ETH amount
 
     """
-    amount_eth_in_wei_int = int(amount_eth_in_wei)
-    has_graduated = get_has_graduated(wallet_provider, token_address)
-
-    token_quote = (
-        has_graduated
-        and (
-            get_uniswap_quote(wallet_provider, token_address, amount_eth_in_wei_int, "buy")
-        ).amount_out
-    ) or wallet_provider.read_contract(
-        contract_address=token_address,
-        abi=WOW_ABI,
-        function_name="getEthBuyQuote",
-        args=[amount_eth_in_wei_int],
-    )
-    return token_quote
+    return get_buy_quotes(wallet_provider, token_address, [int(amount_eth_in_wei)])[0]
 
 
 def get_sell_quote(
@@ -91,18 +158,4 @@ def get_sell_quote(
         int: The amount of ETH that would be received for the given token amount
 
     """
-    amount_tokens_in_wei_int = int(amount_tokens_in_wei)
-    has_graduated = get_has_graduated(wallet_provider, token_address)
-
-    token_quote = (
-        has_graduated
-        and (
-            get_uniswap_quote(wallet_provider, token_address, amount_tokens_in_wei_int, "sell")
-        ).amount_out
-    ) or wallet_provider.read_contract(
-        contract_address=token_address,
-        abi=WOW_ABI,
-        function_name="getTokenSellQuote",
-        args=[amount_tokens_in_wei_int],
-    )
-    return token_quote
+    return get_sell_quotes(wallet_provider, token_address, [int(amount_tokens_in_wei)])[0]
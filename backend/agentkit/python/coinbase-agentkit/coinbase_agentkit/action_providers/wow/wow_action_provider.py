@@ -1,20 +1,38 @@
 """WOW action provider."""
 
 import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Any
 
 from web3 import Web3
 
-from ...network import Network
+from ...network import NETWORK_ID_TO_CHAIN, Network
 from ...wallet_providers import EvmWalletProvider
 from ..action_decorator import create_action
 from ..action_provider import ActionProvider
 from .constants import (
     GENERIC_TOKEN_METADATA_URI,
+    TOKEN_INDEX_DB_ENV,
+    TOKEN_INDEX_DEFAULT_PATH,
+    TOKEN_INDEX_INITIAL_BLOCKS,
+    TOKEN_INDEX_SYNC_INTERVAL,
     WOW_ABI,
     WOW_FACTORY_ABI,
+    WOW_FACTORY_CONTRACT_ADDRESSES,
+    addresses,
 )
-from .schemas import WowBuyTokenSchema, WowCreateTokenSchema, WowSellTokenSchema
+from .market_state import market_states
+from .schemas import (
+    WowBuyTokenSchema,
+    WowCreateTokenSchema,
+    WowListRecentTokensSchema,
+    WowSearchTokensSchema,
+    WowSellTokenSchema,
+)
+from .token_index import WowToken, WowTokenIndex, WowTokenIndexer
 from .utils import (
     get_buy_quote,
     get_factory_address,
@@ -28,9 +46,133 @@ SUPPORTED_CHAINS = ["8453", "84532"]
 class WowActionProvider(ActionProvider[EvmWalletProvider]):
     """Provides actions for interacting with WOW protocol."""
 
-    def __init__(self):
-        """Initialize WOW action provider."""
+    def __init__(
+        self,
+        token_index_path: str | None = None,
+        rpc_url: str | None = None,
+        start_block: int | None = None,
+    ):
+        """Initialize WOW action provider.
+
+        Args:
+            token_index_path: Optional path to persist the token index to. If not provided,
+                    will use WOW_TOKEN_INDEX_PATH, or TOKEN_INDEX_DEFAULT_PATH. Use
+                    ":memory:" to keep the index in memory. The index is only opened
+                    when tokens are first searched or listed.
+            rpc_url: Optional RPC URL to scan for tokens. If not provided, the default
+                    RPC URL of the wallet network is used.
+            start_block: Optional block to start the first scan for tokens from, such as
+                    the block the factory was deployed at. If not provided, only the latest
+                    TOKEN_INDEX_INITIAL_BLOCKS blocks are scanned and the index is partial.
+
+        """
         super().__init__("wow", [])
+        # Token market states are shared with the quote functions, see market_states.metrics
+        self.market_states = market_states
+        self.token_index_path = (
+            token_index_path or os.getenv(TOKEN_INDEX_DB_ENV) or TOKEN_INDEX_DEFAULT_PATH
+        )
+        self._token_index: WowTokenIndex | None = None
+        self._token_index_lock = threading.Lock()
+        self.token_index_sync_interval = TOKEN_INDEX_SYNC_INTERVAL
+        self.rpc_url = rpc_url
+        self.start_block = start_block
+        self._indexers: dict[int, WowTokenIndexer] = {}
+        self._indexers_lock = threading.Lock()
+
+    def get_token_index(self) -> WowTokenIndex:
+        """Get the token index, opening it on first use.
+
+        Returns:
+            WowTokenIndex: The token index.
+
+        """
+        with self._token_index_lock:
+            if self._token_index is None:
+                self._token_index = WowTokenIndex(self.token_index_path)
+            return self._token_index
+
+    def get_token_indexer(self, wallet_provider: EvmWalletProvider) -> WowTokenIndexer:
+        """Get the token indexer of the wallet network, creating it on first use.
+
+        Args:
+            wallet_provider: The wallet provider whose network is indexed.
+
+        Returns:
+            WowTokenIndexer: The token indexer.
+
+        """
+        network = wallet_provider.get_network()
+        chain_id = int(network.chain_id)
+        with self._indexers_lock:
+            indexer = self._indexers.get(chain_id)
+            if indexer is None:
+                network_id = "base-mainnet" if chain_id == 8453 else "base-sepolia"
+                rpc_url = (
+                    self.rpc_url or NETWORK_ID_TO_CHAIN[network_id].rpc_urls["default"].http[0]
+                )
+                factories = {
+                    WOW_FACTORY_CONTRACT_ADDRESSES[network_id],
+                    addresses[network_id]["wow_factory"],
+                }
+                indexer = WowTokenIndexer(
+                    Web3(Web3.HTTPProvider(rpc_url)),
+                    self.get_token_index(),
+                    chain_id,
+                    sorted(factories),
+                    start_block=self.start_block,
+                    max_initial_blocks=TOKEN_INDEX_INITIAL_BLOCKS,
+                )
+                self._indexers[chain_id] = indexer
+            return indexer
+
+    def _sync_token_index(self, wallet_provider: EvmWalletProvider) -> str:
+        """Scan new blocks for created tokens if the index is stale.
+
+        If the scan fails but the index was synced before, the stored tokens are
+        used and a note saying so is returned. A note is also returned if the index
+        only covers the latest blocks.
+
+        Args:
+            wallet_provider: The wallet provider whose network is indexed.
+
+        Returns:
+            str: A note to show above the response, or an empty string.
+
+        Raises:
+            Exception: If the scan fails and the index was never synced.
+
+        """
+        indexer = self.get_token_indexer(wallet_provider)
+        index = self.get_token_index()
+        note = ""
+        synced_at = index.get_synced_at(indexer.chain_id)
+        if synced_at is None or time.time() - synced_at >= self.token_index_sync_interval:
+            try:
+                indexer.sync()
+            except Exception as e:
+                synced_at = index.get_synced_at(indexer.chain_id)
+                if synced_at is None:
+                    raise
+                synced = datetime.fromtimestamp(synced_at, tz=timezone.utc)
+                note = (
+                    f"Note: Scanning for new tokens failed ({e!s}), showing tokens indexed at "
+                    f"{synced.strftime('%Y-%m-%d %H:%M:%S')} UTC.\n\n"
+                )
+
+        first_block = index.get_first_block(indexer.chain_id)
+        if first_block is not None:
+            note += f"Note: Only tokens created since block {first_block} are indexed.\n\n"
+        return note
+
+    @staticmethod
+    def _format_tokens(tokens: list[WowToken]) -> str:
+        """Format tokens as one line each."""
+        return "\n".join(
+            f"- {token.name} ({token.symbol}): {token.address}, created by {token.creator} "
+            f"at block {token.block_number}"
+            for token in tokens
+        )
 
     @create_action(
         name="buy_token",
@@ -254,6 +396,85 @@ Important notes:
         except Exception as e:
             return f"Error selling Zora Wow ERC20 memecoin: {e!s}"
 
+    @create_action(
+        name="search_wow_tokens",
+        description="""
+This tool searches Zora Wow ERC20 memecoins on the current network by name, symbol or address.
+Use it to find the contract address of a WOW token before buying or selling it.
+
+Inputs:
+- query: Text to find in token names or symbols, e.g. "doge", or a token address
+- limit: (Optional) Maximum number of tokens to return, 10 by default
+
+Important notes:
+- Exact symbol matches are listed first, then the newest tokens
+- Several tokens can share a name or symbol, so confirm the address with the user before trading""",
+        schema=WowSearchTokensSchema,
+    )
+    def search_wow_tokens(self, wallet_provider: EvmWalletProvider, args: dict[str, Any]) -> str:
+        """Search WOW tokens by name, symbol or address.
+
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider whose network is searched.
+            args (dict[str, Any]): Input arguments containing query and optional limit.
+
+        Returns:
+            str: A message containing the matching tokens or error message.
+
+        """
+        try:
+            validated_args = WowSearchTokensSchema(**args)
+            note = self._sync_token_index(wallet_provider)
+            tokens = self.get_token_index().search(
+                int(wallet_provider.get_network().chain_id),
+                validated_args.query,
+                validated_args.limit,
+            )
+
+            if not tokens:
+                return f"{note}No WOW tokens found matching '{validated_args.query}'."
+            return (
+                f"{note}WOW tokens matching '{validated_args.query}':\n"
+                f"{self._format_tokens(tokens)}"
+            )
+        except Exception as e:
+            return f"Error searching Zora Wow ERC20 memecoins: {e!s}"
+
+    @create_action(
+        name="list_recent_wow_tokens",
+        description="""
+This tool lists the most recently created Zora Wow ERC20 memecoins on the current network.
+
+Inputs:
+- limit: (Optional) Maximum number of tokens to return, 10 by default""",
+        schema=WowListRecentTokensSchema,
+    )
+    def list_recent_wow_tokens(
+        self, wallet_provider: EvmWalletProvider, args: dict[str, Any]
+    ) -> str:
+        """List the most recently created WOW tokens.
+
+        Args:
+            wallet_provider (EvmWalletProvider): The wallet provider whose network is listed.
+            args (dict[str, Any]): Input arguments containing an optional limit.
+
+        Returns:
+            str: A message containing the tokens or error message.
+
+        """
+        try:
+            validated_args = WowListRecentTokensSchema(**args)
+            note = self._sync_token_index(wallet_provider)
+            tokens = self.get_token_index().recent(
+                int(wallet_provider.get_network().chain_id), validated_args.limit
+            )
+
+            if not tokens:
+                return f"{note}No WOW tokens have been created yet."
+            return f"{note}Most recently created WOW tokens:\n{self._format_tokens(tokens)}"
+        except Exception as e:
+            return f"Error listing Zora Wow ERC20 memecoins: {e!s}"
+
     def supports_network(self, network: Network) -> bool:
         """Check if network is supported by WOW protocol.
 
@@ -267,6 +488,22 @@ Important notes:
         return network.protocol_family == "evm" and network.chain_id in SUPPORTED_CHAINS
 
 
-def wow_action_provider() -> WowActionProvider:
-    """Create a new WowActionProvider instance."""
-    return WowActionProvider()
+def wow_action_provider(
+    token_index_path: str | None = None,
+    rpc_url: str | None = None,
+    start_block: int | None = None,
+) -> WowActionProvider:
+    """Create a new WowActionProvider instance.
+
+    Args:
+        token_index_path: Optional path to persist the token index to.
+        rpc_url: Optional RPC URL to scan for tokens.
+        start_block: Optional block to start the first scan for tokens from.
+
+    Returns:
+        WowActionProvider: A new WOW action provider instance.
+
+    """
+    return WowActionProvider(
+        token_index_path=token_index_path, rpc_url=rpc_url, start_block=start_block
+    )
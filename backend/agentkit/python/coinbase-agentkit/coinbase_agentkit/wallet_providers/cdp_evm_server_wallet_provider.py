@@ -183,6 +183,26 @@ class CdpEvmServerWalletProvider(EvmWalletProvider):
             args = []
         return func(*args).call(block_identifier=block_identifier)
 
+    def simulate_transaction(
+        self, transaction: TxParams, block_identifier: BlockIdentifier = "latest"
+    ) -> bytes:
+        """Run a transaction from the wallet with eth_call, without sending it.
+
+        Args:
+            transaction (TxParams): Transaction parameters including to, value, and data
+            block_identifier (BlockIdentifier): The block to run on, defaults to 'latest'
+
+        Returns:
+            bytes: The data returned by the call
+
+        Raises:
+            ContractLogicError: If the call reverts
+
+        """
+        return bytes(
+            self._web3.eth.call({**transaction, "from": self.get_address()}, block_identifier)
+        )
+
     def send_transaction(self, transaction: TxParams) -> HexStr:
         """Send a transaction to the network.
 
@@ -264,6 +264,26 @@ class EthAccountWalletProvider(EvmWalletProvider):
             args = []
         return func(*args).call(block_identifier=block_identifier)
 
+    def simulate_transaction(
+        self, transaction: TxParams, block_identifier: BlockIdentifier = "latest"
+    ) -> bytes:
+        """Run a transaction from the wallet with eth_call, without sending it.
+
+        Args:
+            transaction (TxParams): Transaction parameters including to, value, and data
+            block_identifier (BlockIdentifier): The block to run on, defaults to 'latest'
+
+        Returns:
+            bytes: The data returned by the call
+
+        Raises:
+            ContractLogicError: If the call reverts
+
+        """
+        return bytes(
+            self.web3.eth.call({**transaction, "from": self.get_address()}, block_identifier)
+        )
+
     def native_transfer(self, to: str, value: Decimal) -> str:
         """Transfer the native asset of the network.
 
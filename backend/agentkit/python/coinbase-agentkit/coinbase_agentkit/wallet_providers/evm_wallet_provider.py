@@ -62,3 +62,17 @@ class EvmWalletProvider(WalletProvider, ABC):
     ) -> Any:
         """Read data from a smart contract."""
         pass
+
+    def simulate_transaction(
+        self, transaction: TxParams, block_identifier: BlockIdentifier = "latest"
+    ) -> bytes | None:
+        """Run a transaction from the wallet with eth_call, without sending it.
+
+        Wallet providers that cannot make calls as the wallet don't need to implement it.
+
+        Returns:
+            bytes | None: The data returned by the call, or None if the wallet provider
+                does not support simulation
+
+        """
+        return None
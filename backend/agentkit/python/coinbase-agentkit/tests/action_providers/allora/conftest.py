@@ -70,4 +70,6 @@ def integration_provider():
         chain_slug = ChainSlug.MAINNET
 
     # Create the provider with optional custom values (will use defaults if None)
-    return AlloraActionProvider(api_key=api_key, chain_slug=chain_slug)
+    provider = AlloraActionProvider(api_key=api_key, chain_slug=chain_slug)
+    yield provider
+    provider.close()
@@ -0,0 +1,214 @@
+"""Tests for the Allora topic catalog and batched price inferences."""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from allora_sdk.v2.api_client import PriceInferenceTimeframe, PriceInferenceToken
+
+from coinbase_agentkit.action_providers.allora.allora_action_provider import AlloraActionProvider
+from coinbase_agentkit.action_providers.allora.topic_catalog import (
+    TopicCatalog,
+    normalize_timeframe,
+    parse_topic_name,
+)
+
+TOPICS = [
+    {"topic_id": 1, "topic_name": "ETH 10min Prediction", "is_active": True},
+    {"topic_id": 2, "topic_name": "ETH 5min Volatility Prediction", "is_active": True},
+    {"topic_id": 3, "topic_name": "Bitcoin 8h", "is_active": False},
+    {"topic_id": 4, "topic_name": "SOL/USD - 8h Price Prediction", "is_active": False},
+    {"topic_id": 5, "topic_name": "SOL 8h Price Prediction", "is_active": True},
+    {"topic_id": 6, "topic_name": "Weather forecast", "is_active": True},
+]
+
+DELAY = 0.1
+
+
+def _inference(price: str):
+    """Build an inference with a normalized price."""
+    return SimpleNamespace(
+        inference_data=SimpleNamespace(network_inference_normalized=price, timestamp=1718198400)
+    )
+
+
+class _FakeClient:
+    """Async Allora client answering after a delay and recording its calls."""
+
+    def __init__(self):
+        self.calls = []
+        self.loops = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_all_topics(self):
+        self.calls.append(("topics",))
+        return TOPICS
+
+    async def get_price_inference(self, asset, timeframe):
+        self.calls.append(("price", asset, timeframe))
+        self.loops.add(asyncio.get_running_loop())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(DELAY)
+        self.in_flight -= 1
+        return _inference(f"{asset.value}-{timeframe.value}")
+
+    async def get_inference_by_topic_id(self, topic_id):
+        self.calls.append(("topic", topic_id))
+        self.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(DELAY)
+        if topic_id == 1:
+            raise ValueError("Failed to fetch price inference")
+        return _inference(f"topic-{topic_id}")
+
+
+@pytest.fixture(autouse=True)
+def mock_analytics():
+    """Stop actions from sending analytics events."""
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        yield
+
+
+@pytest.fixture
+def fake_provider():
+    """Create an Allora action provider with a fake async client."""
+    provider = AlloraActionProvider(api_key="test-api-key")
+    provider.client = _FakeClient()
+    yield provider
+    provider.close()
+
+
+def test_parse_topic_name():
+    """Test that assets and timeframes are read from topic names."""
+    assert parse_topic_name("ETH 10min Prediction") == ("ETH", "10m")
+    assert parse_topic_name("Bitcoin 8h") == ("BTC", "8h")
+    assert parse_topic_name("SOL/USD - 8h Price Prediction") == ("SOL", "8h")
+    assert parse_topic_name("BTC 24 hours") == ("BTC", "24h")
+    assert parse_topic_name("Weather forecast") == (None, None)
+    assert normalize_timeframe("05 Minutes") == "5m"
+    assert normalize_timeframe("soon") is None
+
+
+def test_topic_catalog_prefers_active_price_topics():
+    """Test that lookups prefer active topics that predict prices."""
+    catalog = TopicCatalog(TOPICS)
+
+    assert len(catalog) == 6
+    assert catalog.by_id[6]["topic_name"] == "Weather forecast"
+    assert catalog.find_topic("sol", "8 hours")["topic_id"] == 5
+    assert catalog.find_topic("bitcoin", "8h")["topic_id"] == 3
+    assert [t["topic_id"] for t in catalog.find_topics("ETH", "10min")] == [1]
+    assert catalog.find_topic("DOGE", "8h") is None
+    assert catalog.find_topic("ETH", "later") is None
+
+
+def test_topic_catalog_cached_within_ttl(fake_provider):
+    """Test that topics are fetched once until the TTL expires."""
+    result = fake_provider.get_all_topics({})
+    fake_provider.get_all_topics({})
+
+    assert json.dumps(TOPICS) in result
+    assert fake_provider.client.calls == [("topics",)]
+
+    fake_provider.get_topic_catalog(max_age=0)
+    assert fake_provider.client.calls == [("topics",), ("topics",)]
+
+
+def test_get_price_inferences(fake_provider):
+    """Test price endpoint pairs, topic pairs, missing topics and failures in one batch."""
+    result = fake_provider.get_price_inferences(
+        {
+            "requests": [
+                {"asset": "BTC", "timeframe": "8h"},
+                {"asset": "sol", "timeframe": "8h"},
+                {"asset": "DOGE", "timeframe": "1h"},
+                {"asset": "ETH", "timeframe": "10min"},
+                {"asset": "btc", "timeframe": "8h"},
+            ]
+        }
+    )
+
+    assert result.startswith("The price inferences from Allora Network are:\n")
+    inferences = json.loads(result.split("\n", 1)[1])
+    assert inferences == [
+        {"asset": "BTC", "timeframe": "8h", "price": "BTC-8h", "timestamp": 1718198400},
+        {
+            "asset": "SOL",
+            "timeframe": "8h",
+            "price": "topic-5",
+            "timestamp": 1718198400,
+            "topic_id": 5,
+        },
+        {
+            "asset": "DOGE",
+            "timeframe": "1h",
+            "error": "No price inference topic found for DOGE (1h)",
+        },
+        {"asset": "ETH", "timeframe": "10min", "error": "Failed to fetch price inference"},
+    ]
+    assert ("price", PriceInferenceToken.BTC, PriceInferenceTimeframe.EIGHT_HOURS) in (
+        fake_provider.client.calls
+    )
+    assert fake_provider.client.calls.count(("topics",)) == 1
+
+
+def test_get_price_inferences_concurrent_on_shared_loop(fake_provider):
+    """Test that a batch runs concurrently, and all calls share one event loop."""
+    requests = [
+        {"asset": asset, "timeframe": timeframe}
+        for asset in ("BTC", "ETH")
+        for timeframe in ("5m", "8h")
+    ]
+
+    fake_provider.get_price_inferences({"requests": requests})
+    fake_provider.get_price_inference({"asset": "BTC", "timeframe": "5m"})
+
+    assert fake_provider.client.max_in_flight == len(requests)
+    assert len(fake_provider.client.loops) == 1
+
+
+def test_hung_request_times_out_and_is_cancelled(fake_provider):
+    """Test that a request exceeding the timeout is cancelled and frees the shared loop."""
+    cancelled = threading.Event()
+
+    async def hang(topic_id):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    fake_provider.request_timeout = DELAY
+    fake_provider.client.get_inference_by_topic_id = hang
+
+    result = fake_provider.get_inference_by_topic_id({"topic_id": 5})
+
+    assert result == (
+        f"Error getting inference for topic 5: Allora request timed out after {DELAY} seconds"
+    )
+    assert cancelled.wait(timeout=1)
+    fake_provider.request_timeout = DELAY * 10
+    assert "BTC-5m" in fake_provider.get_price_inference({"asset": "BTC", "timeframe": "5m"})
+
+
+def test_get_price_inferences_requires_requests(fake_provider):
+    """Test that an empty batch is rejected."""
+    result = fake_provider.get_price_inferences({"requests": []})
+
+    assert "Error getting price inferences:" in result
+    assert fake_provider.client.calls == []
+
+
+def test_close_stops_event_loop(fake_provider):
+    """Test that close stops the shared event loop, which restarts when needed."""
+    fake_provider.get_price_inference({"asset": "BTC", "timeframe": "5m"})
+    thread = fake_provider._loop_thread
+
+    fake_provider.close()
+
+    assert not thread.is_alive()
+    assert "BTC-5m" in fake_provider.get_price_inference({"asset": "BTC", "timeframe": "5m"})
@@ -8,6 +8,11 @@ from web3 import Web3
 from coinbase_agentkit.action_providers.basename.basename_action_provider import (
     basename_action_provider,
 )
+from coinbase_agentkit.action_providers.basename.constants import (
+    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET,
+    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_TESTNET,
+    REGISTRAR_ABI,
+)
 from coinbase_agentkit.network import Network
 from coinbase_agentkit.wallet_providers import EvmWalletProvider
 
@@ -16,13 +21,43 @@ MOCK_TX_HASH = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
 MOCK_BASENAME = "test"
 MOCK_AMOUNT = "0.01"
 MOCK_RECEIPT = {"status": 1}
+MOCK_PRICE = Web3.to_wei("0.001", "ether")
+
+
+class FakeRegistrar:
+    """A registrar controller answering availability and price reads like the chain."""
+
+    def __init__(self):
+        self.taken = {"taken"}
+
+    def answer(self, address, function_name, args):
+        """Answer a call to the registrar controller."""
+        if function_name == "available":
+            return (args["name"] not in self.taken,)
+        assert function_name == "registerPrice"
+        # Shorter names cost more, as with the Basenames price oracle
+        return (MOCK_PRICE * 10 if len(args["name"]) < 5 else MOCK_PRICE,)
+
+
+@pytest.fixture
+def registrar(multicall3):
+    """Create a registrar controller answering reads."""
+    registrar = FakeRegistrar()
+    for address in (
+        BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET,
+        BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_TESTNET,
+    ):
+        multicall3.add_contract(address, REGISTRAR_ABI, registrar.answer)
+    return registrar
 
 
 @pytest.fixture
-def mock_wallet_provider():
+def mock_wallet_provider(registrar, multicall3):
     """Create a mock wallet provider for testing."""
     mock = Mock(spec=EvmWalletProvider)
     mock.get_address.return_value = MOCK_ADDRESS
+    mock.read_contract.side_effect = multicall3.read_contract
+    mock.simulate_transaction.return_value = b""
     mock.send_transaction.return_value = MOCK_TX_HASH
     mock.wait_for_transaction_receipt.return_value = MOCK_RECEIPT
 
@@ -0,0 +1,146 @@
+"""Tests for Basename availability checks and registration pre-flight."""
+
+import pytest
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.basename.constants import (
+    BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET,
+    L2_RESOLVER_ABI,
+    REGISTRAR_ABI,
+)
+from coinbase_agentkit.action_providers.basename.preflight import (
+    check_basenames,
+    namehash,
+    normalize_basename,
+    prepare_registration,
+)
+
+from .conftest import MOCK_ADDRESS, MOCK_PRICE, MOCK_TX_HASH
+
+_registrar_contract = Web3().eth.contract(abi=REGISTRAR_ABI)
+_resolver_contract = Web3().eth.contract(abi=L2_RESOLVER_ABI)
+
+
+def test_namehash():
+    """Test the namehash against the EIP-137 examples and that parents are cached."""
+    assert namehash("") == bytes(32)
+    assert namehash("eth").hex() == (
+        "93cdeb708b7545dc668eb9280176169d1c33cfd8ed6f04690a0bcc88a93fc4ae"
+    )
+    assert namehash("foo.eth").hex() == (
+        "de9b09fd7c5f901e23a3f19fecc54828e9c848539801e86591bd9801b019f84f"
+    )
+
+    namehash.cache_clear()
+    namehash("alice.base.eth")
+    namehash("bob.base.eth")
+    assert namehash.cache_info().misses == 5
+
+
+def test_normalize_basename():
+    """Test that names get the suffix and are lowercased."""
+    assert normalize_basename("Alice", ".base.eth") == ("alice.base.eth", "alice")
+    assert normalize_basename("alice.base.eth", ".base.eth") == ("alice.base.eth", "alice")
+    assert normalize_basename(" _My-Agent1 ", ".basetest.eth") == (
+        "_my-agent1.basetest.eth",
+        "_my-agent1",
+    )
+    with pytest.raises(ValueError, match="is not a valid Basename"):
+        normalize_basename(".base.eth", ".base.eth")
+
+
+def test_check_basenames_in_one_read(multicall3, mock_wallet_provider):
+    """Test that the availability and price of many names take one read."""
+    quotes = check_basenames(mock_wallet_provider, ["alice", "taken.base.eth", "bob"])
+
+    assert [(q.name, q.available, q.price) for q in quotes] == [
+        ("alice.base.eth", True, MOCK_PRICE),
+        ("taken.base.eth", False, MOCK_PRICE),
+        ("bob.base.eth", True, MOCK_PRICE * 10),
+    ]
+    assert multicall3.reads == ["aggregate3"]
+
+
+def test_prepare_registration(mock_wallet_provider):
+    """Test that a registration pays the price by default and is simulated first."""
+    quote, transaction = prepare_registration(mock_wallet_provider, "alice")
+
+    assert transaction["to"] == BASENAMES_REGISTRAR_CONTROLLER_ADDRESS_MAINNET
+    assert transaction["value"] == MOCK_PRICE
+    mock_wallet_provider.simulate_transaction.assert_called_once_with(transaction)
+
+    function, args = _registrar_contract.decode_function_input(transaction["data"])
+    request = args["request"]
+    assert function.fn_name == "register"
+    assert (request["name"], request["owner"], request["reverseRecord"]) == (
+        "alice",
+        MOCK_ADDRESS,
+        True,
+    )
+    set_addr, set_addr_args = _resolver_contract.decode_function_input(request["data"][0])
+    assert set_addr.fn_name == "setAddr"
+    assert set_addr_args["node"] == namehash(quote.name)
+
+
+def test_prepare_registration_errors(mock_wallet_provider):
+    """Test that unavailable names, underpayments and reverts stop before sending."""
+    with pytest.raises(ValueError, match="^taken.base.eth is not available$"):
+        prepare_registration(mock_wallet_provider, "taken")
+
+    with pytest.raises(
+        ValueError,
+        match="^0.005 ETH is below the registration price of 0.01 ETH for bob.base.eth$",
+    ):
+        prepare_registration(mock_wallet_provider, "bob", Web3.to_wei("0.005", "ether"))
+    mock_wallet_provider.simulate_transaction.assert_not_called()
+
+    mock_wallet_provider.simulate_transaction.side_effect = Exception("execution reverted")
+    with pytest.raises(ValueError, match="^Registering alice.base.eth would revert"):
+        prepare_registration(mock_wallet_provider, "alice")
+
+
+def test_prepare_registration_without_simulation(mock_wallet_provider):
+    """Test that a wallet provider without simulation still gets the registration."""
+    mock_wallet_provider.simulate_transaction.return_value = None
+
+    quote, transaction = prepare_registration(mock_wallet_provider, "alice")
+
+    assert (quote.name, transaction["value"]) == ("alice.base.eth", MOCK_PRICE)
+
+
+def test_register_basename_preflight_failure(provider, mock_wallet_provider):
+    """Test that a registration failing its pre-flight is never sent."""
+    response = provider.register_basename(mock_wallet_provider, {"basename": "taken"})
+
+    assert response == "Error registering basename: taken.base.eth is not available"
+    mock_wallet_provider.send_transaction.assert_not_called()
+    mock_wallet_provider.wait_for_transaction_receipt.assert_not_called()
+
+
+def test_register_basename_pays_price(provider, mock_wallet_provider):
+    """Test that the registration price is paid when no amount is given."""
+    response = provider.register_basename(mock_wallet_provider, {"basename": "alice"})
+
+    assert response == f"Successfully registered basename alice.base.eth for address {MOCK_ADDRESS}"
+    assert mock_wallet_provider.send_transaction.call_args[0][0]["value"] == MOCK_PRICE
+    mock_wallet_provider.wait_for_transaction_receipt.assert_called_once_with(MOCK_TX_HASH)
+
+
+def test_check_basenames_action(provider, mock_wallet_provider):
+    """Test that the check lists each name with its availability and price."""
+    response = provider.check_basenames(
+        mock_wallet_provider, {"basenames": ["alice", "taken", "bob"]}
+    )
+
+    assert response.splitlines() == [
+        "Basenames for one year:",
+        "- alice.base.eth: available for 0.001 ETH",
+        "- taken.base.eth: not available",
+        "- bob.base.eth: available for 0.01 ETH",
+    ]
+
+    mock_wallet_provider.read_contract.side_effect = Exception("rpc error")
+    assert (
+        provider.check_basenames(mock_wallet_provider, {"basenames": ["alice"]})
+        == "Error checking basenames: rpc error"
+    )
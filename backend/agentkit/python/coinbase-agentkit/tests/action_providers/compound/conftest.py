@@ -1,10 +1,73 @@
 from unittest.mock import MagicMock
 
 import pytest
+from web3 import Web3
 
 from coinbase_agentkit.action_providers.compound.compound_action_provider import (
     CompoundActionProvider,
 )
+from coinbase_agentkit.action_providers.compound.constants import COMET_ABI, PRICE_FEED_ABI
+from coinbase_agentkit.action_providers.compound.portfolio import portfolio_reader
+from coinbase_agentkit.action_providers.erc20.constants import ERC20_ABI
+
+COMET = "0xb125E6687d4313864e53df431d5425969c15Eb2F"
+WALLET = "0x9876543210987654321098765432109876543210"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+WETH = "0x4200000000000000000000000000000000000006"
+CBBTC = "0xcbB7C0000aB88B473b1f5aFd9ef808440eed33Bf"
+USDC_FEED = "0x00000000000000000000000000000000000000A1"
+WETH_FEED = "0x00000000000000000000000000000000000000A2"
+CBBTC_FEED = "0x00000000000000000000000000000000000000A3"
+
+
+class FakeComet:
+    """The Base USDC Comet with WETH and cbBTC collateral, answering reads like the chain."""
+
+    def __init__(self, multicall3):
+        self.multicall3 = multicall3
+        self.tokens = {USDC: ("USDC", 6), WETH: ("WETH", 18), CBBTC: ("cbBTC", 8)}
+        self.assets = [(WETH, WETH_FEED, 825 * 10**15), (CBBTC, CBBTC_FEED, 8 * 10**17)]
+        self.prices = {USDC_FEED: 10**8, WETH_FEED: 2_500 * 10**8, CBBTC_FEED: 60_000 * 10**8}
+        self.collateral = {WETH: 2 * 10**18, CBBTC: 0}
+        self.borrowed = 1_500 * 10**6
+
+        multicall3.block_number = 1234
+        multicall3.add_contract(COMET, COMET_ABI, self.answer)
+        for token in self.tokens:
+            multicall3.add_contract(token, ERC20_ABI, self.answer_token)
+        for feed in self.prices:
+            multicall3.add_contract(feed, PRICE_FEED_ABI, self.answer_feed)
+
+    def answer(self, address, function_name, args):
+        """Answer a call to the Comet."""
+        if function_name == "getAssetInfo":
+            asset, feed, factor = self.assets[args["i"]]
+            return ((args["i"], asset, feed, 10**18, factor, factor + 5 * 10**16, 10**18, 10**24),)
+        if function_name == "collateralBalanceOf":
+            return (self.collateral[Web3.to_checksum_address(args["asset"])],)
+        return {
+            "numAssets": (len(self.assets),),
+            "baseToken": (USDC,),
+            "baseTokenPriceFeed": (USDC_FEED,),
+            "borrowBalanceOf": (self.borrowed,),
+        }[function_name]
+
+    def answer_token(self, address, function_name, args):
+        """Answer a call to a token."""
+        symbol, decimals = self.tokens[address]
+        return (symbol,) if function_name == "symbol" else (decimals,)
+
+    def answer_feed(self, address, function_name, args):
+        """Answer a call to a price feed."""
+        return (1, self.prices[address], 0, 1_700_000_000, 1)
+
+    def wallet_provider(self):
+        """Create a wallet provider reading from the chain."""
+        wallet_provider = self.multicall3.wallet_provider()
+        wallet_provider.get_network.return_value.chain_id = "8453"
+        wallet_provider.get_network.return_value.network_id = "base-mainnet"
+        wallet_provider.get_address.return_value = WALLET
+        return wallet_provider
 
 
 @pytest.fixture
@@ -31,3 +94,11 @@ def compound_wallet():
     fake_receipt.transaction_link = "http://example.com/tx/0xTxHash"
     wallet.wait_for_transaction_receipt.return_value = fake_receipt
     return wallet
+
+
+@pytest.fixture(autouse=True)
+def fresh_portfolio_reader():
+    """Forget Comet asset tables read by other tests."""
+    portfolio_reader.clear()
+    yield
+    portfolio_reader.clear()
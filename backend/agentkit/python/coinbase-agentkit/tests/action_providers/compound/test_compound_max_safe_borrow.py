@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.compound.compound_action_provider import (
+    CompoundActionProvider,
+)
+
+from .conftest import FakeComet
+
+
+@pytest.fixture
+def compound_provider():
+    """Fixture that returns a CompoundActionProvider reading the Base mainnet Comet."""
+    return CompoundActionProvider()
+
+
+def _max_safe_borrow(compound_provider, comet, args):
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        return compound_provider.max_safe_borrow(comet.wallet_provider(), args)
+
+
+def test_max_safe_borrow_success(compound_provider, multicall3):
+    """Test that the max safe borrow action reports the amount and health ratios."""
+    comet = FakeComet(multicall3)
+
+    result = _max_safe_borrow(compound_provider, comet, {"target_health_ratio": 1.5})
+
+    assert result == (
+        "Max safe borrow: 1250 USDC (target health ratio 1.50).\n"
+        "Health ratio now 2.75, 1.50 after borrowing the max"
+    )
+    assert multicall3.reads == ["aggregate3"] * 4
+
+
+def test_max_safe_borrow_with_price_drop(compound_provider, multicall3):
+    """Test that the max safe borrow action applies the collateral price change."""
+    comet = FakeComet(multicall3)
+
+    result = _max_safe_borrow(compound_provider, comet, {"collateral_price_change_percent": -20})
+
+    assert result == (
+        "Max safe borrow: 1800 USDC (target health ratio 1.00, collateral prices -20%).\n"
+        "Health ratio now 2.75, 2.20 after the price change, 1.00 after borrowing the max"
+    )
+
+
+def test_max_safe_borrow_below_target(compound_provider, multicall3):
+    """Test the max safe borrow action when the position is already below the target."""
+    comet = FakeComet(multicall3)
+
+    result = _max_safe_borrow(compound_provider, comet, {"target_health_ratio": 3})
+
+    assert result == (
+        "No additional USDC can be borrowed from Compound (target health ratio 3.00).\n"
+        "Health ratio now 2.75"
+    )
+
+
+def test_max_safe_borrow_error(compound_provider, multicall3):
+    """Test the max safe borrow action when reading the position fails."""
+    comet = FakeComet(multicall3)
+    wallet_provider = comet.wallet_provider()
+    wallet_provider.read_contract.side_effect = Exception("RPC unavailable")
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = compound_provider.max_safe_borrow(wallet_provider, {})
+
+    assert result == "Error finding max safe borrow from Compound: RPC unavailable"
@@ -0,0 +1,145 @@
+"""Tests for Compound portfolio snapshots."""
+
+from decimal import Decimal
+
+from coinbase_agentkit.action_providers.compound.portfolio import HealthScenario, portfolio_reader
+from coinbase_agentkit.action_providers.compound.utils import (
+    get_health_ratio,
+    get_health_ratio_after_borrow,
+    get_health_ratio_after_withdraw,
+    get_portfolio_details_markdown,
+    get_supply_details,
+)
+
+from .conftest import CBBTC, COMET, USDC, WETH, FakeComet
+
+
+def test_asset_table_read_once_per_comet(multicall3):
+    """Test that the asset table is read once and each snapshot takes one read."""
+    comet = FakeComet(multicall3)
+    wallet_provider = comet.wallet_provider()
+
+    snapshot = portfolio_reader.get_snapshot(wallet_provider, COMET)
+    assert len(multicall3.reads) == 4
+    assert (snapshot.block_number, snapshot.borrow_balance, snapshot.base_price) == (
+        1234,
+        1_500 * 10**6,
+        10**8,
+    )
+    assert [asset.symbol for asset in snapshot.table.assets] == ["WETH", "cbBTC"]
+    assert snapshot.table.get_asset(CBBTC.lower()).liquidate_collateral_factor == 85 * 10**16
+
+    get_health_ratio(wallet_provider, COMET)
+    get_health_ratio_after_borrow(wallet_provider, COMET, "1000000")
+    assert len(multicall3.reads) == 6
+    assert portfolio_reader.rpc_calls == 6
+
+
+def test_health_ratios(multicall3):
+    """Test the health ratio and the projected ratios after a borrow or withdrawal."""
+    comet = FakeComet(multicall3)
+    wallet_provider = comet.wallet_provider()
+
+    # 2 WETH at $2,500 with an 82.5% collateral factor against 1,500 USDC
+    assert get_health_ratio(wallet_provider, COMET) == Decimal("4125") / Decimal("1500")
+    assert get_health_ratio_after_borrow(wallet_provider, COMET, str(2_625 * 10**6)) == 1
+    assert get_health_ratio_after_withdraw(wallet_provider, COMET, WETH, str(10**18)) == Decimal(
+        "2062.5"
+    ) / Decimal("1500")
+    # Withdrawing an asset that is not supplied leaves the ratio unchanged
+    assert get_health_ratio_after_withdraw(wallet_provider, COMET, USDC, "1") == Decimal(
+        "4125"
+    ) / Decimal("1500")
+
+    comet.borrowed = 0
+    assert get_health_ratio(wallet_provider, COMET) == Decimal("Infinity")
+    assert get_health_ratio_after_borrow(wallet_provider, COMET, "0") == Decimal("Infinity")
+
+
+def test_health_ratio_scenarios(multicall3):
+    """Test that scenarios match single projections and apply price changes."""
+    comet = FakeComet(multicall3)
+    comet.collateral[CBBTC] = 5 * 10**7
+    snapshot = portfolio_reader.get_snapshot(comet.wallet_provider(), COMET)
+    borrows = [0, 10**6, 2_000 * 10**6, 10_000 * 10**6]
+    withdrawals = [(WETH, 10**18), (CBBTC, 10**7), (USDC, 1)]
+
+    ratios = snapshot.health_ratios(
+        [HealthScenario(borrow=amount) for amount in borrows]
+        + [HealthScenario(withdraw_asset=a, withdraw_amount=n) for a, n in withdrawals]
+    )
+
+    assert ratios == [snapshot.health_ratio_after_borrow(amount) for amount in borrows] + [
+        snapshot.health_ratio_after_withdraw(a, n) for a, n in withdrawals
+    ]
+    # 2 WETH at $2,500 * 0.825 and 0.5 cbBTC at $60,000 * 0.8 against 1,500 USDC
+    assert ratios[0] == Decimal("28125") / Decimal("1500")
+
+    weth_drop, btc_drop_with_borrow, usdc_depeg = snapshot.health_ratios(
+        [
+            HealthScenario(price_changes={WETH.lower(): Decimal("0.5")}),
+            HealthScenario(borrow=1_500 * 10**6, price_changes={CBBTC: Decimal("0.5")}),
+            HealthScenario(price_changes={USDC: Decimal("1.25")}),
+        ]
+    )
+    assert weth_drop == Decimal("26062.5") / Decimal("1500")
+    assert btc_drop_with_borrow == Decimal("16125") / Decimal("3000")
+    assert usdc_depeg == Decimal("28125") / Decimal("1875")
+
+
+def test_max_safe_borrow(multicall3):
+    """Test that the max safe borrow is the largest amount meeting the target."""
+    comet = FakeComet(multicall3)
+    snapshot = portfolio_reader.get_snapshot(comet.wallet_provider(), COMET)
+    weth_drop = {WETH: Decimal("0.8")}
+
+    assert snapshot.max_safe_borrow() == 2_625 * 10**6
+    assert snapshot.max_safe_borrow(Decimal("1.5")) == 1_250 * 10**6
+    assert snapshot.max_safe_borrow(price_changes=weth_drop) == 1_800 * 10**6
+    assert snapshot.max_safe_borrow(Decimal(3)) == 0
+
+    # Exact at the atomic unit for targets that do not divide evenly
+    target = Decimal("1.7")
+    amount = snapshot.max_safe_borrow(target)
+    assert snapshot.health_ratio_after_borrow(amount) >= target
+    assert snapshot.health_ratio_after_borrow(amount + 1) < target
+    assert len(multicall3.reads) == 4
+
+
+def test_supply_details(multicall3):
+    """Test that only supplied assets are listed, in human-readable units."""
+    comet = FakeComet(multicall3)
+    comet.collateral[CBBTC] = 5 * 10**7
+
+    assert get_supply_details(comet.wallet_provider(), COMET) == [
+        {
+            "Token Symbol": "WETH",
+            "Supply Amount": Decimal("2"),
+            "Price": Decimal("2500"),
+            "Collateral Factor": Decimal("0.825"),
+            "Decimals": 18,
+        },
+        {
+            "Token Symbol": "cbBTC",
+            "Supply Amount": Decimal("0.5"),
+            "Price": Decimal("60000"),
+            "Collateral Factor": Decimal("0.8"),
+            "Decimals": 8,
+        },
+    ]
+
+
+def test_portfolio_markdown_reads_one_snapshot(multicall3):
+    """Test that the portfolio details come from a single snapshot."""
+    comet = FakeComet(multicall3)
+    wallet_provider = comet.wallet_provider()
+    portfolio_reader.get_asset_table(wallet_provider, COMET)
+    multicall3.reads.clear()
+
+    markdown = get_portfolio_details_markdown(wallet_provider, COMET)
+
+    assert multicall3.reads == ["aggregate3"]
+    assert "### WETH\n- **Supply Amount:** 2.000000000000000000\n" in markdown
+    assert "### Total Supply Value: $5000.00" in markdown
+    assert "### USDC\n- **Borrow Amount:** 1500.000000\n" in markdown
+    assert "- **Health Ratio:** 2.75" in markdown
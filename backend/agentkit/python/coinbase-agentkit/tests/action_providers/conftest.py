@@ -0,0 +1,86 @@
+"""Shared fixtures for the action provider tests."""
+
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from eth_abi import encode
+from eth_utils.abi import get_abi_output_types
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.multicall import MULTICALL3_ABI, MULTICALL3_ADDRESS
+
+# Answers a call with its outputs, given the called address, function name and arguments
+CallAnswer = Callable[[str, str, dict], tuple]
+
+
+class FakeMulticall3:
+    """Contracts behind Multicall3, answering reads like the chain.
+
+    Tests add the contracts they read, each with its ABI and a function answering
+    its calls, and the reads made outside of a batch. The calls of an aggregate3
+    batch are decoded, answered and encoded with the ABI of their contract, and
+    getBlockNumber answers with block_number.
+    """
+
+    def __init__(self):
+        self.block_number = 1000
+        self.contracts: dict[str, tuple[Any, CallAnswer]] = {}
+        self.answers: dict[str, Callable[[str, list | None], Any]] = {}
+        self.reads: list[str] = []
+        self.add_contract(MULTICALL3_ADDRESS, MULTICALL3_ABI, lambda *_: (self.block_number,))
+
+    def add_contract(self, address: str, abi: list, answer: CallAnswer) -> None:
+        """Answer the calls of a batch to a contract.
+
+        Args:
+            address: The address of the contract.
+            abi: The ABI to decode calls and encode outputs with.
+            answer: Returns the outputs of a call, given the address, function name and
+                arguments of the call.
+
+        """
+        contract = Web3().eth.contract(abi=abi)
+        self.contracts[Web3.to_checksum_address(address)] = (contract, answer)
+
+    def add_read(self, function_name: str, answer: Callable[[str, list | None], Any]) -> None:
+        """Answer a read made outside of a batch.
+
+        Args:
+            function_name: The function read.
+            answer: Returns the result of a read, given the contract address and arguments.
+
+        """
+        self.answers[function_name] = answer
+
+    def _answer(self, target: str, data: bytes) -> bytes:
+        """Answer one call of an aggregate3 batch."""
+        address = Web3.to_checksum_address(target)
+        if address not in self.contracts:
+            raise AssertionError(f"Unexpected call to {address}")
+        contract, answer = self.contracts[address]
+        function, args = contract.decode_function_input(data)
+        abi = next(item for item in contract.abi if item.get("name") == function.fn_name)
+        return encode(get_abi_output_types(abi), answer(address, function.fn_name, args))
+
+    def read_contract(self, contract_address, abi, function_name, args=None, **kwargs):
+        """Answer a read like the chain."""
+        self.reads.append(function_name)
+        if function_name == "aggregate3":
+            return [(True, self._answer(target, data)) for target, _, data in args[0]]
+        if function_name not in self.answers:
+            raise AssertionError(f"Unexpected read of {function_name}")
+        return self.answers[function_name](contract_address, args)
+
+    def wallet_provider(self) -> MagicMock:
+        """Create a wallet provider reading from the chain."""
+        wallet_provider = MagicMock()
+        wallet_provider.read_contract.side_effect = self.read_contract
+        return wallet_provider
+
+
+@pytest.fixture
+def multicall3():
+    """Create contracts behind Multicall3 answering the reads of a test."""
+    return FakeMulticall3()
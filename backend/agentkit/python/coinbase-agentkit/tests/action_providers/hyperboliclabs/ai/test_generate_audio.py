@@ -1,104 +1,87 @@
 """Tests for generate_audio action in HyperbolicAIActionProvider."""
 
+import base64
 import os
-from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
 
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider import AIActionProvider
 from coinbase_agentkit.action_providers.hyperboliclabs.ai.schemas import (
     GenerateAudioSchema,
 )
 from coinbase_agentkit.action_providers.hyperboliclabs.ai.types import (
-    AudioGenerationResponse,
+    AudioFileResponse,
 )
 
+MOCK_FILE_PATH = "/tmp/generated_audio_test.mp3"
+
 
 @pytest.fixture
 def mock_response():
-    """Create a standard mock audio response."""
-    return AudioGenerationResponse(
-        audio="base64_encoded_audio_data",
-        duration=3.5,
-    )
+    """Create a standard mock saved audio response."""
+    return AudioFileResponse(path=MOCK_FILE_PATH, size_bytes=2048, duration=3.5)
 
 
 def test_generate_audio_success(provider, mock_ai_service, mock_response):
     """Test successful audio generation."""
-    mock_ai_service.generate_audio.return_value = mock_response
-
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = "/tmp/generated_audio_test.mp3"
-        mock_save.return_value = mock_file_path
+    mock_ai_service.generate_audio_to_file.return_value = mock_response
 
-        args = {"text": "Test audio text"}
-        result = provider.generate_audio(args)
+    args = {"text": "Test audio text"}
+    result = provider.generate_audio(args)
 
-        assert isinstance(result, str)
+    assert isinstance(result, str)
 
-        assert "Audio generation successful:" in result
-        assert mock_file_path in result
+    assert "Audio generation successful:" in result
+    assert MOCK_FILE_PATH in result
 
-        mock_ai_service.generate_audio.assert_called_once()
-        request = mock_ai_service.generate_audio.call_args[0][0]
-        assert request.text == "Test audio text"
-        assert request.language == "EN"
-        assert request.speaker == "EN-US"
+    mock_ai_service.generate_audio_to_file.assert_called_once()
+    mock_ai_service.generate_audio.assert_not_called()
+    request = mock_ai_service.generate_audio_to_file.call_args[0][0]
+    assert request.text == "Test audio text"
+    assert request.language == "EN"
+    assert request.speaker == "EN-US"
 
 
 def test_generate_audio_with_minimal_input(provider, mock_ai_service, mock_response):
     """Test audio generation with a dictionary containing only the required text field."""
-    mock_ai_service.generate_audio.return_value = mock_response
-
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = "/tmp/generated_audio_test.mp3"
-        mock_save.return_value = mock_file_path
+    mock_ai_service.generate_audio_to_file.return_value = mock_response
 
-        result = provider.generate_audio({"text": "Test audio text"})
+    result = provider.generate_audio({"text": "Test audio text"})
 
-        assert isinstance(result, str)
+    assert isinstance(result, str)
 
-        assert "Audio generation successful:" in result
-        assert mock_file_path in result
+    assert "Audio generation successful:" in result
+    assert MOCK_FILE_PATH in result
 
-        request = mock_ai_service.generate_audio.call_args[0][0]
-        assert request.text == "Test audio text"
-        assert request.language == "EN"
-        assert request.speaker == "EN-US"
+    request = mock_ai_service.generate_audio_to_file.call_args[0][0]
+    assert request.text == "Test audio text"
+    assert request.language == "EN"
+    assert request.speaker == "EN-US"
 
 
 def test_generate_audio_with_custom_parameters(provider, mock_ai_service, mock_response):
     """Test audio generation with custom parameters."""
-    mock_ai_service.generate_audio.return_value = mock_response
-
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = "/tmp/generated_audio_test.mp3"
-        mock_save.return_value = mock_file_path
-
-        args = {
-            "text": "Test audio text",
-            "language": "ES",
-            "speaker": "ES-ES",
-            "speed": 1.2,
-        }
-        result = provider.generate_audio(args)
+    mock_ai_service.generate_audio_to_file.return_value = mock_response
+
+    args = {
+        "text": "Test audio text",
+        "language": "ES",
+        "speaker": "ES-ES",
+        "speed": 1.2,
+    }
+    result = provider.generate_audio(args)
 
-        assert isinstance(result, str)
+    assert isinstance(result, str)
 
-        assert "Audio generation successful:" in result
-        assert mock_file_path in result
+    assert "Audio generation successful:" in result
+    assert MOCK_FILE_PATH in result
 
-        request = mock_ai_service.generate_audio.call_args[0][0]
-        assert request.text == "Test audio text"
-        assert request.language == "ES"
-        assert request.speaker == "ES-ES"
-        assert request.speed == 1.2
+    request = mock_ai_service.generate_audio_to_file.call_args[0][0]
+    assert request.text == "Test audio text"
+    assert request.language == "ES"
+    assert request.speaker == "ES-ES"
+    assert request.speed == 1.2
 
 
 def test_generate_audio_schema_validation():
@@ -125,7 +108,7 @@ def test_generate_audio_schema_validation():
 
 def test_generate_audio_error(provider, mock_ai_service):
     """Test audio generation with error."""
-    mock_ai_service.generate_audio.side_effect = Exception("API error")
+    mock_ai_service.generate_audio_to_file.side_effect = Exception("API error")
 
     args = {"text": "Test audio text"}
     result = provider.generate_audio(args)
@@ -134,26 +117,20 @@ def test_generate_audio_error(provider, mock_ai_service):
     assert "Error: Audio generation: API error" in result
 
 
-def test_generate_audio_saves_to_file(provider, mock_ai_service, mock_response, tmpdir):
-    """Test that audio generation saves the output to a file."""
-    mock_ai_service.generate_audio.return_value = mock_response
-
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = os.path.join(tmpdir, "generated_audio_test.mp3")
-        mock_save.return_value = mock_file_path
-
-        args = {"text": "Test audio text"}
-        result = provider.generate_audio(args)
-
-        assert isinstance(result, str)
+def test_generate_audio_saves_to_file(mock_request, mock_api_key, tmp_path, monkeypatch):
+    """Test that generated audio is decoded straight to a file in ./tmp."""
+    monkeypatch.chdir(tmp_path)
+    mock_request.return_value.json.return_value = {
+        "audio": base64.b64encode(b"mp3 bytes").decode(),
+        "duration": 3.5,
+    }
 
-        assert "Audio generation successful:" in result
-        assert mock_file_path in result
+    result = AIActionProvider(api_key=mock_api_key).generate_audio({"text": "Test audio text"})
 
-        mock_save.assert_called_once()
-        audio_data, file_path_arg = mock_save.call_args[0]
-        assert audio_data == "base64_encoded_audio_data"
-        assert file_path_arg.startswith("./tmp/generated_audio_")
-        assert file_path_arg.endswith(".mp3")
+    header, saved = result.splitlines()
+    assert header == "Audio generation successful:"
+    file_path = saved.removeprefix("- Saved to: ")
+    assert os.path.basename(file_path).startswith("generated_audio_")
+    assert file_path.endswith(".mp3")
+    with open(file_path, "rb") as f:
+        assert f.read() == b"mp3 bytes"
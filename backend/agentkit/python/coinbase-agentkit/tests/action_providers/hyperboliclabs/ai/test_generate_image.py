@@ -1,135 +1,107 @@
 """Tests for generate_image action in HyperbolicAIActionProvider."""
 
+import base64
 import os
-from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
 
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider import AIActionProvider
 from coinbase_agentkit.action_providers.hyperboliclabs.ai.schemas import (
     GenerateImageSchema,
 )
 from coinbase_agentkit.action_providers.hyperboliclabs.ai.types import (
-    GeneratedImage,
-    ImageGenerationResponse,
+    ImageFilesResponse,
+    SavedImage,
 )
 
+MOCK_FILE_PATH = "/tmp/generated_image_test.png"
+
 
 @pytest.fixture
 def mock_response():
-    """Create a standard mock image response."""
-    return ImageGenerationResponse(
-        images=[
-            GeneratedImage(
-                image="base64_encoded_image_data",
-                random_seed=12345,
-                index=0,
-            )
-        ],
+    """Create a standard mock saved image response."""
+    return ImageFilesResponse(
+        images=[SavedImage(path=MOCK_FILE_PATH, size_bytes=1024, random_seed=12345, index=0)],
         inference_time=5.67,
     )
 
 
 def test_generate_image_success(provider, mock_ai_service, mock_response):
     """Test successful image generation."""
-    mock_ai_service.generate_image.return_value = mock_response
-
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = "/tmp/generated_image_test.png"
-        mock_save.return_value = mock_file_path
+    mock_ai_service.generate_image_to_files.return_value = mock_response
 
-        args = {"prompt": "Test image prompt"}
-        result = provider.generate_image(args)
+    args = {"prompt": "Test image prompt"}
+    result = provider.generate_image(args)
 
-        assert isinstance(result, str)
+    assert isinstance(result, str)
 
-        assert "Image generation successful:" in result
-        assert mock_file_path in result
+    assert "Image generation successful:" in result
+    assert MOCK_FILE_PATH in result
 
-        mock_ai_service.generate_image.assert_called_once()
-        request = mock_ai_service.generate_image.call_args[0][0]
-        assert request.prompt == "Test image prompt"
-        assert request.model_name == "SDXL1.0-base"
-        assert request.height == 1024
-        assert request.width == 1024
+    mock_ai_service.generate_image_to_files.assert_called_once()
+    mock_ai_service.generate_image.assert_not_called()
+    request = mock_ai_service.generate_image_to_files.call_args[0][0]
+    assert request.prompt == "Test image prompt"
+    assert request.model_name == "SDXL1.0-base"
+    assert request.height == 1024
+    assert request.width == 1024
 
 
 def test_generate_image_with_custom_parameters(provider, mock_ai_service, mock_response):
     """Test image generation with custom parameters."""
-    mock_ai_service.generate_image.return_value = mock_response
-
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = "/tmp/generated_image_test.png"
-        mock_save.return_value = mock_file_path
-
-        args = {
-            "prompt": "Test image prompt",
-            "model_name": "SD1.5",
-            "height": 512,
-            "width": 512,
-            "steps": 50,
-            "negative_prompt": "blurry, low quality",
-        }
-        result = provider.generate_image(args)
-
-        assert isinstance(result, str)
-
-        assert "Image generation successful:" in result
-        assert mock_file_path in result
-
-        request = mock_ai_service.generate_image.call_args[0][0]
-        assert request.prompt == "Test image prompt"
-        assert request.model_name == "SD1.5"
-        assert request.height == 512
-        assert request.width == 512
-        assert request.steps == 50
-        assert request.negative_prompt == "blurry, low quality"
+    mock_ai_service.generate_image_to_files.return_value = mock_response
+
+    args = {
+        "prompt": "Test image prompt",
+        "model_name": "SD1.5",
+        "height": 512,
+        "width": 512,
+        "steps": 50,
+        "negative_prompt": "blurry, low quality",
+    }
+    result = provider.generate_image(args)
+
+    assert isinstance(result, str)
+
+    assert "Image generation successful:" in result
+    assert MOCK_FILE_PATH in result
+
+    request = mock_ai_service.generate_image_to_files.call_args[0][0]
+    assert request.prompt == "Test image prompt"
+    assert request.model_name == "SD1.5"
+    assert request.height == 512
+    assert request.width == 512
+    assert request.steps == 50
+    assert request.negative_prompt == "blurry, low quality"
 
 
 def test_generate_image_multiple_images(provider, mock_ai_service):
     """Test generation of multiple images."""
-    mock_response = ImageGenerationResponse(
+    mock_file_paths = ["/tmp/generated_image_test_1.png", "/tmp/generated_image_test_2.png"]
+    mock_ai_service.generate_image_to_files.return_value = ImageFilesResponse(
         images=[
-            GeneratedImage(
-                image="base64_encoded_image_data_1",
-                random_seed=12345,
-                index=0,
-            ),
-            GeneratedImage(
-                image="base64_encoded_image_data_2",
-                random_seed=67890,
-                index=1,
-            ),
+            SavedImage(path=mock_file_paths[0], size_bytes=1024, random_seed=12345, index=0),
+            SavedImage(path=mock_file_paths[1], size_bytes=1024, random_seed=67890, index=1),
         ],
         inference_time=10.5,
     )
-    mock_ai_service.generate_image.return_value = mock_response
 
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_paths = ["/tmp/generated_image_test_1.png", "/tmp/generated_image_test_2.png"]
-        mock_save.side_effect = mock_file_paths
-
-        args = {
-            "prompt": "Test image prompt",
-            "num_images": 2,
-        }
-        result = provider.generate_image(args)
+    args = {
+        "prompt": "Test image prompt",
+        "num_images": 2,
+    }
+    result = provider.generate_image(args)
 
-        assert isinstance(result, str)
+    assert isinstance(result, str)
 
-        assert "Image generation successful:" in result
-        assert mock_file_paths[0] in result
-        assert mock_file_paths[1] in result
+    assert "Image generation successful:" in result
+    assert mock_file_paths[0] in result
+    assert mock_file_paths[1] in result
 
-        request = mock_ai_service.generate_image.call_args[0][0]
-        assert request.prompt == "Test image prompt"
-        assert request.num_images == 2
+    request = mock_ai_service.generate_image_to_files.call_args[0][0]
+    assert request.prompt == "Test image prompt"
+    assert request.num_images == 2
 
 
 def test_generate_image_schema_validation():
@@ -165,7 +137,7 @@ def test_generate_image_schema_validation():
 
 def test_generate_image_error(provider, mock_ai_service):
     """Test image generation with error."""
-    mock_ai_service.generate_image.side_effect = Exception("API error")
+    mock_ai_service.generate_image_to_files.side_effect = Exception("API error")
 
     args = {"prompt": "Test image prompt"}
     result = provider.generate_image(args)
@@ -174,26 +146,28 @@ def test_generate_image_error(provider, mock_ai_service):
     assert "Error: Image generation: API error" in result
 
 
-def test_generate_image_saves_to_file(provider, mock_ai_service, mock_response, tmpdir):
-    """Test that image generation saves the output to a file."""
-    mock_ai_service.generate_image.return_value = mock_response
+def test_generate_image_no_images(provider, mock_ai_service):
+    """Test image generation that returns no images."""
+    mock_ai_service.generate_image_to_files.return_value = ImageFilesResponse(images=[])
+
+    result = provider.generate_image({"prompt": "Test image prompt"})
 
-    with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.ai.action_provider.save_base64_data"
-    ) as mock_save:
-        mock_file_path = os.path.join(tmpdir, "generated_image_test.png")
-        mock_save.return_value = mock_file_path
+    assert result == "Error: Generation failed: No images were generated."
 
-        args = {"prompt": "Test image prompt"}
-        result = provider.generate_image(args)
 
-        assert isinstance(result, str)
+def test_generate_image_saves_to_file(mock_request, mock_api_key, tmp_path, monkeypatch):
+    """Test that generated images are decoded straight to files in ./tmp."""
+    monkeypatch.chdir(tmp_path)
+    mock_request.return_value.json.return_value = {
+        "images": [{"image": base64.b64encode(b"png bytes").decode(), "index": 0}],
+    }
 
-        assert "Image generation successful:" in result
-        assert mock_file_path in result
+    result = AIActionProvider(api_key=mock_api_key).generate_image({"prompt": "A cat"})
 
-        mock_save.assert_called_once()
-        image_data, file_path_arg = mock_save.call_args[0]
-        assert image_data == "base64_encoded_image_data"
-        assert file_path_arg.startswith("./tmp/generated_image_")
-        assert file_path_arg.endswith(".png")
+    header, saved = result.splitlines()
+    assert header == "Image generation successful:"
+    file_path = saved.removeprefix("- Saved to: ")
+    assert os.path.basename(file_path).startswith("generated_image_")
+    assert file_path.endswith(".png")
+    with open(file_path, "rb") as f:
+        assert f.read() == b"png bytes"
@@ -0,0 +1,188 @@
+"""Tests for streamed text generation."""
+
+import asyncio
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.service import AIService
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.types import (
+    ChatCompletionChunk,
+    ChatCompletionRequest,
+    ChatMessage,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.utils import (
+    accumulate_chat_completion,
+    parse_chat_completion_chunks,
+    parse_sse_data,
+)
+
+MODEL = "meta-llama/Meta-Llama-3-70B-Instruct"
+
+
+def _chunk(content: str | None = None, finish_reason: str | None = None) -> dict:
+    """Create a chat completion chunk payload."""
+    delta = {"content": content} if content is not None else {"role": "assistant"}
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": MODEL,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _event_stream(*chunks: dict) -> bytes:
+    """Encode chunks as a server-sent event stream."""
+    events = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks]
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode()
+
+
+@pytest.fixture
+def request_body():
+    """Create a chat completion request."""
+    return ChatCompletionRequest(messages=[ChatMessage(role="user", content="Hi")], model=MODEL)
+
+
+@pytest.fixture
+def stream_chunks():
+    """Create the chunks of a streamed completion."""
+    return [_chunk(), _chunk("Hello"), _chunk(", world"), _chunk(finish_reason="stop")]
+
+
+def test_parse_sse_data():
+    """Test parsing event data, comments, multi-line data and the DONE sentinel."""
+    lines = [b": keep-alive", b"", b"data: one", b"", b"data: two", b"data: lines", b""]
+    lines += [b"event: ignored", b"data:three", b"", b"data: [DONE]", b"", b"data: after"]
+
+    assert list(parse_sse_data(lines)) == ["one", "two\nlines", "three"]
+
+
+def test_parse_chat_completion_chunks(stream_chunks):
+    """Test parsing chunks from the lines of an event stream."""
+    lines = _event_stream(*stream_chunks).decode().split("\n")
+
+    chunks = list(parse_chat_completion_chunks(lines))
+
+    assert len(chunks) == len(stream_chunks)
+    assert chunks[1].choices[0].delta.content == "Hello"
+
+
+def test_accumulate_chat_completion(stream_chunks):
+    """Test combining streamed chunks into a complete response."""
+    chunks = [ChatCompletionChunk(**chunk) for chunk in stream_chunks]
+
+    response = accumulate_chat_completion(chunks)
+
+    assert response.id == "chatcmpl-1"
+    assert response.choices[0].message.content == "Hello, world"
+    assert response.choices[0].finish_reason == "stop"
+
+
+def test_accumulate_chat_completion_empty():
+    """Test that an empty stream is an error."""
+    with pytest.raises(ValueError, match="without any chat completion chunks"):
+        accumulate_chat_completion([])
+
+
+def test_generate_text_stream(mock_server, mock_api_key, request_body, stream_chunks):
+    """Test that chunks are yielded from a streamed response."""
+    mock_server.responses = [
+        (200, {"Content-Type": "text/event-stream"}, _event_stream(*stream_chunks))
+    ]
+    service = AIService(mock_api_key)
+    service.base_url = mock_server.url
+
+    chunks = list(service.generate_text_stream(request_body))
+
+    assert [c.choices[0].delta.content for c in chunks] == [None, "Hello", ", world", None]
+    assert json.loads(mock_server.requests[0]["body"])["stream"] is True
+
+
+def test_generate_text_accumulates_stream(mock_server, mock_api_key, stream_chunks):
+    """Test that generate_text returns a complete response for streamed requests."""
+    mock_server.responses = [
+        (200, {"Content-Type": "text/event-stream"}, _event_stream(*stream_chunks))
+    ]
+    service = AIService(mock_api_key)
+    service.base_url = mock_server.url
+    request = ChatCompletionRequest(
+        messages=[ChatMessage(role="user", content="Hi")], model=MODEL, stream=True
+    )
+
+    response = service.generate_text(request)
+
+    assert response.choices[0].message.content == "Hello, world"
+
+
+def test_generate_text_stream_async(mock_server, mock_api_key, request_body, stream_chunks):
+    """Test that chunks can be consumed from an async iterator."""
+    mock_server.responses = [
+        (200, {"Content-Type": "text/event-stream"}, _event_stream(*stream_chunks))
+    ]
+    service = AIService(mock_api_key)
+    service.base_url = mock_server.url
+
+    async def collect():
+        return [chunk async for chunk in service.generate_text_stream_async(request_body)]
+
+    chunks = asyncio.run(collect())
+
+    assert "".join(c.choices[0].delta.content or "" for c in chunks) == "Hello, world"
+
+
+def test_generate_text_stream_error(mock_server, mock_api_key, request_body):
+    """Test that an error response is raised before any chunk is yielded."""
+    mock_server.responses = [(400, {}, {"message": "Invalid model"})]
+    service = AIService(mock_api_key)
+    service.base_url = mock_server.url
+
+    with pytest.raises(Exception, match="Invalid model"):
+        next(service.generate_text_stream(request_body))
+
+
+def test_generate_text_stream_action(
+    provider, mock_ai_service, stream_chunks, tmp_path, monkeypatch
+):
+    """Test that the action writes tokens to a file as they arrive."""
+    mock_ai_service.generate_text_stream.return_value = iter(
+        ChatCompletionChunk(**chunk) for chunk in stream_chunks
+    )
+
+    monkeypatch.chdir(tmp_path)
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        response = provider.generate_text_stream({"prompt": "Hi"})
+
+    assert "Text generation successful" in response
+    assert "Time to first token" in response
+    file_path = response.split("Saved to: ")[1].split("\n")[0]
+    with open(file_path, encoding="utf-8") as f:
+        assert f.read() == "Hello, world"
+    request = mock_ai_service.generate_text_stream.call_args[0][0]
+    assert request.stream is True
+
+
+def test_generate_text_stream_action_empty(provider, mock_ai_service, tmp_path, monkeypatch):
+    """Test that a stream without any text is reported as an error."""
+    mock_ai_service.generate_text_stream.return_value = iter([])
+    monkeypatch.chdir(tmp_path)
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        response = provider.generate_text_stream({"prompt": "Hi"})
+
+    assert response == "Error: Generation failed: No text was generated by the model."
+    assert not os.path.exists(tmp_path / "tmp")
+
+
+def test_generate_text_stream_action_error(provider, mock_ai_service):
+    """Test that service errors are returned as an error message."""
+    mock_ai_service.generate_text_stream.side_effect = Exception("API request failed")
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        response = provider.generate_text_stream({"prompt": "Hi"})
+
+    assert response == "Error: Text generation: API request failed"
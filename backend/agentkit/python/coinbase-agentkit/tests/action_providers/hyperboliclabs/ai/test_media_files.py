@@ -0,0 +1,201 @@
+"""Tests for decoding generated images and audio directly to files."""
+
+import base64
+import io
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.service import AIService
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.types import (
+    AudioGenerationRequest,
+    ImageFilesResponse,
+    ImageGenerationRequest,
+    SavedImage,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.ai.utils import (
+    decode_base64_to_file,
+    save_base64_data,
+)
+
+RAW_DATA = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def small_chunks():
+    """Decode in small slices so tests cross many slice boundaries."""
+    with patch(
+        "coinbase_agentkit.action_providers.hyperboliclabs.ai.utils.BASE64_DECODE_CHUNK_SIZE", 12
+    ):
+        yield
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        base64.b64encode(RAW_DATA).decode(),
+        base64.b64encode(RAW_DATA),
+        "data:image/png;base64," + base64.b64encode(RAW_DATA).decode(),
+        base64.encodebytes(RAW_DATA).decode(),
+    ],
+    ids=["str", "bytes", "data-uri", "line-wrapped"],
+)
+def test_decode_base64_to_file(small_chunks, encoded):
+    """Test that sliced decoding produces the original bytes."""
+    output = io.BytesIO()
+
+    written = decode_base64_to_file(encoded, output)
+
+    assert output.getvalue() == RAW_DATA
+    assert written == len(RAW_DATA)
+
+
+def test_save_base64_data_invalid(tmp_path):
+    """Test that invalid data raises and leaves no partial file behind."""
+    output_path = tmp_path / "image.png"
+
+    with pytest.raises(ValueError, match="Invalid base64 data"):
+        save_base64_data("not*base64", str(output_path))
+
+    assert not output_path.exists()
+
+
+def test_generate_image_to_files(mock_request, mock_api_key, tmp_path):
+    """Test that generated images are saved to files without a payload model."""
+    encoded = base64.b64encode(RAW_DATA).decode()
+    mock_request.return_value.json.return_value = {
+        "images": [
+            {"image": encoded, "random_seed": 1, "index": 0},
+            {"image": encoded, "random_seed": 2, "index": 1},
+        ],
+        "inference_time": 1.5,
+    }
+    service = AIService(mock_api_key)
+    request = ImageGenerationRequest(
+        prompt="A cat", model_name="SDXL1.0-base", height=512, width=512
+    )
+
+    response = service.generate_image_to_files(request, str(tmp_path))
+
+    assert [image.random_seed for image in response.images] == [1, 2]
+    assert response.inference_time == 1.5
+    for image in response.images:
+        assert os.path.dirname(image.path) == str(tmp_path)
+        assert image.size_bytes == len(RAW_DATA)
+        with open(image.path, "rb") as f:
+            assert f.read() == RAW_DATA
+
+
+def test_generate_image_to_files_unsupported_model(mock_request, mock_api_key):
+    """Test that unsupported models are rejected before any request is made."""
+    service = AIService(mock_api_key)
+    request = ImageGenerationRequest(prompt="A cat", model_name="unknown", height=512, width=512)
+
+    with pytest.raises(ValueError, match="not supported"):
+        service.generate_image_to_files(request)
+
+    mock_request.assert_not_called()
+
+
+def test_generate_audio_to_file(mock_request, mock_api_key, tmp_path):
+    """Test that generated audio is saved to a file."""
+    mock_request.return_value.json.return_value = {
+        "audio": base64.b64encode(RAW_DATA).decode(),
+        "duration": 2.5,
+    }
+    service = AIService(mock_api_key)
+    output_path = tmp_path / "speech.mp3"
+
+    response = service.generate_audio_to_file(
+        AudioGenerationRequest(text="Hello"), str(output_path)
+    )
+
+    assert response.path == str(output_path)
+    assert response.duration == 2.5
+    assert output_path.read_bytes() == RAW_DATA
+
+
+def test_generate_images_batch_runs_concurrently(mock_api_key):
+    """Test that batch requests are in flight at the same time and keep their order."""
+    service = AIService(mock_api_key)
+    requests = [
+        ImageGenerationRequest(prompt=prompt, model_name="SDXL1.0-base", height=64, width=64)
+        for prompt in ["one", "two", "three"]
+    ]
+    barrier = threading.Barrier(len(requests), timeout=5)
+
+    def generate(request, output_dir):
+        barrier.wait()
+        if request.prompt == "two":
+            raise ValueError("Generation failed")
+        return ImageFilesResponse(
+            images=[SavedImage(path=f"{output_dir}/{request.prompt}.png", size_bytes=1, index=0)]
+        )
+
+    with patch.object(service, "generate_image_to_files", side_effect=generate):
+        results = service.generate_images_batch(requests, output_dir="/out")
+
+    assert results[0].images[0].path == "/out/one.png"
+    assert isinstance(results[1], ValueError)
+    assert results[2].images[0].path == "/out/three.png"
+
+
+def test_generate_images_batch_action(provider, mock_ai_service):
+    """Test that the batch action reports each prompt's outcome."""
+    mock_ai_service.generate_images_batch.return_value = [
+        ImageFilesResponse(images=[SavedImage(path="/tmp/one.png", size_bytes=1, index=0)]),
+        ValueError("API request failed"),
+    ]
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.generate_images_batch({"prompts": ["one", "two"], "height": 512})
+
+    assert result.splitlines() == [
+        "Batch image generation complete (1/2 succeeded):",
+        "- Prompt 1: Saved to: /tmp/one.png",
+        "- Prompt 2: Error: API request failed",
+    ]
+    requests = mock_ai_service.generate_images_batch.call_args[0][0]
+    assert [request.prompt for request in requests] == ["one", "two"]
+    assert all(request.height == 512 for request in requests)
+
+
+def test_generate_images_batch_action_error(provider, mock_ai_service):
+    """Test that batch service errors are returned as an error message."""
+    mock_ai_service.generate_images_batch.side_effect = Exception("API error")
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.generate_images_batch({"prompts": ["one"]})
+
+    assert result == "Error: Batch image generation: API error"
+
+
+def test_generate_image_to_files_decodes_in_slices(
+    small_chunks, mock_request, mock_api_key, tmp_path
+):
+    """Test that a saved image is decoded slice by slice without a payload model."""
+    encoded = base64.b64encode(RAW_DATA).decode()
+    mock_request.return_value.json.return_value = {
+        "images": [{"image": encoded, "random_seed": 1, "index": 0}]
+    }
+    service = AIService(mock_api_key)
+    request = ImageGenerationRequest(prompt="A cat", model_name="SDXL1.0-base", height=64, width=64)
+
+    with (
+        patch(
+            "coinbase_agentkit.action_providers.hyperboliclabs.ai.utils.base64.b64decode",
+            wraps=base64.b64decode,
+        ) as mock_decode,
+        patch(
+            "coinbase_agentkit.action_providers.hyperboliclabs.ai.service.ImageGenerationResponse"
+        ) as mock_response_model,
+    ):
+        response = service.generate_image_to_files(request, str(tmp_path))
+
+    assert mock_decode.call_count == len(encoded) // 12
+    assert all(len(call.args[0]) <= 12 for call in mock_decode.call_args_list)
+    mock_response_model.assert_not_called()
+    with open(response.images[0].path, "rb") as f:
+        assert f.read() == RAW_DATA
@@ -0,0 +1,145 @@
+"""Tests for columnar spend analytics."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.hyperboliclabs.billing import analytics as analytics_module
+from coinbase_agentkit.action_providers.hyperboliclabs.billing.analytics import SpendAnalytics
+from coinbase_agentkit.action_providers.hyperboliclabs.marketplace.types import (
+    GpuHardware,
+    HardwareInfo,
+    InstanceHistoryEntry,
+    InstanceHistoryResponse,
+    Price,
+)
+
+
+def _rental(
+    name: str,
+    started_at: str | None,
+    terminated_at: str | None,
+    models: list[str],
+    price: float = 100.0,
+    gpu_count: int = 1,
+) -> InstanceHistoryEntry:
+    """Create an instance history entry for testing."""
+    return InstanceHistoryEntry(
+        instance_name=name,
+        started_at=started_at,
+        terminated_at=terminated_at,
+        gpu_count=gpu_count,
+        hardware=HardwareInfo(gpus=[GpuHardware(model=model) for model in models]),
+        price=Price(amount=price, period="hourly"),
+    )
+
+
+@pytest.fixture
+def analytics():
+    """Create analytics over rentals of several models, days and durations."""
+    return SpendAnalytics(
+        InstanceHistoryResponse(
+            instance_history=[
+                _rental("h100", "2024-01-14T10:00:00Z", "2024-01-14T12:00:00Z", ["H100"], 300),
+                _rental("overnight", "2024-01-14T23:00:00Z", "2024-01-15T01:00:00Z", ["A100"], 200),
+                _rental(
+                    "mixed",
+                    "2024-01-15T12:00:00Z",
+                    "2024-01-15T13:00:00Z",
+                    ["A100", "H100"],
+                    1000,
+                    gpu_count=2,
+                ),
+                _rental("running", "2024-01-16T00:00:00Z", None, ["H100"], 300),
+            ]
+        )
+    )
+
+
+def test_columns(analytics):
+    """Test that rentals are ingested into columns once."""
+    assert len(analytics) == 4
+    assert analytics.names == ["h100", "overnight", "mixed", "running"]
+    assert analytics.gpu_labels[2] == "A100, H100"
+    assert list(analytics.costs[:3]) == [6.0, 4.0, 10.0]
+    assert analytics.complete == [0, 1, 2]
+    assert analytics.get_recent(2) == [3, 2]
+    assert analytics.get_total_cost() == 20.0
+
+
+def test_by_gpu_model_splits_mixed_rentals(analytics):
+    """Test that multi-model rentals are split evenly and models are ranked by cost."""
+    breakdown = analytics.get_by_gpu_model()
+
+    assert [entry.key for entry in breakdown] == ["H100", "A100"]
+    assert breakdown[0].total_cost == 11.0
+    assert breakdown[0].rentals == 1.5
+    assert breakdown[0].gpus == 2.0
+    assert breakdown[1].total_seconds == 3 * 3600
+    assert [entry.key for entry in analytics.get_by_gpu_model(limit=1, sort_by="key")] == ["A100"]
+
+
+def test_by_day_splits_overnight_rentals(analytics):
+    """Test that rentals spanning midnight are split between days."""
+    breakdown = analytics.get_by_day()
+
+    assert [(entry.key, entry.total_cost) for entry in breakdown] == [
+        ("2024-01-14", 8.0),
+        ("2024-01-15", 12.0),
+    ]
+    assert breakdown[0].rentals == 2
+    assert analytics.get_by_day(sort_by="cost", limit=1)[0].key == "2024-01-15"
+
+
+def test_time_window(analytics):
+    """Test that a time window clips rentals to the time inside it."""
+    start = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 15, 12, 30, tzinfo=timezone.utc)
+
+    assert analytics.get_total_cost(start=start, end=end) == 2.0 + 5.0
+    assert [(e.key, e.total_seconds) for e in analytics.get_by_instance(start, end)] == [
+        ("mixed", 1800.0),
+        ("overnight", 3600.0),
+    ]
+    assert [e.key for e in analytics.get_by_gpu_model(start=start)] == ["A100", "H100"]
+    assert [e.key for e in analytics.get_by_day(start=start)] == ["2024-01-15"]
+    assert analytics.get_by_instance(start=datetime(2025, 1, 1)) == []
+
+
+def test_invalid_sort_key(analytics):
+    """Test that an unknown sort key is rejected."""
+    with pytest.raises(ValueError, match="Invalid sort key"):
+        analytics.get_by_instance(sort_by="price")
+
+
+def test_breakdowns_parse_timestamps_once():
+    """Test that a large history is parsed once on ingest and not again per breakdown."""
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    models = ["NVIDIA-H100", "NVIDIA-A100", "NVIDIA-RTX-4090", "NVIDIA-L40S"]
+    rentals = [
+        _rental(
+            f"instance-{i}",
+            (base + timedelta(hours=i)).isoformat(),
+            (base + timedelta(hours=i, minutes=30 + i % 600)).isoformat(),
+            [models[i % len(models)]],
+            price=50 + i % 300,
+        )
+        for i in range(5000)
+    ]
+    history = InstanceHistoryResponse(instance_history=rentals)
+
+    with patch.object(
+        analytics_module, "parse_timestamp", wraps=analytics_module.parse_timestamp
+    ) as mock_parse:
+        analytics = SpendAnalytics(history)
+        assert mock_parse.call_count == 2 * len(rentals)
+
+        analytics.get_by_gpu_model()
+        analytics.get_by_day()
+        analytics.get_by_instance(limit=10)
+        analytics.get_by_gpu_model(start=base + timedelta(days=100))
+
+    assert mock_parse.call_count == 2 * len(rentals)
+    assert len(analytics.complete) == len(rentals)
+    assert len(analytics.get_by_gpu_model()) == len(models)
@@ -0,0 +1,98 @@
+"""Tests for get_spend_breakdown action in HyperbolicBillingActionProvider."""
+
+from unittest.mock import Mock, patch
+
+from coinbase_agentkit.action_providers.hyperboliclabs.marketplace.types import (
+    GpuHardware,
+    HardwareInfo,
+    InstanceHistoryEntry,
+    InstanceHistoryResponse,
+    Price,
+)
+
+
+def _history() -> InstanceHistoryResponse:
+    """Create an instance history with two GPU models."""
+    return InstanceHistoryResponse(
+        instance_history=[
+            InstanceHistoryEntry(
+                instance_name="instance-123",
+                started_at="2024-01-15T12:00:00Z",
+                terminated_at="2024-01-15T13:00:00Z",
+                gpu_count=2,
+                hardware=HardwareInfo(gpus=[GpuHardware(model="NVIDIA A100")]),
+                price=Price(amount=2500.0, period="hourly"),
+            ),
+            InstanceHistoryEntry(
+                instance_name="instance-456",
+                started_at="2024-01-14T10:00:00Z",
+                terminated_at="2024-01-14T12:00:00Z",
+                gpu_count=1,
+                hardware=HardwareInfo(gpus=[GpuHardware(model="NVIDIA H100")]),
+                price=Price(amount=3750.0, period="hourly"),
+            ),
+        ]
+    )
+
+
+def test_get_spend_breakdown_by_gpu_model(provider):
+    """Test breaking down spend by GPU model, highest cost first."""
+    provider.marketplace.get_instance_history = Mock(return_value=_history())
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.get_spend_breakdown({})
+
+    assert result.splitlines() == [
+        "=== GPU Rental Spend by GPU Model (all time) ===",
+        "",
+        "- NVIDIA H100: $75.00 (75.0%)",
+        "  Rentals: 1, GPUs: 1, Time: 2.00 hours",
+        "- NVIDIA A100: $25.00 (25.0%)",
+        "  Rentals: 1, GPUs: 2, Time: 1.00 hours",
+        "",
+        "Total Spending: $100.00",
+    ]
+
+
+def test_get_spend_breakdown_by_day(provider):
+    """Test breaking down spend by day, in date order."""
+    provider.marketplace.get_instance_history = Mock(return_value=_history())
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.get_spend_breakdown({"group_by": "day", "limit": 1})
+
+    assert "=== GPU Rental Spend by Day (all time) ===" in result
+    assert "- 2024-01-14: $75.00 (75.0%)" in result
+    assert "2024-01-15" not in result
+
+
+def test_get_spend_breakdown_window_without_spend(provider):
+    """Test that a window without any rentals is reported."""
+    provider.marketplace.get_instance_history = Mock(return_value=_history())
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.get_spend_breakdown({"group_by": "instance", "days": 7})
+
+    assert result == "No GPU rental spend found (last 7 days)."
+
+
+def test_get_spend_breakdown_empty(provider):
+    """Test get_spend_breakdown action with empty history."""
+    provider.marketplace.get_instance_history = Mock(
+        return_value=InstanceHistoryResponse(instance_history=[])
+    )
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.get_spend_breakdown({})
+
+    assert result == "No rental history found."
+
+
+def test_get_spend_breakdown_api_error(provider):
+    """Test get_spend_breakdown action with API error."""
+    provider.marketplace.get_instance_history = Mock(side_effect=Exception("API Error"))
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = provider.get_spend_breakdown({})
+
+    assert result == "Error: Spend breakdown retrieval: API Error"
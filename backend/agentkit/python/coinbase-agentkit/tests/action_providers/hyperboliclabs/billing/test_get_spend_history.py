@@ -70,7 +70,7 @@ def test_get_spend_history_success(provider):
     assert "GPU: NVIDIA A100 (Count: 1)" in result
     assert "Duration: 7200 seconds" in result
     assert "Cost: $25.00" in result
-    assert "GPU Type Statistics (showing 1 most recent):" in result
+    assert "GPU Type Statistics (showing top 1 by cost):" in result
     assert "NVIDIA A100:" in result
     assert "Total Rentals: 3" in result
     assert "Total Time: 10800 seconds" in result
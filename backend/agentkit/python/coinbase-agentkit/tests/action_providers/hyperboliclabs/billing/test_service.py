@@ -7,6 +7,7 @@ from coinbase_agentkit.action_providers.hyperboliclabs.billing.service import Bi
 from coinbase_agentkit.action_providers.hyperboliclabs.constants import (
     BILLING_BASE_URL,
     BILLING_ENDPOINTS,
+    DEFAULT_TIMEOUT,
 )
 
 
@@ -30,6 +31,8 @@ def test_billing_get_current_balance(mock_request, mock_api_key):
         headers={"Content-Type": "application/json", "Authorization": f"Bearer {mock_api_key}"},
         json=None,
         params=None,
+        timeout=DEFAULT_TIMEOUT,
+        stream=False,
     )
 
 
@@ -58,6 +61,8 @@ def test_billing_get_purchase_history(mock_request, mock_api_key):
         headers={"Content-Type": "application/json", "Authorization": f"Bearer {mock_api_key}"},
         json=None,
         params=None,
+        timeout=DEFAULT_TIMEOUT,
+        stream=False,
     )
 
 
@@ -0,0 +1,140 @@
+"""Tests for the local billing history store and incremental sync."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.hyperboliclabs.billing.action_provider import (
+    BillingActionProvider,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.billing.store import (
+    INSTANCE_HISTORY,
+    BillingHistoryStore,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.billing.types import (
+    BillingPurchaseHistoryEntry,
+    BillingPurchaseHistoryResponse,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.marketplace.types import (
+    GpuHardware,
+    HardwareInfo,
+    InstanceHistoryEntry,
+    InstanceHistoryResponse,
+    Price,
+)
+
+
+def _rental(name: str, started_at: str, terminated_at: str | None) -> InstanceHistoryEntry:
+    """Create an instance history entry for testing."""
+    return InstanceHistoryEntry(
+        instance_name=name,
+        started_at=started_at,
+        terminated_at=terminated_at,
+        gpu_count=1,
+        hardware=HardwareInfo(gpus=[GpuHardware(model="NVIDIA A100")]),
+        price=Price(amount=100.0, period="hourly"),
+    )
+
+
+def _purchase(amount: str, timestamp: str) -> BillingPurchaseHistoryEntry:
+    """Create a purchase history entry for testing."""
+    return BillingPurchaseHistoryEntry(amount=amount, timestamp=timestamp, source="stripe")
+
+
+@pytest.fixture
+def rentals():
+    """Create one finished and one running rental."""
+    return [
+        _rental("finished", "2024-01-14T10:00:00Z", "2024-01-14T12:00:00Z"),
+        _rental("running", "2024-01-15T10:00:00Z", None),
+    ]
+
+
+def test_sync_instance_history_only_writes_new_and_open(rentals):
+    """Test that a sync only writes new rentals and rentals that were running."""
+    store = BillingHistoryStore()
+
+    assert store.sync_instance_history(InstanceHistoryResponse(instance_history=rentals)) == 2
+
+    updated = [
+        rentals[0],
+        _rental("running", "2024-01-15T10:00:00Z", "2024-01-15T11:00:00Z"),
+        _rental("new", "2024-01-16T10:00:00Z", "2024-01-16T11:00:00Z"),
+    ]
+    assert store.sync_instance_history(InstanceHistoryResponse(instance_history=updated)) == 2
+    assert store.sync_instance_history(InstanceHistoryResponse(instance_history=updated)) == 0
+
+    history = store.get_instance_history().instance_history
+    assert [entry.instance_name for entry in history] == ["new", "running", "finished"]
+    assert history[1].terminated_at == "2024-01-15T11:00:00Z"
+
+
+def test_sync_purchase_history_skips_old_purchases():
+    """Test that purchases before the watermark are skipped and duplicates ignored."""
+    store = BillingHistoryStore()
+    first = [_purchase("1000", "2024-01-14T10:00:00Z"), _purchase("500", "2024-01-15T10:00:00Z")]
+
+    assert store.sync_purchase_history(BillingPurchaseHistoryResponse(purchase_history=first)) == 2
+
+    second = [_purchase("2000", "2024-01-16T10:00:00Z"), *first]
+    assert store.sync_purchase_history(BillingPurchaseHistoryResponse(purchase_history=second)) == 1
+
+    history = store.get_purchase_history().purchase_history
+    assert [entry.amount for entry in history] == ["2000", "500", "1000"]
+
+
+def test_store_persists_to_file(tmp_path, rentals):
+    """Test that synced history survives reopening the store."""
+    path = str(tmp_path / "billing.sqlite3")
+    store = BillingHistoryStore(path)
+    store.sync_instance_history(InstanceHistoryResponse(instance_history=rentals))
+    store.close()
+
+    reopened = BillingHistoryStore(path)
+
+    assert reopened.get_synced_at(INSTANCE_HISTORY) is not None
+    assert len(reopened.get_instance_history().instance_history) == 2
+
+
+def test_spend_history_served_from_store(mock_api_key, rentals):
+    """Test that repeated queries within the sync interval do not refetch."""
+    provider = BillingActionProvider(api_key=mock_api_key)
+    provider.marketplace.get_instance_history = Mock(
+        return_value=InstanceHistoryResponse(instance_history=rentals)
+    )
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        provider.get_spend_history({})
+        provider.get_spend_breakdown({})
+        result = provider.get_spend_history({})
+
+    provider.marketplace.get_instance_history.assert_called_once()
+    assert "- finished:" in result
+
+
+def test_spend_history_during_outage(mock_api_key, rentals):
+    """Test that stored history is served with a note when the API fails."""
+    provider = BillingActionProvider(api_key=mock_api_key)
+    provider.sync_interval = 0
+    provider.marketplace.get_instance_history = Mock(
+        side_effect=[InstanceHistoryResponse(instance_history=rentals), Exception("API Error")]
+    )
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        provider.get_spend_history({})
+        result = provider.get_spend_history({})
+
+    assert result.startswith("Note: The API request failed (API Error), showing history synced at")
+    assert "- finished:" in result
+
+
+def test_history_db_path_from_env(mock_api_key, tmp_path, rentals):
+    """Test that the history is persisted to the path in the environment."""
+    path = str(tmp_path / "billing.sqlite3")
+
+    with patch.dict("os.environ", {"HYPERBOLIC_BILLING_DB_PATH": path}):
+        provider = BillingActionProvider(api_key=mock_api_key)
+    provider.history_store.sync_instance_history(InstanceHistoryResponse(instance_history=rentals))
+
+    assert provider.history_store.path == path
+    assert len(BillingHistoryStore(path).get_instance_history().instance_history) == 2
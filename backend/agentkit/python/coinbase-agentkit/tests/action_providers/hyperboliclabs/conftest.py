@@ -1,10 +1,15 @@
 """Common test fixtures for Hyperbolic services."""
 
+import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 import pytest
 
+from coinbase_agentkit.action_providers.hyperboliclabs.service import close_sessions
+
 
 @pytest.fixture
 def api_key() -> str:
@@ -32,9 +37,75 @@ def mock_api_key():
 def mock_request():
     """Mock requests for all tests."""
     with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.service.requests.request"
+        "coinbase_agentkit.action_providers.hyperboliclabs.service.requests.Session.request"
     ) as mock:
         mock.return_value.status_code = 200
         mock.return_value.json.return_value = {"status": "success"}
         mock.return_value.raise_for_status.return_value = None
         yield mock
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """Request handler replaying scripted responses from its server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        self.server.requests.append(
+            {
+                "method": self.command,
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": body,
+                "client_port": self.client_address[1],
+            }
+        )
+
+        if self.server.responses:
+            status, headers, payload = self.server.responses.pop(0)
+        else:
+            status, headers, payload = 200, {}, {"status": "success"}
+
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        headers = {"Content-Type": "application/json", **headers}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802
+        """Handle a GET request."""
+        self._handle()
+
+    def do_POST(self):  # noqa: N802
+        """Handle a POST request."""
+        self._handle()
+
+    def log_message(self, format, *args):
+        """Silence request logging."""
+
+
+@pytest.fixture
+def mock_server():
+    """Run a local HTTP server standing in for the Hyperbolic API.
+
+    Queue responses as (status, headers, payload) tuples on ``server.responses``;
+    received requests are recorded on ``server.requests``.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockAPIHandler)
+    server.daemon_threads = True
+    server.responses = []
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    close_sessions()
+    server.shutdown()
+    server.server_close()
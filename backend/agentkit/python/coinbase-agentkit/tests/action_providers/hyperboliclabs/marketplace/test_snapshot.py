@@ -0,0 +1,138 @@
+"""Tests for the cached, indexed snapshot of available GPU instances."""
+
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.hyperboliclabs.marketplace.action_provider import (
+    MarketplaceActionProvider,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.marketplace.snapshot import (
+    GpuAvailabilitySnapshot,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.marketplace.types import (
+    AvailableInstance,
+    AvailableInstancesResponse,
+    GpuHardware,
+    HardwareInfo,
+    Price,
+    PricingInfo,
+    RentInstanceRequest,
+)
+
+
+def _instance(
+    node_id: str,
+    model: str,
+    cluster: str,
+    price: float,
+    gpus_total: int = 4,
+    gpus_reserved: int = 0,
+    reserved: bool = False,
+) -> AvailableInstance:
+    """Create an available instance for testing."""
+    return AvailableInstance(
+        id=node_id,
+        status="node_ready",
+        hardware=HardwareInfo(gpus=[GpuHardware(model=model)]),
+        gpus_total=gpus_total,
+        gpus_reserved=gpus_reserved,
+        pricing=PricingInfo(price=Price(amount=price, period="hourly")),
+        reserved=reserved,
+        cluster_name=cluster,
+    )
+
+
+@pytest.fixture
+def instances():
+    """Create a mix of available, full and reserved instances."""
+    return [
+        _instance("node-1", "NVIDIA-H100", "cluster-a", 250),
+        _instance("node-2", "NVIDIA-RTX-4090", "cluster-a", 40),
+        _instance("node-3", "NVIDIA-H100", "cluster-b", 180),
+        _instance("node-4", "NVIDIA-A100", "cluster-b", 120, gpus_reserved=4),
+        _instance("node-5", "NVIDIA-A100", "cluster-c", 100, reserved=True),
+    ]
+
+
+def test_snapshot_indexes_available_instances(instances):
+    """Test that only rentable instances are indexed, by model and cluster."""
+    snapshot = GpuAvailabilitySnapshot(instances)
+
+    assert snapshot.instances == instances
+    assert [i.id for i in snapshot.available] == ["node-1", "node-2", "node-3"]
+    assert snapshot.gpu_models == ["NVIDIA-H100", "NVIDIA-RTX-4090"]
+    assert [i.id for i in snapshot.get_instances_by_cluster("cluster-a")] == ["node-1", "node-2"]
+    assert snapshot.get_instances_by_model("NVIDIA-A100") == []
+
+
+def test_snapshot_sorts_models_by_price(instances):
+    """Test that instances of a model are ordered cheapest first."""
+    snapshot = GpuAvailabilitySnapshot(instances)
+
+    assert [i.id for i in snapshot.get_instances_by_model("NVIDIA-H100")] == ["node-3", "node-1"]
+    assert snapshot.get_cheapest("NVIDIA-H100").id == "node-3"
+    assert snapshot.get_cheapest("NVIDIA-A100") is None
+
+
+def test_discovery_actions_share_one_fetch(mock_api_key, instances):
+    """Test that the family of GPU discovery actions is answered from one fetch."""
+    provider = MarketplaceActionProvider(api_key=mock_api_key)
+    response = AvailableInstancesResponse(instances=instances)
+
+    with (
+        patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"),
+        patch.object(
+            provider.marketplace, "get_available_instances", return_value=response
+        ) as mock_fetch,
+    ):
+        all_gpus = provider.get_available_gpus({})
+        gpu_types = provider.get_available_gpus_types({})
+        by_type = provider.get_available_gpus_by_type({"gpu_model": "NVIDIA-H100"})
+
+    mock_fetch.assert_called_once()
+    assert "Node ID: node-4" not in all_gpus
+    assert "- NVIDIA-RTX-4090" in gpu_types
+    assert "NVIDIA-A100" not in gpu_types
+    assert by_type.index("node-3") < by_type.index("node-1")
+
+
+def test_snapshot_refetched_after_ttl(mock_api_key, instances):
+    """Test that the snapshot is refetched once it expires."""
+    provider = MarketplaceActionProvider(api_key=mock_api_key)
+    response = AvailableInstancesResponse(instances=instances)
+
+    with patch.object(
+        provider.marketplace, "get_available_instances", return_value=response
+    ) as mock_fetch:
+        first = provider.marketplace.get_available_gpus_snapshot()
+        assert provider.marketplace.get_available_gpus_snapshot() is first
+
+        with patch(
+            "coinbase_agentkit.action_providers.hyperboliclabs.marketplace.snapshot.time.monotonic",
+            return_value=first.fetched_at + provider.marketplace.cache_ttl,
+        ):
+            second = provider.marketplace.get_available_gpus_snapshot()
+            assert second is not first
+            assert mock_fetch.call_count == 2
+
+            provider.marketplace.get_available_gpus_snapshot(max_age=0)
+            assert mock_fetch.call_count == 3
+
+
+def test_snapshot_invalidated_by_rental(mock_request, mock_api_key, instances):
+    """Test that renting an instance discards the cached snapshot."""
+    provider = MarketplaceActionProvider(api_key=mock_api_key)
+    response = AvailableInstancesResponse(instances=instances)
+    mock_request.return_value.json.return_value = {"status": "success"}
+
+    with patch.object(
+        provider.marketplace, "get_available_instances", return_value=response
+    ) as mock_fetch:
+        provider.marketplace.get_available_gpus_snapshot()
+        provider.marketplace.rent_instance(
+            RentInstanceRequest(cluster_name="cluster-a", node_name="node-1", gpu_count=1)
+        )
+        provider.marketplace.get_available_gpus_snapshot()
+
+    assert mock_fetch.call_count == 2
@@ -6,6 +6,7 @@ import pytest
 import requests
 
 from coinbase_agentkit.action_providers.hyperboliclabs.constants import (
+    DEFAULT_TIMEOUT,
     SETTINGS_BASE_URL,
     SETTINGS_ENDPOINTS,
 )
@@ -43,6 +44,8 @@ def test_settings_link_wallet_success(mock_request, mock_api_key):
         headers={"Content-Type": "application/json", "Authorization": f"Bearer {mock_api_key}"},
         json={"address": wallet_address},
         params=None,
+        timeout=DEFAULT_TIMEOUT,
+        stream=False,
     )
 
 
@@ -99,6 +102,8 @@ def test_link_wallet_success(mock_request, mock_api_key):
         headers=ANY,
         json={"address": wallet_address},
         params=None,
+        timeout=DEFAULT_TIMEOUT,
+        stream=False,
     )
 
 
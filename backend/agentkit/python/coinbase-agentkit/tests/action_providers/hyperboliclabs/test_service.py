@@ -1,18 +1,27 @@
 """Unit tests for the Base service class."""
 
+import asyncio
 from unittest.mock import patch
 
 import pytest
 import requests
 
-from coinbase_agentkit.action_providers.hyperboliclabs.service import Base
+from coinbase_agentkit.action_providers.hyperboliclabs.constants import (
+    DEFAULT_TIMEOUT,
+    MAX_RETRY_DELAY,
+)
+from coinbase_agentkit.action_providers.hyperboliclabs.service import (
+    Base,
+    close_sessions,
+    get_retry_delay,
+)
 
 
 @pytest.fixture
 def mock_request():
     """Mock the request function for testing."""
     with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.service.requests.request"
+        "coinbase_agentkit.action_providers.hyperboliclabs.service.requests.Session.request"
     ) as mock:
         mock.return_value.status_code = 200
         mock.return_value.json.return_value = {"status": "success"}
@@ -32,7 +41,7 @@ def test_make_request():
     base = Base("test_api_key", "https://api.example.com")
 
     with patch(
-        "coinbase_agentkit.action_providers.hyperboliclabs.service.requests.request"
+        "coinbase_agentkit.action_providers.hyperboliclabs.service.requests.Session.request"
     ) as mock_request:
         mock_response = mock_request.return_value
         mock_response.json.return_value = {"status": "success"}
@@ -95,3 +104,131 @@ def test_service_make_request_invalid_method(mock_request, mock_api_key):
 
     with pytest.raises(ValueError, match="Invalid HTTP method"):
         service.make_request("/test", method="INVALID")
+
+
+def test_make_request_reuses_pooled_connection(mock_server, mock_api_key):
+    """Test that services sharing an API key reuse one keep-alive connection."""
+    first = Base(mock_api_key, mock_server.url)
+    second = Base(mock_api_key, mock_server.url)
+
+    first.make_request("/first", method="GET")
+    second.make_request("/second", method="GET")
+
+    assert first.session is second.session
+    assert len(mock_server.requests) == 2
+    assert mock_server.requests[0]["client_port"] == mock_server.requests[1]["client_port"]
+
+
+def test_make_request_separate_sessions_per_api_key(mock_api_key):
+    """Test that different API keys get different sessions."""
+    assert Base(mock_api_key).session is not Base("other-api-key").session
+    close_sessions()
+
+
+def test_make_request_passes_timeout(mock_request, mock_api_key):
+    """Test that the configured timeout is passed to each request."""
+    Base(mock_api_key).make_request("/test")
+    assert mock_request.call_args.kwargs["timeout"] == DEFAULT_TIMEOUT
+
+    Base(mock_api_key, timeout=5).make_request("/test")
+    assert mock_request.call_args.kwargs["timeout"] == 5
+
+    Base(mock_api_key, timeout=5).make_request("/test", timeout=(1, 2))
+    assert mock_request.call_args.kwargs["timeout"] == (1, 2)
+
+
+def test_make_request_retries_rate_limit(mock_server, mock_api_key):
+    """Test that a rate limited request is retried after the Retry-After delay."""
+    mock_server.responses = [
+        (429, {"Retry-After": "1"}, {"message": "Too many requests"}),
+        (200, {}, {"status": "success"}),
+    ]
+    base = Base(mock_api_key, mock_server.url)
+
+    with patch("coinbase_agentkit.action_providers.hyperboliclabs.service.time.sleep") as sleep:
+        response = base.make_request("/test", method="POST", data={"key": "value"})
+
+    assert response.json() == {"status": "success"}
+    assert len(mock_server.requests) == 2
+    sleep.assert_called_once_with(1.0)
+
+
+def test_make_request_retries_server_error_with_backoff(mock_server, mock_api_key):
+    """Test that idempotent requests are retried on server errors with exponential backoff."""
+    mock_server.responses = [
+        (503, {}, {"message": "Unavailable"}),
+        (502, {}, {"message": "Bad gateway"}),
+        (200, {}, {"status": "success"}),
+    ]
+    base = Base(mock_api_key, mock_server.url, backoff_factor=0.5)
+
+    with patch("coinbase_agentkit.action_providers.hyperboliclabs.service.time.sleep") as sleep:
+        response = base.make_request("/test", method="GET")
+
+    assert response.status_code == 200
+    assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0]
+
+
+def test_make_request_does_not_retry_non_idempotent_server_error(mock_server, mock_api_key):
+    """Test that POST requests are not retried on server errors by default."""
+    mock_server.responses = [(500, {}, {"message": "Internal error", "error_code": 5000})]
+    base = Base(mock_api_key, mock_server.url)
+
+    with pytest.raises(requests.exceptions.HTTPError, match=r"Internal error \(code: 5000\)"):
+        base.make_request("/test", method="POST")
+
+    assert len(mock_server.requests) == 1
+
+
+def test_make_request_retry_opt_in(mock_server, mock_api_key):
+    """Test that POST requests are retried on server errors when retry is enabled."""
+    mock_server.responses = [(500, {}, {}), (200, {}, {"status": "success"})]
+    base = Base(mock_api_key, mock_server.url)
+
+    with patch("coinbase_agentkit.action_providers.hyperboliclabs.service.time.sleep"):
+        response = base.make_request("/test", method="POST", retry=True)
+
+    assert response.status_code == 200
+    assert len(mock_server.requests) == 2
+
+
+def test_make_request_gives_up_after_max_retries(mock_server, mock_api_key):
+    """Test that the last error is raised once retries are exhausted."""
+    mock_server.responses = [(429, {}, {"message": "Slow down"})] * 3
+    base = Base(mock_api_key, mock_server.url, max_retries=2)
+
+    with (
+        patch("coinbase_agentkit.action_providers.hyperboliclabs.service.time.sleep"),
+        pytest.raises(requests.exceptions.HTTPError, match="Slow down"),
+    ):
+        base.make_request("/test", method="GET")
+
+    assert len(mock_server.requests) == 3
+
+
+def test_get_retry_delay():
+    """Test Retry-After parsing and backoff capping."""
+    response = requests.Response()
+    assert get_retry_delay(response, 0, 0.5) == 0.5
+    assert get_retry_delay(response, 3, 0.5) == 4.0
+    assert get_retry_delay(response, 20, 0.5) == MAX_RETRY_DELAY
+
+    response.headers["Retry-After"] = "2"
+    assert get_retry_delay(response, 0, 0.5) == 2.0
+
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert get_retry_delay(response, 0, 0.5) == 0.0
+
+    response.headers["Retry-After"] = "not a date"
+    assert get_retry_delay(response, 1, 0.5) == 1.0
+
+
+def test_make_request_async(mock_server, mock_api_key):
+    """Test the async variant against the local server."""
+    mock_server.responses = [(200, {}, {"status": "async"})]
+    base = Base(mock_api_key, mock_server.url)
+
+    response = asyncio.run(base.make_request_async("/test", method="GET"))
+
+    assert response.json() == {"status": "async"}
+    assert mock_server.requests[0]["headers"]["Authorization"] == f"Bearer {mock_api_key}"
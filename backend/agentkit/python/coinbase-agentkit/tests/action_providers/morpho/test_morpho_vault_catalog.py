@@ -0,0 +1,189 @@
+"""Tests for the Morpho Vault catalog and the compare_morpho_vaults action."""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.erc20.constants import ERC20_ABI
+from coinbase_agentkit.action_providers.morpho.constants import METAMORPHO_ABI
+from coinbase_agentkit.action_providers.morpho.morpho_action_provider import morpho_action_provider
+from coinbase_agentkit.action_providers.morpho.vault_catalog import vault_catalog
+
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+WETH = "0x4200000000000000000000000000000000000006"
+USDC_VAULT = "0xc1256Ae5FF1cf2719D4937adb3bbCCab2E00A2Ca"
+OTHER_USDC_VAULT = "0x616a4E1db48e22028f6bbf20444Cd3b8e3273738"
+WETH_VAULT = "0xa0E430870c4604CcfC7B38Ca7845B1FF653D0ff1"
+WALLET = "0x5555555555555555555555555555555555555555"
+MOCK_TX_HASH = "0xabcdef1234567890"
+
+
+class _FakeVaults:
+    """ERC-4626 vaults answering reads like the chain."""
+
+    def __init__(self, multicall3):
+        self.multicall3 = multicall3
+        self.tokens = {USDC: ("USDC", 6), WETH: ("WETH", 18)}
+        # name, symbol, asset, total assets, total supply
+        self.vaults = {
+            USDC_VAULT: ("Moonwell Flagship USDC", "mwUSDC", USDC, 30_000_000 * 10**6, 28 * 10**24),
+            OTHER_USDC_VAULT: ("Seamless USDC Vault", "smUSDC", USDC, 10_000_000 * 10**6, 10**25),
+            WETH_VAULT: ("Moonwell Flagship ETH", "mwETH", WETH, 5_000 * 10**18, 4_900 * 10**18),
+        }
+        self.allowance = 0
+
+        multicall3.block_number = 4321
+        for token in self.tokens:
+            multicall3.add_contract(token, ERC20_ABI, self.answer_token)
+        for vault in self.vaults:
+            multicall3.add_contract(vault, METAMORPHO_ABI, self.answer)
+        multicall3.add_read(
+            "decimals", lambda address, _: self.tokens[Web3.to_checksum_address(address)][1]
+        )
+        multicall3.add_read("allowance", lambda *_: self.allowance)
+
+    def answer_token(self, address, function_name, args):
+        """Answer a call to a token."""
+        symbol, decimals = self.tokens[address]
+        return (symbol,) if function_name == "symbol" else (decimals,)
+
+    def answer(self, address, function_name, args):
+        """Answer a call to a vault."""
+        name, symbol, asset, total_assets, total_supply = self.vaults[address]
+        # Shares have 18 decimals, rounding down as OpenZeppelin's ERC4626
+        if function_name in ("convertToAssets", "previewRedeem"):
+            return (args["shares"] * total_assets // total_supply,)
+        if function_name == "previewDeposit":
+            return (args["assets"] * total_supply // total_assets,)
+        return {
+            "asset": (asset,),
+            "name": (name,),
+            "symbol": (symbol,),
+            "decimals": (18,),
+            "totalAssets": (total_assets,),
+            "totalSupply": (total_supply,),
+        }[function_name]
+
+    def wallet_provider(self):
+        """Create a wallet provider reading from the chain."""
+        wallet_provider = self.multicall3.wallet_provider()
+        wallet_provider.get_network.return_value.chain_id = "8453"
+        wallet_provider.get_address.return_value = WALLET
+        wallet_provider.send_transaction.return_value = MOCK_TX_HASH
+        return wallet_provider
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog():
+    """Forget vaults read by other tests."""
+    vault_catalog.clear()
+    yield
+    vault_catalog.clear()
+
+
+def test_static_data_read_once(multicall3):
+    """Test that the static data of vaults is read once and quotes take one read."""
+    chain = _FakeVaults(multicall3)
+    wallet_provider = chain.wallet_provider()
+
+    vaults = vault_catalog.get_vaults(wallet_provider, [USDC_VAULT, WETH_VAULT.lower()])
+    assert [(v.symbol, v.asset_symbol, v.asset_decimals) for v in vaults] == [
+        ("mwUSDC", "USDC", 6),
+        ("mwETH", "WETH", 18),
+    ]
+    assert multicall3.reads == ["aggregate3", "aggregate3"]
+
+    # Only the new vault is read, and its asset decimals come with it
+    vault_catalog.get_vaults(wallet_provider, [USDC_VAULT, OTHER_USDC_VAULT])
+    assert vault_catalog.get_decimals(wallet_provider, USDC) == 6
+    assert len(multicall3.reads) == 4
+
+    quotes = vault_catalog.get_quotes(
+        wallet_provider, [USDC_VAULT, OTHER_USDC_VAULT, WETH_VAULT], [Decimal(100)], [Decimal(1)]
+    )
+    assert len(multicall3.reads) == 5
+    assert vault_catalog.rpc_calls == 5
+    assert [q.block_number for q in quotes] == [4321] * 3
+
+
+def test_quotes(multicall3):
+    """Test the vault state and previews, with amounts in the units of each vault."""
+    chain = _FakeVaults(multicall3)
+
+    usdc, weth = vault_catalog.get_quotes(
+        chain.wallet_provider(), [USDC_VAULT, WETH_VAULT], deposit_amounts=[Decimal("1.5")]
+    )
+
+    assert (usdc.total_assets, usdc.total_supply) == (30_000_000 * 10**6, 28 * 10**24)
+    assert usdc.share_price == 10**18 * 30_000_000 * 10**6 // (28 * 10**24)
+    assert usdc.deposit_previews == {Decimal("1.5"): 1_500_000 * 28 * 10**24 // (30 * 10**12)}
+    assert weth.deposit_previews == {Decimal("1.5"): 15 * 10**17 * 4_900 // 5_000}
+    assert usdc.redeem_previews == {}
+
+
+def test_compare_morpho_vaults(multicall3):
+    """Test that the comparison lists each vault with a deposit preview."""
+    chain = _FakeVaults(multicall3)
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = morpho_action_provider().compare_morpho_vaults(
+            chain.wallet_provider(),
+            {"vault_addresses": [USDC_VAULT, OTHER_USDC_VAULT], "amount": "100"},
+        )
+
+    assert result.splitlines() == [
+        "Morpho Vaults at block 4321:",
+        f"- Moonwell Flagship USDC (mwUSDC) {USDC_VAULT}: 30,000,000.00 USDC total assets, "
+        "share price 1.071428 USDC",
+        "  Depositing 100 USDC mints 93.333333 mwUSDC",
+        f"- Seamless USDC Vault (smUSDC) {OTHER_USDC_VAULT}: 10,000,000.00 USDC total assets, "
+        "share price 1.000000 USDC",
+        "  Depositing 100 USDC mints 100.000000 smUSDC",
+    ]
+    assert multicall3.reads == ["aggregate3"] * 3
+
+
+def test_compare_morpho_vaults_errors(multicall3):
+    """Test the comparison with an invalid amount and with a failed read."""
+    chain = _FakeVaults(multicall3)
+    wallet_provider = chain.wallet_provider()
+    provider = morpho_action_provider()
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        assert (
+            provider.compare_morpho_vaults(
+                wallet_provider, {"vault_addresses": [USDC_VAULT], "amount": "0"}
+            )
+            == "Error: Assets amount must be greater than 0"
+        )
+        wallet_provider.read_contract.side_effect = Exception("execution reverted")
+        assert provider.compare_morpho_vaults(
+            wallet_provider, {"vault_addresses": [USDC_VAULT]}
+        ) == ("Error comparing Morpho Vaults: execution reverted")
+
+
+def test_deposit_reuses_decimals_and_allowance(multicall3):
+    """Test that a deposit reads decimals once and skips approving with enough allowance."""
+    chain = _FakeVaults(multicall3)
+    wallet_provider = chain.wallet_provider()
+    provider = morpho_action_provider()
+    args = {
+        "vault_address": USDC_VAULT,
+        "token_address": USDC,
+        "assets": "100",
+        "receiver": WALLET,
+    }
+
+    with patch(
+        "coinbase_agentkit.action_providers.morpho.morpho_action_provider.approve"
+    ) as mock_approve:
+        assert "Deposited 100" in provider.deposit(wallet_provider, args)
+        mock_approve.assert_called_once_with(wallet_provider, USDC, USDC_VAULT, 100 * 10**6)
+
+        chain.allowance = 100 * 10**6
+        assert "Deposited 100" in provider.deposit(wallet_provider, args)
+        mock_approve.assert_called_once()
+
+    assert multicall3.reads == ["decimals", "allowance", "allowance"]
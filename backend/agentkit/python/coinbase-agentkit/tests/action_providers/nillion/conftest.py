@@ -1,10 +1,18 @@
 """Shared fixtures for Nillion action provider tests."""
 
 import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from coinbase_agentkit.action_providers.nillion.nillion_action_provider import (
+    nillion_action_provider,
+)
+
 TEST_SCHEMA_ID = "1f105829-2698-47e5-8f35-c1665895f501"
 TEST_SCHEMA_DEF = """{
   "name": "My names",
@@ -30,6 +38,38 @@ TEST_SCHEMA_DEF = """{
   }
 }"""
 
+TEST_SECRET_SCHEMA_DEF = """{
+  "name": "My secrets",
+  "keys": ["_id"],
+  "schema": {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "array",
+    "items": {
+      "type": "object",
+      "properties": {
+        "_id": {
+          "type": "string",
+          "format": "uuid",
+          "coerce": true
+        },
+        "name": {
+          "type": "string"
+        },
+        "password": {
+          "type": "object",
+          "properties": {
+            "%share": {
+              "type": "string"
+            }
+          }
+        }
+      },
+      "required": ["_id", "name", "password"],
+      "additionalProperties": false
+    }
+  }
+}"""
+
 
 class DummyChatOpenAIContent:
     """Placeholder class to mock LLM."""
@@ -105,6 +145,7 @@ def mock_api_calls():
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"debug": "read", "data": []}
+            mock_response.iter_content.return_value = [json.dumps({"data": []}).encode()]
             return mock_response
         elif "api/v1/data/create" in url:
             mock_response = MagicMock()
@@ -143,9 +184,12 @@ def mock_api_calls():
             mock_response.status_code = 404
             return mock_response
 
-    with patch("requests.post") as mock_post, patch("requests.get") as mock_get:
-        mock_post.side_effect = _post
-        mock_get.side_effect = _get
+    with (
+        patch("requests.post", side_effect=_post) as mock_post,
+        patch("requests.get", side_effect=_get) as mock_get,
+        patch("requests.Session.post", side_effect=_post),
+        patch("requests.Session.get", side_effect=_get),
+    ):
         yield mock_post, mock_get
 
 
@@ -154,3 +198,113 @@ def mock_chat_openai_basic():
     """Mock LLM object."""
     with patch("tests.action_providers.nillion.conftest.DummyChatOpenAI", autospec=True) as mock:
         yield mock
+
+
+class MockNodeHandler(BaseHTTPRequestHandler):
+    """Request handler standing in for a nildb node."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else {}
+        self.server.requests.append(
+            {"path": self.path, "body": body, "headers": dict(self.headers)}
+        )
+        time.sleep(self.server.delay)
+
+        etag = None
+        if self.server.fail:
+            status, payload = 500, {"errors": ["node unavailable"]}
+        elif self.path == "/api/v1/schemas":
+            status, payload = 200, {"data": self.server.schemas}
+            etag = f'"{zlib.crc32(json.dumps(self.server.schemas).encode()):x}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        elif self.path == "/api/v1/data/create":
+            self.server.records.extend(body["data"])
+            status, payload = 200, {"data": {"created": [r["_id"] for r in body["data"]]}}
+        elif self.path == "/api/v1/data/read":
+            match = body.get("filter", {}).items()
+            records = [r for r in self.server.records if all(r.get(k) == v for k, v in match)]
+            status, payload = 200, {"data": records}
+        else:
+            status, payload = 404, {"errors": ["not found"]}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802
+        """Handle a GET request."""
+        self._handle()
+
+    def do_POST(self):  # noqa: N802
+        """Handle a POST request."""
+        self._handle()
+
+    def log_message(self, format, *args):
+        """Silence request logging."""
+
+
+class MockNodeServer(ThreadingHTTPServer):
+    """Server that ignores clients hanging up early, e.g. after a timeout."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Silence errors from disconnected clients."""
+
+
+@pytest.fixture
+def node_servers():
+    """Run three local HTTP servers standing in for the nodes of a nildb cluster.
+
+    Each server has ``delay`` (seconds before responding), ``fail`` (respond with
+    an error), ``schemas``, ``records`` and ``requests`` attributes. Schema lists
+    are served with an ETag and conditional requests are answered with 304.
+    """
+    servers = []
+    for i in range(3):
+        server = MockNodeServer(("127.0.0.1", 0), MockNodeHandler)
+        server.delay = 0.0
+        server.fail = False
+        server.schemas = [{"_id": TEST_SCHEMA_ID, **json.loads(TEST_SECRET_SCHEMA_DEF)}]
+        server.records = []
+        server.requests = []
+        server.node = {
+            "name": f"nildb-{i}",
+            "url": f"http://127.0.0.1:{server.server_address[1]}",
+            "did": f"did:nil:testnet:nillion1node{i}",
+        }
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+    yield servers
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def node_provider(mock_env, node_servers):
+    """Create a NillionActionProvider configured with the local node servers."""
+    config = MagicMock()
+    config.json.return_value = {"nodes": [dict(server.node) for server in node_servers]}
+
+    with patch("requests.post", return_value=config):
+        provider = nillion_action_provider(DummyChatOpenAI())
+
+    yield provider
+
+    provider.node_client.close()
@@ -0,0 +1,218 @@
+"""Tests for streaming, filtered reads of records."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from unittest.mock import patch
+
+import nilql
+import pytest
+
+from coinbase_agentkit.action_providers.nillion.download import (
+    iter_data_records,
+    project,
+    stream_records,
+)
+from coinbase_agentkit.action_providers.nillion.node_client import NodeClient, NodeRequestError
+from coinbase_agentkit.action_providers.nillion.upload import encrypt_chunk
+from tests.action_providers.nillion.conftest import TEST_SCHEMA_ID
+
+
+class _StreamedResponse:
+    """Response streaming a body in fixed-size chunks."""
+
+    raw = None
+
+    def __init__(self, body: bytes, chunk_size: int = 64 * 1024):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size):
+        """Yield the body in chunks."""
+        for start in range(0, len(self.body), self.chunk_size):
+            self.chunks_read += 1
+            yield self.body[start : start + self.chunk_size]
+
+    def close(self):
+        """Close the response."""
+
+
+class _StalledResponse(_StreamedResponse):
+    """Response sending part of a body, then waiting for more until its socket is shut down."""
+
+    def __init__(self, body: bytes):
+        super().__init__(body)
+        self.raw = self
+        self.shut_down = threading.Event()
+
+    def iter_content(self, chunk_size):
+        """Yield the body, then wait for data that never arrives."""
+        yield self.body
+        if self.shut_down.wait(timeout=5):
+            raise ConnectionError("connection closed")
+
+    def shutdown(self):
+        """Shut the socket down, waking the read."""
+        self.shut_down.set()
+
+
+class _StreamingClient:
+    """Node client serving pre-encoded data/read bodies without a network."""
+
+    def __init__(self, bodies: list[bytes], chunk_size: int = 64 * 1024, response=None):
+        self.nodes = [{"did": f"node{i}"} for i in range(len(bodies))]
+        self.responses = [
+            response(body) if response else _StreamedResponse(body, chunk_size) for body in bodies
+        ]
+        self.futures = []
+        self._executor = ThreadPoolExecutor(max_workers=len(bodies))
+
+    def request(self, node, method, endpoint, payload=None, stream=False):
+        """Return the response of the node."""
+        return self.responses[self.nodes.index(node)]
+
+    def submit(self, fn, *args):
+        """Run a function on a worker thread."""
+        future = self._executor.submit(fn, *args)
+        self.futures.append(future)
+        return future
+
+
+@pytest.fixture(autouse=True)
+def mock_analytics():
+    """Stop actions from sending analytics events."""
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        yield
+
+
+@pytest.fixture
+def key():
+    """Create a cluster key for three nodes."""
+    return nilql.ClusterKey.generate({"nodes": [{}] * 3}, {"store": True})
+
+
+def _records(count: int) -> list[dict]:
+    """Create records with a secret password field."""
+    return [
+        {"_id": "", "name": f"user{i}", "team": i % 2, "password": {"%share": f"secret{i}"}}
+        for i in range(count)
+    ]
+
+
+def test_iter_data_records_across_chunks():
+    """Test that records split over network chunks, even mid-character, are parsed."""
+    records = [{"_id": str(i), "name": f"ü{i}", "nested": {"list": [1, "]"]}} for i in range(5)]
+    body = json.dumps({"data": records}, ensure_ascii=False).encode()
+
+    assert list(iter_data_records(_StreamedResponse(body, chunk_size=1))) == records
+    assert list(iter_data_records(_StreamedResponse(b'{"data": []}'))) == []
+
+
+def test_iter_data_records_other_bodies():
+    """Test that bodies not starting with a data array are parsed in full."""
+    body = json.dumps({"errors": [], "data": [{"_id": "x"}]}).encode()
+    assert list(iter_data_records(_StreamedResponse(body))) == [{"_id": "x"}]
+
+    with pytest.raises(NodeRequestError, match="schema not found"):
+        list(iter_data_records(_StreamedResponse(b'{"errors": ["schema not found"]}')))
+
+    with pytest.raises(NodeRequestError, match="ended before"):
+        list(iter_data_records(_StreamedResponse(b'{"data": [{"_id": "x"}, {"_i')))
+
+
+def test_project():
+    """Test that projection keeps the selected fields and the id."""
+    record = {"_id": "x", "name": "alice", "password": {"%share": "s"}}
+
+    assert project(record, None) is record
+    assert project(record, ["name"]) == {"_id": "x", "name": "alice"}
+
+
+def test_stream_records_filter_fields_limit(key, node_servers):
+    """Test a filtered, projected and limited read against the nodes."""
+    for server, shard in zip(node_servers, encrypt_chunk(key, _records(10)), strict=True):
+        server.records = shard
+    client = NodeClient([{**server.node, "bearer": "token"} for server in node_servers])
+
+    records = list(stream_records(client, key, TEST_SCHEMA_ID))
+    assert sorted(r["password"] for r in records) == sorted(f"secret{i}" for i in range(10))
+
+    records = list(stream_records(client, key, TEST_SCHEMA_ID, filter={"team": 1}))
+    assert sorted(r["name"] for r in records) == [f"user{i}" for i in (1, 3, 5, 7, 9)]
+    assert node_servers[0].requests[-1]["body"]["filter"] == {"team": 1}
+
+    records = list(stream_records(client, key, TEST_SCHEMA_ID, fields=["name"], limit=3))
+    assert len(records) == 3
+    assert all(set(r) == {"_id", "name"} for r in records)
+
+    client.close()
+
+
+def test_stream_records_node_failure(key, node_servers):
+    """Test that a failed node fails the read."""
+    node_servers[1].fail = True
+    client = NodeClient([{**server.node, "bearer": "token"} for server in node_servers])
+
+    with pytest.raises(NodeRequestError, match="node unavailable"):
+        list(stream_records(client, key, TEST_SCHEMA_ID))
+
+    client.close()
+
+
+def test_data_download_action(node_provider, node_servers):
+    """Test that data_download passes the filter, fields and limit through."""
+    for server, shard in zip(
+        node_servers, encrypt_chunk(node_provider.key, _records(6)), strict=True
+    ):
+        server.records = shard
+
+    records = node_provider.data_download(
+        {"schema_uuid": TEST_SCHEMA_ID, "filter": {"team": 0}, "fields": ["password"]}
+    )
+
+    assert sorted(r["password"] for r in records) == ["secret0", "secret2", "secret4"]
+    assert all(set(r) == {"_id", "password"} for r in records)
+
+
+def test_stream_records_reads_bodies_incrementally(key):
+    """Test that records are yielded while the node responses are still being read.
+
+    The node readers stop a bounded number of record batches ahead of the join, so
+    only part of each response is read when the first record is unified.
+    """
+    count, chunk_size = 6000, 4096
+    shards = encrypt_chunk(key, _records(count))
+    client = _StreamingClient(
+        [json.dumps({"data": shard}).encode() for shard in shards], chunk_size
+    )
+    total_chunks = [-(-len(response.body) // chunk_size) for response in client.responses]
+
+    records = stream_records(client, key, TEST_SCHEMA_ID)
+    first = next(records)
+
+    assert first["password"] == "secret0"
+    assert all(
+        response.chunks_read < total / 2
+        for response, total in zip(client.responses, total_chunks, strict=True)
+    )
+    assert 1 + sum(1 for _ in records) == count
+    assert [response.chunks_read for response in client.responses] == total_chunks
+
+
+def test_stream_records_releases_readers_when_stopped(key):
+    """Test that readers waiting for the network are released once reading stops."""
+    shards = encrypt_chunk(key, _records(100))
+    # The bodies end mid-array, so the readers wait for the rest
+    client = _StreamingClient(
+        [json.dumps({"data": shard}).encode()[:-2] for shard in shards],
+        response=_StalledResponse,
+    )
+
+    records = stream_records(client, key, TEST_SCHEMA_ID, limit=1)
+    assert next(records)["password"] == "secret0"
+    records.close()
+
+    done, _ = wait(client.futures, timeout=1)
+    assert len(done) == len(client.futures)
+    assert all(response.shut_down.is_set() for response in client.responses)
@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from uuid import UUID
 
 import pytest
@@ -6,6 +7,7 @@ from coinbase_agentkit.action_providers.nillion.nillion_action_provider import (
     NillionActionProvider,
     nillion_action_provider,
 )
+from coinbase_agentkit.action_providers.nillion.upload import PartialUploadError
 from tests.action_providers.nillion.conftest import (
     TEST_SCHEMA_ID,
     DummyChatOpenAI,
@@ -82,3 +84,24 @@ def test_action_data_upload():
     assert len(result) > 0
     assert result[0] is not None
     assert isinstance(UUID(result[0]), UUID)
+
+
+@pytest.mark.usefixtures("mock_api_calls")
+@pytest.mark.usefixtures("mock_env")
+@pytest.mark.usefixtures("mock_chat_openai_basic")
+def test_action_data_upload_partial_failure():
+    """Test that an upload failing part way returns the ids of the records stored."""
+    provider = nillion_action_provider(DummyChatOpenAI())
+
+    with patch(
+        "coinbase_agentkit.action_providers.nillion.nillion_action_provider.upload_records",
+        side_effect=PartialUploadError("Upload stopped after 1 of 2 records", ["id-0"]),
+    ):
+        result = provider.data_upload(
+            args={
+                "schema_uuid": TEST_SCHEMA_ID,
+                "data_to_store": [{"_id": "", "name": "a"}, {"_id": "", "name": "b"}],
+            }
+        )
+
+    assert result == ["id-0"]
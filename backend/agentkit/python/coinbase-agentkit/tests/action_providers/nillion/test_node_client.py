@@ -0,0 +1,119 @@
+"""Tests for concurrent requests to the nodes of a nildb cluster."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.nillion.node_client import NodeClient, NodeRequestError
+from tests.action_providers.nillion.conftest import TEST_SCHEMA_ID
+
+
+@pytest.fixture(autouse=True)
+def mock_analytics():
+    """Stop actions from sending analytics events."""
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        yield
+
+
+def _client(node_servers, **kwargs) -> NodeClient:
+    """Create a node client for the local node servers."""
+    return NodeClient([{**server.node, "bearer": "token"} for server in node_servers], **kwargs)
+
+
+def test_request_all_returns_responses_in_node_order(node_servers):
+    """Test that per-node payloads reach their node and responses keep node order."""
+    client = _client(node_servers)
+    payloads = [{"schema": TEST_SCHEMA_ID, "data": [{"_id": str(i)}]} for i in range(3)]
+
+    responses = client.request_all("POST", "data/create", payloads)
+
+    assert [r.json()["data"]["created"] for r in responses] == [["0"], ["1"], ["2"]]
+    assert [server.records for server in node_servers] == [[{"_id": str(i)}] for i in range(3)]
+
+
+def test_request_all_shorter_payload_list(node_servers):
+    """Test that a shorter payload list is only sent to the first nodes."""
+    client = _client(node_servers)
+
+    responses = client.request_all("POST", "data/create", [{"data": [{"_id": "0"}]}])
+
+    assert len(responses) == 1
+    assert [len(server.requests) for server in node_servers] == [1, 0, 0]
+
+
+def test_quorum_read_tolerates_failed_node(node_servers):
+    """Test that a read with a quorum of one succeeds while a node is down."""
+    node_servers[0].fail = True
+    client = _client(node_servers)
+
+    responses = client.request_all("GET", "schemas", quorum=1)
+
+    assert responses[0] is None
+    assert any(r is not None and r.json()["data"][0]["_id"] == TEST_SCHEMA_ID for r in responses)
+
+
+def test_unreachable_quorum_fails_fast(node_servers):
+    """Test that a failed node fails the request without waiting for slow nodes."""
+    node_servers[0].fail = True
+    node_servers[1].delay = node_servers[2].delay = 1.0
+    client = _client(node_servers)
+
+    start = time.perf_counter()
+    with pytest.raises(NodeRequestError, match="quorum of 3 not reached"):
+        client.request_all("POST", "data/read", {"filter": {}})
+
+    assert time.perf_counter() - start < 0.9
+
+
+def test_per_node_timeout(node_servers):
+    """Test that a node slower than the timeout fails the request."""
+    node_servers[2].delay = 1.0
+    client = _client(node_servers, timeout=0.2)
+
+    with pytest.raises(NodeRequestError, match="quorum of 3 not reached"):
+        client.request_all("GET", "schemas")
+
+
+def test_upload_download_roundtrip(node_provider, node_servers):
+    """Test that secret shares are spread over the nodes and unified on download."""
+    record_ids = node_provider.data_upload(
+        {
+            "schema_uuid": TEST_SCHEMA_ID,
+            "data_to_store": [{"_id": "x", "name": "alice", "password": {"%share": "hunter2"}}],
+        }
+    )
+
+    assert len(record_ids) == 1
+    shares = [server.records[0]["password"]["%share"] for server in node_servers]
+    assert len(set(shares)) == 3
+    assert "hunter2" not in shares
+
+    records = node_provider.data_download({"schema_uuid": TEST_SCHEMA_ID})
+    assert records == [{"_id": record_ids[0], "name": "alice", "password": "hunter2"}]
+
+
+def test_schema_lookup_with_first_node_down(node_provider, node_servers):
+    """Test that schemas are still fetched while the first node is down."""
+    node_servers[0].fail = True
+
+    assert node_provider.find_schema(TEST_SCHEMA_ID)["type"] == "array"
+
+
+def test_request_all_sends_to_nodes_concurrently(node_servers):
+    """Test that the requests to all nodes are in flight at the same time."""
+    client = _client(node_servers)
+    barrier = threading.Barrier(len(node_servers), timeout=5)
+    send = client.request
+
+    def request(*args, **kwargs):
+        barrier.wait()
+        return send(*args, **kwargs)
+
+    with patch.object(client, "request", side_effect=request) as mock_request:
+        responses = client.request_all("GET", "schemas")
+
+    assert mock_request.call_count == len(node_servers)
+    assert all(response.status_code == 200 for response in responses)
+    assert [len(server.requests) for server in node_servers] == [1, 1, 1]
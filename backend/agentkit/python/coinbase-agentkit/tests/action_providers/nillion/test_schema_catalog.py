@@ -0,0 +1,140 @@
+"""Tests for the cached schema catalog and compiled validators."""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from coinbase_agentkit.action_providers.nillion.node_client import NodeClient
+from coinbase_agentkit.action_providers.nillion.schema_catalog import SchemaCatalog
+from tests.action_providers.nillion.conftest import (
+    TEST_SCHEMA_DEF,
+    TEST_SCHEMA_ID,
+    DummyChatOpenAISchema,
+)
+
+OTHER_SCHEMA_ID = "2f105829-2698-47e5-8f35-c1665895f502"
+
+
+@pytest.fixture(autouse=True)
+def mock_analytics():
+    """Stop actions from sending analytics events."""
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        yield
+
+
+@pytest.fixture
+def catalog(node_servers):
+    """Create a schema catalog for the local node servers."""
+    client = NodeClient([{**server.node, "bearer": "token"} for server in node_servers])
+    yield SchemaCatalog(client, ttl=60)
+    client.close()
+
+
+def _other_schema() -> dict:
+    """Create a second schema as listed by the nodes."""
+    return {"_id": OTHER_SCHEMA_ID, **json.loads(TEST_SCHEMA_DEF)}
+
+
+def _schema_requests(node_servers) -> list[dict]:
+    """Get the schema requests received by all node servers."""
+    return [r for server in node_servers for r in server.requests if r["path"].endswith("schemas")]
+
+
+def test_schemas_cached_within_ttl(catalog, node_servers):
+    """Test that the schema list is fetched once and reused within the ttl."""
+    schemas = catalog.get_schemas()
+    time.sleep(0.05)  # let the slower nodes answer too
+
+    assert [s["_id"] for s in schemas] == [TEST_SCHEMA_ID]
+    assert catalog.get_schema(TEST_SCHEMA_ID)["type"] == "array"
+    assert catalog.get_schemas() == schemas
+    assert len(_schema_requests(node_servers)) == 3
+
+
+def test_revalidation_with_etag(catalog, node_servers):
+    """Test that an expired list is revalidated with a conditional request."""
+    for server in node_servers[1:]:
+        server.delay = 0.2
+    catalog.get_schemas()
+    schemas = catalog.get_schemas(max_age=0)
+
+    revalidation = node_servers[0].requests[-1]
+    assert "If-None-Match" in revalidation["headers"]
+    assert all("If-None-Match" not in server.requests[-1]["headers"] for server in node_servers[1:])
+    assert [s["_id"] for s in schemas] == [TEST_SCHEMA_ID]
+
+    node_servers[0].schemas = [*node_servers[0].schemas, _other_schema()]
+    schemas = catalog.get_schemas(max_age=0)
+    assert [s["_id"] for s in schemas] == [TEST_SCHEMA_ID, OTHER_SCHEMA_ID]
+
+
+def test_unknown_schema_refetched_once(catalog, node_servers):
+    """Test that an unknown schema id triggers a single refetch."""
+    catalog.get_schemas()
+    for server in node_servers:
+        server.schemas = [*server.schemas, _other_schema()]
+
+    assert catalog.get_schema(OTHER_SCHEMA_ID)["items"]["required"] == ["_id", "name"]
+
+    with pytest.raises(KeyError, match="failed to lookup schema"):
+        catalog.get_schema("missing")
+
+
+def test_validator_cached_per_schema(catalog):
+    """Test that validators are compiled once per schema and rebuilt on change."""
+    validator = catalog.get_validator(TEST_SCHEMA_ID)
+    assert catalog.get_validator(TEST_SCHEMA_ID) is validator
+    assert validator.is_valid([{"_id": "x", "name": "alice", "password": {"%share": "s"}}])
+
+    catalog.add({"_id": TEST_SCHEMA_ID, **json.loads(TEST_SCHEMA_DEF)})
+    rebuilt = catalog.get_validator(TEST_SCHEMA_ID)
+    assert rebuilt is not validator
+    assert not rebuilt.is_valid([{"_id": "x", "name": "alice", "password": {"%share": "s"}}])
+
+
+def test_repeated_uploads_fetch_schemas_once(node_provider, node_servers):
+    """Test that uploads reuse the cached schema and validator."""
+    node_provider.schema_catalog.validator_class = _count_builds(
+        node_provider.schema_catalog.validator_class
+    )
+    for i in range(3):
+        record_ids = node_provider.data_upload(
+            {
+                "schema_uuid": TEST_SCHEMA_ID,
+                "data_to_store": [{"_id": "x", "name": f"user{i}", "password": {"%share": "pw"}}],
+            }
+        )
+        assert len(record_ids) == 1
+
+    assert len(_schema_requests(node_servers)) <= 3
+    assert node_provider.schema_catalog.validator_class.builds == 1
+    assert all(len(server.records) == 3 for server in node_servers)
+
+
+def test_created_schema_added_to_catalog(node_provider, node_servers):
+    """Test that a created schema can be used without refetching the list."""
+    node_provider.llm = DummyChatOpenAISchema()
+    node_provider.fetch_schemas()
+    time.sleep(0.05)  # let the slower nodes answer too
+    requests_before = len(_schema_requests(node_servers))
+
+    schema_id, _ = node_provider.create_schema({"schema_description": "names"})
+
+    assert node_provider.find_schema(schema_id)["items"]["required"] == ["_id", "name"]
+    get_requests = [r for r in _schema_requests(node_servers) if r["body"] == {}]
+    assert len(get_requests) == requests_before
+
+
+def _count_builds(validator_class: type) -> type:
+    """Wrap a validator class to count how often validators are built."""
+
+    class CountingValidator:
+        builds = 0
+
+        def __new__(cls, schema):
+            cls.builds += 1
+            return validator_class(schema)
+
+    return CountingValidator
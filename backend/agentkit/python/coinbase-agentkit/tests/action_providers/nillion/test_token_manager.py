@@ -0,0 +1,87 @@
+"""Tests for the cached, self-refreshing node JWTs."""
+
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+from ecdsa import SECP256k1, SigningKey
+
+from coinbase_agentkit.action_providers.nillion.token_manager import NodeTokenManager
+
+ORG_DID = "did:nil:testnet:nillion1org"
+NODE_A = {"did": "did:nil:testnet:nillion1a"}
+NODE_B = {"did": "did:nil:testnet:nillion1b"}
+
+TIME_PATH = "coinbase_agentkit.action_providers.nillion.token_manager.time.time"
+
+
+@pytest.fixture
+def token_manager():
+    """Create a token manager with a one-hour ttl and five-minute refresh margin."""
+    signer = SigningKey.from_string(bytes.fromhex("DEADBEEF" * 8), curve=SECP256k1)
+    return NodeTokenManager(ORG_DID, signer, ttl=3600, refresh_margin=300)
+
+
+def test_token_claims(token_manager):
+    """Test that a token is issued by the org, for the node, with the ttl."""
+    with patch(TIME_PATH, return_value=1_000_000):
+        token = token_manager.get_token(NODE_A)
+
+    claims = jwt.decode(token, options={"verify_signature": False})
+    assert claims == {"iss": ORG_DID, "aud": NODE_A["did"], "exp": 1_003_600}
+    assert jwt.get_unverified_header(token)["alg"] == "ES256K"
+
+
+def test_token_cached_until_refresh_margin(token_manager):
+    """Test that a token is reused until it is close to expiry, then refreshed."""
+    with patch(TIME_PATH, return_value=1_000_000):
+        first = token_manager.get_token(NODE_A)
+        assert token_manager.get_token(NODE_A) is first
+        assert token_manager.get_token(NODE_B) != first
+
+    with patch(TIME_PATH, return_value=1_003_299):
+        assert token_manager.get_token(NODE_A) is first
+
+    with patch(TIME_PATH, return_value=1_003_300):
+        refreshed = token_manager.get_token(NODE_A)
+
+    assert refreshed != first
+    assert token_manager.get_expiry(NODE_A) == 1_006_900
+
+
+def test_invalidate(token_manager):
+    """Test that invalidated tokens are signed again on next use."""
+    with patch(TIME_PATH, return_value=1_000_000):
+        token_manager.get_token(NODE_A)
+        token_manager.get_token(NODE_B)
+
+        token_manager.invalidate(NODE_A)
+        assert token_manager.get_expiry(NODE_A) is None
+        assert token_manager.get_expiry(NODE_B) == 1_003_600
+
+        token_manager.invalidate()
+        assert token_manager.get_expiry(NODE_B) is None
+
+
+def test_refresh_margin_must_be_shorter_than_ttl():
+    """Test that a refresh margin covering the whole ttl is rejected."""
+    signer = SigningKey.from_string(bytes.fromhex("DEADBEEF" * 8), curve=SECP256k1)
+
+    with pytest.raises(ValueError, match="refresh_margin"):
+        NodeTokenManager(ORG_DID, signer, ttl=60, refresh_margin=60)
+
+
+def test_provider_requests_use_managed_tokens(node_provider, node_servers):
+    """Test that the provider signs node tokens lazily and sends them per node."""
+    assert node_provider.token_manager.get_expiry(node_servers[0].node) is None
+
+    node_provider.fetch_schemas()
+    node_provider.fetch_schemas(max_age=0)
+    time.sleep(0.05)  # let the slower nodes answer too
+
+    for server in node_servers:
+        token = server.requests[0]["headers"]["Authorization"].removeprefix("Bearer ")
+        claims = jwt.decode(token, options={"verify_signature": False})
+        assert claims["aud"] == server.node["did"]
+        assert {r["headers"]["Authorization"] for r in server.requests} == {f"Bearer {token}"}
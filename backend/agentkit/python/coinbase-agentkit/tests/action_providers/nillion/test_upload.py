@@ -0,0 +1,159 @@
+"""Tests for chunked, parallel secret sharing and upload of records."""
+
+import pickle
+from unittest.mock import patch
+
+import nilql
+import pytest
+
+from coinbase_agentkit.action_providers.nillion.node_client import NodeClient
+from coinbase_agentkit.action_providers.nillion.upload import (
+    PartialUploadError,
+    RecordValidationError,
+    encrypt_chunk,
+    iter_chunks,
+    process_chunk,
+    upload_records,
+)
+from tests.action_providers.nillion.conftest import TEST_SCHEMA_ID
+
+
+@pytest.fixture
+def key():
+    """Create a cluster key for three nodes."""
+    return nilql.ClusterKey.generate({"nodes": [{}] * 3}, {"store": True})
+
+
+@pytest.fixture
+def client(node_servers):
+    """Create a node client for the local node servers."""
+    client = NodeClient([{**server.node, "bearer": "token"} for server in node_servers])
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def schema(node_servers):
+    """Get the secret test schema definition."""
+    return node_servers[0].schemas[0]["schema"]
+
+
+def _records(count: int) -> list[dict]:
+    """Create records with a secret password field."""
+    return [
+        {"_id": "", "name": f"user{i}", "password": {"%share": f"secret{i}"}} for i in range(count)
+    ]
+
+
+def _unify(key, node_servers) -> dict[str, dict]:
+    """Unify the records stored on the node servers by id."""
+    shares = zip(*(server.records for server in node_servers), strict=True)
+    return {group[0]["_id"]: nilql.unify(key, list(group)) for group in shares}
+
+
+def test_encrypt_chunk(key):
+    """Test that a chunk is split into one shard per node with fresh ids."""
+    shards = encrypt_chunk(key, _records(2))
+
+    assert len(shards) == 3
+    assert [r["_id"] for r in shards[0]] == [r["_id"] for r in shards[2]]
+    assert all(r["_id"] for r in shards[0])
+    assert shards[0][0]["password"]["%share"] != shards[1][0]["password"]["%share"]
+
+
+def test_process_chunk_validates_shards(key, schema):
+    """Test that invalid shards raise an error that can be sent back from a worker."""
+    records = _records(2)
+    records[1]["unexpected"] = "field"
+
+    with pytest.raises(RecordValidationError, match="'unexpected' was unexpected") as e:
+        process_chunk(key, TEST_SCHEMA_ID, schema, records)
+
+    assert "(at /1)" in str(e.value)
+    assert pickle.loads(pickle.dumps(e.value)).args == e.value.args
+
+
+def test_iter_chunks():
+    """Test that records are split into chunks of at most chunk_size."""
+    assert [len(c) for c in iter_chunks(_records(5), 2)] == [2, 2, 1]
+    assert list(iter_chunks([], 2)) == []
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_upload_records_in_chunks(key, client, schema, node_servers, max_workers):
+    """Test that records are posted in chunks and can be unified in input order."""
+    record_ids = upload_records(
+        client, key, TEST_SCHEMA_ID, schema, _records(25), chunk_size=10, max_workers=max_workers
+    )
+
+    assert len(record_ids) == 25
+    for server in node_servers:
+        assert [len(r["body"]["data"]) for r in server.requests] == [10, 10, 5]
+        assert {r["body"]["schema"] for r in server.requests} == {TEST_SCHEMA_ID}
+
+    records = _unify(key, node_servers)
+    assert list(records) == record_ids
+    assert [r["password"] for r in records.values()] == [f"secret{i}" for i in range(25)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_invalid_chunk_stops_upload(key, client, schema, node_servers, max_workers):
+    """Test that a chunk failing validation is not posted, nor are later chunks.
+
+    The ids of the chunks stored before the failure are raised with the error.
+    """
+    records = _records(25)
+    records[12]["unexpected"] = "field"
+
+    with pytest.raises(PartialUploadError, match="^Upload stopped after 10 of 25 records") as e:
+        upload_records(
+            client, key, TEST_SCHEMA_ID, schema, records, chunk_size=10, max_workers=max_workers
+        )
+
+    assert isinstance(e.value.__cause__, RecordValidationError)
+    assert [len(server.records) for server in node_servers] == [10, 10, 10]
+    assert e.value.record_ids == list(_unify(key, node_servers))
+
+    records = _records(5)
+    records[0]["unexpected"] = "field"
+    with pytest.raises(RecordValidationError):
+        upload_records(client, key, TEST_SCHEMA_ID, schema, records, max_workers=max_workers)
+
+
+def test_upload_holds_one_chunk_at_a_time(key, schema):
+    """Test that each chunk is posted before the next one is encrypted.
+
+    Only the shards of one chunk are held in memory instead of three copies of
+    the whole dataset.
+    """
+    count, chunk_size = 2000, 500
+    with patch(
+        "coinbase_agentkit.action_providers.nillion.upload.encrypt_chunk", wraps=encrypt_chunk
+    ) as mock_encrypt:
+        client = _RecordingClient(mock_encrypt)
+        record_ids = upload_records(
+            client,
+            key,
+            TEST_SCHEMA_ID,
+            schema,
+            _records(count),
+            chunk_size=chunk_size,
+            max_workers=1,
+        )
+
+    assert len(record_ids) == count
+    assert client.posts == [(i + 1, [chunk_size] * 3) for i in range(count // chunk_size)]
+
+
+class _RecordingClient:
+    """Node client that records the shard sizes of each post and drops the request."""
+
+    def __init__(self, mock_encrypt):
+        self.mock_encrypt = mock_encrypt
+        self.posts = []
+
+    def request_all(self, method, endpoint, payloads):
+        """Record the chunks encrypted so far and the size of each shard."""
+        self.posts.append(
+            (self.mock_encrypt.call_count, [len(payload["data"]) for payload in payloads])
+        )
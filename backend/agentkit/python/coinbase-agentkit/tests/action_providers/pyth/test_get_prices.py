@@ -0,0 +1,151 @@
+"""Tests for the Pyth feed ID index and batched price fetching."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from coinbase_agentkit.action_providers.pyth.constants import MAX_FEEDS_PER_REQUEST
+from coinbase_agentkit.action_providers.pyth.feed_index import PriceFeedIndex, normalize_feed_id
+from coinbase_agentkit.action_providers.pyth.pyth_action_provider import pyth_action_provider
+
+BTC_USD = "e62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"
+BTC_EUR = "b1e9fe5d2d2f1b4f2b5e0f1c1b2e9b8a7c6d5e4f3a2b1c0d9e8f7a6b5c4d3e2f"
+ETH_USD = "ff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace"
+
+FEEDS = [
+    {"id": BTC_EUR, "attributes": {"base": "BTC", "quote_currency": "EUR"}},
+    {"id": BTC_USD, "attributes": {"base": "BTC", "quote_currency": "USD"}},
+    {"id": ETH_USD, "attributes": {"base": "ETH", "quote_currency": "USD"}},
+]
+
+PRICES = {
+    BTC_USD: {"price": "4212345", "expo": -2},
+    ETH_USD: {"price": "234567000000", "expo": -8},
+}
+
+
+def _hermes(url, params=None, **kwargs):
+    """Answer Hermes requests from the test feeds and prices.
+
+    Like Hermes, a request with an unknown feed ID fails unless those are ignored.
+    """
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    if url.endswith("/v2/price_feeds"):
+        response.json.return_value = FEEDS
+    elif params.get("ignore_invalid_price_ids") != "true" and not set(params["ids[]"]) <= set(
+        PRICES
+    ):
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            "404 Client Error: Not Found"
+        )
+    else:
+        response.json.return_value = {
+            "parsed": [
+                {"id": feed_id, "price": PRICES[feed_id]}
+                for feed_id in params["ids[]"]
+                if feed_id in PRICES
+            ]
+        }
+    return response
+
+
+@pytest.fixture
+def mock_hermes():
+    """Mock the Hermes API."""
+    with (
+        patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"),
+        patch("requests.Session.get", side_effect=_hermes) as mock_get,
+    ):
+        yield mock_get
+
+
+def test_feed_index_prefers_usd_quote():
+    """Test that symbols with several feeds resolve to the USD quoted one."""
+    index = PriceFeedIndex(FEEDS)
+
+    assert len(index) == 2
+    assert index.get_feed_id("btc") == BTC_USD
+    assert index.get_feed_id(" ETH ") == ETH_USD
+    assert index.get_feed_id("DOGE") is None
+    assert PriceFeedIndex(FEEDS[:1]).get_feed_id("BTC") == BTC_EUR
+
+
+def test_normalize_feed_id():
+    """Test that feed IDs are compared without 0x prefix and case."""
+    assert normalize_feed_id(f"0x{BTC_USD.upper()}") == BTC_USD
+
+
+def test_feed_index_loaded_once_within_ttl(mock_hermes):
+    """Test that feed ID lookups share one bulk load until the TTL expires."""
+    provider = pyth_action_provider()
+
+    assert provider.fetch_price_feed_id({"token_symbol": "BTC"}) == BTC_USD
+    assert provider.fetch_price_feed_id({"token_symbol": "ETH"}) == ETH_USD
+    assert mock_hermes.call_count == 1
+
+    provider.get_feed_index(max_age=0)
+    assert mock_hermes.call_count == 2
+
+
+def test_get_prices_in_one_request(mock_hermes):
+    """Test that symbols and feed IDs are priced with a single price request."""
+    provider = pyth_action_provider()
+
+    result = provider.get_prices(
+        {"token_symbols": ["BTC", "DOGE"], "price_feed_ids": [f"0x{ETH_USD}", "00" * 32]}
+    )
+
+    assert result.splitlines() == [
+        "Prices from Pyth:",
+        "- BTC: 42123.45",
+        "- DOGE: Error: No price feed found for DOGE",
+        f"- 0x{ETH_USD}: 2345.67",
+        f"- {'00' * 32}: Error: No price data found for {'00' * 32}",
+    ]
+    price_calls = [c for c in mock_hermes.call_args_list if "latest" in c.args[0]]
+    assert len(price_calls) == 1
+    assert price_calls[0].kwargs["params"]["ids[]"] == [BTC_USD, ETH_USD, "00" * 32]
+
+
+def test_invalid_feed_id_reported_alone(mock_hermes):
+    """Test that an unknown feed ID leaves the other prices of its request intact."""
+    provider = pyth_action_provider()
+    invalid = "ab" * 32
+
+    assert provider.fetch_prices([BTC_USD, invalid, ETH_USD]) == {
+        BTC_USD: PRICES[BTC_USD],
+        ETH_USD: PRICES[ETH_USD],
+    }
+    assert mock_hermes.call_count == 1
+
+    result = provider.get_prices({"price_feed_ids": [BTC_USD, invalid, ETH_USD]})
+    assert result.splitlines() == [
+        "Prices from Pyth:",
+        f"- {BTC_USD}: 42123.45",
+        f"- {invalid}: Error: No price data found for {invalid}",
+        f"- {ETH_USD}: 2345.67",
+    ]
+
+
+def test_fetch_prices_chunks_large_requests(mock_hermes):
+    """Test that many feeds are split into requests of MAX_FEEDS_PER_REQUEST."""
+    provider = pyth_action_provider()
+    feed_ids = [f"{i:064x}" for i in range(MAX_FEEDS_PER_REQUEST + 1)] + [BTC_USD]
+
+    prices = provider.fetch_prices(feed_ids)
+
+    assert prices == {BTC_USD: PRICES[BTC_USD]}
+    assert [len(c.kwargs["params"]["ids[]"]) for c in mock_hermes.call_args_list] == [
+        MAX_FEEDS_PER_REQUEST,
+        2,
+    ]
+
+
+def test_get_prices_requires_input(mock_hermes):
+    """Test that get_prices reports missing input."""
+    result = pyth_action_provider().get_prices({})
+
+    assert "At least one token symbol or price feed ID is required" in result
+    mock_hermes.assert_not_called()
@@ -0,0 +1,232 @@
+"""Tests for streaming Pyth prices against a local Hermes stand-in."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from coinbase_agentkit.action_providers.pyth.price_stream import PriceStreamer
+from coinbase_agentkit.action_providers.pyth.pyth_action_provider import PythActionProvider
+
+BTC_USD = "e62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"
+ETH_USD = "ff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace"
+
+PRICES = {BTC_USD: "4212345", ETH_USD: "234567"}
+
+
+class _Hermes(ThreadingHTTPServer):
+    """Hermes stand-in serving latest prices and a price update stream."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _HermesHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.requests: list[tuple[str, list[str]]] = []
+        self.publish_time: int | None = None
+
+    def price_update(self, feed_id: str) -> dict:
+        """Build the parsed price update of a feed."""
+        publish_time = int(time.time()) if self.publish_time is None else self.publish_time
+        return {
+            "id": feed_id,
+            "price": {"price": PRICES[feed_id], "expo": -2, "publish_time": publish_time},
+        }
+
+
+class _HermesHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        """Silence request logging."""
+
+    def do_GET(self):  # noqa: N802
+        """Serve /v2/updates/price/latest and /v2/updates/price/stream."""
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        feed_ids = query.get("ids[]", [])
+        self.server.requests.append((url.path, feed_ids))
+        if query.get("ignore_invalid_price_ids") != ["true"] and not set(feed_ids) <= set(PRICES):
+            # Hermes refuses requests with unknown feed IDs unless told to skip them
+            self.send_error(404)
+            return
+        updates = [self.server.price_update(feed_id) for feed_id in feed_ids if feed_id in PRICES]
+
+        if url.path.endswith("/latest"):
+            body = json.dumps({"parsed": updates}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        try:
+            while True:
+                updates = [self.server.price_update(u["id"]) for u in updates]
+                self.wfile.write(f"data: {json.dumps({'parsed': updates})}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def hermes():
+    """Run a local Hermes stand-in."""
+    server = _Hermes()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def mock_analytics():
+    """Stop actions from sending analytics events."""
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        yield
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def _streams(server: _Hermes) -> list[list[str]]:
+    """Get the feeds of each stream request."""
+    return [feed_ids for path, feed_ids in server.requests if path.endswith("/stream")]
+
+
+def test_streamer_fills_price_table(hermes):
+    """Test that streamed updates are written to the price table."""
+    streamer = PriceStreamer(base_url=hermes.url)
+    assert streamer.get_price(BTC_USD) is None
+
+    streamer.subscribe([f"0x{BTC_USD}"])
+    _wait_for(lambda: streamer.get_price(BTC_USD) is not None)
+
+    assert streamer.get_price(BTC_USD)["price"] == PRICES[BTC_USD]
+    assert _streams(hermes) == [[BTC_USD]]
+    streamer.close()
+
+
+def test_streamer_reconnects_on_new_subscription(hermes):
+    """Test that subscribing new feeds reopens the stream with all feeds."""
+    streamer = PriceStreamer(base_url=hermes.url)
+    streamer.subscribe([BTC_USD])
+    _wait_for(lambda: streamer.get_price(BTC_USD) is not None)
+
+    streamer.subscribe([BTC_USD])
+    assert len(_streams(hermes)) == 1
+
+    streamer.subscribe([ETH_USD])
+    _wait_for(lambda: streamer.get_price(ETH_USD) is not None)
+    assert _streams(hermes)[-1] == [BTC_USD, ETH_USD]
+    streamer.close()
+
+
+def test_streamer_keeps_newer_price():
+    """Test that an older update does not replace a newer price."""
+    streamer = PriceStreamer()
+    now = int(time.time())
+    streamer.update(BTC_USD, {"price": "2", "expo": 0, "publish_time": now})
+    streamer.update(BTC_USD, {"price": "1", "expo": 0, "publish_time": now - 1})
+
+    assert streamer.get_price(BTC_USD)["price"] == "2"
+    assert streamer.get_price(BTC_USD, max_age=-1) is None
+
+
+def test_streamer_close_stops_thread(hermes):
+    """Test that close ends the stream and its thread."""
+    streamer = PriceStreamer(base_url=hermes.url)
+    streamer.subscribe([BTC_USD])
+    _wait_for(lambda: streamer.get_price(BTC_USD) is not None)
+
+    streamer.close()
+
+    assert not streamer._thread.is_alive()
+
+
+def test_fetch_price_from_stream(hermes):
+    """Test that fresh streamed prices are served without a price request."""
+    provider = PythActionProvider(stream_prices=True, hermes_url=hermes.url)
+
+    assert provider.fetch_price({"price_feed_id": BTC_USD}) == "42123.45"
+    _wait_for(lambda: _streams(hermes))
+    requests_before = len(hermes.requests)
+
+    for _ in range(10):
+        assert provider.fetch_price({"price_feed_id": BTC_USD}) == "42123.45"
+
+    assert len(hermes.requests) == requests_before
+    provider.close()
+
+
+def test_fetch_price_stale_stream_falls_back(hermes):
+    """Test that a stale streamed price is fetched over HTTP instead."""
+    hermes.publish_time = int(time.time()) - 60
+    provider = PythActionProvider(stream_prices=True, hermes_url=hermes.url)
+
+    provider.fetch_price({"price_feed_id": BTC_USD})
+    _wait_for(lambda: _streams(hermes))
+    provider.fetch_price({"price_feed_id": BTC_USD})
+
+    latest = [path for path, _ in hermes.requests if path.endswith("/latest")]
+    assert len(latest) == 2
+    provider.close()
+
+
+def test_get_prices_subscribes_all_feeds(hermes):
+    """Test that get_prices streams every requested feed."""
+    provider = PythActionProvider(stream_prices=True, hermes_url=hermes.url)
+
+    result = provider.get_prices({"price_feed_ids": [BTC_USD, ETH_USD]})
+
+    assert result.splitlines()[1:] == [f"- {BTC_USD}: 42123.45", f"- {ETH_USD}: 2345.67"]
+    _wait_for(lambda: provider.price_streamer.feed_ids == {BTC_USD, ETH_USD})
+    provider.close()
+
+
+def test_invalid_feed_id_does_not_break_stream(hermes):
+    """Test that an unknown feed ID in the stream leaves the other feeds streaming."""
+    invalid = "ab" * 32
+    streamer = PriceStreamer(base_url=hermes.url)
+
+    streamer.subscribe([BTC_USD, invalid])
+
+    _wait_for(lambda: streamer.get_price(BTC_USD) is not None)
+    assert streamer.get_price(invalid) is None
+    streamer.close()
+
+
+def test_fetch_price_requests_per_lookup(hermes):
+    """Test that lookups over HTTP each take a request and streamed lookups take none."""
+    count = 50
+
+    def latest_requests():
+        return sum(1 for path, _ in hermes.requests if path.endswith("/latest"))
+
+    provider = PythActionProvider(stream_prices=False, hermes_url=hermes.url)
+    for _ in range(count):
+        assert provider.fetch_price({"price_feed_id": BTC_USD}) == "42123.45"
+    provider.close()
+    assert latest_requests() == count
+
+    hermes.requests.clear()
+    provider = PythActionProvider(stream_prices=True, hermes_url=hermes.url)
+    provider.fetch_price({"price_feed_id": BTC_USD})
+    _wait_for(lambda: _streams(hermes))
+    for _ in range(count):
+        assert provider.fetch_price({"price_feed_id": BTC_USD}) == "42123.45"
+    provider.close()
+    assert latest_requests() == 1
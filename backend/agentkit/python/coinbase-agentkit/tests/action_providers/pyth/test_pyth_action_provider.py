@@ -3,6 +3,7 @@ from unittest.mock import patch
 import pytest
 import requests
 
+from coinbase_agentkit.action_providers.pyth.constants import DEFAULT_TIMEOUT
 from coinbase_agentkit.action_providers.pyth.pyth_action_provider import pyth_action_provider
 
 MOCK_TOKEN_SYMBOL = "BTC"
@@ -21,7 +22,7 @@ def test_pyth_fetch_price_feed_id_success():
         ]
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = mock_response["data"]
         mock_get.return_value.raise_for_status.return_value = None
 
@@ -29,13 +30,15 @@ def test_pyth_fetch_price_feed_id_success():
 
         assert result == MOCK_PRICE_FEED_ID
         mock_get.assert_called_once_with(
-            "https://hermes.pyth.network/v2/price_feeds?query=BTC&asset_type=crypto"
+            "https://hermes.pyth.network/v2/price_feeds",
+            params={"asset_type": "crypto"},
+            timeout=DEFAULT_TIMEOUT,
         )
 
 
 def test_pyth_fetch_price_feed_id_empty_response():
     """Test pyth fetch price feed id error with empty response for ticker symbol."""
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = []
         mock_get.return_value.raise_for_status.return_value = None
 
@@ -45,7 +48,7 @@ def test_pyth_fetch_price_feed_id_empty_response():
 
 def test_pyth_fetch_price_feed_id_http_error():
     """Test pyth fetch price feed id error with HTTP error."""
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError(
             "404 Client Error: Not Found"
         )
@@ -64,12 +67,12 @@ def test_pyth_fetch_price_success():
                     "expo": -2,
                     "conf": "1234",
                 },
-                "id": "test_feed_id",
+                "id": MOCK_PRICE_FEED_ID,
             }
         ]
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = mock_response
         mock_get.return_value.raise_for_status.return_value = None
 
@@ -80,7 +83,7 @@ def test_pyth_fetch_price_success():
 
 def test_pyth_fetch_price_http_error():
     """Test pyth fetch price error with HTTP error."""
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError(
             "404 Client Error: Not Found"
         )
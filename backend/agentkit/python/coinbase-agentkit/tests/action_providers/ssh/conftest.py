@@ -5,6 +5,7 @@ from unittest import mock
 import paramiko
 import pytest
 
+from coinbase_agentkit.action_providers.ssh.auth_cache import clear_auth_caches
 from coinbase_agentkit.action_providers.ssh.connection import SSHConnection, SSHConnectionParams
 from coinbase_agentkit.action_providers.ssh.ssh_action_provider import SshActionProvider
 
@@ -16,6 +17,14 @@ MOCK_CONNECTION_PASSWORD = "test-pass"
 MOCK_CONNECTION_INFO = "Connection Info Mock"
 
 
+@pytest.fixture(autouse=True)
+def clear_ssh_auth_caches():
+    """Clear the shared key and host key caches around each test."""
+    clear_auth_caches()
+    yield
+    clear_auth_caches()
+
+
 @pytest.fixture
 def mock_ssh_client():
     """Create a mock SSH client with standard behaviors."""
@@ -0,0 +1,295 @@
+"""Tests for SSH key and host key caching.
+
+This module tests the shared authentication caches and the transparent
+re-establishment of dropped connections using cached key material.
+"""
+
+import io
+import os
+from unittest import mock
+
+import paramiko
+import pytest
+
+from coinbase_agentkit.action_providers.ssh.auth_cache import HostKeyCache, SSHKeyCache, key_cache
+from coinbase_agentkit.action_providers.ssh.connection import (
+    SSHConnection,
+    SSHConnectionError,
+    SSHConnectionParams,
+    UnknownHostKeyError,
+)
+
+MOCK_HOST = "example.com"
+MOCK_USERNAME = "testuser"
+SSH_CLIENT_CLASS = paramiko.SSHClient
+
+
+@pytest.fixture(scope="module")
+def rsa_key_string():
+    """Generate an RSA private key as a string."""
+    key_file = io.StringIO()
+    paramiko.RSAKey.generate(1024).write_private_key(key_file)
+    return key_file.getvalue()
+
+
+@pytest.fixture
+def key_connection(rsa_key_string):
+    """Create an SSH connection using private key authentication."""
+    params = SSHConnectionParams(
+        connection_id="test-conn",
+        host=MOCK_HOST,
+        username=MOCK_USERNAME,
+        private_key=rsa_key_string,
+    )
+    return SSHConnection(params)
+
+
+def _mock_client_class():
+    """Create a mock SSHClient class whose clients pass the connection test."""
+    mock_client_class = mock.Mock()
+
+    def make_client():
+        client = mock.Mock(spec=SSH_CLIENT_CLASS)
+        stdout = mock.Mock()
+        stdout.read.return_value = b"Connection successful"
+        stdout.channel.recv_exit_status.return_value = 0
+        stderr = mock.Mock()
+        stderr.read.return_value = b""
+        client.exec_command.return_value = (None, stdout, stderr)
+        return client
+
+    mock_client_class.side_effect = make_client
+    return mock_client_class
+
+
+def test_key_cache_parses_string_once():
+    """Test that a key string is only parsed once."""
+    cache = SSHKeyCache()
+    loader = mock.Mock(return_value=mock.Mock(spec=paramiko.PKey))
+
+    first = cache.get_from_string("KEY_CONTENT", None, loader)
+    second = cache.get_from_string("KEY_CONTENT", None, loader)
+
+    assert first is second
+    loader.assert_called_once()
+    assert len(cache) == 1
+
+
+def test_key_cache_separates_passwords():
+    """Test that the same key content with different passwords is cached separately."""
+    cache = SSHKeyCache()
+    loader = mock.Mock(side_effect=lambda: mock.Mock(spec=paramiko.PKey))
+
+    cache.get_from_string("KEY_CONTENT", "one", loader)
+    cache.get_from_string("KEY_CONTENT", "two", loader)
+
+    assert loader.call_count == 2
+
+
+def test_key_cache_does_not_cache_failures():
+    """Test that a failed parse is retried on the next request."""
+    cache = SSHKeyCache()
+    loader = mock.Mock(side_effect=[ValueError("bad key"), mock.Mock(spec=paramiko.PKey)])
+
+    with pytest.raises(ValueError):
+        cache.get_from_string("KEY_CONTENT", None, loader)
+    cache.get_from_string("KEY_CONTENT", None, loader)
+
+    assert loader.call_count == 2
+
+
+def test_key_cache_invalidates_changed_file(tmp_path):
+    """Test that a key file is parsed again after it changes."""
+    cache = SSHKeyCache()
+    key_path = tmp_path / "id_rsa"
+    key_path.write_text("first")
+    loader = mock.Mock(side_effect=lambda: mock.Mock(spec=paramiko.PKey))
+
+    cache.get_from_file(str(key_path), None, loader)
+    cache.get_from_file(str(key_path), None, loader)
+    assert loader.call_count == 1
+
+    key_path.write_text("second key")
+    stat = key_path.stat()
+    os.utime(key_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    cache.get_from_file(str(key_path), None, loader)
+    assert loader.call_count == 2
+
+
+def test_key_cache_skips_missing_file():
+    """Test that keys for files that cannot be stat'ed are never cached."""
+    cache = SSHKeyCache()
+    loader = mock.Mock(side_effect=lambda: mock.Mock(spec=paramiko.PKey))
+
+    cache.get_from_file("/nonexistent/id_rsa", None, loader)
+    cache.get_from_file("/nonexistent/id_rsa", None, loader)
+
+    assert loader.call_count == 2
+    assert len(cache) == 0
+
+
+def test_host_key_cache_reloads_changed_file(tmp_path):
+    """Test that a known_hosts file is re-read only after it changes."""
+    cache = HostKeyCache()
+    host_key = paramiko.RSAKey.generate(1024)
+    known_hosts = tmp_path / "known_hosts"
+    known_hosts.write_text(f"{MOCK_HOST} {host_key.get_name()} {host_key.get_base64()}\n")
+
+    first = cache.get(str(known_hosts))
+    assert cache.get(str(known_hosts)) is first
+    assert first.lookup(MOCK_HOST) is not None
+
+    with open(known_hosts, "a") as f:
+        f.write(f"other.com {host_key.get_name()} {host_key.get_base64()}\n")
+
+    reloaded = cache.get(str(known_hosts))
+    assert reloaded is not first
+    assert reloaded.lookup("other.com") is not None
+
+
+def test_host_key_cache_load_into_client(tmp_path):
+    """Test that cached host keys are added to an SSH client."""
+    cache = HostKeyCache()
+    host_key = paramiko.RSAKey.generate(1024)
+    known_hosts = tmp_path / "known_hosts"
+    known_hosts.write_text(f"{MOCK_HOST} {host_key.get_name()} {host_key.get_base64()}\n")
+    client = paramiko.SSHClient()
+
+    assert cache.load_into(client, str(known_hosts)) is True
+    assert client.get_host_keys().lookup(MOCK_HOST)[host_key.get_name()] == host_key
+    assert cache.load_into(client, str(tmp_path / "missing")) is False
+
+
+def test_host_key_cache_load_system_keys(tmp_path):
+    """Test that system host keys are kept apart, so they are never saved back."""
+    cache = HostKeyCache()
+    host_key = paramiko.RSAKey.generate(1024)
+    known_hosts = tmp_path / "known_hosts"
+    known_hosts.write_text(f"{MOCK_HOST} {host_key.get_name()} {host_key.get_base64()}\n")
+    client = paramiko.SSHClient()
+
+    assert cache.load_into(client, str(known_hosts), system=True) is True
+    assert client._system_host_keys.lookup(MOCK_HOST)[host_key.get_name()] == host_key
+    assert len(client.get_host_keys()) == 0
+
+    saved = tmp_path / "saved_hosts"
+    client.save_host_keys(str(saved))
+    assert saved.read_text() == ""
+
+
+def test_reconnect_reuses_parsed_key(key_connection):
+    """Test that connecting again does not re-parse the private key."""
+    with (
+        mock.patch("paramiko.SSHClient", _mock_client_class()),
+        mock.patch.object(
+            SSHConnection, "_parse_key_from_string", wraps=key_connection._parse_key_from_string
+        ) as mock_parse,
+    ):
+        key_connection.connect()
+        first_key = key_connection._auth_key
+        key_connection.reset_connection()
+        key_connection.reconnect()
+        key_connection.connect()
+
+        assert mock_parse.call_count == 1
+        assert key_connection._auth_key is first_key
+        assert key_connection.connected is True
+
+
+def test_execute_reconnects_dropped_connection(key_connection):
+    """Test that execute transparently re-establishes a dropped connection."""
+    with mock.patch("paramiko.SSHClient", _mock_client_class()):
+        key_connection.connect()
+        key_connection.reset_connection()
+
+        output = key_connection.execute("echo hello")
+
+        assert output == "Connection successful"
+        assert key_connection.connected is True
+
+
+def test_execute_does_not_reconnect_after_disconnect(key_connection):
+    """Test that an explicitly disconnected connection is not re-established."""
+    with mock.patch("paramiko.SSHClient", _mock_client_class()):
+        key_connection.connect()
+        key_connection.disconnect()
+
+        with pytest.raises(SSHConnectionError) as exc_info:
+            key_connection.execute("echo hello")
+
+        assert "No active SSH connection" in str(exc_info.value)
+
+
+def test_execute_reconnect_failure(key_connection):
+    """Test that a failed re-establishment surfaces as a missing connection."""
+    mock_client_class = _mock_client_class()
+    with mock.patch("paramiko.SSHClient", mock_client_class):
+        key_connection.connect()
+        key_connection.reset_connection()
+        mock_client_class.side_effect = None
+        mock_client_class.return_value.connect.side_effect = OSError("Connection refused")
+
+        with pytest.raises(SSHConnectionError) as exc_info:
+            key_connection.execute("echo hello")
+
+        assert "No active SSH connection" in str(exc_info.value)
+
+
+def test_execute_retries_reconnect_after_failure(key_connection):
+    """Test that a failed re-establishment does not stop later attempts."""
+    mock_client_class = _mock_client_class()
+    with mock.patch("paramiko.SSHClient", mock_client_class):
+        key_connection.connect()
+        key_connection.reset_connection()
+        mock_client_class.side_effect = None
+        mock_client_class.return_value.connect.side_effect = OSError("Network is unreachable")
+
+        with pytest.raises(SSHConnectionError):
+            key_connection.execute("echo hello")
+
+        mock_client_class.side_effect = _mock_client_class().side_effect
+        output = key_connection.execute("echo hello")
+
+        assert output == "Connection successful"
+        assert key_connection.connected is True
+
+
+def test_execute_reconnect_unknown_host_key(key_connection):
+    """Test that a changed host key is surfaced instead of a missing connection."""
+    mock_client_class = _mock_client_class()
+    with mock.patch("paramiko.SSHClient", mock_client_class):
+        key_connection.connect()
+        key_connection.reset_connection()
+        mock_client_class.side_effect = None
+        mock_client_class.return_value.connect.side_effect = UnknownHostKeyError(
+            "Host key verification failed for example.com"
+        )
+
+        with pytest.raises(UnknownHostKeyError) as exc_info:
+            key_connection.execute("echo hello")
+
+        assert "Host key verification failed" in str(exc_info.value)
+        assert key_connection.connected is False
+
+
+def test_repeated_reconnects_parse_key_once(key_connection):
+    """Test that only connects after the key cache is cleared parse the key again."""
+    iterations = 20
+    with (
+        mock.patch("paramiko.SSHClient", _mock_client_class()),
+        mock.patch.object(
+            SSHConnection, "_parse_key_from_string", wraps=key_connection._parse_key_from_string
+        ) as mock_parse,
+    ):
+        for _ in range(iterations):
+            key_cache.clear()
+            key_connection.connect()
+        assert mock_parse.call_count == iterations
+
+        mock_parse.reset_mock()
+        for _ in range(iterations):
+            key_connection.reset_connection()
+            key_connection.reconnect()
+        assert mock_parse.call_count == 0
+        assert key_connection.connected is True
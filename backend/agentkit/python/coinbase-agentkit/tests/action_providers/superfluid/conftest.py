@@ -0,0 +1,88 @@
+"""Shared fixtures for the Superfluid action provider tests."""
+
+import pytest
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.superfluid.batch import flow_batcher
+from coinbase_agentkit.action_providers.superfluid.constants import (
+    CFA_V1_ABI,
+    CFA_V1_TYPE,
+    SUPER_TOKEN_ABI,
+)
+from coinbase_agentkit.action_providers.superfluid.flow_state import flow_states
+
+HOST = "0x4C073B3baB6d8826b8C5b229f3cfdC1eC6E47E74"
+CFA = "0x19ba78B9cDB05A877718841c574325fdB53601bb"
+USDCX = "0xD04383398dD2426297da660F9CCA3d439AF9ce1b"
+DAIX = "0x708169c8C87563Ce904E0a7F3BFC1F3b0b767f41"
+WALLET = "0x5555555555555555555555555555555555555555"
+ALICE = "0x1111111111111111111111111111111111111111"
+BOB = "0x2222222222222222222222222222222222222222"
+MOCK_TX_HASH = "0xabcdef1234567890"
+
+
+class FakeSuperfluid:
+    """Super Tokens, a host and its flow agreement answering reads like the chain."""
+
+    def __init__(self, multicall3):
+        self.multicall3 = multicall3
+        self.hosts = {USDCX: HOST, DAIX: HOST}
+        self.symbols = {USDCX: "USDCx", DAIX: "DAIx"}
+        # available balance, deposit and net flow rate of each token of the wallet
+        self.balances = {
+            USDCX: (1_000 * 10**18, 5 * 10**18, -(10**13)),
+            DAIX: (50 * 10**18, 0, 2 * 10**12),
+        }
+        self.timestamp = 1_700_000_000
+
+        multicall3.block_number = 4321
+        multicall3.add_contract(CFA, CFA_V1_ABI, self.answer_agreement)
+        for token in self.symbols:
+            multicall3.add_contract(token, SUPER_TOKEN_ABI, self.answer_token)
+        multicall3.add_read("getHost", self.get_host)
+        multicall3.add_read("getAgreementClass", self.get_agreement_class)
+
+    def answer_agreement(self, address, function_name, args):
+        """Answer a call to the flow agreement."""
+        assert function_name == "getNetFlow"
+        assert args["account"] == WALLET
+        return (self.balances[args["token"]][2],)
+
+    def answer_token(self, address, function_name, args):
+        """Answer a call to a Super Token."""
+        if function_name == "realtimeBalanceOfNow":
+            assert args["account"] == WALLET
+            available, deposit, _ = self.balances[address]
+            return (available, deposit, 0, self.timestamp)
+        return {"symbol": (self.symbols[address],), "decimals": (18,)}[function_name]
+
+    def get_host(self, address, args):
+        """Read the host of a Super Token, which reverts for other contracts."""
+        address = Web3.to_checksum_address(address)
+        if address not in self.hosts:
+            raise Exception("execution reverted")
+        return self.hosts[address]
+
+    def get_agreement_class(self, address, args):
+        """Read the flow agreement of the host."""
+        assert Web3.to_checksum_address(address) == HOST
+        assert args == [Web3.keccak(text=CFA_V1_TYPE)]
+        return CFA.lower()
+
+    def wallet_provider(self):
+        """Create a wallet provider reading from the chain."""
+        wallet_provider = self.multicall3.wallet_provider()
+        wallet_provider.get_network.return_value.chain_id = "8453"
+        wallet_provider.get_address.return_value = WALLET
+        wallet_provider.send_transaction.return_value = MOCK_TX_HASH
+        return wallet_provider
+
+
+@pytest.fixture(autouse=True)
+def fresh_superfluid_caches():
+    """Forget hosts, agreements and flow states read by other tests."""
+    flow_batcher.clear()
+    flow_states.clear()
+    yield
+    flow_batcher.clear()
+    flow_states.clear()
@@ -0,0 +1,267 @@
+"""Tests for batching Superfluid flow operations into one transaction."""
+
+from unittest.mock import patch
+
+import pytest
+from eth_abi import decode
+from pydantic import ValidationError
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.superfluid.batch import flow_batcher
+from coinbase_agentkit.action_providers.superfluid.constants import (
+    CFA_V1_ABI,
+    HOST_ABI,
+    OPERATION_TYPE_SUPERFLUID_CALL_AGREEMENT,
+)
+from coinbase_agentkit.action_providers.superfluid.schemas import BatchFlowsSchema
+from coinbase_agentkit.action_providers.superfluid.superfluid_action_provider import (
+    superfluid_action_provider,
+)
+
+from .conftest import ALICE, BOB, CFA, DAIX, HOST, MOCK_TX_HASH, USDCX, WALLET, FakeSuperfluid
+
+_host_contract = Web3().eth.contract(abi=HOST_ABI)
+_cfa_contract = Web3().eth.contract(abi=CFA_V1_ABI)
+
+
+def _decode_batch(data: str) -> list[tuple]:
+    """Decode a batchCall into (operation type, target, CFA function, CFA args) tuples."""
+    function, args = _host_contract.decode_function_input(data)
+    assert function.fn_name == "batchCall"
+    decoded = []
+    for operation in args["operations"]:
+        call_data, user_data = decode(["bytes", "bytes"], operation["data"])
+        assert user_data == b""
+        cfa_function, cfa_args = _cfa_contract.decode_function_input(call_data)
+        decoded.append(
+            (operation["operationType"], operation["target"], cfa_function.fn_name, cfa_args)
+        )
+    return decoded
+
+
+def _batch_flows(wallet_provider, args):
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        return superfluid_action_provider().batch_flows(wallet_provider, args)
+
+
+def test_batch_flows_sends_one_transaction(multicall3):
+    """Test that create, update and delete operations are sent as one host batchCall."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+
+    result = _batch_flows(
+        wallet_provider,
+        {
+            "operations": [
+                {
+                    "operation": "create",
+                    "recipient": ALICE,
+                    "token_address": USDCX,
+                    "flow_rate": "385",
+                },
+                {
+                    "operation": "update",
+                    "recipient": BOB,
+                    "token_address": USDCX,
+                    "flow_rate": "1000",
+                },
+                {"operation": "delete", "recipient": ALICE, "token_address": DAIX.lower()},
+            ]
+        },
+    )
+
+    assert result.startswith(
+        "Batched 3 flow operations (1 create, 1 update, 1 delete) in one transaction. "
+        f"Transaction hash: {MOCK_TX_HASH}\nEstimated gas: ~"
+    )
+    wallet_provider.send_transaction.assert_called_once()
+    wallet_provider.wait_for_transaction_receipt.assert_called_once_with(MOCK_TX_HASH)
+    params = wallet_provider.send_transaction.call_args[0][0]
+    assert params["to"] == HOST
+    agreement_call = OPERATION_TYPE_SUPERFLUID_CALL_AGREEMENT
+    assert _decode_batch(params["data"]) == [
+        (
+            agreement_call,
+            CFA,
+            "createFlow",
+            {"token": USDCX, "receiver": ALICE, "flowRate": 385, "ctx": b""},
+        ),
+        (
+            agreement_call,
+            CFA,
+            "updateFlow",
+            {"token": USDCX, "receiver": BOB, "flowRate": 1000, "ctx": b""},
+        ),
+        (
+            agreement_call,
+            CFA,
+            "deleteFlow",
+            {"token": DAIX, "sender": WALLET, "receiver": ALICE, "ctx": b""},
+        ),
+    ]
+
+
+def test_hosts_and_agreement_read_once(multicall3):
+    """Test that the host of each token and the agreement are read once per chain."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+    operations = [
+        {"operation": "create", "recipient": ALICE, "token_address": USDCX, "flow_rate": "1"},
+        {"operation": "create", "recipient": BOB, "token_address": USDCX, "flow_rate": "1"},
+    ]
+
+    flow_batcher.build(wallet_provider, operations)
+    flow_batcher.build(wallet_provider, operations)
+
+    assert multicall3.reads == ["getHost", "getAgreementClass"]
+    assert flow_batcher.rpc_calls == 2
+
+
+def test_gas_estimate(multicall3):
+    """Test that one batch is estimated below the same operations as separate transactions."""
+    wallet_provider = FakeSuperfluid(multicall3).wallet_provider()
+    recipients = [Web3.to_checksum_address(f"0x{i:040x}") for i in range(1, 21)]
+
+    batch = flow_batcher.build(
+        wallet_provider,
+        [
+            {"operation": "create", "recipient": r, "token_address": USDCX, "flow_rate": "100"}
+            for r in recipients
+        ],
+    )
+
+    assert len(batch.operations) == 20
+    assert batch.estimated_gas > 20 * 200_000 + 21_000
+    assert batch.separate_estimated_gas - batch.estimated_gas >= 19 * 21_000
+
+
+def test_dry_run_does_not_send(multicall3):
+    """Test that a dry run validates and estimates without sending."""
+    wallet_provider = FakeSuperfluid(multicall3).wallet_provider()
+
+    result = _batch_flows(
+        wallet_provider,
+        {
+            "operations": [
+                {"operation": "delete", "recipient": ALICE, "token_address": USDCX},
+            ],
+            "dry_run": True,
+        },
+    )
+
+    assert result.startswith(
+        "Validated 1 flow operations (0 create, 0 update, 1 delete) "
+        f"for one batchCall to {HOST}.\nEstimated gas: ~"
+    )
+    wallet_provider.send_transaction.assert_not_called()
+
+
+def test_validation_lists_every_problem(multicall3):
+    """Test that invalid operations are reported together before anything is read or sent."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+
+    result = _batch_flows(
+        wallet_provider,
+        {
+            "operations": [
+                {"operation": "create", "recipient": ALICE, "token_address": USDCX},
+                {
+                    "operation": "update",
+                    "recipient": WALLET,
+                    "token_address": USDCX,
+                    "flow_rate": "1.5",
+                },
+                {
+                    "operation": "create",
+                    "recipient": "0xnotanaddress",
+                    "token_address": USDCX,
+                    "flow_rate": "1",
+                },
+                {
+                    "operation": "create",
+                    "recipient": BOB,
+                    "token_address": USDCX,
+                    "flow_rate": str(2**95),
+                },
+                {"operation": "delete", "recipient": ALICE, "token_address": USDCX.lower()},
+            ]
+        },
+    )
+
+    assert result.splitlines() == [
+        "Error: Invalid flow operations:",
+        "- operation 1: flow_rate is required",
+        "- operation 2: the recipient is the sender",
+        "- operation 2: flow_rate '1.5' must be a whole number of wei per second",
+        "- operation 3: recipient '0xnotanaddress' is not a valid address",
+        f"- operation 4: flow_rate {2**95} must be positive and fit in an int96",
+        "- operation 5: the flow is also changed by operation 1",
+    ]
+    assert multicall3.reads == []
+    wallet_provider.send_transaction.assert_not_called()
+
+
+def test_tokens_must_be_super_tokens_on_one_host(multicall3):
+    """Test that tokens without a host or on different hosts are refused."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+    other = "0x3333333333333333333333333333333333333333"
+
+    result = _batch_flows(
+        wallet_provider,
+        {"operations": [{"operation": "delete", "recipient": ALICE, "token_address": other}]},
+    )
+    assert result == (f"Error: {other} is not a Superfluid Super Token: execution reverted")
+
+    chain.hosts[other] = ALICE
+    result = _batch_flows(
+        wallet_provider,
+        {
+            "operations": [
+                {"operation": "delete", "recipient": ALICE, "token_address": USDCX},
+                {"operation": "delete", "recipient": ALICE, "token_address": other},
+            ]
+        },
+    )
+    assert result.startswith(
+        "Error: The tokens belong to different Superfluid hosts and cannot share a batch"
+    )
+    wallet_provider.send_transaction.assert_not_called()
+
+
+def test_batch_flows_transaction_error(multicall3):
+    """Test that a failed transaction is reported."""
+    wallet_provider = FakeSuperfluid(multicall3).wallet_provider()
+    wallet_provider.send_transaction.side_effect = Exception("insufficient funds")
+
+    result = _batch_flows(
+        wallet_provider,
+        {"operations": [{"operation": "delete", "recipient": ALICE, "token_address": USDCX}]},
+    )
+
+    assert result == "Error batching flows: insufficient funds"
+
+
+def test_batch_flows_schema(multicall3):
+    """Test that the schema parses operations and bounds their number."""
+    schema = BatchFlowsSchema(
+        operations=[
+            {"operation": "create", "recipient": ALICE, "token_address": USDCX, "flow_rate": "1"}
+        ]
+    )
+    assert schema.dry_run is False
+    assert flow_batcher.build(
+        FakeSuperfluid(multicall3).wallet_provider(), schema.operations
+    ).operations
+
+    with pytest.raises(ValidationError):
+        BatchFlowsSchema(operations=[])
+    with pytest.raises(ValidationError):
+        BatchFlowsSchema(
+            operations=[{"operation": "pause", "recipient": ALICE, "token_address": USDCX}]
+        )
+    with pytest.raises(ValidationError):
+        BatchFlowsSchema(
+            operations=[{"operation": "delete", "recipient": ALICE, "token_address": USDCX}] * 51
+        )
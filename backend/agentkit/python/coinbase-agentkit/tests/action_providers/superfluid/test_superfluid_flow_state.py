@@ -0,0 +1,134 @@
+"""Tests for reading Superfluid streams and projecting balances."""
+
+from unittest.mock import patch
+
+from coinbase_agentkit.action_providers.superfluid.flow_state import (
+    SuperfluidFlowStateReader,
+    TokenFlowState,
+    flow_states,
+)
+from coinbase_agentkit.action_providers.superfluid.superfluid_action_provider import (
+    superfluid_action_provider,
+)
+
+from .conftest import DAIX, USDCX, WALLET, FakeSuperfluid
+
+
+def _state(available_balance: int, net_flow_rate: int) -> TokenFlowState:
+    return TokenFlowState(
+        token=USDCX,
+        symbol="USDCx",
+        decimals=18,
+        available_balance=available_balance,
+        deposit=0,
+        owed_deposit=0,
+        net_flow_rate=net_flow_rate,
+        timestamp=1_000,
+    )
+
+
+def test_projection():
+    """Test the projected balance and the time until it runs out."""
+    outflow = _state(1_000, -3)
+    assert outflow.balance_at(1_100) == 700
+    assert outflow.seconds_until_zero() == 334
+    assert outflow.balance_at(1_334) < 0 <= outflow.balance_at(1_333)
+
+    assert _state(1_000, 5).balance_at(1_010) == 1_050
+    assert _state(1_000, 5).seconds_until_zero() is None
+    assert _state(1_000, 0).seconds_until_zero() is None
+    assert _state(-1, -3).seconds_until_zero() == 0
+
+
+def test_state_read_in_one_call_and_cached(multicall3):
+    """Test that a state takes one read, is reused for its max age and keeps token data."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+
+    state = flow_states.get(wallet_provider, WALLET.lower(), [USDCX, DAIX])
+    assert multicall3.reads == ["getHost", "getAgreementClass", "getHost", "aggregate3"]
+    assert state.block_number == 4321
+    assert [(t.symbol, t.available_balance, t.net_flow_rate) for t in state.tokens] == [
+        ("USDCx", 1_000 * 10**18, -(10**13)),
+        ("DAIx", 50 * 10**18, 2 * 10**12),
+    ]
+    assert state.tokens[0].deposit == 5 * 10**18
+
+    assert flow_states.get(wallet_provider, WALLET, [USDCX, DAIX]) is state
+    assert len(multicall3.reads) == 4
+
+    # A stale state is reloaded with one read, without the token data
+    multicall3.block_number = 4322
+    reloaded = flow_states.get(wallet_provider, WALLET, [USDCX, DAIX], max_age=0)
+    assert reloaded.block_number == 4322
+    assert multicall3.reads[4:] == ["aggregate3"]
+    assert (flow_states.metrics.hits, flow_states.metrics.misses) == (1, 2)
+    assert flow_states.metrics.rpc_calls == 2
+
+
+def test_separate_readers_share_token_resolution(multicall3):
+    """Test that a new reader still reuses the hosts and agreement of the batcher."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+    flow_states.get(wallet_provider, WALLET, [USDCX])
+    multicall3.reads.clear()
+
+    SuperfluidFlowStateReader().get(wallet_provider, WALLET, [USDCX])
+
+    assert multicall3.reads == ["aggregate3"]
+
+
+def test_get_flow_state(multicall3):
+    """Test that the streams are listed with balances, flow rates and runways."""
+    chain = FakeSuperfluid(multicall3)
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = superfluid_action_provider().get_flow_state(
+            chain.wallet_provider(), {"token_addresses": [USDCX, DAIX]}
+        )
+
+    assert result.splitlines() == [
+        f"Superfluid streams of {WALLET} at block 4321:",
+        f"- USDCx {USDCX}: available balance 1,000.000000 USDCx (deposit 5.000000 USDCx), "
+        "net flow -10000000000000 wei/s (-0.864000 USDCx/day), runs out in 1157d 9h 46m",
+        f"- DAIx {DAIX}: available balance 50.000000 DAIx (deposit 0.000000 DAIx), "
+        "net flow +2000000000000 wei/s (+0.172800 DAIx/day), not decreasing",
+    ]
+
+
+def test_project_flow_balance_without_polling(multicall3):
+    """Test that projections reuse the cached state."""
+    chain = FakeSuperfluid(multicall3)
+    wallet_provider = chain.wallet_provider()
+    provider = superfluid_action_provider()
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        provider.get_flow_state(wallet_provider, {"token_addresses": [USDCX, DAIX]})
+        reads = len(multicall3.reads)
+        result = provider.project_flow_balance(
+            wallet_provider, {"token_addresses": [USDCX, DAIX], "hours": 24.0}
+        )
+
+    assert len(multicall3.reads) == reads
+    assert result.splitlines() == [
+        f"Projected Superfluid balances of {WALLET} in 24h (flows read at block 4321):",
+        f"- USDCx {USDCX}: 1,000.000000 USDCx now, 999.136000 USDCx then, "
+        "runs out in 1157d 9h 46m",
+        f"- DAIx {DAIX}: 50.000000 DAIx now, 50.172800 DAIx then, not decreasing",
+    ]
+
+
+def test_flow_state_errors(multicall3):
+    """Test that a token that is not a Super Token is reported."""
+    other = "0x3333333333333333333333333333333333333333"
+    wallet_provider = FakeSuperfluid(multicall3).wallet_provider()
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        result = superfluid_action_provider().get_flow_state(
+            wallet_provider, {"token_addresses": [other]}
+        )
+
+    assert result == (
+        "Error reading Superfluid streams: "
+        f"{other} is not a Superfluid Super Token: execution reverted"
+    )
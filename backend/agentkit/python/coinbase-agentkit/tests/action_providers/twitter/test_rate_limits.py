@@ -0,0 +1,250 @@
+"""Tests for rate limit scheduling and incremental mention polling."""
+
+import json
+import threading
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from coinbase_agentkit.action_providers.twitter.rate_limiter import (
+    RateLimitExceededError,
+    RateLimitScheduler,
+    endpoint_key,
+)
+from coinbase_agentkit.action_providers.twitter.twitter_action_provider import (
+    twitter_action_provider,
+)
+
+MOCK_USER_ID = "1234"
+NOW = 1_700_000_000.0
+
+
+class _Clock:
+    """Fake clock advanced by sleeping."""
+
+    def __init__(self):
+        self.now = NOW
+        self.sleeps = []
+
+    def time(self):
+        """Get the current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _TwitterAdapter(BaseAdapter):
+    """Transport answering Twitter API requests from a list of canned responses."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        """Answer a request with the next canned response."""
+        self.requests.append(request)
+        status_code, headers, body = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers)
+        response._content = json.dumps(body).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        """Close the adapter."""
+
+
+def _headers(limit, remaining, reset):
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(int(reset)),
+    }
+
+
+@pytest.fixture
+def clock():
+    """Create a fake clock."""
+    return _Clock()
+
+
+@pytest.fixture
+def provider(mock_env, clock):
+    """Create a Twitter action provider with a fake clock."""
+    provider = twitter_action_provider()
+    provider.rate_limits.clock = clock.time
+    provider.rate_limits.sleep = clock.sleep
+    return provider
+
+
+def _mount(provider, responses):
+    adapter = _TwitterAdapter(responses)
+    provider.client.session.mount("https://api.twitter.com", adapter)
+    return adapter
+
+
+def test_endpoint_key():
+    """Test that numeric path segments are replaced, so users share one endpoint."""
+    assert endpoint_key("get", "https://api.twitter.com/2/users/1234/mentions?x=1") == (
+        "GET /2/users/:id/mentions"
+    )
+    assert endpoint_key("POST", "https://api.twitter.com/2/tweets") == "POST /2/tweets"
+
+
+def test_scheduler_waits_for_reset(clock):
+    """Test that an endpoint without quota waits until its window resets."""
+    scheduler = RateLimitScheduler(max_wait=60, clock=clock.time, sleep=clock.sleep)
+    scheduler.record("GET /2/users/me", _headers(75, 0, NOW + 30))
+
+    assert scheduler.wait_time("GET /2/users/me") == 30
+    assert scheduler.wait_time("GET /2/unknown") == 0
+
+    scheduler.acquire("GET /2/users/me")
+    assert clock.sleeps == [30]
+    assert scheduler.windows["GET /2/users/me"].remaining == 74
+
+
+def test_scheduler_fails_fast_beyond_max_wait(clock):
+    """Test that an exhausted endpoint resetting after max_wait raises with the reset time."""
+    scheduler = RateLimitScheduler(max_wait=60, clock=clock.time, sleep=clock.sleep)
+    scheduler.record("POST /2/tweets", _headers(100, 5, NOW + 900), status_code=429)
+
+    with pytest.raises(
+        RateLimitExceededError, match="exhausted, quota resets in 900 seconds"
+    ) as error:
+        scheduler.acquire("POST /2/tweets")
+
+    assert error.value.wait_time == 900
+    assert clock.sleeps == []
+
+
+def test_scheduler_paces_remaining_quota(clock):
+    """Test that paced endpoints spread the remaining quota over the window."""
+    scheduler = RateLimitScheduler(max_wait=60, clock=clock.time, sleep=clock.sleep)
+    scheduler.record("POST /2/tweets", _headers(100, 10, NOW + 100))
+
+    for _ in range(3):
+        scheduler.call("POST /2/tweets", lambda: None)
+
+    # 10 requests left for 100s: one now, the next after 100/9s, then after 88.9/8s
+    assert clock.sleeps == pytest.approx([100 / 9, (100 - 100 / 9) / 8])
+    assert scheduler.windows["POST /2/tweets"].remaining == 7
+
+
+def test_scheduler_caps_pacing_of_small_daily_limits(clock):
+    """Test that pacing a small daily quota waits at most max_wait and never refuses."""
+    scheduler = RateLimitScheduler(max_wait=60, clock=clock.time, sleep=clock.sleep)
+    scheduler.record("POST /2/tweets", _headers(17, 16, NOW + 24 * 3600))
+
+    for _ in range(16):
+        scheduler.call("POST /2/tweets", lambda: None)
+
+    # The even spread is about 5,400s per tweet, so every paced wait is capped
+    assert clock.sleeps == [60] * 15
+    assert scheduler.windows["POST /2/tweets"].remaining == 0
+
+    with pytest.raises(RateLimitExceededError, match="exhausted, quota resets in 85500 seconds"):
+        scheduler.acquire("POST /2/tweets")
+
+
+def test_scheduler_queues_concurrent_requests(clock):
+    """Test that concurrent requests to one endpoint run one at a time."""
+    scheduler = RateLimitScheduler(clock=clock.time, sleep=clock.sleep)
+    active = []
+    overlaps = []
+
+    def request():
+        active.append(1)
+        overlaps.append(len(active))
+        threading.Event().wait(0.01)
+        active.pop()
+
+    threads = [
+        threading.Thread(target=scheduler.call, args=("POST /2/tweets", request)) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == [1] * 5
+
+
+def test_response_headers_update_quota(provider, clock):
+    """Test that the quota is read from the headers of client responses."""
+    adapter = _mount(
+        provider,
+        [
+            (200, _headers(100, 42, NOW + 600), {"data": {"id": "1", "text": "hi"}}),
+            (
+                429,
+                _headers(100, 0, NOW + 300),
+                {"title": "Too Many Requests", "detail": "Too Many Requests"},
+            ),
+        ],
+    )
+
+    assert provider.post_tweet({"tweet": "hi"}).startswith("Successfully posted to Twitter")
+    assert provider.rate_limits.windows["POST /2/tweets"].remaining == 42
+
+    result = provider.post_tweet({"tweet": "hi again"})
+    assert result.startswith("Error posting to Twitter:\n429")
+
+    result = provider.post_tweet_reply({"tweet_reply": "hi", "tweet_id": "1"})
+    assert (
+        result
+        == "Error posting reply to Twitter:\nRate limit for POST /2/tweets exhausted, quota resets in 300 seconds"
+    )
+    assert len(adapter.requests) == 2
+
+    status = json.loads(provider.rate_limit_status({}).split("\n", 1)[1])
+    assert status == {
+        "POST /2/tweets": {"limit": 100, "remaining": 0, "reset_in": 300, "wait_time": 300.0}
+    }
+
+
+def test_account_mentions_polls_incrementally(provider):
+    """Test that mention polling passes the newest mention ID seen as since_id."""
+    adapter = _mount(
+        provider,
+        [
+            (
+                200,
+                _headers(180, 179, NOW + 900),
+                {
+                    "data": [{"id": "20", "text": "b"}, {"id": "10", "text": "a"}],
+                    "meta": {"newest_id": "20", "oldest_id": "10", "result_count": 2},
+                },
+            ),
+            (200, _headers(180, 178, NOW + 900), {"meta": {"result_count": 0}}),
+            (
+                200,
+                _headers(180, 177, NOW + 900),
+                {
+                    "data": [{"id": "30", "text": "c"}],
+                    "meta": {"newest_id": "30", "result_count": 1},
+                },
+            ),
+            (200, _headers(180, 176, NOW + 900), {"meta": {"result_count": 0}}),
+        ],
+    )
+
+    provider.account_mentions({"user_id": MOCK_USER_ID})
+    result = provider.account_mentions({"user_id": MOCK_USER_ID})
+    assert result.endswith('{"meta": {"result_count": 0}}')
+    provider.account_mentions({"user_id": MOCK_USER_ID})
+    provider.account_mentions({"user_id": MOCK_USER_ID, "new_only": False})
+
+    since_ids = [
+        requests.utils.urlparse(r.url).query.partition("since_id=")[2].split("&")[0]
+        for r in adapter.requests
+    ]
+    assert since_ids == ["", "20", "20", ""]
+    assert provider.mention_since_ids == {MOCK_USER_ID: "30"}
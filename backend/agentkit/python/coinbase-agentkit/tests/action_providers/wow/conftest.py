@@ -0,0 +1,11 @@
+"""Shared fixtures for the WOW action provider tests."""
+
+import pytest
+
+from coinbase_agentkit.action_providers.wow.constants import TOKEN_INDEX_DB_ENV
+
+
+@pytest.fixture(autouse=True)
+def memory_token_index(monkeypatch):
+    """Keep the token index of each provider in memory instead of the default file."""
+    monkeypatch.setenv(TOKEN_INDEX_DB_ENV, ":memory:")
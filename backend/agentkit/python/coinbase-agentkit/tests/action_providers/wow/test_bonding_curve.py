@@ -0,0 +1,157 @@
+"""Tests for offline bonding curve quotes of WOW tokens."""
+
+import os
+import random
+from decimal import Decimal, getcontext
+
+import pytest
+
+from coinbase_agentkit.action_providers.wow.bonding_curve import BondingCurve, exp_wad, ln_wad
+from coinbase_agentkit.action_providers.wow.constants import WOW_ABI
+from coinbase_agentkit.action_providers.wow.market_state import WowMarketStateCache
+
+getcontext().prec = 80
+
+CURVE = "0x264ece5D58A576cc775B719bf182F2946076bE78"
+A = 1060848709
+B = 4379701787
+E18 = 10**18
+
+
+def _reference_buy(supply: int, eth: int) -> Decimal:
+    """Tokens bought for an ETH amount with exact exponentials and logarithms."""
+    b = Decimal(B) / E18**2
+    exp_b_x1 = (b * supply).exp() + Decimal(eth) * B / A / E18
+    return exp_b_x1.ln() / b - supply
+
+
+def _reference_sell(supply: int, tokens: int) -> Decimal:
+    """ETH received for selling tokens with exact exponentials."""
+    b = Decimal(B) / E18**2
+    return ((b * supply).exp() - (b * (supply - tokens)).exp()) * E18 * A / B
+
+
+def test_fixed_point_math_matches_solady():
+    """Test expWad and lnWad against Solady's test vectors."""
+    assert exp_wad(-41446531673892822313) == 0
+    assert exp_wad(-41446531673892822312) == 1
+    assert exp_wad(-3 * E18) == 49787068367863942
+    assert exp_wad(-E18) == 367879441171442321
+    assert exp_wad(0) == E18
+    assert exp_wad(5 * E18 // 10) == 1648721270700128146
+    assert exp_wad(E18) == 2718281828459045235
+    assert exp_wad(10 * E18) == 22026465794806716516980
+    assert exp_wad(50 * E18) == 5184705528587072464148529318587763226117
+    with pytest.raises(ValueError, match="ExpOverflow"):
+        exp_wad(135305999368893231589)
+
+    assert ln_wad(E18) == 0
+    assert ln_wad(2718281828459045235) == 999999999999999999
+    assert ln_wad(11723640096265400935) == 2461607324344817918
+    assert ln_wad(1) == -41446531673892822313
+    assert ln_wad(2**255 - 1) == 135305999368893231589
+    with pytest.raises(ValueError, match="LnWadUndefined"):
+        ln_wad(0)
+
+
+def test_fixed_point_math_is_accurate():
+    """Test expWad and lnWad against high precision decimals."""
+    rng = random.Random(3)
+    for _ in range(500):
+        x = rng.randint(-10 * E18, 130 * E18)
+        expected = (Decimal(x) / E18).exp() * E18
+        assert abs(exp_wad(x) - expected) <= expected * Decimal("1e-17") + 1
+
+        y = rng.randint(1, 10 ** rng.randint(1, 70))
+        assert abs(ln_wad(y) - (Decimal(y) / E18).ln() * E18) <= 2
+
+
+def test_quotes_match_exact_curve():
+    """Test buy and sell quotes against the curve with exact math."""
+    curve = BondingCurve(address=CURVE, a=A, b=B)
+    rng = random.Random(5)
+    for _ in range(200):
+        supply = rng.randint(0, 800_000_000) * E18
+        eth = rng.randint(10**14, 5 * E18)
+        bought = curve.get_eth_buy_quote(supply, eth)
+        assert abs(bought - _reference_buy(supply, eth)) <= bought * Decimal("1e-15") + 10**9
+
+        tokens = rng.randint(1, supply) if supply else 0
+        received = curve.get_token_sell_quote(supply, tokens)
+        assert (
+            abs(received - _reference_sell(supply, tokens)) <= received * Decimal("1e-15") + 10**3
+        )
+
+
+def test_quote_properties():
+    """Test that quotes grow with the amount and round trips never profit."""
+    curve = BondingCurve(address=CURVE, a=A, b=B)
+    rng = random.Random(7)
+    for _ in range(100):
+        supply = rng.randint(1, 700_000_000) * E18
+        amounts = sorted(rng.randint(10**14, 2 * E18) for _ in range(5))
+
+        bought = curve.get_eth_buy_quotes(supply, amounts)
+        assert bought == sorted(bought)
+        assert bought == [curve.get_eth_buy_quote(supply, eth) for eth in amounts]
+
+        for eth, tokens in zip(amounts, bought, strict=True):
+            assert curve.get_token_sell_quote(supply + tokens, tokens) <= eth
+            assert curve.get_token_buy_quote(supply, tokens) <= eth
+            assert curve.get_eth_sell_quote(supply + tokens, eth) >= tokens - 10**10
+
+        sold = curve.get_token_sell_quotes(supply, [supply // 10, supply // 2, supply])
+        assert sold == sorted(sold)
+
+
+def test_sell_more_than_supply():
+    """Test that selling more than the supply is rejected like the contract."""
+    curve = BondingCurve(address=CURVE, a=A, b=B)
+
+    with pytest.raises(ValueError, match="INSUFFICIENT_SUPPLY"):
+        curve.get_token_sell_quotes(E18, [1, 2 * E18])
+
+
+@pytest.mark.e2e
+def test_quotes_match_contract_on_fork():
+    """Test local quotes against the token contract on a Base mainnet fork.
+
+    Requires an anvil fork of Base mainnet at ANVIL_RPC_URL, and the address of a
+    WOW token still on its bonding curve in WOW_BONDING_CURVE_TOKEN.
+    """
+    rpc_url = os.environ.get("ANVIL_RPC_URL")
+    token = os.environ.get("WOW_BONDING_CURVE_TOKEN")
+    if not rpc_url or not token:
+        pytest.skip("ANVIL_RPC_URL and WOW_BONDING_CURVE_TOKEN are not set")
+
+    from eth_account import Account
+
+    from coinbase_agentkit.wallet_providers.eth_account_wallet_provider import (
+        EthAccountWalletProvider,
+        EthAccountWalletProviderConfig,
+    )
+
+    wallet_provider = EthAccountWalletProvider(
+        EthAccountWalletProviderConfig(account=Account.create(), chain_id="8453", rpc_url=rpc_url)
+    )
+    state = WowMarketStateCache().get(wallet_provider, token)
+    rng = random.Random(11)
+    buy_amounts = [rng.randint(10**12, 5 * E18) for _ in range(20)]
+    sell_amounts = [rng.randint(1, state.total_supply) for _ in range(20)]
+
+    for amount, quote in zip(buy_amounts, state.buy_quotes(buy_amounts), strict=True):
+        assert quote == wallet_provider.read_contract(
+            contract_address=token,
+            abi=WOW_ABI,
+            function_name="getEthBuyQuote",
+            args=[amount],
+            block_identifier=state.block_number,
+        )
+    for amount, quote in zip(sell_amounts, state.sell_quotes(sell_amounts), strict=True):
+        assert quote == wallet_provider.read_contract(
+            contract_address=token,
+            abi=WOW_ABI,
+            function_name="getTokenSellQuote",
+            args=[amount],
+            block_identifier=state.block_number,
+        )
@@ -0,0 +1,183 @@
+"""Tests for the cached market state of WOW tokens."""
+
+import math
+from unittest.mock import patch
+
+import pytest
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.wow.bonding_curve import BondingCurve
+from coinbase_agentkit.action_providers.wow.constants import BONDING_CURVE_ABI, WOW_ABI
+from coinbase_agentkit.action_providers.wow.market_state import market_states
+from coinbase_agentkit.action_providers.wow.utils import (
+    get_buy_quote,
+    get_buy_quotes,
+    get_has_graduated,
+    get_sell_quote,
+    get_sell_quotes,
+)
+from coinbase_agentkit.action_providers.wow.wow_action_provider import WowActionProvider
+
+TOKEN = "0x1234567890123456789012345678901234567890"
+OTHER_TOKEN = "0x2234567890123456789012345678901234567890"
+POOL = Web3.to_checksum_address("0x00000000000000000000000000000000000000aa")
+CURVE = "0x264ece5D58A576cc775B719bf182F2946076bE78"
+WALLET = "0x9876543210987654321098765432109876543210"
+A = 1060848709
+B = 4379701787
+E18 = 10**18
+
+
+class _FakeChain:
+    """WOW tokens on their bonding curve, answering reads like the chain."""
+
+    def __init__(self, multicall3, total_supply: int):
+        self.multicall3 = multicall3
+        self.curve = BondingCurve(address=CURVE, a=A, b=B)
+        self.total_supply = total_supply
+        self.market_type = 0
+        self.token_reads = []
+        multicall3.add_contract(
+            CURVE, BONDING_CURVE_ABI, lambda _, name, __: ({"A": A, "B": B}[name],)
+        )
+        for token in (TOKEN, OTHER_TOKEN):
+            multicall3.add_contract(token, WOW_ABI, self.answer)
+        multicall3.add_read(
+            "getEthBuyQuote",
+            lambda _, args: self.curve.get_eth_buy_quote(self.total_supply, args[0]),
+        )
+        multicall3.add_read(
+            "getTokenSellQuote",
+            lambda _, args: self.curve.get_token_sell_quote(self.total_supply, args[0]),
+        )
+
+    def answer(self, address, function_name, args):
+        """Answer a call to a token."""
+        self.token_reads.append(function_name)
+        return {
+            "marketType": (self.market_type,),
+            "totalSupply": (self.total_supply,),
+            "poolAddress": (POOL,),
+            "bondingCurve": (CURVE,),
+        }[function_name]
+
+    def wallet_provider(self):
+        """Create a wallet provider reading from the chain."""
+        wallet_provider = self.multicall3.wallet_provider()
+        wallet_provider.get_network.return_value.chain_id = 84532
+        wallet_provider.get_address.return_value = WALLET
+        wallet_provider.wait_for_transaction_receipt.return_value = {"status": 1}
+        return wallet_provider
+
+
+@pytest.fixture(autouse=True)
+def fresh_market_states():
+    """Forget market states loaded by other tests."""
+    market_states.clear()
+    yield
+    market_states.clear()
+
+
+def test_state_loaded_once_per_block(multicall3):
+    """Test that the state is read once per block and permanent facts only once."""
+    chain = _FakeChain(multicall3, total_supply=100_000_000 * E18)
+    wallet_provider = chain.wallet_provider()
+
+    state = market_states.get(wallet_provider, TOKEN)
+    assert (state.curve, state.total_supply, state.pool_address, state.has_graduated) == (
+        chain.curve,
+        chain.total_supply,
+        POOL,
+        False,
+    )
+    assert multicall3.reads == ["aggregate3", "aggregate3"]
+
+    assert market_states.get(wallet_provider, TOKEN) is state
+    assert len(multicall3.reads) == 2
+
+    chain.total_supply += E18
+    chain.token_reads.clear()
+    assert market_states.get(wallet_provider, TOKEN, max_age=0).total_supply == chain.total_supply
+    assert len(multicall3.reads) == 3
+    assert chain.token_reads == ["marketType", "totalSupply"]
+
+    # The curve is shared, so another token costs a single call
+    market_states.get(wallet_provider, OTHER_TOKEN)
+    assert len(multicall3.reads) == 4
+
+    metrics = market_states.metrics
+    assert (metrics.hits, metrics.misses, metrics.rpc_calls) == (1, 3, 4)
+    assert metrics.hit_rate == 0.25
+
+
+def test_graduation_is_permanent(multicall3):
+    """Test that a graduated token is never reloaded."""
+    chain = _FakeChain(multicall3, total_supply=10**9 * E18)
+    wallet_provider = chain.wallet_provider()
+
+    assert not get_has_graduated(wallet_provider, TOKEN)
+
+    chain.market_type = 1
+    state = market_states.get(wallet_provider, TOKEN, max_age=0)
+    assert state.has_graduated
+    assert state.curve is None
+    reads = len(multicall3.reads)
+
+    assert get_has_graduated(wallet_provider, TOKEN)
+    assert market_states.get(wallet_provider, TOKEN, max_age=0) is state
+    assert len(multicall3.reads) == reads
+
+    with pytest.raises(ValueError, match="has graduated"):
+        state.buy_quotes([E18])
+
+
+def test_quotes_match_contract_quotes(multicall3):
+    """Test that buy and sell quotes equal the token contract quotes."""
+    chain = _FakeChain(multicall3, total_supply=250_000_000 * E18)
+    wallet_provider = chain.wallet_provider()
+
+    bought = get_buy_quote(wallet_provider, TOKEN, str(E18))
+    sold = get_sell_quote(wallet_provider, TOKEN, str(10**6 * E18))
+
+    assert multicall3.reads == ["aggregate3", "aggregate3"]
+    assert bought == wallet_provider.read_contract(TOKEN, WOW_ABI, "getEthBuyQuote", [E18])
+    assert sold == wallet_provider.read_contract(TOKEN, WOW_ABI, "getTokenSellQuote", [10**6 * E18])
+
+
+def test_buy_token_reads_market_state_once(multicall3):
+    """Test that a buy reads the market state once for its quote and market type."""
+    chain = _FakeChain(multicall3, total_supply=200_000_000 * E18)
+    wallet_provider = chain.wallet_provider()
+    provider = WowActionProvider()
+    market_states.get(wallet_provider, TOKEN)
+    reads = len(multicall3.reads)
+
+    with patch("web3.eth.Eth.contract") as mock_contract:
+        mock_contract.return_value.encode_abi.return_value = "0xencoded"
+        response = provider.buy_token(
+            wallet_provider, {"contract_address": TOKEN, "amount_eth_in_wei": str(E18)}
+        )
+
+    assert "Purchased WoW ERC20 memecoin" in response
+    assert len(multicall3.reads) == reads
+    quote = chain.curve.get_eth_buy_quote(chain.total_supply, E18)
+    assert mock_contract.return_value.encode_abi.call_args.args[1][4:6] == [
+        0,
+        math.floor(float(quote) * 0.99),
+    ]
+    assert provider.market_states.metrics.hits == 2
+
+
+def test_quote_table_in_two_reads(multicall3):
+    """Test that a price impact table takes two reads instead of one read per quote."""
+    chain = _FakeChain(multicall3, total_supply=300_000_000 * E18)
+    wallet_provider = chain.wallet_provider()
+    buy_amounts = [10**15 * (i + 1) for i in range(200)]
+    sell_amounts = [10**23 * (i + 1) for i in range(200)]
+
+    bought = get_buy_quotes(wallet_provider, TOKEN, buy_amounts)
+    sold = get_sell_quotes(wallet_provider, TOKEN, sell_amounts)
+
+    assert multicall3.reads == ["aggregate3", "aggregate3"]
+    assert bought == chain.curve.get_eth_buy_quotes(chain.total_supply, buy_amounts)
+    assert sold == chain.curve.get_token_sell_quotes(chain.total_supply, sell_amounts)
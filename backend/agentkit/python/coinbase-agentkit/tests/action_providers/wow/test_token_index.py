@@ -0,0 +1,448 @@
+"""Tests for the WOW token index and the token discovery actions."""
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.wow.constants import (
+    TOKEN_INDEX_DB_ENV,
+    TOKEN_INDEX_DEFAULT_PATH,
+    TOKEN_INDEX_INITIAL_BLOCKS,
+)
+from coinbase_agentkit.action_providers.wow.token_index import (
+    TOKEN_CREATED_DATA_TYPES,
+    TOKEN_CREATED_TOPIC,
+    WowTokenIndex,
+    WowTokenIndexer,
+    decode_token_created,
+)
+from coinbase_agentkit.action_providers.wow.wow_action_provider import WowActionProvider
+
+CHAIN_ID = 84532
+FACTORY = "0x04870e22fa217Cb16aa00501D7D5253B8838C1eA"
+OTHER_FACTORY = "0x00000000000000000000000000000000000000F1"
+CURVE = "0x264ece5D58A576cc775B719bf182F2946076bE78"
+CREATOR = "0x9876543210987654321098765432109876543210"
+ZERO = "0x0000000000000000000000000000000000000000"
+
+
+def _topic(address: str) -> HexBytes:
+    return HexBytes(bytes(12) + bytes.fromhex(address[2:]))
+
+
+def _token_created_log(
+    n: int, block: int, name: str, symbol: str, factory: str = FACTORY, emitter: str | None = None
+) -> dict:
+    """Build the WowTokenCreated log of the nth synthetic token."""
+    token = Web3.to_checksum_address(f"0x{n + 1:040x}")
+    pool = Web3.to_checksum_address(f"0x{n + 1:039x}f")
+    return {
+        "address": emitter or token,
+        "topics": [HexBytes(TOKEN_CREATED_TOPIC), _topic(factory), _topic(CREATOR)],
+        "data": HexBytes(
+            encode(
+                TOKEN_CREATED_DATA_TYPES,
+                [ZERO, ZERO, CURVE, f"ipfs://{n}", name, symbol, token, pool],
+            )
+        ),
+        "blockNumber": block,
+        "logIndex": n % 3,
+    }
+
+
+class _FakeEth:
+    """Node answering eth_getLogs, refusing ranges longer than max_range blocks.
+
+    Code is only served from history_from onwards, like a node without archive state.
+    """
+
+    def __init__(self, logs, block_number, max_range=None, deploy_block=0):
+        self.logs = logs
+        self.block_number = block_number
+        self.max_range = max_range
+        self.deploy_block = deploy_block
+        self.history_from = 0
+        self.fail_from = None
+        self.requests = []
+        self.code_requests = 0
+        self._lock = threading.Lock()
+
+    def get_logs(self, params):
+        from_block, to_block = params["fromBlock"], params["toBlock"]
+        with self._lock:
+            self.requests.append((from_block, to_block))
+        if self.max_range and to_block - from_block + 1 > self.max_range:
+            raise ValueError("query returned more than 10000 results")
+        if self.fail_from is not None and to_block >= self.fail_from:
+            raise ConnectionError("node unavailable")
+
+        topic0, factories = params["topics"]
+        return [
+            log
+            for log in self.logs
+            if from_block <= log["blockNumber"] <= to_block
+            and log["topics"][0].to_0x_hex() == topic0
+            and log["topics"][1].to_0x_hex() in factories
+        ]
+
+    def get_code(self, address, block_identifier):
+        self.code_requests += 1
+        if block_identifier < self.history_from:
+            raise ValueError("missing trie node")
+        return b"\x60\x80" if block_identifier >= self.deploy_block else b""
+
+
+def _web3(eth: _FakeEth):
+    web3 = MagicMock()
+    web3.eth = eth
+    return web3
+
+
+SYNTHETIC_LOGS = [
+    _token_created_log(0, 120, "Doge Wow", "DOGEW"),
+    _token_created_log(1, 4_500, "Based Doge", "BDOGE"),
+    _token_created_log(2, 9_001, "Pepe", "PEPE"),
+    _token_created_log(3, 9_001, "Doge", "DOGE"),
+    _token_created_log(4, 15_000, "100%_Real", "REAL", factory=OTHER_FACTORY),
+    _token_created_log(5, 16_000, "Fake Doge", "DOGE", emitter=CREATOR),
+    _token_created_log(6, 19_999, "Cat", "CAT", factory=CREATOR),
+]
+
+
+def _indexer(eth: _FakeEth, index: WowTokenIndex | None = None, **kwargs) -> WowTokenIndexer:
+    return WowTokenIndexer(
+        _web3(eth),
+        index or WowTokenIndex(),
+        CHAIN_ID,
+        [FACTORY, OTHER_FACTORY],
+        **{"start_block": 0, "chunk_size": 2_000, "max_workers": 4, **kwargs},
+    )
+
+
+def test_decode_token_created_rejects_spoofed_logs():
+    """Test that a log is only trusted when emitted by the token it announces."""
+    token = decode_token_created(SYNTHETIC_LOGS[0])
+
+    assert (token.name, token.symbol, token.creator, token.factory, token.block_number) == (
+        "Doge Wow",
+        "DOGEW",
+        CREATOR,
+        FACTORY,
+        120,
+    )
+    assert token.bonding_curve == CURVE
+    assert decode_token_created(SYNTHETIC_LOGS[5]) is None
+
+
+def test_sync_scans_chunks_and_skips_other_factories():
+    """Test that a sync finds the tokens of the factories in every chunk."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    indexer = _indexer(eth)
+
+    assert indexer.sync() == 5
+    assert indexer.index.count(CHAIN_ID) == 5
+    assert indexer.index.get_next_block(CHAIN_ID) == 20_001
+    assert len(eth.requests) == 11
+    assert sorted(eth.requests)[0] == (0, 1_999)
+    assert sorted(eth.requests)[-1] == (20_000, 20_000)
+
+
+def test_sync_splits_refused_ranges():
+    """Test that ranges the node refuses are split and later chunks are smaller."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000, max_range=600)
+    indexer = _indexer(eth, max_workers=1)
+
+    assert indexer.sync() == 5
+    assert indexer.requests == len(eth.requests)
+    assert eth.requests[:4] == [(0, 1_999), (0, 999), (0, 499), (500, 999)]
+    # Chunks stay near the largest accepted size, so few requests are refused
+    refused = [(start, end) for start, end in eth.requests if end - start + 1 > 600]
+    assert len(refused) < len(eth.requests) / 3
+    assert indexer.chunk_size <= 1_000
+
+
+def test_sync_resumes_after_last_completed_round():
+    """Test that an interrupted sync keeps its progress and resumes without duplicates."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    index = WowTokenIndex()
+    indexer = _indexer(eth, index, max_workers=2)
+    eth.fail_from = 10_000
+
+    with pytest.raises(ConnectionError):
+        indexer.sync()
+    assert index.get_next_block(CHAIN_ID) == 8_000
+    assert index.count(CHAIN_ID) == 2
+
+    eth.fail_from = None
+    eth.requests.clear()
+    assert indexer.sync() == 3
+    assert min(start for start, _ in eth.requests) == 8_000
+
+    eth.block_number = 21_000
+    eth.requests.clear()
+    assert indexer.sync() == 0
+    assert eth.requests == [(20_001, 21_000)]
+
+
+def test_sync_only_splits_range_errors():
+    """Test that errors other than range limits are raised without splitting the range."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    eth.fail_from = 0
+    indexer = _indexer(eth, max_workers=1)
+
+    with pytest.raises(ConnectionError):
+        indexer.sync()
+    assert eth.requests == [(0, 1_999)]
+    assert indexer.chunk_size == 2_000
+
+
+def test_find_start_block():
+    """Test that the first scan starts at the factory deployment."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000, deploy_block=4_321)
+    indexer = _indexer(eth, start_block=None, chunk_size=100_000)
+
+    assert indexer.find_start_block(20_000) == 4_321
+    assert eth.code_requests < 2 * 2 * 16
+
+    indexer.sync()
+    assert eth.requests[0][0] == 4_321
+    assert [t.symbol for t in indexer.index.recent(CHAIN_ID)] == ["REAL", "PEPE", "DOGE", "BDOGE"]
+
+
+def test_sync_limits_first_scan():
+    """Test that the first scan can be limited to the latest blocks, making a partial index."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    indexer = _indexer(eth, start_block=None, max_initial_blocks=12_000)
+
+    assert indexer.sync() == 3
+    assert min(start for start, _ in eth.requests) == 8_001
+    assert eth.code_requests == 0
+    assert indexer.index.get_first_block(CHAIN_ID) == 8_001
+
+    eth.block_number = 21_000
+    indexer.sync()
+    assert indexer.index.get_first_block(CHAIN_ID) == 8_001
+
+    # A limit covering the whole chain makes a complete index
+    indexer = _indexer(eth, start_block=None, max_initial_blocks=30_000)
+    assert indexer.sync() == 5
+    assert indexer.index.get_first_block(CHAIN_ID) is None
+
+
+def test_find_start_block_errors():
+    """Test that a missing factory or state history is reported instead of scanning from 0."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000, deploy_block=30_000)
+    indexer = _indexer(eth, start_block=None)
+    with pytest.raises(ValueError, match=f"No WOW factory is deployed on chain {CHAIN_ID}"):
+        indexer.sync()
+
+    eth.deploy_block = 4_321
+    eth.history_from = 19_000
+    with pytest.raises(ValueError, match="the RPC node has no state history"):
+        indexer.sync()
+    assert eth.requests == []
+    assert indexer.index.get_next_block(CHAIN_ID) is None
+
+
+def test_search_ranks_exact_matches_first(tmp_path):
+    """Test search ranking, escaping and persistence across reopening."""
+    path = str(tmp_path / "tokens.db")
+    _indexer(_FakeEth(SYNTHETIC_LOGS, block_number=20_000), WowTokenIndex(path)).sync()
+
+    index = WowTokenIndex(path)
+    assert index.path == path
+    assert [t.symbol for t in index.search(CHAIN_ID, "doge")] == ["DOGE", "DOGEW", "BDOGE"]
+    assert [t.symbol for t in index.search(CHAIN_ID, "DOGE", limit=1)] == ["DOGE"]
+    assert [t.symbol for t in index.search(CHAIN_ID, "0%_")] == ["REAL"]
+    assert [t.symbol for t in index.search(CHAIN_ID, "0_")] == []
+    address = index.search(CHAIN_ID, "pepe")[0].address
+    assert [t.symbol for t in index.search(CHAIN_ID, address.lower())] == ["PEPE"]
+    assert index.search(CHAIN_ID + 1, "doge") == []
+    index.close()
+
+
+def test_provider_persists_index_by_default(tmp_path, monkeypatch):
+    """Test that the index is kept in a file under the home directory by default.
+
+    The file is only created when the index is first used, not with the provider.
+    """
+    monkeypatch.delenv(TOKEN_INDEX_DB_ENV)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    provider = WowActionProvider()
+    assert os.listdir(tmp_path) == []
+
+    index = provider.get_token_index()
+    assert index.path == os.path.expanduser(TOKEN_INDEX_DEFAULT_PATH)
+    assert index.path.startswith(str(tmp_path))
+    assert os.path.isfile(index.path)
+    assert provider.get_token_index() is index
+    index.close()
+
+
+@pytest.fixture
+def provider_with_chain():
+    """Create a WOW provider whose token indexer reads a fake node."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    provider = WowActionProvider()
+    provider._indexers[CHAIN_ID] = WowTokenIndexer(
+        _web3(eth), provider.get_token_index(), CHAIN_ID, [FACTORY, OTHER_FACTORY], start_block=0
+    )
+    wallet_provider = MagicMock()
+    wallet_provider.get_network.return_value.chain_id = str(CHAIN_ID)
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        yield provider, wallet_provider, eth
+
+
+def test_search_and_list_actions(provider_with_chain):
+    """Test that the actions sync once and then answer from the index."""
+    provider, wallet_provider, eth = provider_with_chain
+
+    response = provider.search_wow_tokens(wallet_provider, {"query": "doge", "limit": 2})
+    assert response.splitlines() == [
+        "WOW tokens matching 'doge':",
+        f"- Doge (DOGE): {Web3.to_checksum_address(f'0x{4:040x}')}, created by {CREATOR} "
+        "at block 9001",
+        f"- Doge Wow (DOGEW): {Web3.to_checksum_address(f'0x{1:040x}')}, created by {CREATOR} "
+        "at block 120",
+    ]
+    requests = len(eth.requests)
+
+    response = provider.list_recent_wow_tokens(wallet_provider, {"limit": 1})
+    assert response.splitlines()[0] == "Most recently created WOW tokens:"
+    assert "100%_Real (REAL)" in response
+    assert len(eth.requests) == requests
+
+    assert provider.search_wow_tokens(wallet_provider, {"query": "shib"}) == (
+        "No WOW tokens found matching 'shib'."
+    )
+
+
+def test_actions_use_stale_index_when_scan_fails(provider_with_chain):
+    """Test that a failed scan falls back to the stored tokens with a note."""
+    provider, wallet_provider, eth = provider_with_chain
+    provider.list_recent_wow_tokens(wallet_provider, {})
+    provider.token_index_sync_interval = 0
+    eth.block_number = 30_000
+    eth.fail_from = 25_000
+
+    response = provider.search_wow_tokens(wallet_provider, {"query": "pepe"})
+
+    assert response.startswith("Note: Scanning for new tokens failed (node unavailable)")
+    assert "- Pepe (PEPE)" in response
+
+
+def test_actions_note_partial_index():
+    """Test that the provider limits the first scan unless given a start block, and says so."""
+    wallet_provider = MagicMock()
+    wallet_provider.get_network.return_value.chain_id = str(CHAIN_ID)
+    indexer = WowActionProvider().get_token_indexer(wallet_provider)
+    assert (indexer.start_block, indexer.max_initial_blocks) == (
+        None,
+        TOKEN_INDEX_INITIAL_BLOCKS,
+    )
+    assert WowActionProvider(start_block=4_321).get_token_indexer(wallet_provider).start_block == (
+        4_321
+    )
+
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    provider = WowActionProvider()
+    provider._indexers[CHAIN_ID] = WowTokenIndexer(
+        _web3(eth), provider.get_token_index(), CHAIN_ID, [FACTORY], max_initial_blocks=12_000
+    )
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        response = provider.list_recent_wow_tokens(wallet_provider, {})
+
+    assert response.splitlines()[:3] == [
+        "Note: Only tokens created since block 8001 are indexed.",
+        "",
+        "Most recently created WOW tokens:",
+    ]
+
+
+def test_actions_report_errors_before_first_sync():
+    """Test that a scan failure without stored tokens is reported."""
+    eth = _FakeEth(SYNTHETIC_LOGS, block_number=20_000)
+    eth.fail_from = 0
+    provider = WowActionProvider()
+    provider._indexers[CHAIN_ID] = WowTokenIndexer(
+        _web3(eth), provider.get_token_index(), CHAIN_ID, [FACTORY], start_block=0
+    )
+    wallet_provider = MagicMock()
+    wallet_provider.get_network.return_value.chain_id = CHAIN_ID
+
+    with patch("coinbase_agentkit.action_providers.action_decorator.send_analytics_event"):
+        response = provider.list_recent_wow_tokens(wallet_provider, {})
+
+    assert response == "Error listing Zora Wow ERC20 memecoins: node unavailable"
+
+
+def _synthetic_deployment_code(name: str, symbol: str, factory: str) -> str:
+    """Build init code that emits WowTokenCreated for the contract being created."""
+    template = encode(
+        TOKEN_CREATED_DATA_TYPES, [ZERO, ZERO, CURVE, "ipfs://e2e", name, symbol, ZERO, ZERO]
+    )
+
+    def assemble(code_length: int) -> bytes:
+        return (
+            b"\x61"
+            + len(template).to_bytes(2, "big")  # PUSH2 size
+            + b"\x61"
+            + code_length.to_bytes(2, "big")  # PUSH2 offset of the template
+            + b"\x60\x00\x39"  # PUSH1 0, CODECOPY
+            + b"\x30\x61"
+            + (6 * 32).to_bytes(2, "big")  # ADDRESS, PUSH2 offset of tokenAddress
+            + b"\x52"  # MSTORE
+            + b"\x7f"
+            + bytes(_topic(CREATOR))  # PUSH32 topic2
+            + b"\x7f"
+            + bytes(_topic(factory))  # PUSH32 topic1
+            + b"\x7f"
+            + bytes(HexBytes(TOKEN_CREATED_TOPIC))  # PUSH32 topic0
+            + b"\x61"
+            + len(template).to_bytes(2, "big")  # PUSH2 size
+            + b"\x60\x00\xa3\x00"  # PUSH1 0, LOG3, STOP
+        )
+
+    code = assemble(len(assemble(0)))
+    return "0x" + (code + template).hex()
+
+
+@pytest.mark.e2e
+def test_index_synthetic_deployments_on_anvil():
+    """Test indexing tokens deployed on anvil with synthetic creation events.
+
+    Requires an anvil node at ANVIL_RPC_URL with its default unlocked accounts.
+    """
+    rpc_url = os.environ.get("ANVIL_RPC_URL")
+    if not rpc_url:
+        pytest.skip("ANVIL_RPC_URL is not set")
+
+    web3 = Web3(Web3.HTTPProvider(rpc_url))
+    start_block = web3.eth.block_number + 1
+    deployed = []
+    for i in range(5):
+        tx_hash = web3.eth.send_transaction(
+            {
+                "from": web3.eth.accounts[0],
+                "data": _synthetic_deployment_code(f"E2E Token {i}", f"E2E{i}", FACTORY),
+            }
+        )
+        deployed.append(web3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"])
+
+    index = WowTokenIndex()
+    indexer = WowTokenIndexer(
+        web3, index, web3.eth.chain_id, [FACTORY], start_block=start_block, chunk_size=2
+    )
+    latest = web3.eth.block_number
+    assert indexer.sync(latest) == 5
+    assert indexer.requests == -(-(latest - start_block + 1) // 2)
+
+    assert [t.address for t in index.recent(web3.eth.chain_id)] == deployed[::-1]
+    assert index.search(web3.eth.chain_id, "e2e3")[0].address == deployed[3]
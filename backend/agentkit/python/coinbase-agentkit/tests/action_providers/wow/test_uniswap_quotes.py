@@ -0,0 +1,412 @@
+"""Tests for offline Uniswap V3 quotes of graduated WOW tokens."""
+
+import os
+import random
+from decimal import ROUND_FLOOR, Decimal, getcontext
+
+import pytest
+from web3 import Web3
+
+from coinbase_agentkit.action_providers.wow.constants import WOW_ABI
+from coinbase_agentkit.action_providers.wow.uniswap.constants import (
+    UNISWAP_QUOTER_ABI,
+    UNISWAP_V3_ABI,
+)
+from coinbase_agentkit.action_providers.wow.uniswap.pool_state import (
+    PoolState,
+    PoolStateRangeError,
+    clear_pool_states,
+    load_pool_state,
+)
+from coinbase_agentkit.action_providers.wow.uniswap.utils import (
+    exact_input_single,
+    get_uniswap_quote,
+    get_uniswap_quotes,
+)
+from coinbase_agentkit.action_providers.wow.uniswap.v3_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    Q96,
+    compute_swap_step,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    next_initialized_tick_within_one_word,
+    tick_bitmap_position,
+)
+
+getcontext().prec = 80
+
+WETH = "0x4200000000000000000000000000000000000006"
+TOKEN = "0x1234567890123456789012345678901234567890"
+POOL = "0x00000000000000000000000000000000000000Aa"
+E18 = 10**18
+
+
+def _encode_price_sqrt(reserve1: int, reserve0: int) -> int:
+    """Encode a price as a sqrt price, like the Uniswap V3 core test utilities."""
+    ratio = (Decimal(reserve1) / Decimal(reserve0)).sqrt()
+    ratio = ratio.quantize(Decimal(10) ** -40, rounding=ROUND_FLOOR)
+    return int((ratio * Decimal(Q96)).to_integral_value(rounding=ROUND_FLOOR))
+
+
+class _FakePool:
+    """Uniswap V3 pool with positions, answering reads like the chain."""
+
+    def __init__(self, positions, tick, fee=10000, tick_spacing=200, token0=WETH, token1=TOKEN):
+        self.fee = fee
+        self.tick_spacing = tick_spacing
+        self.token0 = token0
+        self.token1 = token1
+        self.tick = tick
+        self.sqrt_price_x96 = get_sqrt_ratio_at_tick(tick) + 12345
+        self.liquidity_net = {}
+        for lower, upper, liquidity in positions:
+            self.liquidity_net[lower] = self.liquidity_net.get(lower, 0) + liquidity
+            self.liquidity_net[upper] = self.liquidity_net.get(upper, 0) - liquidity
+        self.liquidity = sum(
+            liquidity for lower, upper, liquidity in positions if lower <= tick < upper
+        )
+        self.bitmap = {}
+        for t in self.liquidity_net:
+            word, bit = tick_bitmap_position(t // tick_spacing)
+            self.bitmap[word] = self.bitmap.get(word, 0) | 1 << bit
+        self.balances = {token0: 50 * E18, token1: 10**27}
+
+    def state(self) -> PoolState:
+        """Build the pool state directly, covering all ticks."""
+        return PoolState(
+            address=POOL,
+            token0=self.token0,
+            token1=self.token1,
+            fee=self.fee,
+            tick_spacing=self.tick_spacing,
+            sqrt_price_x96=self.sqrt_price_x96,
+            tick=self.tick,
+            liquidity=self.liquidity,
+            balance0=self.balances[self.token0],
+            balance1=self.balances[self.token1],
+            block_number=1000,
+            tick_bitmap=self.bitmap,
+            liquidity_net=self.liquidity_net,
+            word_range=(-(1 << 15), (1 << 15) - 1),
+        )
+
+    def answer(self, address, function_name, args):
+        """Answer a call to the pool."""
+        return {
+            "slot0": lambda: (self.sqrt_price_x96, self.tick, 0, 1, 1, 0, True),
+            "liquidity": lambda: (self.liquidity,),
+            "fee": lambda: (self.fee,),
+            "tickSpacing": lambda: (self.tick_spacing,),
+            "token0": lambda: (self.token0,),
+            "token1": lambda: (self.token1,),
+            "tickBitmap": lambda: (self.bitmap.get(args["wordPosition"], 0),),
+            "ticks": lambda: (0, self.liquidity_net[args["tick"]], 0, 0, 0, 0, 0, True),
+        }[function_name]()
+
+    def wallet_provider(self, multicall3):
+        """Create a wallet provider reading the pool and its token balances."""
+        multicall3.add_contract(POOL, UNISWAP_V3_ABI, self.answer)
+        for token in (self.token0, self.token1):
+            multicall3.add_contract(token, WOW_ABI, lambda address, *_: (self.balances[address],))
+        multicall3.add_read("poolAddress", lambda *_: POOL)
+        multicall3.add_read(
+            "quoteExactInputSingle",
+            lambda _, args: self.state().quote(args[0]["tokenIn"], args[0]["amountIn"]).amount_out,
+        )
+        wallet_provider = multicall3.wallet_provider()
+        wallet_provider.get_network.return_value.chain_id = 84532
+        return wallet_provider
+
+
+def _reference_swap(pool: _FakePool, amount_in: int, zero_for_one: bool) -> Decimal:
+    """Simulate a swap with high precision decimals instead of contract rounding."""
+    sqrt_price = Decimal(pool.sqrt_price_x96) / Q96
+    liquidity = Decimal(pool.liquidity)
+    remaining = Decimal(amount_in) * (1 - Decimal(pool.fee) / 10**6)
+    amount_out = Decimal(0)
+    ticks = sorted(pool.liquidity_net, reverse=zero_for_one)
+    ticks = [t for t in ticks if (t <= pool.tick if zero_for_one else t > pool.tick)]
+
+    for tick in [*ticks, MIN_TICK if zero_for_one else MAX_TICK]:
+        target = Decimal(get_sqrt_ratio_at_tick(tick)) / Q96
+        if zero_for_one:
+            needed = liquidity * (1 / target - 1 / sqrt_price)
+            if remaining < needed:
+                target = 1 / (remaining / liquidity + 1 / sqrt_price)
+                needed = remaining
+            amount_out += liquidity * (sqrt_price - target)
+        else:
+            needed = liquidity * (target - sqrt_price)
+            if remaining < needed:
+                target = sqrt_price + remaining / liquidity
+                needed = remaining
+            amount_out += liquidity * (1 / sqrt_price - 1 / target)
+        remaining -= needed
+        sqrt_price = target
+        if remaining <= 0:
+            break
+        net = pool.liquidity_net.get(tick, 0)
+        liquidity += -net if zero_for_one else net
+
+    return amount_out
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool_states():
+    """Forget pool states loaded by other tests."""
+    clear_pool_states()
+    yield
+    clear_pool_states()
+
+
+def _random_pool(seed: int) -> _FakePool:
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(6):
+        lower = rng.randrange(-300, 300) * 200
+        upper = lower + rng.randrange(1, 100) * 200
+        positions.append((lower, upper, rng.randrange(10**18, 10**22)))
+    # A full range position, like the one a WOW token graduates into
+    positions.append((-887200, 887200, 10**21))
+    return _FakePool(positions, tick=rng.randrange(-60000, 60000))
+
+
+def test_tick_math_bounds():
+    """Test the tick math against the bounds of the Uniswap V3 TickMath library."""
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(0) == Q96
+    assert get_tick_at_sqrt_ratio(MIN_SQRT_RATIO) == MIN_TICK
+    assert get_tick_at_sqrt_ratio(MAX_SQRT_RATIO - 1) == MAX_TICK - 1
+
+    with pytest.raises(ValueError):
+        get_sqrt_ratio_at_tick(MAX_TICK + 1)
+    with pytest.raises(ValueError):
+        get_tick_at_sqrt_ratio(MAX_SQRT_RATIO)
+
+
+def test_sqrt_ratio_at_tick_precision():
+    """Test every multiplier of getSqrtRatioAtTick against a high precision result."""
+    for bit in range(20):
+        for tick in (1 << bit, -(1 << bit)):
+            exact = (Decimal("1.0001") ** tick).sqrt() * Q96
+            assert abs(get_sqrt_ratio_at_tick(tick) - exact) / exact < Decimal("1e-17")
+
+
+def test_tick_at_sqrt_ratio_inverts():
+    """Test that getTickAtSqrtRatio is the greatest tick at or below the price."""
+    rng = random.Random(1)
+    for _ in range(500):
+        tick = rng.randrange(MIN_TICK + 1, MAX_TICK - 1)
+        sqrt_price = get_sqrt_ratio_at_tick(tick)
+        assert get_tick_at_sqrt_ratio(sqrt_price) == tick
+        assert get_tick_at_sqrt_ratio(sqrt_price - 1) == tick - 1
+
+
+def test_compute_swap_step_matches_core_vectors():
+    """Test swap steps against the exact input cases of the SwapMath spec of Uniswap V3 core."""
+    price = _encode_price_sqrt(1, 1)
+
+    target = _encode_price_sqrt(101, 100)
+    assert compute_swap_step(price, target, 2 * E18, E18, 600) == (
+        target,
+        9975124224178055,
+        9925619580021728,
+        5988667735148,
+    )
+
+    _, amount_in, amount_out, fee = compute_swap_step(
+        price, _encode_price_sqrt(1000, 100), 2 * E18, E18, 600
+    )
+    assert (amount_in, amount_out, fee) == (999400000000000000, 666399946655997866, 600000000000000)
+
+
+def test_next_initialized_tick_within_one_word():
+    """Test the bitmap search against a search of the initialized tick list."""
+    rng = random.Random(2)
+    for _ in range(500):
+        spacing = rng.choice([1, 10, 60, 200])
+        initialized = rng.sample(range(-3000, 3000), 20)
+        bitmap = {}
+        for compressed in initialized:
+            word, bit = tick_bitmap_position(compressed)
+            bitmap[word] = bitmap.get(word, 0) | 1 << bit
+        tick = rng.randrange(-3000 * spacing, 3000 * spacing)
+        compressed = tick // spacing
+
+        below = [c for c in initialized if c <= compressed and c >> 8 == compressed >> 8]
+        expected = (
+            (max(below) * spacing, True) if below else ((compressed >> 8 << 8) * spacing, False)
+        )
+        assert next_initialized_tick_within_one_word(bitmap, tick, spacing, True) == expected
+
+        word = (compressed + 1) >> 8
+        above = [c for c in initialized if c > compressed and c >> 8 == word]
+        expected = (min(above) * spacing, True) if above else (((word << 8) + 255) * spacing, False)
+        assert next_initialized_tick_within_one_word(bitmap, tick, spacing, False) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quote_matches_reference_swap(seed):
+    """Test simulated swaps across initialized ticks against a high precision swap."""
+    pool = _random_pool(seed)
+    state = pool.state()
+
+    for zero_for_one in (True, False):
+        for amount in (10**12, 10**16, 10**19, 10**21):
+            quote = state.quote_exact_input(amount, zero_for_one)
+            expected = _reference_swap(pool, amount, zero_for_one)
+
+            assert quote.amount_in == amount
+            # Contract rounding only ever favors the pool, by a few wei per step
+            assert quote.amount_out <= expected
+            assert expected - quote.amount_out <= max(expected * Decimal("1e-15"), 10)
+
+
+def test_quote_crosses_ticks():
+    """Test that a swap through a position boundary picks up its liquidity."""
+    pool = _FakePool([(-400, 400, E18), (400, 2000, 10 * E18)], tick=0)
+    state = pool.state()
+
+    small = state.quote_exact_input(10**12, False)
+    large = state.quote_exact_input(10**18, False)
+
+    assert small.initialized_ticks_crossed == 0
+    assert large.initialized_ticks_crossed >= 1
+    assert get_tick_at_sqrt_ratio(large.sqrt_price_x96_after) >= 400
+
+
+def test_quote_partial_fill_when_liquidity_runs_out():
+    """Test that a swap larger than the liquidity stops at the price limit."""
+    pool = _FakePool([(-400, 400, E18)], tick=0)
+
+    quote = pool.state().quote_exact_input(10**30, False)
+
+    assert quote.amount_in < 10**30
+    assert quote.sqrt_price_x96_after == MAX_SQRT_RATIO - 1
+
+
+def test_quote_past_loaded_words_raises():
+    """Test that a swap past the loaded bitmap words is refused."""
+    pool = _FakePool([(-400, 400, E18)], tick=0)
+    state = pool.state()
+    state.word_range = (0, 0)
+
+    with pytest.raises(PoolStateRangeError):
+        state.quote_exact_input(10**30, False)
+
+
+def test_load_pool_state_in_three_reads(multicall3):
+    """Test that the pool state is read with three Multicall3 batches."""
+    pool = _random_pool(7)
+
+    state = load_pool_state(pool.wallet_provider(multicall3), POOL)
+
+    assert multicall3.reads == ["aggregate3"] * 3
+    assert state.block_number == 1000
+    assert state.tick_bitmap == pool.bitmap
+    assert state.liquidity_net == pool.liquidity_net
+    assert (state.token0, state.token1) == (WETH, TOKEN)
+    assert state.balance0 == 50 * E18
+    assert state.quote(WETH, E18) == pool.state().quote(WETH, E18)
+
+
+def test_get_uniswap_quotes_match_quoter(multicall3):
+    """Test that local quotes match the quoter, and reuse one pool state."""
+    pool = _random_pool(3)
+    wallet_provider = pool.wallet_provider(multicall3)
+    amounts = [10**15 * 2**i for i in range(12)]
+
+    buys = get_uniswap_quotes(wallet_provider, TOKEN, amounts, "buy")
+    sells = get_uniswap_quotes(wallet_provider, TOKEN, amounts, "sell")
+
+    assert [q.amount_out for q in buys] == [
+        exact_input_single(wallet_provider, WETH, TOKEN, a, 10000) for a in amounts
+    ]
+    assert [q.amount_out for q in sells] == [
+        exact_input_single(wallet_provider, TOKEN, WETH, a, 10000) for a in amounts
+    ]
+    assert all(q.error is None and q.fee == 0.01 for q in buys + sells)
+    assert buys[0].balance.weth == 50 * E18
+    assert multicall3.reads.count("aggregate3") == 3
+
+
+def test_get_uniswap_quote_insufficient_liquidity(multicall3):
+    """Test that a buy larger than the pool reports insufficient liquidity."""
+    pool = _FakePool([(-400, 400, E18)], tick=0)
+
+    quote = get_uniswap_quote(pool.wallet_provider(multicall3), TOKEN, 10**30, "buy")
+
+    assert quote.error == "Insufficient liquidity"
+
+
+def test_get_uniswap_quotes_report_pool_errors(multicall3):
+    """Test that a pool that cannot be read is reported in the quote errors."""
+    pool = _FakePool([(-400, 400, E18)], tick=0)
+    wallet_provider = pool.wallet_provider(multicall3)
+    wallet_provider.read_contract.side_effect = [POOL, Exception("rpc error")]
+
+    quotes = get_uniswap_quotes(wallet_provider, TOKEN, [E18, 2 * E18], "buy")
+
+    assert [quote.error for quote in quotes] == ["Failed fetching pool: rpc error"] * 2
+
+
+def test_slippage_curve_in_four_reads(multicall3):
+    """Test that a slippage curve is quoted locally instead of one quoter read per amount."""
+    pool = _random_pool(11)
+    amounts = [10**14 * (i + 1) for i in range(200)]
+
+    quotes = get_uniswap_quotes(pool.wallet_provider(multicall3), TOKEN, amounts, "buy")
+
+    assert len(quotes) == len(amounts)
+    assert all(quote.error is None for quote in quotes)
+    assert multicall3.reads == ["poolAddress", "aggregate3", "aggregate3", "aggregate3"]
+
+
+@pytest.mark.e2e
+def test_quotes_match_quoter_on_fork():
+    """Test local quotes against the quoter on a Base mainnet fork.
+
+    Requires an anvil fork of Base mainnet at ANVIL_RPC_URL, and the address of a
+    graduated WOW token in WOW_GRADUATED_TOKEN.
+    """
+    rpc_url = os.environ.get("ANVIL_RPC_URL")
+    token = os.environ.get("WOW_GRADUATED_TOKEN")
+    if not rpc_url or not token:
+        pytest.skip("ANVIL_RPC_URL and WOW_GRADUATED_TOKEN are not set")
+
+    from eth_account import Account
+
+    from coinbase_agentkit.wallet_providers.eth_account_wallet_provider import (
+        EthAccountWalletProvider,
+        EthAccountWalletProviderConfig,
+    )
+
+    wallet_provider = EthAccountWalletProvider(
+        EthAccountWalletProviderConfig(account=Account.create(), chain_id="8453", rpc_url=rpc_url)
+    )
+    quoter = "0x3d4e44Eb1374240CE5F1B871ab261CD16335B76a"
+    amounts = [10**12 * 10**i for i in range(8)]
+
+    for quote_type in ("buy", "sell"):
+        quotes = get_uniswap_quotes(wallet_provider, token, amounts, quote_type)
+        token_in, token_out = (WETH, token) if quote_type == "buy" else (token, WETH)
+        for amount, quote in zip(amounts, quotes, strict=True):
+            expected = wallet_provider.read_contract(
+                contract_address=quoter,
+                abi=UNISWAP_QUOTER_ABI,
+                function_name="quoteExactInputSingle",
+                args=[
+                    {
+                        "tokenIn": Web3.to_checksum_address(token_in),
+                        "tokenOut": Web3.to_checksum_address(token_out),
+                        "fee": 10000,
+                        "amountIn": amount,
+                        "sqrtPriceLimitX96": 0,
+                    }
+                ],
+            )[0]
+            assert quote.amount_out == expected
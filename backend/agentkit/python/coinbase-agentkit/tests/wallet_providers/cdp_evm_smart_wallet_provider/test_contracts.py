@@ -211,3 +211,24 @@ def test_read_contract_with_invalid_address(mocked_wallet_provider, mock_web3):
 
     with pytest.raises(ValueError, match="Invalid address"):
         mocked_wallet_provider.read_contract(invalid_address, abi, "testFunction")
+
+
+def test_simulate_transaction(mocked_wallet_provider, mock_web3):
+    """Test simulate_transaction method runs eth_call from the wallet."""
+    transaction = {"to": MOCK_ADDRESS_TO, "data": "0x1234", "value": 1}
+    mock_web3.return_value.eth.call.return_value = bytes.fromhex("01")
+
+    result = mocked_wallet_provider.simulate_transaction(transaction)
+
+    assert result == bytes.fromhex("01")
+    mock_web3.return_value.eth.call.assert_called_once_with(
+        {**transaction, "from": mocked_wallet_provider.get_address()}, "latest"
+    )
+
+
+def test_simulate_transaction_revert(mocked_wallet_provider, mock_web3):
+    """Test simulate_transaction method when the call reverts."""
+    mock_web3.return_value.eth.call.side_effect = ContractLogicError("execution reverted")
+
+    with pytest.raises(ContractLogicError, match="execution reverted"):
+        mocked_wallet_provider.simulate_transaction({"to": MOCK_ADDRESS_TO, "data": "0x1234"})
@@ -3,6 +3,7 @@
 from unittest.mock import Mock
 
 import pytest
+from web3.exceptions import ContractLogicError
 
 from .conftest import MOCK_ADDRESS_TO
 
@@ -85,3 +86,24 @@ def test_read_contract_with_contract_logic_error(wallet_provider, mock_web3):
 
     with pytest.raises(ContractLogicError, match=error_message):
         wallet_provider.read_contract(contract_address, abi, "testFunction")
+
+
+def test_simulate_transaction(wallet_provider, mock_web3):
+    """Test simulate_transaction method runs eth_call from the wallet."""
+    transaction = {"to": MOCK_ADDRESS_TO, "data": "0x1234", "value": 1}
+    mock_web3.return_value.eth.call.return_value = bytes.fromhex("01")
+
+    result = wallet_provider.simulate_transaction(transaction)
+
+    assert result == bytes.fromhex("01")
+    mock_web3.return_value.eth.call.assert_called_once_with(
+        {**transaction, "from": wallet_provider.get_address()}, "latest"
+    )
+
+
+def test_simulate_transaction_revert(wallet_provider, mock_web3):
+    """Test simulate_transaction method when the call reverts."""
+    mock_web3.return_value.eth.call.side_effect = ContractLogicError("execution reverted")
+
+    with pytest.raises(ContractLogicError, match="execution reverted"):
+        wallet_provider.simulate_transaction({"to": MOCK_ADDRESS_TO, "data": "0x1234"})
@@ -35,6 +35,25 @@ def test_required_methods():
     assert hasattr(EvmWalletProvider, "native_transfer")
 
 
+def test_simulate_transaction_is_optional():
+    """Test that simulate_transaction is not abstract and simulates nothing by default."""
+    assert "simulate_transaction" not in EvmWalletProvider.__abstractmethods__
+
+    # A provider implementing only the abstract methods, like one written before simulation
+    provider_class = type(
+        "Provider",
+        (EvmWalletProvider,),
+        {
+            name: lambda self, *args, **kwargs: None
+            for name in EvmWalletProvider.__abstractmethods__
+        },
+    )
+    assert (
+        provider_class().simulate_transaction({"to": "0x0000000000000000000000000000000000000000"})
+        is None
+    )
+
+
 def test_evm_gas_config_defaults():
     """Test that EvmGasConfig has correct default values."""
     config = EvmGasConfig()
@@ -58,6 +77,7 @@ def test_method_signatures():
         "send_transaction": ["transaction"],
         "wait_for_transaction_receipt": ["tx_hash", "timeout", "poll_latency"],
         "read_contract": ["contract_address", "abi", "function_name", "args", "block_identifier"],
+        "simulate_transaction": ["transaction", "block_identifier"],
         "get_address": [],
         "get_network": [],
         "get_balance": [],